@@ -0,0 +1,271 @@
+"""
+가짜 STT/LLM 제공자로 앱을 프로세스 내에서 구동하는 오프라인 엔드포인트 벤치마크.
+
+외부 API를 호출하지 않으므로 네트워크·과금 없이 실행할 수 있으며, 제공자 지연을 0으로 두면
+순수하게 우리 코드(파이프라인, 직렬화, 미들웨어 등)의 오버헤드만 측정할 수 있습니다.
+같은 프로세스 안에서 uvicorn 서버를 띄우고 실제 HTTP로 부하를 주므로 SSE 첫 이벤트 시간도 측정합니다.
+(부하 생성기와 서버가 이벤트 루프를 공유하므로 절대값보다 실행 간 비교 용도로 사용하세요)
+
+시나리오: analyze(/api/analyze), title(/api/analyze only_title), template/email(/api/template),
+guide(/api/template?generation_type=guide, SSE)
+
+실행 예:
+    poetry run python -m benchmarks.bench_endpoints --scenarios template guide --concurrency 1 8 32
+    poetry run python -m benchmarks.bench_endpoints --llm-latency-ms 0 --stt-latency-ms 0   # 오버헤드만 측정
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import free_port, save_results, summarize_latencies
+
+SCENARIOS = ("analyze", "title", "template", "email", "guide", "bundle")
+
+_TEMPLATE_PAYLOAD = {
+    "user_id": "user_001",
+    "target_info": "(가상)김수연",
+    "purpose": "Growth, Work",
+    "detailed_context": "프로덕트 디자인 팀 내 갈등 상황 진단 및 해결책 논의",
+    "num_questions": "Standard",
+    "question_composition": "Growth/Goal-oriented, Reflection/Thought-provoking",
+    "tone_and_manner": "Casual",
+    "language": "Korean",
+}
+_ANALYZE_PAYLOAD = {
+    "recording_url": "https://bench.invalid/recordings/meeting.m4a",
+    "qa_pairs": json.dumps([{"question": "최근 보람을 느낀 업무는?", "answer": ""}], ensure_ascii=False),
+    "participants_info": json.dumps({"leader": "김지현", "member": "김준희"}, ensure_ascii=False),
+    "meeting_datetime": "2025-07-20T14:30:00",
+}
+
+
+def _request_for(scenario: str) -> Dict[str, Any]:
+    if scenario == "analyze":
+        return {"url": "/api/analyze", "json": _ANALYZE_PAYLOAD}
+    if scenario == "title":
+        return {"url": "/api/analyze", "json": {**_ANALYZE_PAYLOAD, "only_title": True}}
+    if scenario == "guide":
+        questions = {"1": "최근 가장 보람을 느낀 업무는?", "2": "협업에서 어려운 점은?"}
+        return {
+            "url": "/api/template",
+            "params": {"generation_type": "guide"},
+            "json": {**_TEMPLATE_PAYLOAD, "generated_questions": questions},
+            "stream": True,
+        }
+    if scenario == "bundle":
+        # 템플릿/이메일/가이드 3회 순차 호출을 대체하는 단일 SSE 요청
+        return {"url": "/api/template/bundle", "json": _TEMPLATE_PAYLOAD, "stream": True}
+    return {"url": "/api/template", "params": {"generation_type": scenario}, "json": _TEMPLATE_PAYLOAD}
+
+
+class FakeProviders:
+    """앱에 가짜 제공자를 설치/해제 (템플릿 계열 모듈의 llm과 워커 ProviderClients 교체)"""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        from benchmarks import fakes
+
+        def llm(name: str, responder, seed_offset: int) -> fakes.FakeChatModel:
+            return fakes.FakeChatModel(
+                model_name=name,
+                responder=responder,
+                first_token_latency=fakes.LatencyDistribution(args.llm_latency_ms, args.distribution),
+                tokens_per_second=args.llm_tokens_per_second,
+                failure_rate=args.llm_failure_rate,
+                seed=args.seed + seed_offset,
+            )
+
+        self.template_llm = llm("gemini-2.5-flash", fakes.template_responder, 1)
+        self.email_llm = llm("gemini-2.5-flash", fakes.batch_email_responder, 2)
+        self.guide_llm = llm("gemini-2.5-flash", fakes.guide_responder, 3)
+        self.meeting_llm = llm("gemini-2.5-pro", fakes.meeting_analysis_responder, 4)
+        self.title_llm = llm("gemini-2.5-flash", fakes.batch_title_responder, 5)
+        self.meeting_fallback_llm = llm("gemini-2.5-flash", fakes.meeting_analysis_responder, 6)
+        self.stt = fakes.FakeAssemblyAIClient(
+            processing_latency=fakes.LatencyDistribution(args.stt_latency_ms, args.distribution),
+            request_latency=fakes.LatencyDistribution(args.stt_request_latency_ms, args.distribution),
+            failure_rate=args.stt_failure_rate,
+            duration_minutes=args.audio_minutes,
+            seed=args.seed,
+        )
+        self.media = fakes.fake_media_client(
+            args.audio_minutes, fakes.LatencyDistribution(args.stt_request_latency_ms, args.distribution), args.seed
+        )
+        self.stt_poll_interval = args.stt_poll_interval
+        self._restore: List[Any] = []
+
+    def _patch(self, target: Any, name: str, value: Any) -> None:
+        self._restore.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+    def install(self, app) -> None:
+        from src.services.meeting_generator import generate_meeting
+        from src.services.meeting_generator.generate_meeting import create_title_batcher
+        from src.services.meeting_generator.workflow import MeetingPipeline
+        from src.services.template_generator import generate_email, generate_template, generate_usage_guide
+        from src.utils.clients import ProviderClients
+
+        self._patch(generate_template, "llm", self.template_llm)
+        self._patch(generate_template, "chain", generate_template.get_chain())
+        self._patch(generate_email, "llm", self.email_llm)
+        self._patch(generate_usage_guide, "llm", self.guide_llm)
+        self._patch(generate_meeting, "STT_CHECK_INTERVAL", self.stt_poll_interval)
+
+        clients = ProviderClients(
+            stt=self.stt,
+            media=self.media,
+            meeting_llm=self.meeting_llm,
+            meeting_fallback_llm=self.meeting_fallback_llm,
+            title_llm=self.title_llm,
+        )
+        # MICRO_BATCH_ENABLED=true로 띄운 경우 제목 묶음 처리도 가짜 제공자를 사용
+        title_batcher = create_title_batcher(clients) if getattr(app.state, "title_batcher", None) else None
+        self._patch(app.state, "provider_clients", clients)
+        self._patch(app.state, "title_batcher", title_batcher)
+        self._patch(app.state, "meeting_pipeline", MeetingPipeline(clients, title_batcher=title_batcher))
+
+    def uninstall(self) -> None:
+        while self._restore:
+            target, name, value = self._restore.pop()
+            setattr(target, name, value)
+
+
+async def _send(client: httpx.AsyncClient, request: Dict[str, Any]) -> Dict[str, Any]:
+    """요청 1회 실행. SSE는 첫 이벤트 시간과 이벤트 수도 기록"""
+    start = time.perf_counter()
+    kwargs = {key: request[key] for key in ("json", "params") if key in request}
+    if not request.get("stream"):
+        response = await client.post(request["url"], **kwargs)
+        body = response.json() if response.status_code == 200 else None
+        # 파이프라인 실패 시에도 200 + 빈 결과가 반환되므로 빈 본문은 오류로 집계
+        ok = response.status_code == 200 and bool(body)
+        return {"latency": time.perf_counter() - start, "ok": ok}
+
+    first_event: Optional[float] = None
+    events = 0
+    ok = True
+    async with client.stream("POST", request["url"], **kwargs) as response:
+        ok = response.status_code == 200
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            if first_event is None:
+                first_event = time.perf_counter() - start
+            events += 1
+            if '"error"' in line:
+                ok = False
+    return {"latency": time.perf_counter() - start, "ok": ok, "first_event": first_event, "events": events}
+
+
+async def _load(base_url: str, scenario: str, total: int, concurrency: int) -> Dict[str, Any]:
+    request = _request_for(scenario)
+    samples: List[Dict[str, Any]] = []
+    remaining = total
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=600) as client:
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                try:
+                    samples.append(await _send(client, request))
+                except httpx.HTTPError:
+                    samples.append({"latency": 0.0, "ok": False})
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    succeeded = [sample for sample in samples if sample["ok"]]
+    result = {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": total - len(succeeded),
+        "throughput_rps": round(len(succeeded) / elapsed, 2),
+        **summarize_latencies([sample["latency"] for sample in succeeded]),
+    }
+    first_events = [sample["first_event"] for sample in succeeded if sample.get("first_event") is not None]
+    if first_events:
+        result.update(summarize_latencies(first_events, prefix="first_event_"))
+        result["events_per_stream"] = round(sum(s["events"] for s in succeeded) / len(succeeded), 1)
+    return result
+
+
+async def run_benchmark(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """앱을 같은 프로세스에서 띄우고 시나리오 x 동시성 조합별로 부하를 준 결과 반환"""
+    import uvicorn
+
+    from src.web.main import app
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, lifespan="on", log_level="warning"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        if serve_task.done():
+            serve_task.result()
+        await asyncio.sleep(0.05)
+
+    providers = FakeProviders(args)
+    providers.install(app)
+    base_url = f"http://127.0.0.1:{port}"
+    results = []
+    try:
+        for scenario in args.scenarios:
+            await _load(base_url, scenario, min(args.warmup, args.requests), 1)
+            for concurrency in args.concurrency:
+                result = await _load(base_url, scenario, args.requests, concurrency)
+                print(json.dumps(result, ensure_ascii=False))
+                results.append(result)
+    finally:
+        providers.uninstall()
+        server.should_exit = True
+        await serve_task
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="가짜 제공자 기반 오프라인 엔드포인트 벤치마크")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=100, help="시나리오 x 동시성 조합별 요청 수")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--distribution", choices=["constant", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--llm-latency-ms", type=float, default=800, help="LLM 첫 토큰까지 평균 지연")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=150)
+    parser.add_argument("--llm-failure-rate", type=float, default=0.0)
+    parser.add_argument("--stt-latency-ms", type=float, default=3000, help="STT 전사 처리 평균 시간")
+    parser.add_argument("--stt-request-latency-ms", type=float, default=50, help="STT REST 요청 1회 평균 지연")
+    parser.add_argument("--stt-failure-rate", type=float, default=0.0)
+    parser.add_argument("--stt-poll-interval", type=float, default=0.25, help="벤치마크용 STT 폴링 간격 (초)")
+    parser.add_argument("--audio-minutes", type=float, default=30, help="합성 대화록 길이 (분)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/endpoints_<시각>.json)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> str:
+    args = build_parser().parse_args(argv)
+
+    # 앱 임포트 전에 외부 저장소/내보내기를 임시 경로로 격리
+    tmp_dir = tempfile.mkdtemp(prefix="bench_endpoints_")
+    os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "bench-project")
+    os.environ.setdefault("TRACING_EXPORTER", "none")
+    os.environ["STATE_BACKEND_URL"] = f"sqlite:///{os.path.join(tmp_dir, 'state.sqlite3')}"
+    os.environ["COST_LEDGER_PATH"] = os.path.join(tmp_dir, "usage_ledger.sqlite3")
+
+    results = asyncio.run(run_benchmark(args))
+    config = {key: value for key, value in vars(args).items() if key != "output"}
+    output_path = save_results("endpoints", {"config": config, "results": results}, args.output)
+    print(f"결과 저장: {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    main()
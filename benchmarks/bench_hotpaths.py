@@ -0,0 +1,270 @@
+"""
+대화록 크기에 비례하는 순수 Python 구간의 마이크로벤치마크.
+
+측정 대상 (파이프라인에서 호출되는 그대로 실행):
+- speaker_percentages : calculate_speaker_percentages (STT utterance 객체 입력)
+- map_speaker_data    : map_speaker_data (화자 매핑 + 대화록 복사)
+- prompt_render       : 분석 프롬프트(ChatPromptTemplate)에 대화록을 렌더링
+- json_output_parse   : JsonOutputParser로 대용량 LLM 출력 파싱
+- model_dump          : MeetingAnalysis.model_dump
+- response_encode     : JSONResponse 본문 인코딩 (대화록 포함 분석 결과, 표준 json)
+- response_encode_fast: FastJSONResponse 본문 인코딩 (orjson)
+- response_projected  : fields=title,ai_core_summary로 필드를 선택한 FastJSONResponse 인코딩
+- response_gzip       : FastJSONResponse 본문 gzip 압축 (응답 압축 미들웨어 설정값)
+- response_brotli     : FastJSONResponse 본문 brotli 압축 (brotli 패키지가 설치된 경우만)
+
+함수·크기별로 실행 시간(중앙값/최소/평균)과 tracemalloc 기준 최대 추가 메모리를 기록하고
+(응답 인코딩/압축 항목은 전송 크기 output_bytes도 함께 기록),
+--compare로 저장된 기준선과 비교하여 회귀를 표시합니다 (회귀가 있으면 종료 코드 1).
+
+실행 예:
+    poetry run python -m benchmarks.bench_hotpaths --sizes 10m 1h 4h --save-baseline
+    poetry run python -m benchmarks.bench_hotpaths --compare
+"""
+import argparse
+import copy
+import gc
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.common import save_results
+from benchmarks.synthetic import TRANSCRIPT_SIZES, generate_analysis_dict, generate_utterances
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "hotpaths.json")
+
+# 이보다 작은 절대 차이(ms)는 측정 잡음으로 보고 회귀로 판단하지 않음
+_MIN_REGRESSION_DELTA_MS = 0.05
+
+# (함수 이름, 준비 함수) - 준비 함수는 크기별 입력을 받아 매 반복마다 호출할 (함수, 인자)를 반환
+Case = Callable[[Dict[str, Any]], Tuple[Callable, tuple]]
+
+
+def _build_inputs(duration_minutes: float, utterances_per_minute: float, seed: int) -> Dict[str, Any]:
+    """크기별 공통 입력 (준비 비용은 측정에서 제외)"""
+    import assemblyai as aai
+
+    raw_utterances = generate_utterances(duration_minutes, utterances_per_minute, seed=seed)
+    analysis = generate_analysis_dict(duration_minutes, seed=seed)
+    formatted = [{"speaker": u["speaker"], "text": u["text"]} for u in raw_utterances]
+    return {
+        "utterances": [aai.types.Utterance.parse_obj(u) for u in raw_utterances],
+        "formatted": formatted,
+        "analysis": analysis,
+        "analysis_json": json.dumps(analysis, ensure_ascii=False),
+        "speaker_stats": {"A": 55.0, "B": 45.0},
+        "participants": {"leader": "김지현", "member": "김준희"},
+    }
+
+
+def _case_speaker_percentages(inputs):
+    from src.utils.utils import calculate_speaker_percentages
+
+    return calculate_speaker_percentages, (inputs["utterances"],)
+
+
+def _case_map_speaker_data(inputs):
+    from src.utils.utils import map_speaker_data
+
+    # map_speaker_data는 입력 dict를 수정하므로 매 반복마다 복사본 사용
+    return map_speaker_data, (
+        copy.deepcopy(inputs["analysis"]), inputs["speaker_stats"], inputs["formatted"], inputs["participants"],
+    )
+
+
+def _case_prompt_render(inputs):
+    from langchain_core.prompts import ChatPromptTemplate
+
+    from src.prompts.stt_generation.meeting_analysis_prompts import SYSTEM_PROMPT, USER_PROMPT
+
+    prompt = ChatPromptTemplate.from_messages([("system", SYSTEM_PROMPT), ("human", USER_PROMPT)])
+    variables = {
+        "meeting_datetime": "2025-07-20T14:30:00",
+        "transcript": inputs["formatted"],
+        "speaker_stats": inputs["speaker_stats"],
+        "participants": inputs["participants"],
+        "qa_pairs": [],
+    }
+    return prompt.invoke, (variables,)
+
+
+def _case_json_output_parse(inputs):
+    from langchain_core.output_parsers import JsonOutputParser
+
+    return JsonOutputParser().parse, (inputs["analysis_json"],)
+
+
+def _case_model_dump(inputs):
+    from src.utils.schemas import MeetingAnalysis
+
+    return MeetingAnalysis.model_validate(inputs["analysis"]).model_dump, ()
+
+
+def _analysis_result(inputs) -> Dict[str, Any]:
+    from src.utils.utils import map_speaker_data
+
+    return map_speaker_data(
+        copy.deepcopy(inputs["analysis"]), inputs["speaker_stats"], inputs["formatted"], inputs["participants"]
+    )
+
+
+def _case_response_encode(inputs):
+    from fastapi.responses import JSONResponse
+
+    return JSONResponse, (_analysis_result(inputs),)
+
+
+def _case_response_encode_fast(inputs):
+    from src.utils.serialization import FastJSONResponse
+
+    return FastJSONResponse, (_analysis_result(inputs),)
+
+
+def _case_response_projected(inputs):
+    from src.utils.serialization import FastJSONResponse, select_fields
+
+    def encode(result):
+        return FastJSONResponse(select_fields(result, ["title", "ai_core_summary"]))
+
+    return encode, (_analysis_result(inputs),)
+
+
+def _case_response_compress(encoding: str) -> Case:
+    def case(inputs):
+        from src.utils.serialization import dumps
+        from src.web.middleware import compress_body
+
+        return compress_body, (dumps(_analysis_result(inputs)), encoding)
+
+    return case
+
+
+CASES: Dict[str, Case] = {
+    "speaker_percentages": _case_speaker_percentages,
+    "map_speaker_data": _case_map_speaker_data,
+    "prompt_render": _case_prompt_render,
+    "json_output_parse": _case_json_output_parse,
+    "model_dump": _case_model_dump,
+    "response_encode": _case_response_encode,
+    "response_encode_fast": _case_response_encode_fast,
+    "response_projected": _case_response_projected,
+    "response_gzip": _case_response_compress("gzip"),
+}
+if importlib.util.find_spec("brotli") is not None:
+    CASES["response_brotli"] = _case_response_compress("br")
+
+
+def measure(case: Case, inputs: Dict[str, Any], repeat: int) -> Dict[str, float]:
+    """반복 실행 시간과 1회 실행 시 최대 추가 메모리 측정 (준비 단계는 제외)"""
+    timings = []
+    for _ in range(repeat):
+        func, args = case(inputs)
+        gc.collect()
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    # tracemalloc은 실행 속도를 떨어뜨리므로 시간 측정과 분리하여 1회만 실행
+    func, args = case(inputs)
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    output = func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        "median_ms": round(statistics.median(timings) * 1000, 4),
+        "min_ms": round(min(timings) * 1000, 4),
+        "mean_ms": round(statistics.fmean(timings) * 1000, 4),
+        "peak_kb": round((peak - baseline) / 1024, 1),
+    }
+    # 응답 본문(Response.body) 또는 압축 결과는 전송 크기도 기록
+    body = getattr(output, "body", output)
+    if isinstance(body, bytes):
+        result["output_bytes"] = len(body)
+    return result
+
+
+def run(sizes: List[str], functions: List[str], repeat: int, utterances_per_minute: float, seed: int) -> List[Dict]:
+    results = []
+    for size in sizes:
+        inputs = _build_inputs(TRANSCRIPT_SIZES[size], utterances_per_minute, seed)
+        for name in functions:
+            result = {
+                "name": f"{name}[{size}]",
+                "function": name,
+                "size": size,
+                "utterances": len(inputs["formatted"]),
+                **measure(CASES[name], inputs, repeat),
+            }
+            print(json.dumps(result, ensure_ascii=False))
+            results.append(result)
+    return results
+
+
+def compare(results: List[Dict], baseline: List[Dict], threshold: float) -> List[Dict]:
+    """
+    기준선 대비 실행 시간/최대 메모리가 threshold 이상 늘어난 항목 반환.
+    시간은 잡음이 가장 적은 최소값(best of N, timeit과 동일한 기준)으로 비교합니다.
+    """
+    baseline_by_name = {item["name"]: item for item in baseline}
+    regressions = []
+    for result in results:
+        base = baseline_by_name.get(result["name"])
+        if base is None:
+            continue
+        time_ratio = result["min_ms"] / base["min_ms"] if base["min_ms"] else 1.0
+        memory_ratio = result["peak_kb"] / base["peak_kb"] if base["peak_kb"] > 0 else 1.0
+        slower = time_ratio > 1 + threshold and result["min_ms"] - base["min_ms"] > _MIN_REGRESSION_DELTA_MS
+        bigger = memory_ratio > 1 + threshold
+        status = "REGRESSION" if slower or bigger else ("improved" if time_ratio < 1 - threshold else "ok")
+        print(
+            f"{status:>10}  {result['name']:<32} time x{time_ratio:.2f} "
+            f"({base['min_ms']:.3f} → {result['min_ms']:.3f} ms)  memory x{memory_ratio:.2f}"
+        )
+        if slower or bigger:
+            regressions.append({**result, "baseline": base, "time_ratio": time_ratio, "memory_ratio": memory_ratio})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="대화록 크기별 핫패스 마이크로벤치마크")
+    parser.add_argument("--sizes", nargs="+", choices=list(TRANSCRIPT_SIZES), default=list(TRANSCRIPT_SIZES))
+    parser.add_argument("--functions", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--utterances-per-minute", type=float, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/hotpaths_<시각>.json)")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE_PATH, help="결과를 기준선으로 저장")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE_PATH, help="기준선과 비교하여 회귀 표시")
+    parser.add_argument("--threshold", type=float, default=0.15, help="회귀로 판단할 증가 비율")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "bench-project")
+    results = run(args.sizes, args.functions, args.repeat, args.utterances_per_minute, args.seed)
+    config = {"sizes": args.sizes, "repeat": args.repeat, "utterances_per_minute": args.utterances_per_minute,
+              "seed": args.seed, "python": sys.version.split()[0]}
+
+    regressions: List[Dict] = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f)["results"], args.threshold)
+        print(f"회귀 {len(regressions)}건 (기준선: {args.compare}, 임계값 {args.threshold:.0%})")
+
+    payload = {"config": config, "results": results, "regressions": [r["name"] for r in regressions]}
+    print(f"결과 저장: {save_results('hotpaths', payload, args.output)}")
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.save_baseline), exist_ok=True)
+        print(f"기준선 저장: {save_results('hotpaths', payload, args.save_baseline)}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+짧은 LLM 요청 묶음 처리(MicroBatcher) 처리량/지연 벤치마크.
+
+가짜 LLM 제공자(동시 처리 한도 max_concurrency)에 제목/이메일 요청을 포아송 도착으로 보내고
+묶음 처리 없이 개별 호출할 때와 window_ms 동안 모아 한 번에 호출할 때를 비교합니다.
+- throughput_rps : 처리한 요청 수 / 첫 도착부터 마지막 완료까지 걸린 시간
+- p50/p95/p99_ms : 요청별 도착부터 결과 수신까지 지연 (묶음 대기 시간 포함)
+- llm_calls / mean_batch_size : 제공자 호출 수와 호출당 평균 요청 수
+
+요청은 --users명의 사용자가 번갈아 보내며, 다른 사용자의 요청 내용이 한 프롬프트에 섞이지 않도록
+같은 사용자(이메일은 같은 언어)의 요청끼리만 묶습니다. 같은 도착률에서 사용자가 많을수록 한 묶음에 모이는 요청이 줄어
+mean_batch_size와 묶음 처리로 얻는 처리량 이득이 작아지고, 사용자 수가 창 안의 도착 수보다 많으면 개별 호출에 가까워집니다.
+
+실행 예:
+    poetry run python -m benchmarks.bench_microbatch --rates 20 50 100 --windows 20 50 --users 1 10
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from benchmarks import fakes
+from benchmarks.common import save_results, summarize_latencies
+from src.services.meeting_generator.generate_meeting import generate_title, generate_titles_batch, title_batch_key
+from src.services.template_generator import generate_email
+from src.utils.micro_batch import MicroBatcher
+from src.utils.schemas import EmailGeneratorInput
+
+KINDS = ("title", "email")
+
+
+def _title_input(users: int, index: int) -> Dict[str, Any]:
+    return {
+        "participants": {"leader": "김지현", "member": f"구성원{index}"},
+        "qa_pairs": [{"question": "최근 가장 보람을 느낀 업무는 무엇인가요?", "answer": f"{index}번 프로젝트 릴리즈"}],
+        "user_id": f"user_{index % users:03d}",
+    }
+
+
+def _email_input(users: int, index: int) -> EmailGeneratorInput:
+    return EmailGeneratorInput(
+        user_id=f"user_{index % users:03d}",
+        target_info=f"구성원{index}",
+        purpose="Growth, Work",
+        detailed_context=f"{index}번 프로젝트 마무리 이후 다음 분기 목표를 논의하고 싶습니다.",
+        use_previous_data=False,
+    )
+
+
+def _fake_llm(args: argparse.Namespace, kind: str) -> fakes.FakeChatModel:
+    return fakes.FakeChatModel(
+        responder=fakes.batch_title_responder if kind == "title" else fakes.batch_email_responder,
+        first_token_latency=fakes.LatencyDistribution(args.llm_latency_ms, args.distribution),
+        tokens_per_second=args.llm_tokens_per_second,
+        max_concurrency=args.provider_concurrency,
+        seed=args.seed,
+    )
+
+
+async def _run_load(call, make_input, rate: float, total: int, seed: int) -> Dict[str, Any]:
+    """포아송 도착으로 total건을 보내고 요청별 지연과 전체 처리량 측정"""
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(index: int, delay: float) -> None:
+        nonlocal errors
+        await asyncio.sleep(delay)
+        started = time.perf_counter()
+        try:
+            await call(make_input(index))
+        except Exception:
+            errors += 1
+            return
+        latencies.append(time.perf_counter() - started)
+
+    delays, at = [], 0.0
+    for _ in range(total):
+        delays.append(at)
+        at += rng.expovariate(rate)
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index, delay) for index, delay in enumerate(delays)))
+    elapsed = time.perf_counter() - started
+    return {
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        **summarize_latencies(latencies),
+        "errors": errors,
+    }
+
+
+async def run_case(
+    args: argparse.Namespace, kind: str, rate: float, window_ms: Optional[float], users: int = 1
+) -> Dict[str, Any]:
+    """window_ms가 None이면 묶음 처리 없이 개별 호출"""
+    llm = _fake_llm(args, kind)
+    original_llm = generate_email.llm
+    if kind == "title":
+        run_single, run_batch, key, make_input = (
+            partial(generate_title, llm), partial(generate_titles_batch, llm), title_batch_key, _title_input
+        )
+    else:
+        generate_email.llm = llm
+        run_single, run_batch, key, make_input = (
+            generate_email.generate_email, generate_email.generate_emails_batch, generate_email.email_batch_key,
+            _email_input,
+        )
+
+    batcher = None
+    if window_ms is not None:
+        batcher = MicroBatcher(
+            kind, run_batch, run_single, key=key, window_ms=window_ms, max_batch_size=args.max_batch_size
+        )
+    try:
+        metrics = await _run_load(
+            batcher.submit if batcher is not None else run_single, partial(make_input, users), rate, args.requests,
+            args.seed,
+        )
+    finally:
+        if batcher is not None:
+            await batcher.aclose()
+        generate_email.llm = original_llm
+
+    result = {
+        "kind": kind,
+        "rate_rps": rate,
+        "mode": "unbatched" if window_ms is None else "batched",
+        "window_ms": window_ms,
+        "users": users,
+        **metrics,
+        "llm_calls": llm.calls,
+        "mean_batch_size": round(args.requests / max(llm.calls, 1), 2),
+    }
+    print(json.dumps(result, ensure_ascii=False))
+    return result
+
+
+async def run_benchmark(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    for kind in args.kinds:
+        for rate in args.rates:
+            for users in args.users:
+                for window_ms in [None, *args.windows]:
+                    results.append(await run_case(args, kind, rate, window_ms, users))
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="짧은 LLM 요청 묶음 처리 처리량/지연 벤치마크")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--rates", type=float, nargs="+", default=[20, 50, 100], help="초당 도착 요청 수")
+    parser.add_argument("--windows", type=float, nargs="+", default=[20, 50], help="비교할 묶음 대기 시간 (ms)")
+    parser.add_argument("--requests", type=int, default=300, help="조합별 요청 수")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 10], help="요청을 번갈아 보내는 사용자 수")
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--provider-concurrency", type=int, default=8, help="제공자 동시 처리 한도 (0이면 제한 없음)")
+    parser.add_argument("--distribution", choices=["constant", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--llm-latency-ms", type=float, default=400, help="LLM 첫 토큰까지 평균 지연")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=0, help="0이면 출력 토큰 생성 시간 없음")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (기본: benchmarks/results/)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    results = asyncio.run(run_benchmark(args))
+    payload = {"config": vars(args), "results": results}
+    print(f"결과 저장: {save_results('microbatch', payload, args.output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
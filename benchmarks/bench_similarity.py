@@ -0,0 +1,136 @@
+"""
+템플릿 유사 요청 캐시(SimilarityCache) 조회/저장 마이크로벤치마크.
+
+저장 항목 수별로 합성 detailed_context를 채운 뒤 다음을 측정합니다.
+- insert      : put 1회 소요 시간 (MinHash 서명 + LSH 버킷 등록)
+- lookup_hit  : 저장된 문맥의 조사/어미만 바꾼 요청의 조회 시간
+- lookup_miss : 새로 만든 문맥 요청의 조회 시간
+- recall / false_hit_rate : 실제 n-gram Jaccard 유사도 기준 적중/오적중 비율
+
+실행 예:
+    poetry run python -m benchmarks.bench_similarity --entries 1000 10000 100000
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.common import percentile, save_results
+from src.utils.similarity_cache import SimilarityCache, char_ngrams
+
+_NAMES = ["김수연", "이도윤", "박서준", "최하은", "정민재", "강지우", "조예린", "윤태오", "장서아", "임준호"]
+_SUBJECTS = [
+    "신규 결제 프로젝트", "디자인 시스템 개편", "신입 온보딩", "코드 리뷰 문화", "상반기 성과 평가", "팀 이동 이후 적응",
+    "업무 분장 조정", "개발자 채용", "모바일 앱 릴리즈 일정", "레거시 기술 부채 정리", "고객 문의 대응", "데이터 파이프라인 이전",
+]
+_ISSUES = [
+    "일정이 계속 지연되는 문제", "다른 팀과의 커뮤니케이션 문제", "야근이 잦아진 번아웃 징후", "역할과 책임의 혼선",
+    "업무 동기가 떨어진 모습", "동료와의 협업 갈등", "우선순위가 자주 바뀌는 상황", "피드백이 부족하다는 의견",
+]
+_ACTIONS = [
+    "원인을 같이 파악하고 싶습니다", "필요한 지원 방안을 논의하고 싶습니다", "다음 분기 목표를 함께 정하고 싶습니다",
+    "구체적인 개선 계획을 세우고 싶습니다", "본인의 커리어 방향을 들어보고 싶습니다",
+]
+
+
+def _context(rng: random.Random) -> str:
+    """합성 detailed_context (2~3문장, 실제 요청처럼 대상자/주제/이슈 조합이 다양함)"""
+    sentences = [
+        f"{rng.choice(_NAMES)}님이 최근 {rng.choice(_SUBJECTS)}을 맡은 뒤로 {rng.choice(_ISSUES)}이 {rng.randint(2, 12)}주째 보입니다",
+        f"특히 {rng.choice(_SUBJECTS)} 과정에서 {rng.choice(_ISSUES)}이 있었다고 들었습니다",
+        f"이번 1on1에서는 {rng.choice(_ACTIONS)}",
+    ]
+    # 앞 두 문장의 순서를 바꾼 요청도 생성 (슬라이스 복사본이 아닌 목록 자체를 섞음)
+    head = sentences[:2]
+    rng.shuffle(head)
+    sentences[:2] = head
+    return ". ".join(sentences[:rng.randint(2, 3)] if rng.random() < 0.5 else sentences) + "."
+
+
+def _reword(text: str) -> str:
+    """조사/어미만 바꾼 유사 요청"""
+    return text.replace("보입니다", "보여요", 1).replace("들었습니다", "들었어요", 1)
+
+
+def _timed(func, *args) -> float:
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def _summary_us(latencies: List[float], prefix: str) -> Dict[str, float]:
+    return {
+        f"{prefix}_p50_us": round(statistics.median(latencies) * 1e6, 1),
+        f"{prefix}_p99_us": round(percentile(latencies, 0.99) * 1e6, 1),
+    }
+
+
+def _jaccard(a: str, b: str, ngram: int) -> float:
+    """MinHash 추정이 아닌 실제 n-gram Jaccard 유사도"""
+    a_set, b_set = set(char_ngrams(a, ngram)), set(char_ngrams(b, ngram))
+    return len(a_set & b_set) / len(a_set | b_set)
+
+
+def run(entries: List[int], queries: int = 500, partitions: int = 20, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    recall        : 실제 유사도가 threshold 이상인 변형 요청 중 적중 비율
+    false_hit_rate: 적중 결과 중 실제 유사도가 threshold - 0.1 미만인 비율
+    (합성 문맥은 조합 수가 제한적이라 무관한 요청도 실제로 비슷한 항목에 적중할 수 있음)
+    """
+    results = []
+    for size in entries:
+        rng = random.Random(seed)
+        cache = SimilarityCache(max_entries=size)
+        ngram = cache.hasher.ngram
+        texts = [_context(rng) for _ in range(size)]
+        insert = [_timed(cache.put, f"partition-{index % partitions}", text, index) for index, text in enumerate(texts)]
+
+        latencies: Dict[str, List[float]] = {"lookup_hit": [], "lookup_miss": []}
+        expected = recalled = hits = false_hits = 0
+        for _ in range(queries):
+            index = rng.randrange(size)
+            partition = f"partition-{index % partitions}"
+            reworded = _reword(texts[index])
+            for name, query in (("lookup_hit", reworded), ("lookup_miss", _context(rng))):
+                started = time.perf_counter()
+                found = cache.get(partition, query)
+                latencies[name].append(time.perf_counter() - started)
+                if found is not None:
+                    hits += 1
+                    false_hits += _jaccard(query, texts[found[0]], ngram) < cache.threshold - 0.1
+                if name == "lookup_hit" and _jaccard(query, texts[index], ngram) >= cache.threshold:
+                    expected += 1
+                    recalled += found is not None
+
+        result = {
+            "entries": size,
+            **_summary_us(insert, "insert"),
+            **_summary_us(latencies["lookup_hit"], "lookup_hit"),
+            **_summary_us(latencies["lookup_miss"], "lookup_miss"),
+            "recall": round(recalled / max(expected, 1), 3),
+            "false_hit_rate": round(false_hits / max(hits, 1), 3),
+        }
+        print(json.dumps(result, ensure_ascii=False))
+        results.append(result)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="템플릿 유사 요청 캐시 조회/저장 벤치마크")
+    parser.add_argument("--entries", type=int, nargs="+", default=[1000, 10000, 100000], help="저장 항목 수")
+    parser.add_argument("--queries", type=int, default=500, help="항목 수별 조회 횟수")
+    parser.add_argument("--partitions", type=int, default=20, help="정확 일치 입력(대상자/어조 등) 조합 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (기본: benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    results = run(args.entries, args.queries, args.partitions, args.seed)
+    payload = {"config": vars(args), "results": results}
+    print(f"결과 저장: {save_results('similarity', payload, args.output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,175 @@
+"""
+오디오 스트리밍 업로드(/api/audio/upload) 메모리/처리량 벤치마크.
+
+같은 프로세스에서 가짜 STT/Storage 서버(AssemblyAI /v2/upload, Supabase Storage 업로드 API 모사)와 앱을 uvicorn으로 띄우고
+파일 크기별로 합성 오디오 본문을 스트리밍 업로드합니다.
+- peak_alloc_mb : 업로드 동안 늘어난 Python 할당 메모리 최댓값 (tracemalloc, 클라이언트/앱/가짜 서버 모두 포함)
+- max_rss_mb    : 프로세스 최대 RSS (누적 최댓값이므로 크기가 커져도 늘지 않아야 함)
+- throughput_mb_s, verified : 업로드 속도와 두 대상이 받은 내용의 해시가 원본과 같은지 여부
+--upstream-mb-s로 가짜 서버의 수신 속도를 제한하면 클라이언트보다 느린 대상이 있을 때의 역압(backpressure)을 확인할 수 있습니다.
+
+실행 예:
+    poetry run python -m benchmarks.bench_upload --sizes-mb 10 100 500
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import resource
+import time
+import tracemalloc
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import free_port, save_results
+
+_BLOCK = os.urandom(64 * 1024)
+
+
+def create_fake_provider_app(received: Dict[str, Dict[str, Any]], upstream_mb_s: float = 0.0):
+    """받은 본문을 청크 단위로 해시만 계산하고 버리는 가짜 STT 업로드/Storage 서버"""
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    async def consume(request, target: str) -> None:
+        digest, size, started = hashlib.sha256(), 0, time.perf_counter()
+        async for chunk in request.stream():
+            digest.update(chunk)
+            size += len(chunk)
+            if upstream_mb_s > 0:
+                # 누적 수신량 기준으로 속도 제한
+                ahead = size / (upstream_mb_s * 1024 * 1024) - (time.perf_counter() - started)
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+        received[target] = {"size": size, "sha256": digest.hexdigest()}
+
+    async def stt_upload(request):
+        await consume(request, "stt")
+        return JSONResponse({"upload_url": f"https://cdn.assemblyai.test/upload/{uuid.uuid4().hex}"})
+
+    async def storage_upload(request):
+        await consume(request, "storage")
+        return JSONResponse({"Key": f"{request.path_params['bucket']}/{request.path_params['path']}"})
+
+    return Starlette(routes=[
+        Route("/v2/upload", stt_upload, methods=["POST"]),
+        Route("/storage/v1/object/{bucket}/{path:path}", storage_upload, methods=["POST"]),
+    ])
+
+
+async def _serve(app, port: int):
+    import uvicorn
+
+    # 업로드 경로는 provider_clients만 사용하므로 lifespan(상태 저장소, 원장 등)은 띄우지 않음
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.05)
+    return server, task
+
+
+async def _body(size_bytes: int, digest) -> AsyncIterator[bytes]:
+    sent = 0
+    while sent < size_bytes:
+        chunk = _BLOCK[:min(len(_BLOCK), size_bytes - sent)]
+        digest.update(chunk)
+        sent += len(chunk)
+        yield chunk
+
+
+def _max_rss_mb() -> float:
+    # Linux의 ru_maxrss 단위는 KB
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+async def run_benchmark(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    import assemblyai as aai
+
+    from src.utils.clients import AssemblyAIClient, ProviderClients, SupabaseStorageClient
+    from src.web.main import app
+
+    received: Dict[str, Dict[str, Any]] = {}
+    provider_port, app_port = free_port(), free_port()
+    provider_server, provider_task = await _serve(create_fake_provider_app(received, args.upstream_mb_s), provider_port)
+    app_server, app_task = await _serve(app, app_port)
+
+    provider_url = f"http://127.0.0.1:{provider_port}"
+    app.state.provider_clients = ProviderClients(
+        stt=AssemblyAIClient(httpx.AsyncClient(base_url=provider_url, timeout=None), aai.TranscriptionConfig()),
+        storage=SupabaseStorageClient(httpx.AsyncClient(base_url=provider_url, timeout=None)),
+        supabase=object(),
+        meeting_llm=object(),
+        title_llm=object(),
+    )
+    results = []
+    tracemalloc.start()
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{app_port}", timeout=None) as client:
+            for size_mb in args.sizes_mb:
+                size_bytes = int(size_mb * 1024 * 1024)
+                digest = hashlib.sha256()
+                received.clear()
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/audio/upload",
+                    params={"filename": "meeting.m4a"},
+                    content=_body(size_bytes, digest),
+                    headers={"content-type": "audio/mp4"},
+                )
+                elapsed = time.perf_counter() - started
+                peak = tracemalloc.get_traced_memory()[1] - baseline
+                response.raise_for_status()
+                body = response.json()
+                expected = digest.hexdigest()
+                result = {
+                    "size_mb": size_mb,
+                    "upstream_mb_s": args.upstream_mb_s,
+                    "peak_alloc_mb": round(peak / 1024 / 1024, 2),
+                    "max_rss_mb": _max_rss_mb(),
+                    "throughput_mb_s": round(size_mb / elapsed, 1),
+                    "verified": body["content_sha256"] == expected
+                    and all(item == {"size": size_bytes, "sha256": expected} for item in received.values())
+                    and len(received) == 2,
+                }
+                print(json.dumps(result, ensure_ascii=False))
+                results.append(result)
+    finally:
+        tracemalloc.stop()
+        await app.state.provider_clients.aclose()
+        del app.state.provider_clients
+        for server in (app_server, provider_server):
+            server.should_exit = True
+        await asyncio.gather(app_task, provider_task)
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="오디오 스트리밍 업로드 메모리/처리량 벤치마크")
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[10, 100, 500], help="업로드할 파일 크기 (MB)")
+    parser.add_argument("--upstream-mb-s", type=float, default=0.0, help="가짜 STT/Storage 서버 수신 속도 제한 (0이면 제한 없음)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (기본: benchmarks/results/)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "bench-project")
+    os.environ.setdefault("TRACING_EXPORTER", "none")
+
+    results = asyncio.run(run_benchmark(args))
+    payload = {"config": {key: value for key, value in vars(args).items() if key != "output"}, "results": results}
+    print(f"결과 저장: {save_results('upload', payload, args.output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
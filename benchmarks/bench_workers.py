@@ -0,0 +1,121 @@
+"""
+워커 수(1, 2, 4, 8)에 따른 처리량/지연 시간 스케일링 벤치마크.
+
+런처(src.web.launcher)로 서버를 워커 N개로 띄운 뒤, 공유 상태 저장소에 미리 기록해 둔
+작업을 모든 워커가 조회하도록 부하를 주어 워커 간 상태 공유와 처리량을 함께 측정합니다.
+외부 API(STT/LLM)는 호출하지 않습니다.
+
+실행 예:
+    poetry run python -m benchmarks.bench_workers --workers 1 2 4 8 --requests 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.common import free_port, save_results, summarize_latencies
+from src.utils.job_store import JobStore
+from src.utils.state_backend import create_state_backend
+
+
+async def _seed_job(state_url: str) -> str:
+    backend = create_state_backend(state_url)
+    job = await JobStore(backend).create("analyze", recording_url="bench://recording.m4a")
+    await backend.aclose()
+    return job["job_id"]
+
+
+async def _wait_ready(base_url: str, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base_url}/api/config")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.5)
+    raise TimeoutError("서버가 시간 내에 준비되지 않았습니다")
+
+
+async def _load(url: str, total: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(total / elapsed, 1),
+        **summarize_latencies(latencies),
+    }
+
+
+async def bench(workers: int, total: int, concurrency: int, state_url: str) -> Dict[str, float]:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {**os.environ, "STATE_BACKEND_URL": state_url}
+    env.setdefault("GOOGLE_CLOUD_PROJECT", "bench-project")
+
+    job_id = await _seed_job(state_url)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.web.launcher", "--workers", str(workers),
+         "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        await _wait_ready(base_url)
+        await _load(f"{base_url}/api/analyze/jobs/{job_id}", min(total, 200), concurrency)  # 워밍업
+        result = await _load(f"{base_url}/api/analyze/jobs/{job_id}", total, concurrency)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return {"workers": workers, **result}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="멀티 워커 스케일링 벤치마크")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        state_url = f"sqlite:///{os.path.join(tmp_dir, 'state.sqlite3')}"
+        for workers in args.workers:
+            result = asyncio.run(bench(workers, args.requests, args.concurrency, state_url))
+            print(json.dumps(result, ensure_ascii=False))
+            results.append(result)
+
+    output_path = save_results("workers", {"results": results})
+    print(f"결과 저장: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
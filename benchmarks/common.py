@@ -0,0 +1,53 @@
+"""벤치마크 스크립트 공용 유틸리티 (백분위수 계산, 결과 저장 등)"""
+import json
+import os
+import socket
+import statistics
+import subprocess
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize_latencies(latencies: List[float], prefix: str = "") -> Dict[str, float]:
+    """초 단위 지연 시간 목록을 p50/p95/p99 (ms)로 요약"""
+    if not latencies:
+        return {}
+    return {
+        f"{prefix}p50_ms": round(statistics.median(latencies) * 1000, 2),
+        f"{prefix}p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        f"{prefix}p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(name: str, payload: Dict[str, Any], output_path: Optional[str] = None) -> str:
+    """결과를 benchmarks/results/<name>_<시각>.json에 저장하고 경로 반환"""
+    if output_path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output_path = os.path.join(RESULTS_DIR, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    payload = {"benchmark": name, "git_commit": git_commit(), "created_at": datetime.now().isoformat(), **payload}
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return output_path
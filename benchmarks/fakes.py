@@ -0,0 +1,360 @@
+"""
+외부 API 없이 앱을 구동하기 위한 결정적(deterministic) 가짜 STT/LLM 제공자.
+
+- FakeChatModel: ChatVertexAI 대신 사용하는 LangChain 채팅 모델. 첫 토큰 지연 분포,
+  초당 토큰 수, 실패율, 제공자 동시 처리 한도를 설정할 수 있고 invoke/ainvoke/astream/with_structured_output을 지원합니다.
+- FakeAssemblyAIClient: AssemblyAIClient와 같은 submit/get_transcript 인터페이스.
+  전사 처리 시간 분포와 실패율을 설정할 수 있고 합성 한국어 대화록을 반환합니다.
+- fake_media_client: 녹음 파일 URL의 Range 요청에 합성 WAV 파일로 응답하는 httpx 클라이언트 (녹음 사전 점검용).
+
+모든 난수는 seed가 고정된 random.Random을 사용하므로 같은 설정이면 같은 부하가 재현됩니다.
+"""
+import asyncio
+import contextlib
+import json
+import math
+import random
+import re
+import struct
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+import assemblyai as aai
+import httpx
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import ConfigDict, PrivateAttr
+
+from benchmarks.synthetic import generate_transcript_payload
+from src.utils.llm_callbacks import UsageMetricsCallbackHandler
+
+# 토큰 수 근사치 계산용 (한국어 기준 토큰당 약 2자)
+_CHARS_PER_TOKEN = 2
+
+
+class FakeProviderError(Exception):
+    """실패 주입으로 발생시킨 가짜 제공자 오류 (429/503 등 일시 장애를 모사)"""
+
+
+@dataclass
+class LatencyDistribution:
+    """
+    지연 시간 분포 (ms 단위 설정, 초 단위 샘플).
+    kind: constant | uniform(mean ± spread*mean) | lognormal(평균 mean, 형태 모수 spread)
+    """
+
+    mean_ms: float = 0.0
+    kind: str = "lognormal"
+    spread: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.kind == "constant":
+            value = self.mean_ms
+        elif self.kind == "uniform":
+            value = rng.uniform(self.mean_ms * (1 - self.spread), self.mean_ms * (1 + self.spread))
+        elif self.kind == "lognormal":
+            mu = math.log(self.mean_ms) - self.spread ** 2 / 2
+            value = rng.lognormvariate(mu, self.spread)
+        else:
+            raise ValueError(f"지원하지 않는 분포입니다: {self.kind}")
+        return max(value, 0.0) / 1000
+
+
+def _count_tokens(text: str) -> int:
+    return max(len(text) // _CHARS_PER_TOKEN, 1)
+
+
+class FakeChatModel(BaseChatModel):
+    """응답 생성 함수(responder)의 결과를 설정된 지연/토큰 속도로 돌려주는 가짜 채팅 모델"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model_name: str = "fake-gemini"
+    responder: Callable[[List[BaseMessage]], str]
+    first_token_latency: LatencyDistribution = LatencyDistribution()
+    tokens_per_second: float = 0.0  # 0이면 출력 토큰 생성 시간 없음
+    chunk_tokens: int = 8  # 스트리밍 청크당 토큰 수
+    failure_rate: float = 0.0
+    max_concurrency: int = 0  # 0이면 제한 없음, 양수면 그 이상의 비동기 호출은 대기 (제공자 처리량 한도 모사)
+    seed: int = 0
+    calls: int = 0  # 지금까지 받은 호출 수
+
+    _rng: random.Random = PrivateAttr()
+    _slots: Optional[asyncio.Semaphore] = PrivateAttr(default=None)
+
+    def __init__(self, **kwargs: Any) -> None:
+        kwargs.setdefault("callbacks", [UsageMetricsCallbackHandler(kwargs.get("model_name", "fake-gemini"))])
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _plan(self, messages: List[BaseMessage]) -> Tuple[str, float, float]:
+        """응답 텍스트, 첫 토큰 지연(초), 토큰당 생성 시간(초) 결정"""
+        self.calls += 1
+        if self.failure_rate and self._rng.random() < self.failure_rate:
+            raise FakeProviderError(f"{self.model_name}: 주입된 실패 (503 Service Unavailable)")
+        text = self.responder(messages)
+        per_token = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        return text, self.first_token_latency.sample(self._rng), per_token
+
+    def _usage(self, messages: List[BaseMessage], text: str) -> Dict[str, Any]:
+        input_tokens = sum(_count_tokens(str(message.content)) for message in messages)
+        output_tokens = _count_tokens(text)
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+    def _result(self, messages: List[BaseMessage], text: str) -> ChatResult:
+        message = AIMessage(content=text, usage_metadata=self._usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text, first_token, per_token = self._plan(messages)
+        time.sleep(first_token + per_token * _count_tokens(text))
+        return self._result(messages, text)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        async with self._slot():
+            text, first_token, per_token = self._plan(messages)
+            await asyncio.sleep(first_token + per_token * _count_tokens(text))
+        return self._result(messages, text)
+
+    @contextlib.asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        if self.max_concurrency <= 0:
+            yield
+            return
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        async with self._slots:
+            yield
+
+    def _chunks(self, text: str) -> Iterator[str]:
+        size = self.chunk_tokens * _CHARS_PER_TOKEN
+        for start in range(0, len(text), size):
+            yield text[start:start + size]
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        async with self._slot():
+            text, first_token, per_token = self._plan(messages)
+            await asyncio.sleep(first_token)
+            for piece in self._chunks(text):
+                chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece))
+                if run_manager:
+                    await run_manager.on_llm_new_token(piece, chunk=chunk)
+                yield chunk
+                if per_token:
+                    await asyncio.sleep(per_token * self.chunk_tokens)
+        # 마지막 청크에 사용량 메타데이터 포함 (Vertex AI 스트리밍과 동일)
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=self._usage(messages, text)))
+
+    def with_structured_output(self, schema: Any, **kwargs: Any):
+        """도구 호출 대신 JSON 응답을 스키마로 검증하여 구조화 출력 모사"""
+        return self | RunnableLambda(lambda message: schema.model_validate_json(message.content))
+
+
+# ==================== 응답 생성 함수 ====================
+
+_QUESTIONS = (
+    "최근 진행한 업무 중 가장 보람을 느꼈던 순간은 언제였나요?",
+    "지금 팀에서 협업할 때 가장 어려운 점은 무엇인가요?",
+    "앞으로 6개월 동안 가장 성장하고 싶은 역량은 무엇인가요?",
+    "현재 업무량은 적절하다고 느끼시나요? 조정이 필요한 부분이 있을까요?",
+    "제가 리더로서 더 지원해 드릴 수 있는 부분이 있을까요?",
+    "최근 팀 내 갈등 상황을 어떻게 바라보고 계신가요?",
+    "다음 1on1까지 함께 실행해 볼 액션 아이템을 정해 볼까요?",
+)
+
+
+def template_responder(messages: List[BaseMessage]) -> str:
+    return json.dumps({str(index): question for index, question in enumerate(_QUESTIONS, 1)}, ensure_ascii=False)
+
+
+def email_responder(messages: List[BaseMessage]) -> str:
+    body = (
+        "안녕하세요, 다음 주 1on1 미팅 일정을 안내드립니다.\n\n"
+        "이번 미팅에서는 최근 프로젝트 진행 상황과 팀 협업 과정에서의 어려움, "
+        "그리고 앞으로의 성장 방향에 대해 편하게 이야기 나누고자 합니다.\n\n"
+        "미리 생각해 오시면 좋을 내용:\n- 최근 보람을 느꼈던 업무\n- 지원이 필요한 부분\n\n감사합니다."
+    )
+    return json.dumps({"generated_email": body}, ensure_ascii=False)
+
+
+def guide_responder(messages: List[BaseMessage]) -> str:
+    sections = [
+        f"### {index}. {question}\n- **의도**: 구성원의 현재 상태와 맥락을 파악합니다.\n"
+        f"- **활용 팁**: 답변을 끝까지 경청한 뒤 구체적인 사례를 한 번 더 물어보세요.\n"
+        for index, question in enumerate(_QUESTIONS, 1)
+    ]
+    return "## 1on1 질문 활용 가이드\n\n" + "\n".join(sections)
+
+
+def title_responder(messages: List[BaseMessage]) -> str:
+    return "3분기 프로젝트 진행 상황 점검 및 팀 협업 개선 논의"
+
+
+def _batch_indexes(messages: List[BaseMessage], heading: str) -> List[str]:
+    """묶음 처리(micro-batching) 프롬프트의 항목 번호 (예: "## Meeting 2" → "2")"""
+    return re.findall(rf"^{heading} (\d+)$", str(messages[-1].content), flags=re.MULTILINE)
+
+
+def batch_title_responder(messages: List[BaseMessage]) -> str:
+    """묶음 제목 프롬프트면 번호별 JSON, 아니면 단일 제목"""
+    indexes = _batch_indexes(messages, "## Meeting")
+    if not indexes:
+        return title_responder(messages)
+    return json.dumps({index: title_responder(messages) for index in indexes}, ensure_ascii=False)
+
+
+def batch_email_responder(messages: List[BaseMessage]) -> str:
+    """묶음 이메일 프롬프트면 번호별 JSON, 아니면 단일 이메일"""
+    indexes = _batch_indexes(messages, "### Request")
+    if not indexes:
+        return email_responder(messages)
+    body = json.loads(email_responder(messages))["generated_email"]
+    return json.dumps({index: body for index in indexes}, ensure_ascii=False)
+
+
+def meeting_analysis_responder(messages: List[BaseMessage]) -> str:
+    summary = "\n".join(
+        f"### {topic}\n- 현황: 지난 미팅 대비 진행 상황을 공유함\n- 논의: 우선순위와 일정 조정 방안을 논의함"
+        for topic in ("프로젝트 진행", "팀 협업", "성장 방향", "업무량 조정")
+    )
+    return json.dumps({
+        "title": title_responder(messages),
+        "speaker_mapping": ["김지현", "김준희"],
+        "leader_action_items": ["디자인 리뷰 일정 재조정", "채용 계획 공유"],
+        "member_action_items": ["온보딩 문서 초안 작성", "기술 부채 목록 정리"],
+        "ai_summary": summary,
+        "ai_core_summary": {
+            "core_content": "프로젝트 일정과 팀 협업 이슈를 점검하고 다음 분기 우선순위를 합의함",
+            "decisions_made": ["릴리즈 범위 축소", "주간 리뷰 회의 유지"],
+            "support_needs_blockers": ["디자인 리소스 부족 - 외부 협업 검토"],
+        },
+        "leader_feedback": {
+            "positive": [{"title": "경청", "content": "구성원의 의견을 끝까지 듣고 구체적인 질문으로 이어감"}],
+            "negative": [{"title": "후속 조치", "content": "결정 사항의 담당자와 기한을 명확히 하면 좋겠음"}],
+        },
+        "qa_summary": [{"question_index": 1, "answer": "최근 릴리즈를 성공적으로 마친 것이 가장 보람 있었다고 답함"}],
+    }, ensure_ascii=False)
+
+
+# ==================== STT ====================
+
+
+class FakeAssemblyAIClient:
+    """AssemblyAIClient와 같은 인터페이스로 합성 대화록을 반환하는 가짜 STT 클라이언트"""
+
+    def __init__(
+        self,
+        processing_latency: LatencyDistribution = LatencyDistribution(),
+        request_latency: LatencyDistribution = LatencyDistribution(),
+        failure_rate: float = 0.0,
+        duration_minutes: float = 30,
+        utterances_per_minute: float = 8,
+        seed: int = 0,
+    ) -> None:
+        self.processing_latency = processing_latency
+        self.request_latency = request_latency
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        # 응답 JSON은 한 번만 만들고, 조회 시마다 실제 클라이언트처럼 파싱
+        self._payload = generate_transcript_payload(duration_minutes, utterances_per_minute, seed=seed)
+        self._jobs: Dict[str, Tuple[str, float, bool]] = {}
+
+    async def submit(self, audio_url: str) -> aai.types.TranscriptResponse:
+        await asyncio.sleep(self.request_latency.sample(self._rng))
+        transcript_id = uuid.uuid4().hex
+        failed = bool(self.failure_rate) and self._rng.random() < self.failure_rate
+        self._jobs[transcript_id] = (audio_url, time.monotonic() + self.processing_latency.sample(self._rng), failed)
+        return aai.types.TranscriptResponse.parse_obj(
+            {"id": transcript_id, "status": "queued", "audio_url": audio_url}
+        )
+
+    async def upload(self, chunks: AsyncIterator[bytes]) -> str:
+        """업로드 본문을 끝까지 읽고 가짜 upload_url 반환"""
+        async for _ in chunks:
+            pass
+        await asyncio.sleep(self.request_latency.sample(self._rng))
+        return f"https://cdn.assemblyai.test/upload/{uuid.uuid4().hex}"
+
+    async def get_transcript(self, transcript_id: str) -> aai.types.TranscriptResponse:
+        await asyncio.sleep(self.request_latency.sample(self._rng))
+        audio_url, ready_at, failed = self._jobs[transcript_id]
+        base = {"id": transcript_id, "audio_url": audio_url}
+        if time.monotonic() < ready_at:
+            return aai.types.TranscriptResponse.parse_obj({**base, "status": "processing"})
+        # 실제 API처럼 완료된 전사는 다시 조회할 수 있음 (사전 전사를 이어받는 분석 요청)
+        if failed:
+            return aai.types.TranscriptResponse.parse_obj(
+                {**base, "status": "error", "error": "주입된 실패 (audio decoding failed)"}
+            )
+        return aai.types.TranscriptResponse.parse_obj({**base, **self._payload})
+
+
+def wav_header(duration_seconds: float, sample_rate: int = 16000, channels: int = 1) -> bytes:
+    """16bit PCM WAV 헤더 (data 청크 크기는 길이에 맞춰 기록)"""
+    byte_rate = sample_rate * channels * 2
+    data_size = int(duration_seconds * byte_rate)
+    return (
+        b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, byte_rate, channels * 2, 16)
+        + b"data" + struct.pack("<I", data_size)
+    )
+
+
+def fake_media_client(
+    duration_minutes: float = 30,
+    request_latency: LatencyDistribution = LatencyDistribution(),
+    seed: int = 0,
+) -> httpx.AsyncClient:
+    """모든 URL의 Range 요청에 duration_minutes 길이의 합성 WAV 파일(헤더 뒤는 무음)로 응답하는 녹음 파일 클라이언트"""
+    rng = random.Random(seed)
+    header = wav_header(duration_minutes * 60)
+    size = len(header) + struct.unpack("<I", header[40:44])[0]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(request_latency.sample(rng))
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", request.headers.get("range", ""))
+        if match is None:
+            return httpx.Response(200, headers={"content-type": "audio/wav", "content-length": str(size)})
+        start, end = int(match[1]), min(int(match[2]), size - 1)
+        body = header[start:end + 1]
+        body += bytes(end + 1 - start - len(body))
+        return httpx.Response(
+            206,
+            content=body,
+            headers={"content-type": "audio/wav", "content-range": f"bytes {start}-{end}/{size}"},
+        )
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
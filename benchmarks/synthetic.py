@@ -0,0 +1,128 @@
+"""
+벤치마크용 합성 한국어 1on1 대화록 생성기.
+
+같은 seed에는 항상 같은 대화록을 생성하므로 실행 간 결과를 비교할 수 있습니다.
+발화 시간은 한국어 평균 발화 속도(초당 약 4.5음절)를 기준으로 텍스트 길이에 맞춰 배분합니다.
+"""
+import random
+from typing import Any, Dict, List, Sequence
+
+_SYLLABLES_PER_SECOND = 4.5
+
+# 벤치마크에서 사용하는 대화 길이 프리셋 (분)
+TRANSCRIPT_SIZES = {"10m": 10, "30m": 30, "1h": 60, "2h": 120, "4h": 240}
+
+_OPENERS = (
+    "네,", "음,", "그러니까", "사실", "아 그리고", "제 생각에는", "맞아요,", "솔직히 말씀드리면",
+    "그 부분은", "일단", "혹시", "아까 말씀하신 것처럼",
+)
+_TOPICS = (
+    "이번 분기 목표", "디자인 시스템 운영", "신규 채용 계획", "온보딩 프로세스", "AI 프로젝트 일정",
+    "코드 리뷰 문화", "고객 피드백 정리", "다음 릴리즈 범위", "팀 워크로드", "상반기 성과 평가",
+    "협업 툴 전환", "기술 부채 정리", "데이터 파이프라인 안정화", "커리어 성장 방향",
+)
+_PREDICATES = (
+    "관련해서 조금 더 이야기해 보면 좋을 것 같아요.",
+    "쪽은 지난주보다 확실히 나아진 것 같습니다.",
+    "때문에 요즘 일정이 조금 빠듯하게 느껴져요.",
+    "관련해서 리더님 지원이 좀 필요할 것 같습니다.",
+    "부분은 다음 주까지 정리해서 공유드릴게요.",
+    "에서 생각보다 병목이 자주 생기고 있어요.",
+    "은 우선순위를 다시 한번 맞춰 보면 좋겠어요.",
+    "에 대해서는 팀원들 의견도 같이 들어 보려고 합니다.",
+    "관련 회고를 해 보니 커뮤니케이션 이슈가 제일 컸던 것 같아요.",
+    "은 목표 대비 70퍼센트 정도 진행된 상태입니다.",
+)
+
+
+def _sentence(rng: random.Random) -> str:
+    return f"{rng.choice(_OPENERS)} {rng.choice(_TOPICS)} {rng.choice(_PREDICATES)}"
+
+
+def generate_utterances(
+    duration_minutes: float = 30,
+    utterances_per_minute: float = 8,
+    speakers: Sequence[str] = ("A", "B"),
+    leader_share: float = 0.55,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    AssemblyAI utterance 형식(speaker/text/start/end/confidence/words)의 합성 발화 목록 생성.
+    duration_minutes: 대화 길이 (분), utterances_per_minute: 분당 발화 수 (화자 전환 빈도)
+    """
+    rng = random.Random(seed)
+    count = max(int(duration_minutes * utterances_per_minute), 1)
+    total_ms = int(duration_minutes * 60_000)
+    # 첫 번째 화자(리더)가 leader_share 비율만큼 말하도록 발화 길이에 가중치 부여
+    weights = [
+        (leader_share if index % len(speakers) == 0 else (1 - leader_share) / max(len(speakers) - 1, 1))
+        * rng.uniform(0.5, 1.5)
+        for index in range(count)
+    ]
+    scale = total_ms / sum(weights)
+
+    utterances = []
+    cursor = 0
+    for index, weight in enumerate(weights):
+        duration_ms = int(weight * scale)
+        target_chars = max(int(duration_ms / 1000 * _SYLLABLES_PER_SECOND), 8)
+        sentences = [_sentence(rng)]
+        while sum(len(sentence) for sentence in sentences) < target_chars:
+            sentences.append(_sentence(rng))
+        utterances.append({
+            "speaker": speakers[index % len(speakers)],
+            "text": " ".join(sentences),
+            "start": cursor,
+            "end": cursor + duration_ms,
+            "confidence": round(rng.uniform(0.85, 0.99), 3),
+            "words": [],
+        })
+        cursor += duration_ms
+    return utterances
+
+
+def generate_transcript_payload(
+    duration_minutes: float = 30,
+    utterances_per_minute: float = 8,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """완료된 AssemblyAI 전사 응답(JSON) 형태의 합성 결과"""
+    utterances = generate_utterances(duration_minutes, utterances_per_minute, seed=seed)
+    return {
+        "status": "completed",
+        "audio_duration": int(duration_minutes * 60),
+        "text": " ".join(utterance["text"] for utterance in utterances),
+        "utterances": utterances,
+    }
+
+
+def generate_analysis_dict(duration_minutes: float = 30, seed: int = 0) -> Dict[str, Any]:
+    """
+    MeetingAnalysis 스키마 형태의 합성 LLM 출력.
+    긴 회의일수록 요약/액션 아이템/피드백이 길어지도록 대화 길이에 비례해 크기를 조절합니다.
+    """
+    rng = random.Random(seed)
+    sections = max(int(duration_minutes / 5), 1)
+    return {
+        "title": f"{rng.choice(_TOPICS)} 점검 및 {rng.choice(_TOPICS)} 논의",
+        "speaker_mapping": ["김지현", "김준희"],
+        "leader_action_items": [_sentence(rng) for _ in range(sections)],
+        "member_action_items": [_sentence(rng) for _ in range(sections)],
+        "ai_summary": "\n".join(
+            f"### {rng.choice(_TOPICS)}\n" + "\n".join(f"- {_sentence(rng)}" for _ in range(4))
+            for _ in range(sections)
+        ),
+        "ai_core_summary": {
+            "core_content": " ".join(_sentence(rng) for _ in range(3)),
+            "decisions_made": [_sentence(rng) for _ in range(sections)],
+            "support_needs_blockers": [_sentence(rng) for _ in range(max(sections // 2, 1))],
+        },
+        "leader_feedback": {
+            "positive": [{"title": rng.choice(_TOPICS), "content": _sentence(rng)} for _ in range(sections)],
+            "negative": [{"title": rng.choice(_TOPICS), "content": _sentence(rng)} for _ in range(sections)],
+        },
+        "qa_summary": [
+            {"question_index": index, "answer": " ".join(_sentence(rng) for _ in range(2))}
+            for index in range(1, sections + 1)
+        ],
+    }
@@ -1,3 +1,4 @@
+import json
 import os
 from dotenv import load_dotenv
 
@@ -32,6 +33,7 @@ GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
 VERTEX_AI_MODEL = "gemini-2.5-pro"  # Vertex AI 모델명
 VERTEX_AI_TEMPERATURE = 0.0
 VERTEX_AI_MAX_TOKENS = 13000
+VERTEX_AI_FALLBACK_MODEL = "gemini-2.5-flash"  # 요청 마감 시간이 촉박할 때 대신 사용하는 빠른 분석 모델
 
 # 템플릿 생성용 LLM 설정 (Gemini)
 GEMINI_MODEL = "gemini-2.5-flash"  # 기본 모델 설정 (gemini-2.5-flash 사용)
@@ -64,6 +66,176 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 SUPABASE_BUCKET_NAME = os.getenv("SUPABASE_BUCKET_NAME", "audio-recordings")
 
+# 오디오 스트리밍 업로드 설정 (/api/audio/upload, 요청 본문을 STT 업로드 API와 Storage로 동시에 전달)
+AUDIO_UPLOAD_MAX_BYTES = 2 * 1024 ** 3  # 허용하는 최대 오디오 크기 (바이트)
+AUDIO_UPLOAD_BUFFER_CHUNKS = 8  # 업로드 대상별로 미리 받아 둘 최대 청크 수 (가장 느린 대상의 속도에 맞춰 수신을 늦춤)
+
+# 녹음 업로드 완료 시 STT 사전(speculative) 시작 설정 (/api/audio/uploaded 알림, /api/audio/upload 완료 시)
+# 전사 결과는 공유 상태 저장소에 보관되어 이어지는 /api/analyze 요청이 STT 대기 없이 LLM 분석부터 실행
+EAGER_STT_ENABLED = os.getenv("EAGER_STT_ENABLED", "true").lower() == "true"
+EAGER_STT_TTL_SECONDS = 60 * 60  # 분석 요청이 오지 않으면 이 시간 후 전사 결과 폐기 (초)
+EAGER_STT_HOOK_SECRET = os.getenv("EAGER_STT_HOOK_SECRET")  # X-Hook-Secret 헤더가 일치하는 알림만 처리 (없으면 알림 API 비활성화)
+
+# 녹음 파일 사전 점검(preflight) 설정 (STT 전에 Range 요청으로 컨테이너 헤더만 읽어 코덱/길이 확인)
+PREFLIGHT_ENABLED = os.getenv("PREFLIGHT_ENABLED", "true").lower() == "true"
+PREFLIGHT_HEAD_BYTES = 64 * 1024  # 첫 Range 요청으로 읽을 바이트 수
+PREFLIGHT_MAX_RANGE_REQUESTS = 4  # 녹음 1개당 최대 Range 요청 수 (첫 요청 포함, 헤더가 파일 뒤쪽에 있으면 나머지로 추가 요청)
+PREFLIGHT_MAX_READ_BYTES = 4 * 1024 * 1024  # 추가 Range 요청 1회에 읽을 최대 바이트 수
+PREFLIGHT_TIMEOUT_SECONDS = 3.0  # 점검이 이보다 오래 걸리면 길이 미확인으로 STT 진행 (초)
+PREFLIGHT_MIN_DURATION_SECONDS = 1.0  # 이보다 짧은 녹음은 거부 (초)
+PREFLIGHT_MAX_DURATION_SECONDS = 10 * 60 * 60  # 이보다 긴 녹음은 거부 (STT 제공자 처리 한도, 초)
+# 사전 점검으로 읽을 수 있는 녹음 호스트 (쉼표 구분). SUPABASE_URL 호스트는 항상 허용하며, 그 밖의 호스트는 점검 생략
+PREFLIGHT_ALLOWED_HOSTS = [host.strip().lower() for host in os.getenv("PREFLIGHT_ALLOWED_HOSTS", "").split(",") if host.strip()]
+PREFLIGHT_MAX_REDIRECTS = 3  # 녹음 URL이 리다이렉트할 때 따라갈 최대 횟수 (매 단계 호스트/주소 재확인)
+
+# 오디오 길이 기반 STT 완료 시간 예측 (고정 지연 + 길이 × 비율) 및 상태 확인 간격
+STT_TURNAROUND_BASE_SECONDS = 15  # 길이와 관계없는 STT 대기/처리 시간 (초)
+STT_TURNAROUND_RATIO = 0.25  # 오디오 1초당 STT 처리 시간 (초)
+STT_MIN_CHECK_INTERVAL = 1.0  # 예상 완료 시각 근처의 최소 상태 확인 간격 (초)
+STT_MAX_CHECK_FACTOR = 3  # 예상 완료 시각까지 멀 때 상태 확인 간격 상한 (STT_CHECK_INTERVAL의 배수)
+
+# 녹음 길이별 분석 모델 프로필 (fast: VERTEX_AI_FALLBACK_MODEL, default: VERTEX_AI_MODEL)
+ANALYSIS_FAST_PROFILE_MAX_SECONDS = 5 * 60  # 이 길이 이하 녹음은 fast 프로필로 분석 (0이면 사용 안 함, 초)
+ANALYSIS_ESTIMATED_SECONDS = {"default": 60, "fast": 20}  # 프로필별 LLM 분석 예상 소요 시간 (초)
+
 # Supabase 파일 경로 템플릿
 RECORDING_PATH_TEMPLATE = "recordings/{user_id}/{file_id}"
 
+
+# 외부 API HTTP 커넥션 풀 설정 (워커당 1회 생성되어 재사용)
+HTTP_POOL_MAX_CONNECTIONS = 20  # 클라이언트별 최대 동시 커넥션 수
+HTTP_POOL_MAX_KEEPALIVE = 10  # 유지할 keep-alive 커넥션 수
+HTTP_KEEPALIVE_EXPIRY = 30.0  # 유휴 keep-alive 커넥션 만료 시간 (초)
+HTTP_CONNECT_TIMEOUT = 5.0  # 커넥션 수립 타임아웃 (초)
+HTTP_READ_TIMEOUT = 30.0  # 응답 대기 타임아웃 (초)
+ASSEMBLYAI_BASE_URL = "https://api.assemblyai.com"  # AssemblyAI REST API 주소
+
+# 워커 간 공유 상태 저장소 설정 (작업 상태, 캐시, 락)
+# sqlite:///경로 형식이면 로컬 파일 기반, redis://로 시작하면 Redis 사용
+STATE_BACKEND_URL = os.getenv("STATE_BACKEND_URL", "sqlite:///data/state.sqlite3")
+JOB_TTL_SECONDS = 60 * 60 * 24  # 분석 작업 상태 보관 기간 (초)
+
+# 중복 요청 처리 설정 (/api/analyze, /api/template 비스트리밍 응답)
+# 같은 요청이 동시에 들어오면 워커와 관계없이 실행 1회를 공유하고(singleflight),
+# Idempotency-Key 헤더가 있으면 완료된 응답을 보관했다가 재시도에 그대로 돌려줌
+REQUEST_DEDUP_ENABLED = os.getenv("REQUEST_DEDUP_ENABLED", "true").lower() == "true"
+IDEMPOTENCY_TTL_SECONDS = 60 * 60 * 24  # Idempotency-Key 응답 보관 기간 (초)
+SINGLEFLIGHT_LEASE_SECONDS = 30  # 실행 중 표시 만료 시간 (실행 워커가 주기적으로 연장, 워커가 죽으면 이 시간 뒤 다른 워커가 이어받음)
+SINGLEFLIGHT_RESULT_TTL_SECONDS = 60  # 다른 워커에서 기다리던 요청이 결과를 가져가도록 보관하는 시간 (초)
+SINGLEFLIGHT_POLL_INTERVAL = 0.5  # 다른 워커의 실행 결과 확인 간격 (초)
+
+# 멀티 워커 런처 설정
+SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "1"))  # 워커 프로세스 수
+
+# 요청 단위 트레이싱 설정 (span 트리 + Server-Timing 헤더)
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "jsonl")  # jsonl: 로컬 파일, otlp: OTLP/HTTP 수집기, none: 내보내지 않음
+TRACING_JSONL_PATH = "data/traces/spans.jsonl"  # jsonl 내보내기 경로
+TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318")  # OTLP/HTTP 수집기 주소
+TRACING_SERVICE_NAME = "orblit-1on1-ai"  # 내보내는 span의 service.name
+
+# 요청 단위 비용/토큰 원장 설정
+COST_LEDGER_PATH = os.getenv("COST_LEDGER_PATH", "data/usage_ledger.sqlite3")  # 원장 SQLite 파일 경로
+# 모델별 100만 토큰당 단가 (USD). thinking 토큰은 출력 토큰과 별도로 집계되어 thinking 단가로 과금
+LLM_PRICES_PER_MILLION_TOKENS = {
+    "gemini-2.5-pro": {"input": 1.25, "cached": 0.31, "output": 10.0, "thinking": 10.0},
+    "gemini-2.5-flash": {"input": 0.30, "cached": 0.075, "output": 2.50, "thinking": 2.50},
+    "gemini-2.5-flash-lite": {"input": 0.10, "cached": 0.025, "output": 0.40, "thinking": 0.40},
+}
+# STT 음성 모델별 오디오 1시간당 단가 (USD)
+STT_PRICES_PER_HOUR = {
+    "best": 0.37,
+    "nano": 0.12,
+}
+# 배포 환경별 단가는 JSON 문자열 환경 변수로 덮어쓸 수 있음 (예: '{"gemini-2.5-pro": {"input": 1.0, ...}}')
+if os.getenv("LLM_PRICES_JSON"):
+    LLM_PRICES_PER_MILLION_TOKENS.update(json.loads(os.environ["LLM_PRICES_JSON"]))
+if os.getenv("STT_PRICES_JSON"):
+    STT_PRICES_PER_HOUR.update(json.loads(os.environ["STT_PRICES_JSON"]))
+
+# 템플릿/이메일/가이드 응답 캐시 설정 (워커 프로세스 단위 LRU, 기본 비활성화)
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+RESPONSE_CACHE_MAX_ENTRIES = 1000  # 최대 보관 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 제거)
+RESPONSE_CACHE_TTL_SECONDS = 60 * 60 * 6  # 항목 보관 기간 (초)
+# 생성 타입별 보관할 응답 변형 수. temperature가 높은 템플릿은 여러 결과를 모아 번갈아 반환
+RESPONSE_CACHE_VARIANTS = {"template": 3, "email": 1, "guide": 1}
+
+# 템플릿 유사 요청 캐시 설정 (detailed_context 표현만 다르거나 purpose 순서만 다른 요청에 최근 결과 재사용, 기본 비활성화)
+SIMILARITY_CACHE_ENABLED = os.getenv("SIMILARITY_CACHE_ENABLED", "false").lower() == "true"
+SIMILARITY_CACHE_THRESHOLD = float(os.getenv("SIMILARITY_CACHE_THRESHOLD", "0.8"))  # 재사용할 최소 추정 Jaccard 유사도
+SIMILARITY_CACHE_MAX_ENTRIES = 100_000  # 최대 보관 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 제거)
+SIMILARITY_CACHE_TTL_SECONDS = 60 * 60 * 6  # 항목 보관 기간 (초)
+SIMILARITY_CACHE_NGRAM = 3  # 문자 n-gram 크기 (형태소 분석 없이 한국어 조사/어미 변화 흡수)
+SIMILARITY_CACHE_NUM_PERM = 128  # MinHash 서명 길이 (길수록 유사도 추정 오차 감소, 서명 계산 비용 증가)
+SIMILARITY_CACHE_BANDS = 16  # LSH 밴드 수 (밴드당 8행, 유사도 약 0.7 이상부터 비교 후보로 잡힘)
+
+# 짧은 LLM 요청(제목 생성, 비스트리밍 이메일) 묶음 처리(micro-batching) 설정 (워커 프로세스 단위, 기본 비활성화)
+MICRO_BATCH_ENABLED = os.getenv("MICRO_BATCH_ENABLED", "false").lower() == "true"
+MICRO_BATCH_WINDOW_MS = float(os.getenv("MICRO_BATCH_WINDOW_MS", "30"))  # 첫 요청 후 같은 묶음으로 모을 대기 시간 (밀리초)
+MICRO_BATCH_MAX_SIZE = 16  # LLM 호출 1회로 묶을 최대 요청 수 (도달 시 대기 시간 없이 바로 호출)
+
+# 팀 단위 템플릿 일괄 생성 설정 (/api/template/team)
+TEAM_TEMPLATE_MAX_MEMBERS = 30  # 요청당 최대 팀원 수
+TEAM_TEMPLATE_CONCURRENCY = 4  # 동시에 진행할 LLM 호출 수 (제공자 rate limit 보호)
+TEAM_TEMPLATE_PACK_SIZE = 3  # packed 모드에서 LLM 호출 1회로 생성할 최대 팀원 수
+TEAM_TEMPLATE_PACK_MAX_CHARS = 800  # packed 모드로 묶을 팀원 입력 크기 상한 (detailed_context + 지난 기록 요약 글자 수)
+
+# include_guide=true 템플릿 요청 시 가이드 사전(speculative) 생성 설정 (워커 프로세스 단위)
+# true | false | auto: 워커가 1개일 때만 사용 (여러 워커면 이어지는 가이드 요청이 대부분 다른 워커로 가 사전 생성이 버려짐)
+GUIDE_SPECULATION_ENABLED = os.getenv("GUIDE_SPECULATION_ENABLED", "auto").lower()
+GUIDE_SPECULATION_TTL_SECONDS = 120  # 가이드 요청이 오지 않으면 이 시간 후 생성 취소 및 결과 폐기
+GUIDE_SPECULATION_MAX_ENTRIES = 200  # 동시에 보관할 최대 사전 생성 수 (초과 시 가장 오래된 항목부터 취소)
+
+# 1on1 기록 저장소 설정 (use_previous_data=true 템플릿/이메일 생성 시 지난 기록 요약 제공)
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", "data/meeting_history.sqlite3")  # 기록 SQLite 파일 경로
+HISTORY_CACHE_MAX_ENTRIES = 1000  # 워커별 사용자/digest read-through LRU 캐시 크기
+HISTORY_CACHE_TTL_SECONDS = 60  # 캐시 항목 유효 시간 (다른 워커의 기록이 반영되기까지 최대 지연, 초)
+HISTORY_DIGEST_RECENT_MEETINGS = 3  # digest에 남길 최근 미팅 수
+HISTORY_DIGEST_MAX_HIGHLIGHTS = 5  # 미팅당 남길 요약 항목 수
+HISTORY_DIGEST_MAX_ACTION_ITEMS = 10  # digest에 남길 미완료 액션 아이템 수 (최신순)
+
+# 분석 결과 저장소 설정 (완료된 analysis_result/전사를 압축 JSON 파일로 보관, /api/analyze/results/{analysis_id}로 재조회)
+ANALYSIS_STORE_ENABLED = os.getenv("ANALYSIS_STORE_ENABLED", "true").lower() == "true"
+ANALYSIS_STORE_DIR = os.getenv("ANALYSIS_STORE_DIR", "data/analyses")  # 결과 파일 디렉터리 (워커 간 공유 디스크)
+ANALYSIS_STORE_COMPRESS_LEVEL = 6  # gzip 압축 수준 (1: 빠름 ~ 9: 작음)
+ANALYSIS_STORE_MAX_PENDING = 1000  # 백그라운드 기록 대기 최대 건수 (초과 시 저장하지 않고 버림)
+
+# 응답 압축 설정 (Accept-Encoding에 따라 br(brotli 패키지 설치 시) 또는 gzip, SSE 스트림은 압축하지 않음)
+RESPONSE_COMPRESSION_ENABLED = os.getenv("RESPONSE_COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_BYTES = 1024  # 이보다 작은 응답은 압축하지 않음 (헤더 비용이 더 큼)
+COMPRESSION_GZIP_LEVEL = 5  # gzip 압축 수준 (1: 빠름 ~ 9: 작음)
+COMPRESSION_BROTLI_QUALITY = 4  # brotli 압축 품질 (0: 빠름 ~ 11: 작음, 4 이하는 gzip보다 빠르면서 더 작음)
+COMPRESSION_THREAD_MIN_BYTES = 256 * 1024  # 이보다 큰 본문은 이벤트 루프를 막지 않도록 스레드에서 압축
+
+# 사용자별 사용량 한도 설정 (토큰 버킷, 상태는 공유 상태 저장소에 보관되어 워커 간 공유)
+USER_QUOTA_ENABLED = os.getenv("USER_QUOTA_ENABLED", "true").lower() == "true"
+USER_QUOTA_REQUESTS_PER_MINUTE = float(os.getenv("USER_QUOTA_REQUESTS_PER_MINUTE", "60"))  # 분당 채워지는 요청 수 (초과 시 429)
+USER_QUOTA_REQUEST_BURST = 20  # 한 번에 몰아 보낼 수 있는 최대 요청 수 (팀 템플릿은 팀원 수만큼 차감)
+USER_QUOTA_LLM_TOKENS_PER_MINUTE = float(os.getenv("USER_QUOTA_LLM_TOKENS_PER_MINUTE", "300000"))  # 분당 채워지는 LLM 토큰 수
+USER_QUOTA_LLM_TOKEN_BURST = 600_000  # 최대 누적 LLM 토큰 수 (초과 사용 시 다음 LLM 호출을 버킷이 찰 때까지 지연)
+USER_QUOTA_LOCK_TIMEOUT_SECONDS = 1.0  # 버킷 갱신 락 대기 시간 (초과 시 한도 검사 없이 통과)
+
+# LLM 호출 공정 스케줄러 설정 (워커 프로세스 단위, 동시 호출 수 제한 + 사용자별 가중 공정 큐)
+LLM_SCHEDULER_ENABLED = os.getenv("LLM_SCHEDULER_ENABLED", "true").lower() == "true"
+LLM_SCHEDULER_MAX_CONCURRENCY = int(os.getenv("LLM_SCHEDULER_MAX_CONCURRENCY", "32"))  # 워커당 동시에 진행할 LLM 호출 수
+LLM_SCHEDULER_DEFAULT_WEIGHT = 4  # 대화형 요청(분석, 템플릿 생성 등)의 가중치
+# 엔드포인트별 가중치 (작을수록 경쟁 시 뒤로 밀림). 일괄/사전 생성 작업은 대화형 요청에 자리를 양보
+LLM_SCHEDULER_WEIGHTS = {
+    "template:team": 1,
+    "analyze_job": 1,
+    "analyze:stt_speculative": 1,
+    "template:guide_speculative": 2,
+}
+LLM_SCHEDULER_EXPECTED_OUTPUT_TOKENS = 1000  # 대기열 순서 계산 시 호출당 예상 출력 토큰 수
+LLM_SCHEDULER_CHARS_PER_TOKEN = 2.5  # 프롬프트 글자 수로 입력 토큰 수를 추정할 때 토큰당 글자 수
+LLM_SCHEDULER_STATS_MAX_USERS = 1000  # 대기 시간 통계를 보관할 최근 사용자 수
+
+# 2단계 분석 설정 (preview=true 요청: 전사 직후 VERTEX_AI_FALLBACK_MODEL로 미리보기를 먼저 생성한 뒤 전체 분석)
+ANALYSIS_PREVIEW_TIMEOUT_SECONDS = 30  # 미리보기 생성 최대 대기 시간 (초과 시 미리보기 없이 전체 분석 진행)
+
+# 요청별 마감 시간(deadline) 설정 (X-Request-Deadline-Ms 헤더 또는 deadline_ms 쿼리 파라미터로 지정)
+REQUEST_DEADLINE_MAX_MS = 60 * 60 * 1000  # 허용하는 최대 마감 시간 (밀리초)
+DEADLINE_ANALYSIS_MIN_SECONDS = 10  # 남은 시간이 이보다 적으면 LLM 분석을 시작하지 않고 중단 (STT 대기도 이만큼 남겨두고 종료)
+DEADLINE_ANALYSIS_DOWNGRADE_SECONDS = 60  # 남은 시간이 이보다 적으면 분석 모델을 VERTEX_AI_FALLBACK_MODEL로 변경
@@ -225,3 +225,16 @@ Note: The transcript is provided as a list of speaker-text pairs [{{"speaker": "
 }}
 """
 
+
+# 2단계 분석에서 미리보기 결과가 있으면 USER_PROMPT 뒤에 붙여 화자 매핑/액션 아이템을 다시 도출하지 않도록 함
+PREVIEW_HINT_PROMPT = """
+
+# Preview Draft (빠른 1차 분석 결과):
+- Speaker mapping: {preview_speaker_mapping}
+- Draft leader action items: {preview_leader_action_items}
+- Draft member action items: {preview_member_action_items}
+
+# PREVIEW INSTRUCTIONS:
+• Use the speaker mapping above as-is for speaker_mapping unless the transcript clearly contradicts it.
+• Start from the draft action items: keep, merge or correct them instead of extracting them again from scratch, and add only items the draft missed.
+"""
@@ -31,4 +31,25 @@ TITLE_ONLY_USER_PROMPT = """Generate a professional 1-on-1 meeting title based o
 Create a concise, professional Korean title (20-40 characters) that summarizes the main discussion topics and purpose of this 1-on-1 meeting. Focus on the key areas that would be covered based on the provided information.
 
 Return only the title text, nothing else.
-"""
\ No newline at end of file
+"""
+
+# 묶음 처리(micro-batching): 여러 미팅의 제목을 LLM 호출 1회로 생성 (TITLE_ONLY_SYSTEM_PROMPT 공유)
+BATCH_TITLE_USER_PROMPT = """Generate a professional 1-on-1 meeting title for EACH meeting below.
+Each title must be based only on that meeting's own information.
+{meetings}
+
+# Instructions:
+Create a concise, professional Korean title (20-40 characters) per meeting that summarizes its main discussion topics and purpose.
+
+Return only a JSON object that uses the meeting numbers above as keys:
+{{"1": "First meeting title", "2": "Second meeting title"}}
+"""
+
+BATCH_TITLE_MEETING_SECTION = """
+## Meeting {index}
+# Participants Information:
+{participants}
+
+# Q&A Topics:
+{qa_pairs}
+"""
@@ -24,4 +24,26 @@ HUMAN_PROMPT = """
 {{
   "generated_email": "Generated summary about the 1-on-1 session. The summary should start with an appropriate greeting based on the language and must mention the target person's name.
 }}
-"""
\ No newline at end of file
+"""
+
+# 묶음 처리(micro-batching): 여러 요청의 이메일을 LLM 호출 1회로 생성 (SYSTEM_PROMPT 공유)
+BATCH_HUMAN_PROMPT = """
+Write a separate, independent summary for EACH request below.
+Each summary must be based only on that request's own information.
+{requests}
+
+## OUTPUT FORMAT
+Use the request numbers above as keys.
+{{
+  "1": "Generated summary for request 1 (starting with an appropriate greeting and mentioning the target person's name)",
+  "2": "Generated summary for request 2"
+}}
+"""
+
+BATCH_REQUEST_SECTION = """
+### Request {index}
+- Target: {target_info}
+- Purpose/Background: {purpose}
+- Specific Context & Key Issues: {detailed_context}
+- Previous Meeting Context (Optional): {previous_summary_section}
+"""
@@ -30,28 +30,17 @@ You are an expert HR consultant specializing in helping organizational leaders c
   - Strive to create questions that uniquely combine a topic from `purpose` with a style from `question_composition` to avoid redundancy.
 """
 
-HUMAN_PROMPT = """
-## [Basic Information]
-- Target: {target_info}
-
-## [Purpose and Situation]
-- Purpose/Background (You can select multiple. The generated questions will reflect all chosen purposes): {purpose}
+# 목적 선택지 설명 (단일/packed 템플릿 프롬프트 공유)
+PURPOSE_OPTIONS = """
   1. Growth: Focus on career progression, skill development, and new challenges.
   2. Satisfaction: Focus on personal fulfillment, recognition, compensation, and well-being (including Work-Life Balance).
   3. Relationships: Focus on team dynamics, collaboration, and communication with colleagues.
   4. Junior Development: Focus on onboarding, mentorship, and foundational skill growth for new members.
   5. Work: Focus on current tasks, workload, processes, and performance (e.g., Quarterly Review, specific issues).
-- Specific Context & Key Issues 
-  - Please describe in detail below. 
-  - The AI will focus on the core 'problem' within this context.
-  {detailed_context}
-
-## [Previous Meeting Context (Optional)]
-{previous_summary_section}
+"""
 
-## [Request Details]
-- Number of Questions: {num_questions}
-  (Simple: 5 / Standard: 10 / Advanced: 15~20)
+# 질문 구성별 규칙과 어조 (단일/packed 템플릿 프롬프트가 같은 규칙을 쓰도록 공유)
+REQUEST_RULES = """
 - Question Composition (Select multiple): {question_composition}
     1. Experience/Story-based: Based on specific past events or experiences. 
       (e.g., "What's your most memorable project experience recently?")
@@ -75,7 +64,26 @@ HUMAN_PROMPT = """
 
 - Conversation Tone and Manner: {tone_and_manner}
   (Choose: Formal / Casual)
+"""
+
+HUMAN_PROMPT = """
+## [Basic Information]
+- Target: {target_info}
 
+## [Purpose and Situation]
+- Purpose/Background (You can select multiple. The generated questions will reflect all chosen purposes): {purpose}
+""" + PURPOSE_OPTIONS[1:] + """- Specific Context & Key Issues 
+  - Please describe in detail below. 
+  - The AI will focus on the core 'problem' within this context.
+  {detailed_context}
+
+## [Previous Meeting Context (Optional)]
+{previous_summary_section}
+
+## [Request Details]
+- Number of Questions: {num_questions}
+  (Simple: 5 / Standard: 10 / Advanced: 15~20)
+""" + REQUEST_RULES[1:] + """
 ## OUTPUT FORMAT
 {{
     "1": "First question",
@@ -84,6 +92,29 @@ HUMAN_PROMPT = """
 }}
 """
 
+# 팀 템플릿 packed 모드: 입력이 짧은 여러 팀원의 질문을 LLM 호출 1회로 생성 (SYSTEM_PROMPT 공유)
+PACKED_HUMAN_PROMPT = """
+## [Members]
+Generate a separate, independent question set for EACH member below.
+Each member's questions must be based only on that member's own target, context and previous meeting context.
+{members}
 
+## [Shared Purpose and Request Details]
+- Purpose/Background (applies to every member): {purpose}
+""" + PURPOSE_OPTIONS[1:] + """- Number of Questions per member: {num_questions}
+  (Simple: 5 / Standard: 10 / Advanced: 15~20)
+""" + REQUEST_RULES[1:] + """
+## OUTPUT FORMAT
+Use the member numbers above as top-level keys.
+{{
+    "1": {{"1": "First question for member 1", "2": "Second question for member 1"}},
+    "2": {{"1": "First question for member 2", "2": "Second question for member 2"}}
+}}
+"""
 
-
+PACKED_MEMBER_SECTION = """
+### Member {index}
+- Target: {target_info}
+- Specific Context & Key Issues: {detailed_context}
+- Previous Meeting Context (Optional): {previous_summary_section}
+"""
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+from contextlib import nullcontext
+from typing import Any, Dict, Optional, Set
+
+from src.services.meeting_generator.workflow import MeetingPipeline
+from src.utils.cost_ledger import CostLedger
+from src.utils.deadline import Deadline
+from src.utils.job_store import JobStore
+from src.utils.metrics import ANALYSIS_JOB_QUEUE_DEPTH
+from src.utils.schemas import AnalyzeMeetingInput
+
+logger = logging.getLogger("analysis_jobs")
+
+
+async def run_analysis_job(
+    pipeline: MeetingPipeline,
+    job_store: JobStore,
+    job_id: str,
+    input_data: AnalyzeMeetingInput,
+    cost_ledger: Optional[CostLedger] = None,
+    deadline: Optional[Deadline] = None,
+    recording_probe: Optional[Dict[str, Any]] = None,
+) -> Dict:
+    """분석 파이프라인을 실행하고 진행 상태를 공유 작업 저장소에 기록"""
+    await job_store.update(job_id, status="running")
+    
+    async def record_preview(preview: Dict[str, Any]) -> None:
+        # 전체 분석이 끝나기 전에 조회하는 클라이언트에게 미리보기를 먼저 제공
+        await job_store.update(job_id, preview=preview)
+    
+    try:
+        usage_scope = cost_ledger.track("analyze_job", input_data.user_id) if cost_ledger else nullcontext()
+        with usage_scope:
+            result = await pipeline.run(
+                recording_url=input_data.recording_url,
+                qa_pairs=input_data.qa_pairs,
+                participants_info=input_data.participants_info,
+                meeting_datetime=input_data.meeting_datetime,
+                only_title=input_data.only_title,
+                preview=input_data.preview,
+                on_preview=record_preview,
+                deadline=deadline,
+                recording_probe=recording_probe,
+                user_id=input_data.user_id,
+                member_id=input_data.member_id,
+                meeting_id=job_id,
+            )
+    except asyncio.CancelledError:
+        await job_store.update(job_id, status="cancelled")
+        raise
+    except Exception as e:
+        logger.error(f"분석 작업 실패 ({job_id}): {e}")
+        await job_store.update(job_id, status="failed", error=str(e))
+        return {}
+
+    if result.get("status") == "completed":
+        # 전체 분석 결과가 미리보기를 대체
+        await job_store.update(job_id, status="completed", result=result.get("analysis_result", {}), preview=None)
+    else:
+        await job_store.update(job_id, status="failed", error="; ".join(result.get("errors", [])) or f"파이프라인 상태: {result.get('status')}")
+    return result
+
+
+def start_analysis_job(
+    pipeline: MeetingPipeline,
+    job_store: JobStore,
+    job_id: str,
+    input_data: AnalyzeMeetingInput,
+    background_tasks: Set[asyncio.Task],
+    cost_ledger: Optional[CostLedger] = None,
+    deadline: Optional[Deadline] = None,
+    recording_probe: Optional[Dict[str, Any]] = None,
+) -> asyncio.Task:
+    """요청 수명과 무관하게 실행되는 분석 작업 태스크 시작 (recording_probe를 주면 파이프라인의 녹음 사전 점검 생략)"""
+    task = asyncio.create_task(
+        run_analysis_job(pipeline, job_store, job_id, input_data, cost_ledger, deadline, recording_probe)
+    )
+    # 태스크가 GC되지 않도록 완료 전까지 참조 유지
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    ANALYSIS_JOB_QUEUE_DEPTH.inc()
+    task.add_done_callback(lambda _: ANALYSIS_JOB_QUEUE_DEPTH.dec())
+    return task
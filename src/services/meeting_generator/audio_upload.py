@@ -0,0 +1,111 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional
+
+from src.config.config import AUDIO_UPLOAD_BUFFER_CHUNKS, AUDIO_UPLOAD_MAX_BYTES
+from src.utils.clients import ProviderClients
+from src.utils.schemas import AudioUploadResult
+from src.utils.tracing import start_span
+
+logger = logging.getLogger("audio_upload")
+
+# 업로드 대상별 큐의 종료 표시
+_END = object()
+
+
+class AudioUploadTooLarge(Exception):
+    """업로드 크기가 AUDIO_UPLOAD_MAX_BYTES를 넘음"""
+
+
+def make_storage_path(filename: Optional[str]) -> str:
+    """Storage 저장 경로 (일자별 디렉터리 + 임의 ID, 확장자만 원본 파일명에서 가져옴)"""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if not extension[1:].isalnum() or len(extension) > 6:
+        extension = ""
+    return f"{datetime.now():%Y/%m/%d}/{uuid.uuid4().hex}{extension}"
+
+
+async def _drain(queue: asyncio.Queue) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await queue.get()
+        if chunk is _END:
+            return
+        yield chunk
+
+
+async def stream_upload(
+    chunks: AsyncIterator[bytes],
+    clients: ProviderClients,
+    filename: Optional[str] = None,
+    content_type: str = "application/octet-stream",
+    max_bytes: int = AUDIO_UPLOAD_MAX_BYTES,
+    buffer_chunks: int = AUDIO_UPLOAD_BUFFER_CHUNKS,
+) -> AudioUploadResult:
+    """
+    요청 본문 청크를 STT 업로드 API와 Storage로 동시에 흘려보내면서 내용 해시를 계산합니다.
+
+    파일 전체를 메모리나 디스크(TEMP_AUDIO_DIR)에 두지 않습니다. 대상별로 최대 buffer_chunks개 청크만 큐에 두고,
+    큐가 차면 본문 수신을 멈추므로 메모리 사용량은 파일 크기와 관계없이 일정합니다.
+    어느 한쪽 업로드가 실패하거나 크기 제한을 넘으면 나머지 전송도 취소합니다.
+    Storage가 설정되지 않은 경우 STT 업로드만 진행합니다.
+    """
+    if clients.stt is None:
+        raise ValueError("AssemblyAI 클라이언트가 설정되지 않았습니다")
+
+    started = time.perf_counter()
+    digest = hashlib.sha256()
+    size = 0
+    storage_path = make_storage_path(filename) if clients.storage is not None else None
+    queues: Dict[str, asyncio.Queue] = {"stt": asyncio.Queue(maxsize=buffer_chunks)}
+    if storage_path is not None:
+        queues["storage"] = asyncio.Queue(maxsize=buffer_chunks)
+
+    async def pump() -> None:
+        nonlocal size
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            size += len(chunk)
+            if size > max_bytes:
+                raise AudioUploadTooLarge(f"오디오 크기가 최대 {max_bytes} 바이트를 넘었습니다")
+            digest.update(chunk)
+            for queue in queues.values():
+                await queue.put(chunk)
+        for queue in queues.values():
+            await queue.put(_END)
+
+    with start_span("audio_upload", targets=",".join(queues)):
+        tasks = {
+            "pump": asyncio.create_task(pump()),
+            "stt": asyncio.create_task(clients.stt.upload(_drain(queues["stt"]))),
+        }
+        if storage_path is not None:
+            tasks["storage"] = asyncio.create_task(
+                clients.storage.upload(storage_path, _drain(queues["storage"]), content_type)
+            )
+        try:
+            done, _ = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                # 먼저 실패한 작업의 예외를 그대로 전달 (나머지는 finally에서 취소)
+                if task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    result = AudioUploadResult(
+        audio_url=tasks["stt"].result(),
+        storage_path=storage_path,
+        storage_url=clients.storage.public_url(storage_path) if storage_path is not None else None,
+        content_sha256=digest.hexdigest(),
+        size_bytes=size,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+    logger.info(f"✅ 오디오 업로드 완료: {size} 바이트, sha256={result.content_sha256[:12]}")
+    return result
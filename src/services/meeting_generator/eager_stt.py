@@ -0,0 +1,232 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+import assemblyai as aai
+
+from src.config.config import EAGER_STT_TTL_SECONDS, STT_CHECK_INTERVAL
+from src.utils.clients import ProviderClients
+from src.utils.cost_ledger import CostLedger, record_stt_audio
+from src.utils.metrics import STT_AUDIO_SECONDS, record_cache_lookup, record_eager_stt
+from src.utils.utils import calculate_speaker_percentages
+
+logger = logging.getLogger("eager_stt")
+
+# Storage 객체 URL (공개/서명/인증 URL 모두 같은 객체면 같은 캐시 키)
+_STORAGE_OBJECT_PATH = re.compile(r"^/storage/v1/object/(?:public/|sign/|authenticated/)?(?P<object>.+)$")
+
+# 사전 전사 상태
+PENDING = "pending"
+COMPLETED = "completed"
+
+# STT 등록 중인 기록의 전사 ID를 다시 확인하는 간격 (초)
+_SUBMIT_POLL_SECONDS = 0.05
+
+
+def recording_key(recording_url: str) -> str:
+    """녹음 URL의 캐시 키. Supabase Storage URL은 서명 토큰/호스트와 관계없이 버킷/경로 기준"""
+    parsed = urlsplit(recording_url)
+    match = _STORAGE_OBJECT_PATH.match(parsed.path)
+    identity = f"object:{unquote(match['object'])}" if match else f"url:{recording_url}"
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+class EagerTranscriber:
+    """
+    녹음 업로드 완료 알림을 받으면 /api/analyze 요청 전에 STT를 미리 시작하고, 결과를 공유 상태 저장소의
+    전사 캐시에 보관합니다. 이어지는 분석 요청은 완료된 전사를 바로 사용하거나(LLM 단계부터 실행),
+    진행 중인 전사 작업을 새로 등록하지 않고 이어서 기다립니다.
+    전사 캐시는 워커 간에 공유되므로 알림과 분석 요청이 다른 워커로 가도 됩니다.
+    업로드 API처럼 녹음 내용의 SHA-256을 알면 전사를 내용 기준으로 보관하고 녹음 URL들은 그 기록을 가리키게 하여,
+    같은 파일을 다시 올려 URL이 바뀌어도 STT를 다시 실행하지 않습니다.
+    TTL 안에 분석 요청이 오지 않으면 결과를 폐기하고 expired로 집계합니다 (비용은 원장에 별도 엔드포인트로 기록).
+    """
+
+    def __init__(
+        self,
+        clients: ProviderClients,
+        backend,
+        cost_ledger: Optional[CostLedger] = None,
+        ttl_seconds: float = EAGER_STT_TTL_SECONDS,
+        check_interval: float = STT_CHECK_INTERVAL,
+        prefix: str = "transcript",
+    ) -> None:
+        self.clients = clients
+        self.backend = backend
+        self.cost_ledger = cost_ledger
+        self.ttl_seconds = ttl_seconds
+        self.check_interval = check_interval
+        self.prefix = prefix
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def _key(self, recording_url: str, suffix: str = "") -> str:
+        return f"{self.prefix}:{recording_key(recording_url)}{suffix}"
+
+    def _content_key(self, content_sha256: str) -> str:
+        return f"{self.prefix}:sha256:{content_sha256.lower()}"
+
+    async def start(
+        self,
+        recording_url: str,
+        user_id: Optional[str] = None,
+        content_sha256: Optional[str] = None,
+        aliases: Iterable[str] = (),
+    ) -> str:
+        """
+        사전 전사 시작. 같은 녹음의 전사가 이미 진행 중이거나 완료되었으면(다른 워커 포함) 새로 시작하지 않고 그 상태를 반환.
+        content_sha256을 주면 전사를 내용 해시로 보관하고 recording_url과 aliases(같은 파일의 Storage URL 등)가 그 기록을 가리킴.
+        반환값: started | pending | completed
+        """
+        if self.clients.stt is None:
+            raise ValueError("AssemblyAI 클라이언트가 설정되지 않았습니다")
+
+        started_at = time.time()
+        record = {"status": PENDING, "transcript_id": None, "started_at": started_at}
+        if content_sha256:
+            key = self._content_key(content_sha256)
+            alias_keys = [self._key(url) for url in dict.fromkeys([recording_url, *aliases])]
+            # 같은 내용의 전사가 이미 있으면(재업로드) 새 URL도 그 전사를 사용
+            for alias_key in alias_keys:
+                await self.backend.set(alias_key, json.dumps({"alias": key}), ex=self.ttl_seconds)
+            record["aliases"] = alias_keys
+        else:
+            key = self._key(recording_url)
+        # 여러 워커에 같은 알림이 와도 전사는 한 번만 등록
+        if not await self.backend.set(key, json.dumps(record), ex=self.ttl_seconds, nx=True):
+            _, existing = await self._resolve(key)
+            return existing["status"] if existing is not None else PENDING
+
+        try:
+            transcript = await self.clients.stt.submit(recording_url)
+        except BaseException:
+            await self.backend.delete(key, *record.get("aliases", []))
+            raise
+        record["transcript_id"] = transcript.id
+        await self._save(key, record, started_at)
+
+        self._tasks[key] = asyncio.create_task(self._run(key, transcript, record, user_id))
+        self._tasks[key].add_done_callback(lambda _: self._tasks.pop(key, None))
+        record_eager_stt("started")
+        logger.info(f"🎙️ 사전 전사 시작: {recording_url} ({transcript.id})")
+        return "started"
+
+    async def try_start(
+        self,
+        recording_url: str,
+        user_id: Optional[str] = None,
+        content_sha256: Optional[str] = None,
+        aliases: Iterable[str] = (),
+    ) -> Optional[str]:
+        """start와 같지만 실패해도 예외 없이 None 반환 (사전 전사는 최적화이므로 호출한 요청에 영향 없음)"""
+        try:
+            return await self.start(recording_url, user_id, content_sha256, aliases)
+        except Exception as e:
+            logger.warning(f"STT 사전 시작 실패 ({recording_url}): {e}")
+            return None
+
+    async def claim(self, recording_url: str) -> Optional[Dict[str, Any]]:
+        """
+        분석 요청이 사전 전사를 가져감. 없으면 None.
+        완료된 경우 transcript/speaker_stats_percent를, 진행 중이면 이어서 기다릴 transcript_id를 담은 기록을 반환.
+        같은 녹음을 다시 분석(재생성)하면 TTL 안에서는 같은 전사를 재사용합니다.
+        사전 전사가 아직 STT에 등록 중이면(전사 ID 없음) 중복 등록하지 않도록 최대 check_interval 동안 전사 ID를 기다립니다.
+        """
+        key, record = await self._resolve(self._key(recording_url))
+        give_up_at = time.monotonic() + self.check_interval
+        while record is not None and record.get("transcript_id") is None and time.monotonic() < give_up_at:
+            await asyncio.sleep(min(_SUBMIT_POLL_SECONDS, self.check_interval))
+            key, record = await self._resolve(self._key(recording_url))
+        record_cache_lookup("transcript", hit=record is not None and record.get("transcript_id") is not None)
+        if record is None or record.get("transcript_id") is None:
+            return None
+        # 사용 표시는 기록보다 늦게 만료되어 TTL 시점의 사용 여부 확인에 남아 있음 (확인 후 함께 삭제)
+        await self.backend.set(f"{key}:claimed", "1", ex=self.ttl_seconds)
+        record_eager_stt("used")
+        return record
+
+    async def aclose(self) -> None:
+        """워커 종료 시 진행 중인 사전 전사 대기 취소 (전사 캐시에 남은 기록은 TTL로 만료)"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self.backend.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def _resolve(self, key: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """URL 키가 내용 해시 기록을 가리키면 그 기록의 키와 기록 반환"""
+        record = await self._load(key)
+        if record is not None and "alias" in record:
+            key = record["alias"]
+            record = await self._load(key)
+        return key, record
+
+    async def _save(self, key: str, record: Dict[str, Any], started_at: float) -> None:
+        # 기록을 갱신해도 처음 시작한 시점 기준의 TTL 유지
+        remaining = started_at + self.ttl_seconds - time.time()
+        if remaining > 0:
+            await self.backend.set(key, json.dumps(record, ensure_ascii=False), ex=remaining)
+
+    async def _run(
+        self, key: str, transcript: aai.types.TranscriptResponse, record: Dict[str, Any], user_id: Optional[str]
+    ) -> None:
+        """전사 완료까지 대기해 결과를 캐시에 기록하고, TTL이 지나면 사용 여부 집계 후 폐기"""
+        expires_in = record["started_at"] + self.ttl_seconds - time.time()
+        try:
+            await asyncio.wait_for(self._wait(key, transcript, record, user_id), timeout=expires_in)
+        except asyncio.TimeoutError:
+            logger.warning(f"사전 전사가 TTL 안에 끝나지 않았습니다 ({record['transcript_id']})")
+        except Exception as e:
+            logger.error(f"사전 전사 실패 ({record['transcript_id']}): {e}")
+            record_eager_stt("failed")
+            await self.backend.delete(key, *record.get("aliases", []))
+            return
+
+        await asyncio.sleep(max(record["started_at"] + self.ttl_seconds - time.time(), 0))
+        if not await self.backend.exists(f"{key}:claimed"):
+            record_eager_stt("expired")
+            logger.info(f"사용되지 않은 사전 전사 폐기: {record['transcript_id']}")
+        await self.backend.delete(key, f"{key}:claimed", *record.get("aliases", []))
+
+    async def _wait(
+        self, key: str, transcript: aai.types.TranscriptResponse, record: Dict[str, Any], user_id: Optional[str]
+    ) -> None:
+        while transcript.status in (aai.TranscriptStatus.processing, aai.TranscriptStatus.queued):
+            await asyncio.sleep(self.check_interval)
+            transcript = await self.clients.stt.get_transcript(transcript.id)
+        if transcript.status == aai.TranscriptStatus.error:
+            raise aai.types.TranscriptError(str(transcript.error))
+
+        record.update(
+            status=COMPLETED,
+            transcript={
+                "utterances": [
+                    {"speaker": utterance.speaker, "text": utterance.text}
+                    for utterance in transcript.utterances or []
+                ],
+                "total_duration": transcript.audio_duration,
+            },
+            speaker_stats_percent=calculate_speaker_percentages(transcript.utterances),
+        )
+        await self._save(key, record, record["started_at"])
+        record_eager_stt("completed")
+
+        # 사전 전사 비용은 분석 요청과 분리해 별도 엔드포인트로 원장에 기록 (사용되지 않은 비용 추적)
+        tracking = (
+            self.cost_ledger.track("analyze:stt_speculative", user_id) if self.cost_ledger else nullcontext()
+        )
+        with tracking:
+            STT_AUDIO_SECONDS.inc(transcript.audio_duration or 0)
+            record_stt_audio(transcript.audio_duration or 0)
+        logger.info(f"✅ 사전 전사 완료: {record['transcript_id']}")
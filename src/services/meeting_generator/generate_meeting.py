@@ -1,20 +1,70 @@
+import asyncio
 import json
 import logging
 import time
+from functools import partial
+from typing import Any, Dict, Hashable, List, Optional
 import assemblyai as aai
-from src.utils.model import SpeechTranscriber, title_llm, meeting_llm
-from src.utils.schemas import MeetingPipelineState, MeetingAnalysis
-from src.prompts.stt_generation.meeting_analysis_prompts import SYSTEM_PROMPT, USER_PROMPT
-from src.prompts.stt_generation.title_generation_prompts import TITLE_ONLY_SYSTEM_PROMPT, TITLE_ONLY_USER_PROMPT
+from src.services.meeting_generator.eager_stt import COMPLETED, EagerTranscriber
+from src.services.meeting_generator.preflight import next_poll_delay, probe_recording
+from src.utils.clients import ProviderClients
+from src.utils.cost_ledger import record_stt_audio
+from src.utils.deadline import DeadlineExceeded, run_within
+from src.utils.metrics import ANALYSIS_PREVIEWS, DEADLINE_ACTIONS, STT_AUDIO_SECONDS
+from src.utils.micro_batch import MicroBatcher
+from src.utils.tracing import start_span
+from src.utils.schemas import MeetingPipelineState, MeetingAnalysis, MeetingPreview
+from src.prompts.stt_generation.meeting_analysis_prompts import PREVIEW_HINT_PROMPT, SYSTEM_PROMPT, USER_PROMPT
+from src.prompts.stt_generation.meeting_preview_prompts import PREVIEW_SYSTEM_PROMPT, PREVIEW_USER_PROMPT
+from src.prompts.stt_generation.title_generation_prompts import (
+    BATCH_TITLE_MEETING_SECTION,
+    BATCH_TITLE_USER_PROMPT,
+    TITLE_ONLY_SYSTEM_PROMPT,
+    TITLE_ONLY_USER_PROMPT,
+)
 from src.utils.performance_logging import time_node_execution
-from src.config.config import STT_MAX_WAIT_TIME, STT_CHECK_INTERVAL
+from src.config.config import (
+    ANALYSIS_PREVIEW_TIMEOUT_SECONDS,
+    STT_MAX_WAIT_TIME,
+    STT_CHECK_INTERVAL,
+    DEADLINE_ANALYSIS_MIN_SECONDS,
+    DEADLINE_ANALYSIS_DOWNGRADE_SECONDS,
+)
 from src.utils.utils import calculate_speaker_percentages, map_speaker_data
 from langchain.prompts import PromptTemplate
+from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 
 logger = logging.getLogger("meeting_nodes")
 
 
+def _fail_on_deadline(state: MeetingPipelineState, error: DeadlineExceeded) -> MeetingPipelineState:
+    """마감 시간 초과로 단계를 중단하고 상태를 deadline_exceeded로 기록 (이후 노드는 실행하지 않음)"""
+    logger.warning(f"⏰ {error} - 남은 단계를 중단합니다")
+    DEADLINE_ACTIONS.labels(error.stage, "exceeded").inc()
+    state["errors"].append(str(error))
+    state["status"] = "deadline_exceeded"
+    return state
+
+
+def _select_analysis_llm(state: MeetingPipelineState, clients: ProviderClients):
+    """녹음 길이 프로필과 남은 마감 시간에 맞춰 분석 모델 선택 (짧은 녹음/촉박한 마감은 빠른 모델, 시간이 부족하면 중단)"""
+    llm = clients.meeting_llm
+    if (state.get("recording_probe") or {}).get("model_profile") == "fast":
+        llm = clients.meeting_fallback_llm
+    deadline = state.get("deadline")
+    if deadline is not None:
+        remaining = deadline.remaining()
+        if remaining < DEADLINE_ANALYSIS_MIN_SECONDS:
+            raise DeadlineExceeded("analyze")
+        if remaining < DEADLINE_ANALYSIS_DOWNGRADE_SECONDS:
+            logger.warning(f"⏰ 남은 시간 {remaining:.1f}초 - 빠른 분석 모델로 변경")
+            DEADLINE_ACTIONS.labels("analyze", "downgraded").inc()
+            llm = clients.meeting_fallback_llm
+    state["performance_metrics"]["analyze_model"] = getattr(llm, "model_name", None)
+    return llm
+
+
 @time_node_execution("retrieve")
 def retrieve_from_supabase(state: MeetingPipelineState) -> MeetingPipelineState:
     """프론트에서 전달받은 URL 처리"""
@@ -43,11 +93,52 @@ def retrieve_from_supabase(state: MeetingPipelineState) -> MeetingPipelineState:
     return state
 
 
+@time_node_execution("preflight")
+async def preflight_recording(state: MeetingPipelineState, clients: ProviderClients) -> MeetingPipelineState:
+    """
+    STT 전에 녹음 파일 헤더만 읽어 사용할 수 없는 파일은 바로 거부하고(status=rejected),
+    확인한 길이로 STT 상태 확인 간격과 분석 모델 프로필을 정합니다. 요청에서 이미 점검했으면 그 결과를 사용합니다.
+    """
+    if state.get("status") == "failed" or not state.get("file_url"):
+        return state
+    
+    try:
+        probe = state.get("recording_probe")
+        if probe is None:
+            result = await run_within(state.get("deadline"), probe_recording(clients.media, state["file_url"]), "preflight")
+            probe = state["recording_probe"] = result.model_dump()
+        
+        if not probe["usable"]:
+            state["errors"].append(f"녹음 파일을 사용할 수 없습니다 ({probe['reason']}): {probe['detail']}")
+            state["status"] = "rejected"
+            return state
+        
+        state["performance_metrics"]["preflight_audio_seconds"] = probe["duration_seconds"]
+        state["performance_metrics"]["preflight_profile"] = probe["model_profile"]
+        logger.info(
+            f"🔍 녹음 사전 점검 - {probe['container'] or '형식 미확인'}, "
+            f"{probe['duration_seconds'] or '?'}초, 예상 STT {probe['estimated_stt_seconds'] or '?'}초"
+        )
+    except DeadlineExceeded as e:
+        return _fail_on_deadline(state, e)
+    
+    return state
+
+
 @time_node_execution("transcribe")
-def process_with_assemblyai(state: MeetingPipelineState) -> MeetingPipelineState:
-    """AssemblyAI로 STT 처리"""
+async def process_with_assemblyai(
+    state: MeetingPipelineState,
+    clients: ProviderClients,
+    eager_stt: Optional[EagerTranscriber] = None,
+) -> MeetingPipelineState:
+    """
+    AssemblyAI로 STT 처리 (워커 공유 클라이언트 풀 사용).
+    업로드 완료 시 미리 시작한 전사가 있으면 완료된 결과를 그대로 쓰거나 진행 중인 전사 작업을 이어서 기다립니다.
+    """
     logger.info("STT 처리 시작")
     
+    deadline = state.get("deadline")
+    
     try:
         state["status"] = "transcribing"
         
@@ -56,16 +147,38 @@ def process_with_assemblyai(state: MeetingPipelineState) -> MeetingPipelineState
             state["status"] = "failed"
             return state
         
-        speech_transcriber = SpeechTranscriber()
-        transcriber = aai.Transcriber(config=speech_transcriber.config)
+        if clients.stt is None:
+            raise ValueError("AssemblyAI 클라이언트가 설정되지 않았습니다")
+        
+        speculative = None
+        if eager_stt is not None:
+            with start_span("stt.claim"):
+                speculative = await run_within(deadline, eager_stt.claim(state["file_url"]), "transcribe")
         
-        logger.info(f"STT 시작 - 파일 URL: {state['file_url']}")
-        transcript = transcriber.transcribe(state["file_url"])
+        if speculative is not None and speculative["status"] == COMPLETED:
+            logger.info(f"⚡ 사전 전사 결과 사용 - {speculative['transcript_id']}")
+            state["transcript"] = speculative["transcript"]
+            state["speaker_stats_percent"] = speculative["speaker_stats_percent"]
+            state["performance_metrics"]["transcribe_source"] = "eager"
+            return state
         
-        # 전사 상태 확인 및 대기
-        elapsed_time = 0
-        max_wait_time = STT_MAX_WAIT_TIME
-        check_interval = STT_CHECK_INTERVAL
+        if speculative is not None:
+            logger.info(f"⚡ 진행 중인 사전 전사 이어받기 - {speculative['transcript_id']}")
+            state["performance_metrics"]["transcribe_source"] = "eager_pending"
+            with start_span("stt.poll", elapsed_seconds=0):
+                transcript = await run_within(
+                    deadline, clients.stt.get_transcript(speculative["transcript_id"]), "transcribe"
+                )
+        else:
+            logger.info(f"STT 시작 - 파일 URL: {state['file_url']}")
+            with start_span("stt.submit"):
+                transcript = await run_within(deadline, clients.stt.submit(state["file_url"]), "transcribe")
+        
+        # 전사 상태 확인 및 대기 (이벤트 루프를 막지 않도록 비동기 대기)
+        # 사전 점검으로 예상 완료 시간을 알면 완료 시점 근처에서 자주 확인하고, 긴 녹음은 최대 대기 시간도 늘림
+        expected = (state.get("recording_probe") or {}).get("estimated_stt_seconds")
+        elapsed_time = max(time.time() - speculative["started_at"], 0) if speculative is not None else 0
+        max_wait_time = max(STT_MAX_WAIT_TIME, expected * 2) if expected else STT_MAX_WAIT_TIME
         
         while transcript.status in [aai.TranscriptStatus.processing, aai.TranscriptStatus.queued]:
             if elapsed_time >= max_wait_time:
@@ -73,10 +186,19 @@ def process_with_assemblyai(state: MeetingPipelineState) -> MeetingPipelineState
                 state["status"] = "failed"
                 return state
             
-            logger.info(f"🔄 STT 처리 중... ({elapsed_time}초 경과)")
-            time.sleep(check_interval)
+            # 요청 마감 시간이 있으면 LLM 분석에 쓸 최소 시간을 남기고 대기 중단
+            if deadline is not None and deadline.remaining() <= DEADLINE_ANALYSIS_MIN_SECONDS:
+                raise DeadlineExceeded("transcribe")
+            
+            logger.info(f"🔄 STT 처리 중... ({elapsed_time:.0f}초 경과)")
+            check_interval = next_poll_delay(elapsed_time, expected, STT_CHECK_INTERVAL)
+            if deadline is not None:
+                # 마감 시간으로 줄어든 대기 시간만큼만 경과 시간에 더함
+                check_interval = deadline.cap(check_interval, reserve=DEADLINE_ANALYSIS_MIN_SECONDS)
+            await asyncio.sleep(check_interval)
             elapsed_time += check_interval
-            transcript = transcriber.get_transcript(transcript.id)
+            with start_span("stt.poll", elapsed_seconds=elapsed_time):
+                transcript = await run_within(deadline, clients.stt.get_transcript(transcript.id), "transcribe")
         
         if transcript.status == aai.TranscriptStatus.error:
             logger.error(f"STT 처리 실패: {transcript.error}")
@@ -124,10 +246,16 @@ def process_with_assemblyai(state: MeetingPipelineState) -> MeetingPipelineState
             "utterances": formatted_transcript,
             "total_duration": transcript.audio_duration  # STT 비용 계산용
         }
+        # 사전 전사의 오디오 사용량은 사전 전사 쪽에서 기록
+        if speculative is None:
+            STT_AUDIO_SECONDS.inc(transcript.audio_duration or 0)
+            record_stt_audio(transcript.audio_duration or 0)
         state["speaker_stats_percent"] = speaker_stats_percent
         
         logger.info("✅ STT 처리 완료")
         
+    except DeadlineExceeded as e:
+        return _fail_on_deadline(state, e)
     except Exception as e:
         error_msg = f"STT 처리 실패: {str(e)}"
         logger.error(error_msg)
@@ -137,8 +265,62 @@ def process_with_assemblyai(state: MeetingPipelineState) -> MeetingPipelineState
     return state
 
 
+@time_node_execution("generate_preview")
+async def preview_with_llm(state: MeetingPipelineState, clients: ProviderClients) -> MeetingPipelineState:
+    """
+    전사 직후 빠른 모델(meeting_fallback_llm)로 제목/핵심 요약/액션 아이템 미리보기를 생성하고 on_preview로 바로 전달합니다.
+    미리보기는 부가 기능이므로 실패하거나 ANALYSIS_PREVIEW_TIMEOUT_SECONDS를 넘겨도 상태를 바꾸지 않고 전체 분석으로 넘어갑니다.
+    전체 분석도 빠른 모델로 실행될 녹음(짧은 녹음, 촉박한 마감)은 미리보기가 이득이 없으므로 생략합니다.
+    """
+    if not state.get("transcript") or not state["transcript"].get("utterances"):
+        return state
+    
+    deadline = state.get("deadline")
+    fast_profile = (state.get("recording_probe") or {}).get("model_profile") == "fast"
+    if fast_profile or (deadline is not None and deadline.remaining() < DEADLINE_ANALYSIS_DOWNGRADE_SECONDS):
+        ANALYSIS_PREVIEWS.labels("skipped").inc()
+        return state
+    
+    try:
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", PREVIEW_SYSTEM_PROMPT),
+            ("human", PREVIEW_USER_PROMPT)
+        ])
+        participants_info = json.loads(state.get("participants_info")) if state.get("participants_info") else {}
+        input_data = {
+            "transcript": state["transcript"]["utterances"],
+            "participants": participants_info,
+        }
+        chain = prompt | clients.meeting_fallback_llm.with_structured_output(MeetingPreview)
+        result = await asyncio.wait_for(
+            run_within(deadline, chain.ainvoke(input_data), "generate_preview"), ANALYSIS_PREVIEW_TIMEOUT_SECONDS
+        )
+    except Exception as e:
+        # 마감 시간 초과 포함. 남은 시간 확인과 중단은 전체 분석 노드가 처리
+        logger.warning(f"미리보기 생성 실패, 전체 분석으로 진행: {e!r}")
+        ANALYSIS_PREVIEWS.labels("failed").inc()
+        return state
+    
+    if result is None:
+        ANALYSIS_PREVIEWS.labels("failed").inc()
+        return state
+    
+    state["analysis_preview"] = result.model_dump()
+    ANALYSIS_PREVIEWS.labels("ready").inc()
+    logger.info(f"⚡ 미리보기 생성 완료: {state['analysis_preview']['title']}")
+    
+    on_preview = state.get("on_preview")
+    if on_preview is not None:
+        try:
+            await on_preview(state["analysis_preview"])
+        except Exception as e:
+            logger.error(f"미리보기 전달 실패: {e}")
+    
+    return state
+
+
 @time_node_execution("analyze")
-def analyze_with_llm(state: MeetingPipelineState) -> MeetingPipelineState:
+async def analyze_with_llm(state: MeetingPipelineState, clients: ProviderClients) -> MeetingPipelineState:
     """LLM으로 회의 분석"""
     logger.info("LLM 분석 시작")
     
@@ -155,9 +337,13 @@ def analyze_with_llm(state: MeetingPipelineState) -> MeetingPipelineState:
             template=USER_PROMPT
         )
         
+        # 미리보기가 있으면 화자 매핑과 액션 아이템 초안을 힌트로 넘겨 다시 도출하지 않도록 함
+        preview = state.get("analysis_preview")
+        human_template = user_prompt_template.template + (PREVIEW_HINT_PROMPT if preview else "")
+        
         prompt = ChatPromptTemplate.from_messages([
             ("system", SYSTEM_PROMPT),
-            ("human", user_prompt_template.template)
+            ("human", human_template)
         ])
         
         transcript_for_llm = state.get("transcript", {}).get("utterances", [])
@@ -176,10 +362,16 @@ def analyze_with_llm(state: MeetingPipelineState) -> MeetingPipelineState:
             "participants": participants_info,
             "qa_pairs": qa_pairs
         }
+        if preview:
+            input_data.update(
+                preview_speaker_mapping=preview["speaker_mapping"],
+                preview_leader_action_items=preview["leader_action_items"],
+                preview_member_action_items=preview["member_action_items"],
+            )
         
-        chain = prompt | meeting_llm.with_structured_output(MeetingAnalysis)
+        chain = prompt | _select_analysis_llm(state, clients).with_structured_output(MeetingAnalysis)
         
-        result = chain.invoke(input_data)
+        result = await run_within(state.get("deadline"), chain.ainvoke(input_data), "analyze")
         
         if result is None:
             logger.error("회의 분석 실패")
@@ -201,6 +393,8 @@ def analyze_with_llm(state: MeetingPipelineState) -> MeetingPipelineState:
         
         logger.info("✅ LLM 분석 완료")
         
+    except DeadlineExceeded as e:
+        return _fail_on_deadline(state, e)
     except Exception as e:
         error_msg = f"LLM 분석 실패: {str(e)}"
         logger.error(error_msg)
@@ -210,46 +404,99 @@ def analyze_with_llm(state: MeetingPipelineState) -> MeetingPipelineState:
     return state
 
 
+async def generate_title(title_llm, title_input_data: Dict[str, Any]) -> str:
+    """참가자 정보와 Q&A로 제목 1개 생성"""
+    title_user_prompt_template = PromptTemplate(
+        input_variables=["participants", "qa_pairs"],
+        template=TITLE_ONLY_USER_PROMPT
+    )
+    
+    title_prompt = ChatPromptTemplate.from_messages([
+        ("system", TITLE_ONLY_SYSTEM_PROMPT),
+        ("human", title_user_prompt_template.template)
+    ])
+    
+    title_result = await (title_prompt | title_llm).ainvoke(title_input_data)
+    return title_result.content.strip() if title_result is not None else ""
+
+
+async def generate_titles_batch(title_llm, title_inputs: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """여러 미팅의 제목을 LLM 호출 1회로 생성 (응답에서 빠진 미팅은 None)"""
+    batch_prompt = ChatPromptTemplate.from_messages([
+        ("system", TITLE_ONLY_SYSTEM_PROMPT),
+        ("human", BATCH_TITLE_USER_PROMPT)
+    ])
+    meetings = "".join(
+        BATCH_TITLE_MEETING_SECTION.format(index=index, **title_input_data)
+        for index, title_input_data in enumerate(title_inputs, start=1)
+    )
+    titles = await (batch_prompt | title_llm | JsonOutputParser()).ainvoke({"meetings": meetings})
+    if not isinstance(titles, dict):
+        return [None] * len(title_inputs)
+    return [
+        title.strip() if isinstance(title, str) and title.strip() else None
+        for title in (titles.get(str(index)) for index in range(1, len(title_inputs) + 1))
+    ]
+
+
+def title_batch_key(title_input_data: Dict[str, Any]) -> Hashable:
+    """같은 사용자의 제목 요청끼리만 묶음 (사용자를 알 수 없는 요청은 다른 요청과 묶지 않음)"""
+    user_id = title_input_data.get("user_id")
+    return ("user", user_id) if user_id else ("request", id(title_input_data))
+
+
+def create_title_batcher(clients: ProviderClients) -> MicroBatcher:
+    """동시에 들어온 같은 사용자의 제목 생성 요청을 묶어 처리하는 결합기 (워커 단위로 한 번 생성)"""
+    return MicroBatcher(
+        "title",
+        run_batch=partial(generate_titles_batch, clients.title_llm),
+        run_single=partial(generate_title, clients.title_llm),
+        key=title_batch_key,
+    )
+
+
 @time_node_execution("generate_title")
-def generate_title_only(state: MeetingPipelineState) -> MeetingPipelineState:
-    """제목만 생성하는 노드"""
+async def generate_title_only(
+    state: MeetingPipelineState,
+    clients: ProviderClients,
+    title_batcher: Optional[MicroBatcher] = None,
+) -> MeetingPipelineState:
+    """제목만 생성하는 노드 (title_batcher가 있으면 다른 요청과 묶어서 생성)"""
     logger.info("제목 전용 생성 시작")
     
+    deadline = state.get("deadline")
+    
     try:
         state["status"] = "analyzing"
-        
-        title_user_prompt_template = PromptTemplate(
-            input_variables=["participants", "qa_pairs"],
-            template=TITLE_ONLY_USER_PROMPT
-        )
-        
-        title_prompt = ChatPromptTemplate.from_messages([
-            ("system", TITLE_ONLY_SYSTEM_PROMPT),
-            ("human", title_user_prompt_template.template)
-        ])
+        if deadline is not None:
+            deadline.check("generate_title")
         
         qa_pairs = json.loads(state.get("qa_pairs")) if state.get("qa_pairs") else []
         participants_info = json.loads(state.get("participants_info")) if state.get("participants_info") else {}
         
         title_input_data = {
             "participants": participants_info,
-            "qa_pairs": qa_pairs
+            "qa_pairs": qa_pairs,
+            "user_id": state.get("user_id")
         }
         
-        title_chain = title_prompt | title_llm
-        
-        title_result = title_chain.invoke(title_input_data)
+        if title_batcher is not None:
+            title = await run_within(deadline, title_batcher.submit(title_input_data), "generate_title")
+        else:
+            title = await run_within(deadline, generate_title(clients.title_llm, title_input_data), "generate_title")
         
-        if title_result is None:
+        if not title:
             logger.error("제목 생성 실패")
             state["status"] = "failed"
             return state
         
-        state["analysis_result"] = {"title": title_result.content.strip()}
+        state["analysis_result"] = {"title": title}
         state["status"] = "completed"
         
         logger.info("✅ 제목 생성 완료")
         
+    except DeadlineExceeded as e:
+        return _fail_on_deadline(state, e)
     except Exception as e:
         error_msg = f"제목 생성 실패: {str(e)}"
         logger.error(error_msg)
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+
+import httpx
+
+from src.config.config import (
+    ANALYSIS_ESTIMATED_SECONDS,
+    ANALYSIS_FAST_PROFILE_MAX_SECONDS,
+    PREFLIGHT_HEAD_BYTES,
+    PREFLIGHT_MAX_DURATION_SECONDS,
+    PREFLIGHT_MAX_RANGE_REQUESTS,
+    PREFLIGHT_MAX_READ_BYTES,
+    PREFLIGHT_MIN_DURATION_SECONDS,
+    PREFLIGHT_TIMEOUT_SECONDS,
+    STT_CHECK_INTERVAL,
+    STT_MAX_CHECK_FACTOR,
+    STT_MIN_CHECK_INTERVAL,
+    STT_TURNAROUND_BASE_SECONDS,
+    STT_TURNAROUND_RATIO,
+)
+from src.utils.audio_probe import AudioInfo, AudioProbeError, probe_audio
+from src.utils.clients import UnsafeURLError
+from src.utils.metrics import record_recording_preflight
+from src.utils.schemas import RecordingProbe
+from src.utils.tracing import start_span
+
+logger = logging.getLogger("preflight")
+
+# 헤더를 찾지 못했을 때 오디오가 아니라고 판단하는 Content-Type (오류 페이지, JSON 응답 등)
+_NON_AUDIO_CONTENT_TYPES = ("text/", "application/json", "application/xml", "application/xhtml")
+
+
+class RecordingNotFound(Exception):
+    """녹음 파일 URL이 404/410을 반환함"""
+
+
+class _ReadLimitExceeded(Exception):
+    """헤더 확인에 필요한 범위가 Range 요청 한도를 넘음 (길이 미확인으로 처리)"""
+
+
+class RangeSource:
+    """
+    녹음 URL을 HTTP Range 요청으로 필요한 부분만 읽는 바이트 소스.
+    첫 요청으로 앞부분 head_bytes를 읽고, 헤더가 파일 뒤쪽에 있으면(MP4 moov, Ogg 마지막 페이지)
+    첫 요청을 포함해 최대 max_requests번까지 필요한 범위만 추가로 요청합니다. 읽은 범위는 캐시해 같은 범위를 다시 요청하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        url: str,
+        head_bytes: int = PREFLIGHT_HEAD_BYTES,
+        max_requests: int = PREFLIGHT_MAX_RANGE_REQUESTS,
+        max_read_bytes: int = PREFLIGHT_MAX_READ_BYTES,
+    ) -> None:
+        self.http_client = http_client
+        self.url = url
+        self.head_bytes = head_bytes
+        self.max_requests = max_requests
+        self.max_read_bytes = max_read_bytes
+        self.size: Optional[int] = None
+        self.content_type: Optional[str] = None
+        self.ranges_supported = False
+        self.requests = 0
+        self._chunks: List[Tuple[int, bytes]] = []
+
+    async def open(self) -> bytes:
+        """앞부분을 읽어 반환하고 파일 크기/Content-Type 확인"""
+        status, headers, data = await self._get(0, self.head_bytes)
+        self.content_type = headers.get("content-type")
+        if status == 416:
+            # 0바이트부터의 범위도 만족할 수 없으면 빈 파일
+            self.size = 0
+            return b""
+        if status == 206:
+            self.ranges_supported = True
+            total = headers.get("content-range", "").rpartition("/")[2]
+            self.size = int(total) if total.isdigit() else None
+        elif headers.get("content-length", "").isdigit():
+            self.size = int(headers["content-length"])
+        self._chunks.append((0, data))
+        return data
+
+    async def read(self, offset: int, length: int) -> bytes:
+        if self.size is not None:
+            length = max(min(length, self.size - offset), 0)
+        for start, data in self._chunks:
+            if start <= offset and offset + length <= start + len(data):
+                return data[offset - start:offset - start + length]
+        if length == 0:
+            return b""
+        if not self.ranges_supported or self.requests >= self.max_requests or length > self.max_read_bytes:
+            raise _ReadLimitExceeded(f"{offset}바이트 위치의 헤더를 읽지 못했습니다 (Range 요청 한도 초과)")
+        # 작은 범위(박스 헤더 등)도 이어지는 내용을 함께 읽어 추가 요청 수를 줄임
+        fetch = min(max(length, self.head_bytes), self.max_read_bytes)
+        _, _, data = await self._get(offset, fetch)
+        self._chunks.append((offset, data))
+        return data[:length]
+
+    async def _get(self, offset: int, length: int) -> Tuple[int, httpx.Headers, bytes]:
+        self.requests += 1
+        headers = {"range": f"bytes={offset}-{offset + length - 1}"}
+        async with self.http_client.stream("GET", self.url, headers=headers) as response:
+            if response.status_code in (404, 410):
+                raise RecordingNotFound(f"HTTP {response.status_code}")
+            if response.status_code != 416:
+                response.raise_for_status()
+            # Range를 무시하고 전체 파일을 보내는 서버도 필요한 길이만 읽고 연결 종료
+            data = b""
+            async for chunk in response.aiter_bytes():
+                data += chunk
+                if len(data) >= length:
+                    break
+            return response.status_code, response.headers, data[:length]
+
+
+def estimate_stt_seconds(duration_seconds: Optional[float]) -> Optional[float]:
+    """오디오 길이로 예측한 STT 소요 시간 (길이를 모르면 None)"""
+    if duration_seconds is None:
+        return None
+    return round(STT_TURNAROUND_BASE_SECONDS + duration_seconds * STT_TURNAROUND_RATIO, 1)
+
+
+def select_model_profile(duration_seconds: Optional[float]) -> str:
+    """짧은 녹음은 빠른 분석 모델(fast), 그 외에는 기본 모델(default)"""
+    if duration_seconds is not None and duration_seconds <= ANALYSIS_FAST_PROFILE_MAX_SECONDS:
+        return "fast"
+    return "default"
+
+
+def next_poll_delay(
+    elapsed: float, expected: Optional[float], check_interval: float = STT_CHECK_INTERVAL
+) -> float:
+    """
+    다음 STT 상태 확인까지 대기 시간.
+    예상 완료 시간을 모르면 check_interval 간격, 알면 남은 시간의 절반씩 기다려(최대 check_interval × STT_MAX_CHECK_FACTOR)
+    완료 직후에 확인하고, 예상보다 늦어지면 최소 간격부터 다시 점점 늘립니다.
+    """
+    if expected is None:
+        return check_interval
+    shortest = min(STT_MIN_CHECK_INTERVAL, check_interval)
+    remaining = expected - elapsed
+    if remaining > 0:
+        return min(max(remaining / 2, shortest), check_interval * STT_MAX_CHECK_FACTOR)
+    return min(max(-remaining / 4, shortest), check_interval)
+
+
+def _rejection(info: Optional[AudioInfo], size: Optional[int], content_type: Optional[str]) -> Optional[Tuple[str, str]]:
+    if size == 0:
+        return "empty", "빈 파일입니다"
+    if info is None:
+        if content_type and content_type.lower().startswith(_NON_AUDIO_CONTENT_TYPES):
+            return "not_audio", "오디오 파일이 아닙니다"
+        return None
+    if info.channels == 0:
+        return "no_audio", "오디오 채널이 없습니다"
+    if info.duration_seconds is not None and info.duration_seconds < PREFLIGHT_MIN_DURATION_SECONDS:
+        return "too_short", f"녹음이 너무 짧습니다 ({info.duration_seconds:.1f}초)"
+    if info.duration_seconds is not None and info.duration_seconds > PREFLIGHT_MAX_DURATION_SECONDS:
+        return "too_long", f"녹음이 너무 깁니다 ({info.duration_seconds / 3600:.1f}시간)"
+    return None
+
+
+async def _probe(http_client: httpx.AsyncClient, recording_url: str) -> RecordingProbe:
+    # 응답의 detail에는 상대 서버의 응답/오류 내용을 넣지 않음 (내부 서비스 탐색에 쓰이지 않도록 원인은 로그에만 기록)
+    source = RangeSource(http_client, recording_url)
+    try:
+        head = await source.open()
+    except RecordingNotFound as e:
+        logger.info(f"녹음 파일 없음: {recording_url} ({e})")
+        return RecordingProbe(usable=False, reason="not_found", detail="녹음 파일을 찾을 수 없습니다")
+    except UnsafeURLError:
+        return RecordingProbe(usable=True, detail="허용되지 않은 녹음 파일 주소라 길이를 확인하지 않았습니다")
+    except httpx.HTTPError as e:
+        logger.info(f"녹음 파일 읽기 실패: {recording_url} ({type(e).__name__}: {e})")
+        return RecordingProbe(usable=True, detail="녹음 파일을 읽지 못해 길이를 확인하지 않았습니다")
+
+    info = None
+    detail = None
+    try:
+        info = await probe_audio(source, head) if head else None
+        if info is None and head:
+            detail = "지원하지 않는 컨테이너 형식이라 길이를 확인하지 않았습니다"
+    except AudioProbeError as e:
+        return RecordingProbe(usable=False, reason=e.reason, detail=str(e), size_bytes=source.size)
+    except (_ReadLimitExceeded, httpx.HTTPError) as e:
+        logger.info(f"녹음 헤더 읽기 실패: {recording_url} ({type(e).__name__}: {e})")
+        detail = "헤더를 끝까지 읽지 못해 길이를 확인하지 않았습니다"
+
+    rejection = _rejection(info, source.size, source.content_type)
+    fields = {}
+    if info is not None:
+        fields = dict(
+            container=info.container,
+            codec=info.codec,
+            duration_seconds=round(info.duration_seconds, 3) if info.duration_seconds is not None else None,
+            channels=info.channels,
+            sample_rate=info.sample_rate,
+        )
+    if rejection is not None:
+        reason, detail = rejection
+        return RecordingProbe(usable=False, reason=reason, detail=detail, size_bytes=source.size, **fields)
+
+    duration = fields.get("duration_seconds")
+    profile = select_model_profile(duration)
+    estimated_stt = estimate_stt_seconds(duration)
+    return RecordingProbe(
+        usable=True,
+        detail=detail,
+        size_bytes=source.size,
+        model_profile=profile,
+        estimated_stt_seconds=estimated_stt,
+        estimated_completion_seconds=(
+            round(estimated_stt + ANALYSIS_ESTIMATED_SECONDS[profile], 1) if estimated_stt is not None else None
+        ),
+        **fields,
+    )
+
+
+async def probe_recording(
+    http_client: httpx.AsyncClient, recording_url: str, timeout: float = PREFLIGHT_TIMEOUT_SECONDS
+) -> RecordingProbe:
+    """
+    녹음 파일 전체를 받지 않고 Range 요청으로 컨테이너 헤더만 읽어 코덱/길이/채널/샘플레이트를 확인합니다.
+    없는 파일, 빈 파일, 오디오가 아닌 파일, 손상된 헤더, 너무 짧거나 긴 녹음은 usable=False로 거부하고,
+    길이로 STT 완료 시간과 분석 모델 프로필을 정합니다.
+    점검 자체가 실패하면(네트워크 오류, 시간 초과, 지원하지 않는 형식) 분석을 막지 않도록 길이 미확인으로 통과시킵니다.
+    """
+    started = time.perf_counter()
+    with start_span("recording.preflight") as span:
+        try:
+            probe = await asyncio.wait_for(_probe(http_client, recording_url), timeout=timeout)
+        except asyncio.TimeoutError:
+            probe = RecordingProbe(usable=True, detail=f"사전 점검이 {timeout}초 안에 끝나지 않아 길이를 확인하지 않았습니다")
+        probe.probe_ms = round((time.perf_counter() - started) * 1000, 1)
+        if span is not None:
+            span.set_attribute("usable", probe.usable)
+            span.set_attribute("container", probe.container or "unknown")
+
+    result = probe.reason or ("usable" if probe.duration_seconds is not None else "unknown")
+    record_recording_preflight(result, probe.container, probe.probe_ms / 1000)
+    if not probe.usable:
+        logger.warning(f"녹음 파일 거부 ({probe.reason}): {recording_url} - {probe.detail}")
+    elif probe.detail:
+        logger.info(f"녹음 사전 점검 생략: {recording_url} - {probe.detail}")
+    return probe
@@ -1,12 +1,22 @@
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+import uuid
+from functools import partial
+from typing import AsyncIterator, Dict, Any, Optional, Tuple
 from langgraph.graph import StateGraph, END
-from supabase import Client
+from src.config.config import PREFLIGHT_ENABLED
+from src.services.meeting_generator.eager_stt import EagerTranscriber
+from src.utils.analysis_store import AnalysisStore
+from src.utils.clients import ProviderClients
+from src.utils.history_store import MeetingHistoryStore
+from src.utils.micro_batch import MicroBatcher
 from src.utils.schemas import MeetingPipelineState
 from src.utils.performance_logging import generate_performance_report
 from .generate_meeting import (
     retrieve_from_supabase, 
+    preflight_recording,
     process_with_assemblyai, 
+    preview_with_llm,
     analyze_with_llm,
     generate_title_only
 )
@@ -16,24 +26,54 @@ logger = logging.getLogger("meeting_pipeline")
 
 class MeetingPipeline:
     
-    def __init__(self, supabase_client: Client):
-        self.supabase = supabase_client
+    def __init__(
+        self,
+        clients: ProviderClients,
+        history_store: Optional[MeetingHistoryStore] = None,
+        title_batcher: Optional[MicroBatcher] = None,
+        eager_stt: Optional[EagerTranscriber] = None,
+        analysis_store: Optional[AnalysisStore] = None,
+        preflight: bool = PREFLIGHT_ENABLED,
+    ):
+        self.clients = clients
+        self.history_store = history_store
+        self.title_batcher = title_batcher
+        self.eager_stt = eager_stt
+        self.analysis_store = analysis_store
+        self.preflight = preflight
         self.workflow = self._build_graph()
         logger.info("MeetingPipeline 초기화 완료")
     
     def _build_graph(self) -> Any:
         workflow = StateGraph(MeetingPipelineState)
         
-        retrieve_from_supabase._supabase_client = self.supabase
-        
+        # 외부 클라이언트는 모듈 전역 대신 노드에 직접 주입
         workflow.add_node("retrieve", retrieve_from_supabase)
-        workflow.add_node("transcribe", process_with_assemblyai)
-        workflow.add_node("analyze", analyze_with_llm)
-        workflow.add_node("generate_title", generate_title_only)
+        workflow.add_node("transcribe", partial(process_with_assemblyai, clients=self.clients, eager_stt=self.eager_stt))
+        workflow.add_node("generate_preview", partial(preview_with_llm, clients=self.clients))
+        workflow.add_node("analyze", partial(analyze_with_llm, clients=self.clients))
+        workflow.add_node("generate_title", partial(generate_title_only, clients=self.clients, title_batcher=self.title_batcher))
         
         workflow.set_conditional_entry_point(lambda state: "generate_title" if state.get("only_title", False) else "retrieve")
-        workflow.add_edge("retrieve", "transcribe")
-        workflow.add_edge("transcribe", "analyze")
+        if self.preflight:
+            # 녹음 헤더 점검에서 거부(rejected)되면 STT를 등록하지 않고 바로 종료
+            workflow.add_node("preflight", partial(preflight_recording, clients=self.clients))
+            workflow.add_edge("retrieve", "preflight")
+            workflow.add_conditional_edges(
+                "preflight",
+                lambda state: END if state.get("status") in ("rejected", "deadline_exceeded") else "transcribe",
+            )
+        else:
+            workflow.add_edge("retrieve", "transcribe")
+        # 마감 시간 초과로 전사를 중단했으면 분석을 건너뛰고 바로 종료
+        # preview=true이면 빠른 모델로 미리보기를 먼저 만들고, 전체 분석은 미리보기를 힌트로 사용
+        workflow.add_conditional_edges(
+            "transcribe",
+            lambda state: END if state.get("status") == "deadline_exceeded" else (
+                "generate_preview" if state.get("preview") else "analyze"
+            ),
+        )
+        workflow.add_edge("generate_preview", "analyze")
         workflow.add_edge("analyze", END)
         workflow.add_edge("generate_title", END)
         
@@ -48,10 +88,16 @@ class MeetingPipeline:
             "participants_info": kwargs.get("participants_info"),
             "meeting_datetime": kwargs.get("meeting_datetime"),
             "only_title": kwargs.get("only_title", False),
+            "preview": kwargs.get("preview", False),
+            "on_preview": kwargs.get("on_preview"),
+            "deadline": kwargs.get("deadline"),
+            "user_id": kwargs.get("user_id"),
             "file_url": None,
             "file_path": None,
+            "recording_probe": kwargs.get("recording_probe"),
             "transcript": None,
             "speaker_stats_percent": None,
+            "analysis_preview": None,
             "analysis_result": None,
             "errors": [],
             "status": "pending",
@@ -63,9 +109,73 @@ class MeetingPipeline:
         
         result = await self.workflow.ainvoke(initial_state)
         
-        if result.get("status") == "completed":
+        # 마감 시간이 있는 요청은 실패해도 단계별 남은 예산을 리포트로 남김
+        if result.get("status") == "completed" or result.get("deadline") is not None:
             generate_performance_report(result)
         
+        if result.get("status") == "completed" and not result.get("only_title"):
+            meeting_id = kwargs.get("meeting_id") or uuid.uuid4().hex
+            self._store_analysis(result, meeting_id, kwargs.get("user_id"))
+            await self._record_history(result, kwargs.get("member_id") or kwargs.get("user_id"), meeting_id)
+        
         logger.info(f"✅ 파이프라인 실행 완료: {result['status']}")
         
-        return result
\ No newline at end of file
+        return result
+    
+    async def stream(self, recording_url: Optional[str] = None, **kwargs) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        2단계 분석 실행: 미리보기가 생성되면 ("preview", 미리보기)를, 파이프라인이 끝나면 ("done", 실행 결과)를 반환합니다.
+        미리보기를 만들지 못하면 done만 반환하며, 스트림을 중간에 닫으면 파이프라인도 취소합니다.
+        """
+        previews: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(self.run(recording_url, preview=True, on_preview=previews.put, **kwargs))
+        try:
+            while not task.done() or not previews.empty():
+                getter = asyncio.ensure_future(previews.get())
+                await asyncio.wait((getter, task), return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield "preview", getter.result()
+                else:
+                    getter.cancel()
+            yield "done", task.result()
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+    
+    def _store_analysis(self, result: Dict, analysis_id: str, user_id: Optional[str]) -> None:
+        """완료된 분석을 결과 저장소에 백그라운드로 기록하고 조회용 analysis_id를 결과에 추가"""
+        if self.analysis_store is None:
+            return
+        try:
+            stored = self.analysis_store.save_nowait(
+                analysis_id,
+                result.get("analysis_result") or {},
+                transcript=result.get("transcript"),
+                speaker_stats_percent=result.get("speaker_stats_percent"),
+                user_id=user_id,
+                meeting_datetime=result.get("meeting_datetime"),
+            )
+        except ValueError as e:
+            logger.error(f"분석 결과 저장 생략: {e}")
+            return
+        if stored:
+            result["analysis_id"] = analysis_id
+    
+    async def _record_history(self, result: Dict, user_id: Optional[str], meeting_id: str) -> None:
+        """완료된 분석을 미팅 대상 멤버의 1on1 기록에 추가하고 digest를 갱신 (기록 실패는 분석 결과에 영향 없음)"""
+        if self.history_store is None or not user_id:
+            return
+        try:
+            # 기록 저장소에 없는 사용자 ID로는 기록을 만들지 않음 (임의의 ID로 digest가 생기는 것 방지)
+            if await self.history_store.get_user(user_id) is None:
+                logger.warning(f"1on1 기록 생략: 등록되지 않은 사용자 ({user_id})")
+                return
+            await self.history_store.record_analysis(
+                user_id,
+                meeting_id,
+                result.get("analysis_result") or {},
+                result.get("meeting_datetime"),
+            )
+        except Exception as e:
+            logger.error(f"1on1 기록 저장 실패 ({user_id}): {e}")
\ No newline at end of file
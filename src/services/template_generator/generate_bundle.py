@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from src.services.template_generator import generate_email, generate_template, generate_usage_guide
+from src.utils.response_cache import ResponseCache, cached_event_stream
+from src.utils.schemas import EmailGeneratorInput, TemplateGeneratorInput, UsageGuideInput
+from src.utils.similarity_cache import SimilarityCache
+
+logger = logging.getLogger("bundle_generator")
+
+# 각 작업 스트림의 종료 표시
+_FINISHED = object()
+
+
+def to_email_input(input_data: TemplateGeneratorInput) -> EmailGeneratorInput:
+    """템플릿 요청 입력으로 이메일 생성 입력 구성"""
+    return EmailGeneratorInput(
+        user_id=input_data.user_id,
+        target_info=input_data.target_info,
+        purpose=input_data.purpose,
+        detailed_context=input_data.detailed_context,
+        use_previous_data=input_data.use_previous_data,
+        previous_summary=input_data.previous_summary,
+        language=input_data.language or "Korean"  # 사용자 선택 우선, 없으면 기본값
+    )
+
+
+def to_guide_input(input_data: TemplateGeneratorInput, generated_questions: Dict[str, str]) -> UsageGuideInput:
+    """템플릿 요청 입력과 생성된 질문으로 가이드 생성 입력 구성"""
+    return UsageGuideInput(
+        user_id=input_data.user_id,
+        target_info=input_data.target_info,
+        purpose=input_data.purpose,
+        detailed_context=input_data.detailed_context,
+        generated_questions=generated_questions,
+        language=input_data.language or "Korean"  # 사용자 선택 우선, 없으면 기본값
+    )
+
+
+def _template_events(
+    input_data: TemplateGeneratorInput,
+    cache: Optional[ResponseCache],
+    similarity_cache: Optional[SimilarityCache],
+):
+    events, _ = cached_event_stream(
+        cache,
+        generate_template.get_cache_key(input_data),
+        lambda: generate_template.stream_template(input_data),
+        generate_template.replay_template,
+        generate_template.get_similar_lookup(similarity_cache, input_data),
+    )
+    return events
+
+
+def _email_events(email_input: EmailGeneratorInput, cache: Optional[ResponseCache]):
+    events, _ = cached_event_stream(
+        cache,
+        generate_email.get_cache_key(email_input),
+        lambda: generate_email.stream_email(email_input),
+        generate_email.replay_email,
+    )
+    return events
+
+
+def _guide_events(guide_input: UsageGuideInput, cache: Optional[ResponseCache]):
+    # 단독 가이드 요청은 SSE 문자열을 캐시하므로, 이벤트 형태의 결과는 별도 키에 저장
+    events, _ = cached_event_stream(
+        cache,
+        f"{generate_usage_guide.get_cache_key(guide_input)}:events",
+        lambda: generate_usage_guide.stream_usage_guide(guide_input),
+        generate_usage_guide.replay_usage_guide,
+    )
+    return events
+
+
+async def stream_bundle(
+    input_data: TemplateGeneratorInput,
+    cache: Optional[ResponseCache] = None,
+    similarity_cache: Optional[SimilarityCache] = None,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    템플릿, 이메일, 활용 가이드를 한 번에 생성하여 하나의 이벤트 스트림으로 내보냅니다.
+
+    이메일은 질문과 무관하므로 템플릿과 동시에 시작하고, 가이드는 질문이 완성되는 즉시 시작합니다.
+    전체 소요 시간은 max(이메일, 템플릿 + 가이드)가 됩니다.
+    이벤트 이름은 "<작업>.<이벤트>" 형식이며(예: template.question, email.paragraph, guide.chunk),
+    작업 하나가 실패해도 나머지는 계속 진행하고 "<작업>.error"를 보냅니다.
+    마지막 "done" 이벤트에는 모든 결과를 모아 보냅니다.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    result: Dict[str, Any] = {"generated_questions": None, "generated_email": None, "usage_guide": None}
+    started = time.perf_counter()
+
+    async def pump(name: str, events: AsyncIterator[Tuple[str, Any]]) -> Any:
+        """작업 이벤트를 큐로 전달하고 done 이벤트의 데이터를 반환"""
+        final = None
+        try:
+            async for event, data in events:
+                if event == "done":
+                    final = data
+                await queue.put((f"{name}.{event}", data))
+        except Exception as e:
+            logger.error(f"Error during bundle {name} generation: {e}")
+            await queue.put((f"{name}.error", {"error": f"Error during stream generation: {e}"}))
+        return final
+
+    async def template_then_guide() -> None:
+        try:
+            template = await pump("template", _template_events(input_data, cache, similarity_cache))
+            if template is None:
+                return
+            result["generated_questions"] = template.generated_questions
+            guide_input = to_guide_input(input_data, template.generated_questions)
+            guide = await pump("guide", _guide_events(guide_input, cache))
+            if guide is not None:
+                result["usage_guide"] = guide["usage_guide"]
+        finally:
+            await queue.put(_FINISHED)
+
+    async def email() -> None:
+        try:
+            output = await pump("email", _email_events(to_email_input(input_data), cache))
+            if output is not None:
+                result["generated_email"] = output.generated_email
+        finally:
+            await queue.put(_FINISHED)
+
+    tasks = [asyncio.create_task(template_then_guide()), asyncio.create_task(email())]
+    try:
+        running = len(tasks)
+        while running:
+            item = await queue.get()
+            if item is _FINISHED:
+                running -= 1
+                continue
+            yield item
+        yield "done", {**result, "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)}
+    finally:
+        # 클라이언트 연결이 끊겨 스트림이 중간에 닫히면 남은 생성 작업도 취소
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
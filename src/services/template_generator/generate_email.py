@@ -1,10 +1,19 @@
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 
-from src.prompts.template_generation.email_prompts import HUMAN_PROMPT, SYSTEM_PROMPT
+from src.prompts.template_generation.email_prompts import (
+    BATCH_HUMAN_PROMPT,
+    BATCH_REQUEST_SECTION,
+    HUMAN_PROMPT,
+    SYSTEM_PROMPT,
+)
+from src.utils.micro_batch import MicroBatcher
 from src.utils.model import llm
+from src.utils.response_cache import make_cache_key, prompt_fingerprint
 from src.utils.schemas import EmailGeneratorInput, EmailGeneratorOutput
-from src.utils.utils import get_user_data_by_id
+from src.utils.streaming import IncrementalJsonParser, ParagraphBuffer
 
 def get_email_generator_chain():
     """
@@ -19,23 +28,26 @@ def get_email_generator_chain():
     chain = prompt | llm | parser
     return chain
 
-async def generate_email(input_data: EmailGeneratorInput) -> EmailGeneratorOutput:
-    """
-    입력 데이터를 기반으로 1on1 템플릿 요약을 비동기적으로 생성합니다.
-    """
-    chain = get_email_generator_chain()
+def get_email_streaming_chain():
+    """스트리밍용 체인. 문단 단위로 내보내기 위해 JsonOutputParser 대신 증분 파서를 사용합니다."""
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_PROMPT),
+        ("human", HUMAN_PROMPT)
+    ])
+    return prompt | llm
 
-    user_data = get_user_data_by_id(input_data.user_id)
-    if not user_data:
-        raise ValueError(f"User with ID '{input_data.user_id}' not found.")
+# 프롬프트가 바뀌면 응답 캐시 키도 달라지도록 프롬프트 원문 해시를 버전으로 사용
+PROMPT_VERSION = prompt_fingerprint(SYSTEM_PROMPT, HUMAN_PROMPT)
 
+def build_prompt_variables(input_data: EmailGeneratorInput) -> Dict[str, Any]:
+    """이메일 프롬프트 변수 구성"""
     # '지난 기록 활용하기'가 선택되었을 경우, 이전 미팅 내용을 프롬프트에 추가
     # use_previous_data가 True이고 previous_summary가 있을 때만 사용
     previous_summary_section = ""
     if input_data.use_previous_data and input_data.previous_summary:
         previous_summary_section = input_data.previous_summary
 
-    prompt_variables = {
+    return {
         # 스키마에서 필수값과 기본값이 이미 설정되어 있어서 직접 사용
         "target_info": input_data.target_info,
         "purpose": input_data.purpose,
@@ -44,5 +56,80 @@ async def generate_email(input_data: EmailGeneratorInput) -> EmailGeneratorOutpu
         "language": input_data.language,
     }
 
+def get_cache_key(input_data: EmailGeneratorInput) -> str:
+    """응답 캐시 키 (정규화된 프롬프트 입력 + 모델 설정 + 프롬프트 버전)"""
+    return make_cache_key("email", input_data.user_id, build_prompt_variables(input_data), llm, PROMPT_VERSION)
+
+async def generate_email(input_data: EmailGeneratorInput) -> EmailGeneratorOutput:
+    """
+    입력 데이터를 기반으로 1on1 템플릿 요약을 비동기적으로 생성합니다.
+    """
+    chain = get_email_generator_chain()
+
+    prompt_variables = build_prompt_variables(input_data)
+
     response = await chain.ainvoke(prompt_variables)
     return EmailGeneratorOutput(**response)
+
+async def generate_emails_batch(inputs: List[EmailGeneratorInput]) -> List[Optional[EmailGeneratorOutput]]:
+    """
+    같은 언어의 이메일 여러 개를 LLM 호출 1회로 생성합니다 (micro-batching).
+    응답에서 빠졌거나 형식이 잘못된 요청은 None으로 반환하여 개별 호출로 다시 생성하도록 합니다.
+    """
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_PROMPT),
+        ("human", BATCH_HUMAN_PROMPT)
+    ])
+    requests = "".join(
+        BATCH_REQUEST_SECTION.format(index=index, **build_prompt_variables(input_data))
+        for index, input_data in enumerate(inputs, start=1)
+    )
+    emails = await (prompt | llm | JsonOutputParser()).ainvoke({"requests": requests, "language": inputs[0].language})
+    if not isinstance(emails, dict):
+        return [None] * len(inputs)
+    return [
+        EmailGeneratorOutput(generated_email=email) if isinstance(email, str) and email.strip() else None
+        for email in (emails.get(str(index)) for index in range(1, len(inputs) + 1))
+    ]
+
+def email_batch_key(input_data: EmailGeneratorInput) -> Tuple[str, Optional[str]]:
+    """다른 사용자의 요청 내용이 한 프롬프트에 섞이지 않도록 같은 사용자, 같은 언어의 요청끼리만 묶음"""
+    return input_data.user_id, input_data.language
+
+def create_email_batcher() -> MicroBatcher:
+    """동시에 들어온 비스트리밍 이메일 요청을 사용자/언어별로 묶어 처리하는 결합기 (워커 단위로 한 번 생성)"""
+    return MicroBatcher(
+        "email",
+        run_batch=generate_emails_batch,
+        run_single=generate_email,
+        key=email_batch_key,
+    )
+
+async def stream_email(input_data: EmailGeneratorInput) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    이메일을 스트리밍으로 생성합니다.
+    본문 문자열에서 빈 줄로 구분된 문단이 완성될 때마다 ("paragraph", {"index", "text"})를,
+    마지막에 ("done", EmailGeneratorOutput)을 내보냅니다.
+    """
+    parser = IncrementalJsonParser()
+    paragraphs = ParagraphBuffer()
+    index = 0
+    async for chunk in get_email_streaming_chain().astream(build_prompt_variables(input_data)):
+        if not chunk.content:
+            continue
+        for event in parser.feed(chunk.content):
+            if event.key != "generated_email":
+                continue
+            completed = paragraphs.feed(event.value) if event.kind == "delta" else paragraphs.flush()
+            for text in completed:
+                yield "paragraph", {"index": index, "text": text}
+                index += 1
+
+    yield "done", EmailGeneratorOutput(**parser.result)
+
+def replay_email(output: EmailGeneratorOutput) -> Iterator[Tuple[str, Any]]:
+    """캐시된 결과를 스트리밍과 같은 이벤트 순서로 재구성"""
+    paragraphs = ParagraphBuffer()
+    for index, text in enumerate(paragraphs.feed(output.generated_email) + paragraphs.flush()):
+        yield "paragraph", {"index": index, "text": text}
+    yield "done", output
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+from src.config.config import TEAM_TEMPLATE_CONCURRENCY, TEAM_TEMPLATE_PACK_MAX_CHARS, TEAM_TEMPLATE_PACK_SIZE
+from src.prompts.template_generation.template_prompts import PACKED_HUMAN_PROMPT, PACKED_MEMBER_SECTION, SYSTEM_PROMPT
+from src.services.template_generator import generate_template
+from src.utils.metrics import record_cache_lookup
+from src.utils.model import llm
+from src.utils.response_cache import (
+    CACHE_BYPASS, CACHE_HIT, CACHE_MISS, ResponseCache, cached_call, make_cache_key, prompt_fingerprint,
+)
+from src.utils.schemas import TeamMemberInput, TeamTemplateInput, TemplateGeneratorInput, TemplateGeneratorOutput
+from src.utils.similarity_cache import SimilarityCache
+
+logger = logging.getLogger("team_template_generator")
+
+# 각 작업의 종료 표시
+_FINISHED = object()
+
+
+def get_packed_chain():
+    """여러 팀원의 질문을 한 번에 생성하는 체인 (시스템 프롬프트는 단일 템플릿 생성과 공유)"""
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_PROMPT),
+        ("human", PACKED_HUMAN_PROMPT)
+    ])
+    return prompt | llm | JsonOutputParser()
+
+packed_chain = get_packed_chain()
+
+# packed 생성 결과는 단일 생성과 프롬프트가 다르므로 packed 프롬프트 해시를 버전으로 별도 키에 캐시
+PACKED_PROMPT_VERSION = prompt_fingerprint(SYSTEM_PROMPT, PACKED_HUMAN_PROMPT)
+
+
+def to_member_input(team_input: TeamTemplateInput, member: TeamMemberInput) -> TemplateGeneratorInput:
+    """공통 설정과 팀원별 입력으로 단일 템플릿 생성 입력 구성 (응답 캐시 키도 단일 요청과 같음)"""
+    return TemplateGeneratorInput(
+        user_id=member.user_id or team_input.user_id,
+        target_info=member.target_info,
+        purpose=team_input.purpose,
+        detailed_context=member.detailed_context,
+        num_questions=team_input.num_questions,
+        question_composition=team_input.question_composition,
+        tone_and_manner=team_input.tone_and_manner,
+        language=team_input.language,
+        use_previous_data=team_input.use_previous_data,
+        previous_summary=member.previous_summary,
+    )
+
+
+def get_packed_cache_key(input_data: TemplateGeneratorInput) -> str:
+    """packed 모드로 생성한 팀원 결과의 응답 캐시 키 (단일 요청 키와 프롬프트 버전만 다름)"""
+    return make_cache_key(
+        "template", input_data.user_id, generate_template.build_prompt_variables(input_data), llm, PACKED_PROMPT_VERSION
+    )
+
+
+def _is_small(input_data: TemplateGeneratorInput) -> bool:
+    prompt_variables = generate_template.build_prompt_variables(input_data)
+    size = len(prompt_variables["detailed_context"]) + len(prompt_variables["previous_summary_section"])
+    return size <= TEAM_TEMPLATE_PACK_MAX_CHARS
+
+
+def plan_packs(inputs: List[TemplateGeneratorInput], pack_size: int = TEAM_TEMPLATE_PACK_SIZE) -> List[List[int]]:
+    """
+    LLM 호출 단위로 팀원 인덱스를 묶음. 입력이 짧은 팀원만 pack_size명씩 묶고,
+    긴 입력은 한 호출에 몰리면 품질이 떨어지므로 단독으로 생성합니다.
+    """
+    small = [index for index, input_data in enumerate(inputs) if _is_small(input_data)]
+    packs = [small[start:start + pack_size] for start in range(0, len(small), pack_size)]
+    packs += [[index] for index, input_data in enumerate(inputs) if not _is_small(input_data)]
+    return sorted(packs, key=lambda pack: pack[0])
+
+
+def build_packed_variables(inputs: List[TemplateGeneratorInput]) -> Dict[str, Any]:
+    """packed 프롬프트 변수 구성 (공통 설정은 첫 입력 기준, 팀원 번호는 1부터)"""
+    shared = generate_template.build_prompt_variables(inputs[0])
+    members = "".join(
+        PACKED_MEMBER_SECTION.format(index=position, **generate_template.build_prompt_variables(input_data))
+        for position, input_data in enumerate(inputs, start=1)
+    )
+    return {
+        "members": members,
+        "purpose": shared["purpose"],
+        "num_questions": shared["num_questions"],
+        "question_composition": shared["question_composition"],
+        "tone_and_manner": shared["tone_and_manner"],
+        "language": shared["language"],
+    }
+
+
+async def generate_packed(inputs: List[TemplateGeneratorInput]) -> List[Optional[TemplateGeneratorOutput]]:
+    """
+    팀원 여러 명의 질문을 LLM 호출 1회로 생성합니다.
+    응답에서 빠졌거나 형식이 잘못된 팀원은 None으로 반환하여 호출 측에서 단독 생성하도록 합니다.
+    """
+    generated = await packed_chain.ainvoke(build_packed_variables(inputs))
+    outputs: List[Optional[TemplateGeneratorOutput]] = []
+    for position in range(1, len(inputs) + 1):
+        questions = generated.get(str(position)) if isinstance(generated, dict) else None
+        valid = isinstance(questions, dict) and questions and all(isinstance(q, str) for q in questions.values())
+        outputs.append(TemplateGeneratorOutput(generated_questions=questions) if valid else None)
+    return outputs
+
+
+async def stream_team_templates(
+    team_input: TeamTemplateInput,
+    inputs: List[TemplateGeneratorInput],
+    cache: Optional[ResponseCache] = None,
+    similarity_cache: Optional[SimilarityCache] = None,
+    concurrency: int = TEAM_TEMPLATE_CONCURRENCY,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    팀원별 템플릿을 제한된 동시성으로 생성하고 완료되는 순서대로 내보냅니다.
+
+    - ("member", {"index", "target_info", "generated_questions", "cache_status"}): 팀원 한 명 완료
+    - ("member.error", {"index", "target_info", "error"}): 팀원 한 명 실패 (나머지는 계속 진행)
+    - ("done", {"completed", "failed", "llm_calls", "elapsed_ms"}): 전체 종료
+    inputs는 members와 같은 순서의 단일 템플릿 생성 입력(to_member_input, 지난 기록 반영 후)입니다.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {"completed": 0, "failed": 0, "llm_calls": 0}
+    started = time.perf_counter()
+
+    async def emit(index: int, output: Optional[TemplateGeneratorOutput], cache_status: str, error: Optional[str] = None):
+        target_info = inputs[index].target_info
+        if output is None:
+            stats["failed"] += 1
+            await queue.put(("member.error", {"index": index, "target_info": target_info, "error": error}))
+        else:
+            stats["completed"] += 1
+            await queue.put((
+                "member",
+                {
+                    "index": index,
+                    "target_info": target_info,
+                    "generated_questions": output.generated_questions,
+                    "cache_status": cache_status,
+                },
+            ))
+
+    async def produce_one(input_data: TemplateGeneratorInput) -> TemplateGeneratorOutput:
+        async with semaphore:
+            stats["llm_calls"] += 1
+            return await generate_template.generate_template(input_data)
+
+    async def single(index: int) -> None:
+        input_data = inputs[index]
+        try:
+            output, cache_status = await cached_call(
+                cache,
+                generate_template.get_cache_key(input_data),
+                lambda: produce_one(input_data),
+                generate_template.get_similar_lookup(similarity_cache, input_data),
+            )
+            await emit(index, output, cache_status)
+        except Exception as e:
+            logger.error(f"Error during team template generation (member {index}): {e}")
+            await emit(index, None, CACHE_BYPASS, f"Error during template generation: {e}")
+
+    async def packed(indexes: List[int]) -> None:
+        # 캐시에 있는 팀원(단일/packed 생성 결과)은 바로 내보내고 나머지만 묶어서 생성
+        pending = []
+        for index in indexes:
+            value = None
+            if cache is not None:
+                value = cache.get(generate_template.get_cache_key(inputs[index]))
+                if value is None:
+                    value = cache.get(get_packed_cache_key(inputs[index]))
+                record_cache_lookup("response_template", hit=value is not None)
+            if value is not None:
+                await emit(index, value, CACHE_HIT)
+            else:
+                pending.append(index)
+        if len(pending) < 2:
+            await asyncio.gather(*(single(index) for index in pending))
+            return
+
+        try:
+            async with semaphore:
+                stats["llm_calls"] += 1
+                outputs = await generate_packed([inputs[index] for index in pending])
+        except Exception as e:
+            logger.warning(f"Packed team template generation failed, falling back to single calls: {e}")
+            outputs = [None] * len(pending)
+
+        fallback = []
+        for index, output in zip(pending, outputs):
+            if output is None:
+                fallback.append(index)
+                continue
+            if cache is not None:
+                cache.put(get_packed_cache_key(inputs[index]), output)
+            await emit(index, output, CACHE_MISS if cache is not None else CACHE_BYPASS)
+        await asyncio.gather(*(single(index) for index in fallback))
+
+    async def run(job) -> None:
+        try:
+            await job
+        finally:
+            await queue.put(_FINISHED)
+
+    if team_input.packed:
+        jobs = [packed(pack) if len(pack) > 1 else single(pack[0]) for pack in plan_packs(inputs)]
+    else:
+        jobs = [single(index) for index in range(len(inputs))]
+    tasks = [asyncio.create_task(run(job)) for job in jobs]
+    try:
+        running = len(tasks)
+        while running:
+            item = await queue.get()
+            if item is _FINISHED:
+                running -= 1
+                continue
+            yield item
+        yield "done", {**stats, "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)}
+    finally:
+        # 클라이언트 연결이 끊겨 스트림이 중간에 닫히면 남은 생성 작업도 취소
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
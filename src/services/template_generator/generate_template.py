@@ -1,12 +1,15 @@
 import logging
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 
 from src.prompts.template_generation.template_prompts import HUMAN_PROMPT, SYSTEM_PROMPT
 from src.utils.model import llm
+from src.utils.response_cache import make_cache_key, prompt_fingerprint
 from src.utils.schemas import TemplateGeneratorInput, TemplateGeneratorOutput
-from src.utils.utils import get_user_data_by_id
+from src.utils.similarity_cache import SimilarityCache, SimilarLookup
+from src.utils.streaming import IncrementalJsonParser
 
 logger = logging.getLogger("template_generator")
 
@@ -20,20 +23,24 @@ def get_chain():
 
 chain = get_chain()
 
-async def generate_template(input_data: TemplateGeneratorInput) -> TemplateGeneratorOutput:
-    """
-    사용자 입력을 기반으로 1on1 템플릿 질문을 생성합니다.
-    옵션에 따라 활용 가이드도 이어서 생성합니다.
-    """
-    user_data = get_user_data_by_id(input_data.user_id)
-    if not user_data:
-        raise ValueError(f"User with ID '{input_data.user_id}' not found.")
+def get_streaming_chain():
+    """스트리밍용 체인. 질문 단위로 내보내기 위해 JsonOutputParser 대신 증분 파서를 사용합니다."""
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_PROMPT),
+        ("human", HUMAN_PROMPT)
+    ])
+    return prompt | llm
+
+# 프롬프트가 바뀌면 응답 캐시 키도 달라지도록 프롬프트 원문 해시를 버전으로 사용
+PROMPT_VERSION = prompt_fingerprint(SYSTEM_PROMPT, HUMAN_PROMPT)
 
+def build_prompt_variables(input_data: TemplateGeneratorInput) -> Dict[str, Any]:
+    """템플릿 프롬프트 변수 구성"""
     previous_summary_section = ""
     if input_data.use_previous_data and input_data.previous_summary:
         previous_summary_section = input_data.previous_summary
 
-    prompt_variables = {
+    return {
         "target_info": input_data.target_info,
         "purpose": input_data.purpose,
         "detailed_context": input_data.detailed_context,
@@ -44,6 +51,46 @@ async def generate_template(input_data: TemplateGeneratorInput) -> TemplateGener
         "language": input_data.language
     }
 
+def get_cache_key(input_data: TemplateGeneratorInput) -> str:
+    """응답 캐시 키 (정규화된 프롬프트 입력 + 모델 설정 + 프롬프트 버전)"""
+    return make_cache_key("template", input_data.user_id, build_prompt_variables(input_data), llm, PROMPT_VERSION)
+
+def _split_values(values: str) -> List[str]:
+    """쉼표로 구분된 선택 값의 순서/공백/대소문자 차이 제거"""
+    return sorted({value.strip().lower() for value in values.split(",") if value.strip()})
+
+def get_similar_lookup(cache: Optional[SimilarityCache], input_data: TemplateGeneratorInput) -> Optional[SimilarLookup]:
+    """
+    유사 요청 캐시 조회 객체. 선택형 입력(대상자, purpose/question_composition 값 집합, 질문 수, 어조, 언어)은
+    정확히 같아야 하고, 자유 서술인 detailed_context와 이전 기록 요약만 유사도로 비교합니다.
+    """
+    if cache is None:
+        return None
+    prompt_variables = build_prompt_variables(input_data)
+    partition = make_cache_key(
+        "template",
+        input_data.user_id,
+        {
+            "target_info": input_data.target_info,
+            "purpose": _split_values(input_data.purpose),
+            "num_questions": input_data.num_questions,
+            "question_composition": _split_values(input_data.question_composition),
+            "tone_and_manner": input_data.tone_and_manner,
+            "language": input_data.language,
+        },
+        llm,
+        PROMPT_VERSION,
+    )
+    text = f"{prompt_variables['detailed_context']}\n{prompt_variables['previous_summary_section']}"
+    return cache.bind(partition, text)
+
+async def generate_template(input_data: TemplateGeneratorInput) -> TemplateGeneratorOutput:
+    """
+    사용자 입력을 기반으로 1on1 템플릿 질문을 생성합니다.
+    옵션에 따라 활용 가이드도 이어서 생성합니다.
+    """
+    prompt_variables = build_prompt_variables(input_data)
+
     try:
         # 1. 템플릿 질문 생성
         generated_questions = await chain.ainvoke(prompt_variables)
@@ -51,9 +98,34 @@ async def generate_template(input_data: TemplateGeneratorInput) -> TemplateGener
             raise ValueError("Failed to generate questions.")
 
         # API 계약에 따라 순수한 질문 딕셔너리만 반환합니다.
-        # 가이드 생성은 'guide' generation_type으로 분리되어 처리됩니다.
+        # 가이드는 'guide' generation_type으로 분리되어 처리되며,
+        # include_guide=true이면 엔드포인트에서 가이드 사전 생성을 시작합니다 (guide_speculation.py).
         return TemplateGeneratorOutput(generated_questions=generated_questions)
 
     except Exception as e:
         logger.error(f"Error during template generation: {e}")
         raise
+
+async def stream_template(input_data: TemplateGeneratorInput) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    템플릿 질문을 스트리밍으로 생성합니다.
+    각 질문의 JSON 값이 완성되는 즉시 ("question", {"key", "question"})를,
+    마지막에 ("done", TemplateGeneratorOutput)을 내보냅니다.
+    """
+    parser = IncrementalJsonParser()
+    async for chunk in get_streaming_chain().astream(build_prompt_variables(input_data)):
+        if not chunk.content:
+            continue
+        for event in parser.feed(chunk.content):
+            if event.kind == "value":
+                yield "question", {"key": event.key, "question": event.value}
+
+    if not parser.result:
+        raise ValueError("Failed to generate questions.")
+    yield "done", TemplateGeneratorOutput(generated_questions=parser.result)
+
+def replay_template(output: TemplateGeneratorOutput) -> Iterator[Tuple[str, Any]]:
+    """캐시된 결과를 스트리밍과 같은 이벤트 순서로 재구성"""
+    for key, question in output.generated_questions.items():
+        yield "question", {"key": key, "question": question}
+    yield "done", output
@@ -1,11 +1,12 @@
 import logging
 import json
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Iterator, Tuple
 
 from langchain_core.prompts import ChatPromptTemplate
 
 from src.prompts.template_generation.guide_prompts import HUMAN_PROMPT, SYSTEM_PROMPT
 from src.utils.model import llm
+from src.utils.response_cache import make_cache_key, prompt_fingerprint
 from src.utils.schemas import UsageGuideInput
 
 
@@ -23,13 +24,13 @@ def get_usage_guide_chain():
     return prompt | llm
 
 
-async def generate_usage_guide(guide_input: UsageGuideInput) -> AsyncGenerator[str, None]:
-    """
-    입력 데이터를 기반으로 활용 가이드를 스트리밍으로 생성합니다.
-    """
-    chain = get_usage_guide_chain()
-    
-    prompt_variables = {
+# 프롬프트가 바뀌면 응답 캐시 키도 달라지도록 프롬프트 원문 해시를 버전으로 사용
+PROMPT_VERSION = prompt_fingerprint(SYSTEM_PROMPT, HUMAN_PROMPT)
+
+
+def build_prompt_variables(guide_input: UsageGuideInput) -> Dict[str, Any]:
+    """가이드 프롬프트 변수 구성"""
+    return {
         "target_info": guide_input.target_info,
         "purpose": guide_input.purpose,
         "detailed_context": guide_input.detailed_context,
@@ -38,15 +39,52 @@ async def generate_usage_guide(guide_input: UsageGuideInput) -> AsyncGenerator[s
         ),
         "language": guide_input.language
     }
-    
+
+
+def get_cache_key(guide_input: UsageGuideInput) -> str:
+    """응답 캐시 키 (정규화된 프롬프트 입력 + 모델 설정 + 프롬프트 버전)"""
+    return make_cache_key("guide", guide_input.user_id, build_prompt_variables(guide_input), llm, PROMPT_VERSION)
+
+
+def is_error_event(event: str) -> bool:
+    """오류 이벤트 여부 (본문 청크는 JSON 문자열, 오류는 JSON 객체로 전송)"""
+    return event.startswith("data: {")
+
+
+async def stream_usage_guide(guide_input: UsageGuideInput) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    활용 가이드를 ("chunk", 텍스트 조각) 이벤트로 스트리밍하고, 마지막에 ("done", {"usage_guide": 전체 텍스트})를 내보냅니다.
+    """
+    chain = get_usage_guide_chain()
+
+    prompt_variables = build_prompt_variables(guide_input)
+
+    parts = []
+    async for chunk in chain.astream(prompt_variables):
+        if chunk.content:
+            parts.append(chunk.content)
+            yield "chunk", chunk.content
+    yield "done", {"usage_guide": "".join(parts)}
+
+
+async def generate_usage_guide(guide_input: UsageGuideInput) -> AsyncGenerator[str, None]:
+    """
+    입력 데이터를 기반으로 활용 가이드를 스트리밍으로 생성합니다.
+    """
     try:
-        async for chunk in chain.astream(prompt_variables):
-            if chunk.content:
+        async for event, content in stream_usage_guide(guide_input):
+            if event == "chunk":
                 # 각 청크의 내용을 SSE 형식으로 포장하여 스트리밍
                 # ensure_ascii=False로 한글이 제대로 표시되도록 설정
-                yield f"data: {json.dumps(chunk.content, ensure_ascii=False)}\n\n"
+                yield f"data: {json.dumps(content, ensure_ascii=False)}\n\n"
     except Exception as e:
         error_message = f"Error during stream generation: {e}"
         logging.error(error_message)
         # 클라이언트에 오류 메시지 전달
-        yield f"data: {json.dumps({'error': error_message}, ensure_ascii=False)}\n\n"
\ No newline at end of file
+        yield f"data: {json.dumps({'error': error_message}, ensure_ascii=False)}\n\n"
+
+
+def replay_usage_guide(result: Dict[str, str]) -> Iterator[Tuple[str, Any]]:
+    """캐시된 가이드를 스트리밍과 같은 이벤트 순서로 재구성 (본문은 한 번에 전송)"""
+    yield "chunk", result["usage_guide"]
+    yield "done", result
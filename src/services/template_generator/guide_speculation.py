@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from contextlib import nullcontext
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+from src.config.config import GUIDE_SPECULATION_MAX_ENTRIES, GUIDE_SPECULATION_TTL_SECONDS
+from src.services.template_generator.generate_bundle import to_guide_input
+from src.services.template_generator.generate_usage_guide import (
+    generate_usage_guide,
+    get_cache_key,
+    is_error_event,
+)
+from src.utils.cost_ledger import CostLedger
+from src.utils.metrics import record_cache_lookup, record_guide_speculation
+from src.utils.schemas import TemplateGeneratorInput, UsageGuideInput
+
+logger = logging.getLogger("guide_speculation")
+
+
+class _Speculation:
+    """사전 생성 중이거나 완료된 가이드 스트림 (생성된 SSE 이벤트를 버퍼에 보관)"""
+
+    def __init__(self) -> None:
+        self.events: List[str] = []
+        self.finished = False
+        self.changed = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.expiry: Optional[asyncio.TimerHandle] = None
+
+
+class GuideSpeculator:
+    """
+    include_guide=true 템플릿 요청의 질문이 나오는 즉시 가이드를 백그라운드에서 미리 생성합니다.
+    결과는 가이드 입력(질문 목록 포함)의 해시로 보관하며, 이어지는 guide 요청은 새 LLM 호출 대신
+    버퍼에 쌓인 이벤트부터 바로 받습니다. TTL 안에 사용되지 않은 사전 생성은 취소합니다.
+    워커 프로세스 단위이므로 다른 워커로 간 guide 요청은 평소처럼 새로 생성합니다.
+    """
+
+    def __init__(
+        self,
+        cost_ledger: Optional[CostLedger] = None,
+        ttl_seconds: float = GUIDE_SPECULATION_TTL_SECONDS,
+        max_entries: int = GUIDE_SPECULATION_MAX_ENTRIES,
+    ) -> None:
+        self.cost_ledger = cost_ledger
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Speculation]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def start(self, guide_input: UsageGuideInput) -> None:
+        """가이드 사전 생성 시작 (같은 입력이 이미 진행 중이면 무시)"""
+        key = get_cache_key(guide_input)
+        if key in self._entries:
+            return
+
+        speculation = _Speculation()
+        self._entries[key] = speculation
+        speculation.task = asyncio.create_task(self._run(speculation, guide_input))
+        speculation.expiry = asyncio.get_running_loop().call_later(self.ttl_seconds, self._discard, key, "expired")
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)), "evicted")
+
+    def claim(self, guide_input: UsageGuideInput) -> Optional[AsyncIterator[str]]:
+        """사전 생성된 가이드 스트림을 가져감 (한 번만 사용 가능). 없으면 None"""
+        speculation = self._entries.pop(get_cache_key(guide_input), None)
+        if speculation is not None:
+            speculation.expiry.cancel()
+            # 사전 생성이 오류로 끝났으면 새로 생성하도록 미스 처리
+            if speculation.finished and speculation.events and is_error_event(speculation.events[-1]):
+                speculation = None
+        record_cache_lookup("guide_speculation", hit=speculation is not None)
+        if speculation is None:
+            return None
+        record_guide_speculation("used")
+        return self._follow(speculation)
+
+    async def aclose(self) -> None:
+        for key in list(self._entries):
+            self._discard(key, "expired")
+
+    def _discard(self, key: str, reason: str) -> None:
+        speculation = self._entries.pop(key, None)
+        if speculation is None:
+            return
+        speculation.expiry.cancel()
+        if not speculation.finished:
+            speculation.task.cancel()
+        record_guide_speculation(reason)
+        logger.debug(f"Guide speculation {reason}: {key}")
+
+    async def _run(self, speculation: _Speculation, guide_input: UsageGuideInput) -> None:
+        # 사전 생성 비용은 템플릿 요청과 분리해 별도 엔드포인트로 원장에 기록 (사용되지 않은 비용 추적)
+        tracking = (
+            self.cost_ledger.track("template:guide_speculative", guide_input.user_id)
+            if self.cost_ledger else nullcontext()
+        )
+        try:
+            with tracking:
+                async for event in generate_usage_guide(guide_input):
+                    speculation.events.append(event)
+                    speculation.changed.set()
+        finally:
+            speculation.finished = True
+            speculation.changed.set()
+
+    async def _follow(self, speculation: _Speculation) -> AsyncIterator[str]:
+        """버퍼에 쌓인 이벤트를 먼저 보내고, 생성이 진행 중이면 새 이벤트를 이어서 전달"""
+        sent = 0
+        try:
+            while True:
+                while sent < len(speculation.events):
+                    yield speculation.events[sent]
+                    sent += 1
+                if speculation.finished:
+                    return
+                speculation.changed.clear()
+                await speculation.changed.wait()
+        finally:
+            # 가이드를 받던 클라이언트가 연결을 끊으면 남은 생성도 취소
+            if not speculation.finished:
+                speculation.task.cancel()
+
+
+async def speculate_guide(
+    events: AsyncIterator[Tuple[str, Any]],
+    speculator: GuideSpeculator,
+    input_data: TemplateGeneratorInput,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """템플릿 이벤트 스트림을 그대로 전달하면서 질문이 완성되는(done) 즉시 가이드 사전 생성 시작"""
+    async for event, data in events:
+        if event == "done":
+            speculator.start(to_guide_input(input_data, data.generated_questions))
+        yield event, data
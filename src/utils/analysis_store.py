@@ -0,0 +1,178 @@
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+import re
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from src.config.config import ANALYSIS_STORE_COMPRESS_LEVEL, ANALYSIS_STORE_MAX_PENDING
+from src.utils.metrics import record_analysis_store_write
+from src.utils.serialization import dumps, loads
+
+logger = logging.getLogger("analysis_store")
+
+# 파일 경로로 쓰이므로 영숫자/-/_만 허용 (작업 ID, uuid hex)
+_ANALYSIS_ID = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+
+def is_valid_analysis_id(analysis_id: str) -> bool:
+    return bool(_ANALYSIS_ID.match(analysis_id))
+
+
+def serialize_record(record: Dict[str, Any]) -> bytes:
+    """공백 없는 UTF-8 JSON (ETag는 이 바이트열 기준)"""
+    return dumps(record)
+
+
+def make_etag(body: bytes, variant: Optional[str] = None) -> str:
+    """본문 해시 기반 강한 ETag. 같은 결과의 다른 표현(필드 선택)은 variant로 구분"""
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    if variant:
+        digest += "-" + hashlib.sha256(variant.encode("utf-8")).hexdigest()[:8]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더(쉼표로 구분한 여러 값, W/ 약한 비교, *)가 etag와 일치하는지"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+class AnalysisStore:
+    """
+    완료된 분석 결과(analysis_result, 전사, 화자 비율)를 분석 ID별 gzip JSON 파일로 보관하는 저장소.
+    save_nowait는 기록을 큐에 넣기만 하고 응답을 지연시키지 않으며, 백그라운드 writer 태스크가 하나씩
+    직렬화/압축해 임시 파일에 쓴 뒤 os.replace로 교체합니다 (읽는 쪽은 항상 완전한 파일만 봄).
+    디렉터리를 공유하면 다른 워커가 저장한 결과도 조회할 수 있고, 기록 전인 결과는 같은 워커에서 메모리로 응답합니다.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        compress_level: int = ANALYSIS_STORE_COMPRESS_LEVEL,
+        max_pending: int = ANALYSIS_STORE_MAX_PENDING,
+    ) -> None:
+        self.directory = directory
+        self.compress_level = compress_level
+        self.max_pending = max_pending
+        os.makedirs(directory, exist_ok=True)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._writer: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _path(self, analysis_id: str) -> str:
+        # 한 디렉터리에 파일이 너무 많아지지 않도록 ID 앞 2글자로 분산
+        return os.path.join(self.directory, analysis_id[:2], f"{analysis_id}.json.gz")
+
+    def save_nowait(
+        self,
+        analysis_id: str,
+        analysis_result: Dict[str, Any],
+        transcript: Optional[Dict[str, Any]] = None,
+        speaker_stats_percent: Optional[Dict[str, float]] = None,
+        user_id: Optional[str] = None,
+        meeting_datetime: Optional[str] = None,
+    ) -> bool:
+        """분석 결과를 백그라운드 기록 큐에 추가 (기록 대기가 가득 차면 저장하지 않고 False)"""
+        if not is_valid_analysis_id(analysis_id):
+            raise ValueError(f"잘못된 분석 ID입니다: {analysis_id}")
+        if len(self._pending) >= self.max_pending and analysis_id not in self._pending:
+            logger.warning(f"분석 결과 기록 대기가 가득 차 저장하지 않습니다: {analysis_id}")
+            record_analysis_store_write("dropped")
+            return False
+
+        self._pending[analysis_id] = {
+            "analysis_id": analysis_id,
+            "created_at": datetime.now().isoformat(),
+            "user_id": user_id,
+            "meeting_datetime": meeting_datetime,
+            "analysis_result": analysis_result,
+            "speaker_stats_percent": speaker_stats_percent,
+            "transcript": transcript,
+        }
+        self._queue.put_nowait(analysis_id)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.get_running_loop().create_task(self._write_loop())
+        return True
+
+    async def get(self, analysis_id: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """저장된 (결과, 직렬화 본문). 없으면 None"""
+        if not is_valid_analysis_id(analysis_id):
+            return None
+        record = self._pending.get(analysis_id)
+        if record is not None:
+            return record, await asyncio.to_thread(serialize_record, record)
+        return await asyncio.to_thread(self._read, analysis_id)
+
+    async def flush(self) -> None:
+        """큐에 쌓인 기록이 모두 파일에 반영될 때까지 대기"""
+        await self._queue.join()
+
+    async def aclose(self) -> None:
+        """워커 종료 시 남은 기록을 마치고 writer 태스크 정리"""
+        if self._writer is not None:
+            await self.flush()
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+
+    async def _write_loop(self) -> None:
+        while True:
+            analysis_id = await self._queue.get()
+            try:
+                record = self._pending.get(analysis_id)
+                # 같은 ID가 연달아 저장되면 가장 최근 결과를 한 번만 기록
+                if record is not None:
+                    await self._write_record(analysis_id, record)
+                    if self._pending.get(analysis_id) is record:
+                        del self._pending[analysis_id]
+            finally:
+                self._queue.task_done()
+
+    async def _write_record(self, analysis_id: str, record: Dict[str, Any]) -> None:
+        started = time.perf_counter()
+        try:
+            raw_bytes, stored_bytes = await asyncio.to_thread(self._write, analysis_id, record)
+        except Exception as e:
+            logger.error(f"분석 결과 저장 실패 ({analysis_id}): {e}")
+            record_analysis_store_write("failed")
+            return
+        record_analysis_store_write("written", raw_bytes, stored_bytes, time.perf_counter() - started)
+
+    def _write(self, analysis_id: str, record: Dict[str, Any]) -> Tuple[int, int]:
+        body = serialize_record(record)
+        # mtime=0: 같은 결과는 항상 같은 압축 바이트열
+        data = gzip.compress(body, compresslevel=self.compress_level, mtime=0)
+        path = self._path(analysis_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return len(body), len(data)
+
+    def _read(self, analysis_id: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        try:
+            with open(self._path(analysis_id), "rb") as f:
+                body = gzip.decompress(f.read())
+        except FileNotFoundError:
+            return None
+        return loads(body), body
@@ -0,0 +1,434 @@
+import struct
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Protocol
+
+# 오디오 파일 전체를 내려받지 않고 컨테이너 헤더만 읽어 코덱/길이/채널/샘플레이트를 확인하는 파서
+# (WAV, MP3, MP4/M4A, FLAC, Ogg(Opus/Vorbis), WebM/Matroska)
+
+
+class AudioProbeError(Exception):
+    """알려진 컨테이너 형식이지만 헤더가 손상되었거나 오디오가 없음"""
+
+    def __init__(self, message: str, reason: str = "corrupt") -> None:
+        super().__init__(message)
+        self.reason = reason
+
+
+class ByteSource(Protocol):
+    """파일의 일부 범위를 읽는 소스 (size는 알 수 없으면 None)"""
+
+    size: Optional[int]
+
+    async def read(self, offset: int, length: int) -> bytes:
+        ...
+
+
+class BytesSource:
+    """메모리에 있는 바이트열 소스 (테스트/업로드 본문 앞부분 점검용)"""
+
+    def __init__(self, data: bytes, size: Optional[int] = None) -> None:
+        self.data = data
+        self.size = len(data) if size is None else size
+
+    async def read(self, offset: int, length: int) -> bytes:
+        return self.data[offset:offset + length]
+
+
+@dataclass
+class AudioInfo:
+    container: str
+    codec: Optional[str] = None
+    duration_seconds: Optional[float] = None
+    channels: Optional[int] = None
+    sample_rate: Optional[int] = None
+
+
+def sniff_container(head: bytes) -> Optional[str]:
+    """파일 앞부분의 매직 바이트로 컨테이너 형식 판별 (모르는 형식이면 None)"""
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[4:8] == b"ftyp":
+        return "mp4"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if head[:3] == b"ID3" or (len(head) >= 4 and _mp3_frame(head, 0) is not None):
+        return "mp3"
+    return None
+
+
+async def probe_audio(source: ByteSource, head: bytes) -> Optional[AudioInfo]:
+    """컨테이너 헤더 해석. 모르는 형식이면 None, 알려진 형식인데 해석할 수 없으면 AudioProbeError"""
+    container = sniff_container(head)
+    if container is None:
+        return None
+    try:
+        return await _PROBES[container](source, head)
+    except (struct.error, IndexError, ValueError) as e:
+        raise AudioProbeError(f"{container} 헤더를 해석할 수 없습니다: {e}")
+
+
+# ==================== WAV ====================
+
+_WAV_CODECS = {1: "pcm", 3: "pcm_float", 6: "alaw", 7: "mulaw", 0xFFFE: "pcm"}
+
+
+async def _probe_wav(source: ByteSource, head: bytes) -> AudioInfo:
+    offset = 12
+    fmt = None
+    while True:
+        header = await source.read(offset, 8)
+        if len(header) < 8:
+            raise AudioProbeError("WAV data 청크가 없습니다")
+        chunk_id, size = header[:4], struct.unpack("<I", header[4:])[0]
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            audio_format, channels, sample_rate, byte_rate = struct.unpack("<HHII", await source.read(body, 12))
+            if not channels or not sample_rate or not byte_rate:
+                raise AudioProbeError("WAV fmt 청크 값이 올바르지 않습니다")
+            fmt = (_WAV_CODECS.get(audio_format, f"wav_{audio_format}"), channels, sample_rate, byte_rate)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise AudioProbeError("WAV fmt 청크가 data 청크보다 먼저 나오지 않았습니다")
+            codec, channels, sample_rate, byte_rate = fmt
+            # 녹음 중단 등으로 크기가 기록되지 않았거나 파일이 잘렸으면 실제 남은 크기 기준
+            if source.size is not None and (size in (0, 0xFFFFFFFF) or body + size > source.size):
+                size = max(source.size - body, 0)
+            return AudioInfo("wav", codec, size / byte_rate, channels, sample_rate)
+        offset = body + size + (size & 1)
+
+
+# ==================== MP3 ====================
+
+# (MPEG 버전 비트) → 비트레이트(kbps)/샘플레이트 표 (Layer III)
+_MP3_BITRATES = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_BITRATES[0] = _MP3_BITRATES[2]
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def _mp3_frame(data: bytes, offset: int) -> Optional[Dict[str, int]]:
+    """offset 위치가 유효한 MPEG Layer III 프레임 헤더면 해석 결과 반환"""
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+    version = (data[offset + 1] >> 3) & 3
+    layer = (data[offset + 1] >> 1) & 3
+    bitrate_index = data[offset + 2] >> 4
+    sample_rate_index = (data[offset + 2] >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    return {
+        "version": version,
+        "bitrate": _MP3_BITRATES[version][bitrate_index] * 1000,
+        "sample_rate": _MP3_SAMPLE_RATES[version][sample_rate_index],
+        "channels": 1 if data[offset + 3] >> 6 == 3 else 2,
+        "samples_per_frame": 1152 if version == 3 else 576,
+    }
+
+
+async def _probe_mp3(source: ByteSource, head: bytes) -> AudioInfo:
+    offset = 0
+    if head[:3] == b"ID3":
+        # ID3v2 태그 크기는 7비트씩 끊어 저장(synchsafe), 푸터가 있으면 10바이트 추가
+        size = 0
+        for byte in head[6:10]:
+            size = (size << 7) | (byte & 0x7F)
+        offset = 10 + size + (10 if head[5] & 0x10 else 0)
+
+    data = await source.read(offset, 4096)
+    position = next((i for i in range(len(data) - 3) if _mp3_frame(data, i) is not None), None)
+    if position is None:
+        raise AudioProbeError("MP3 프레임을 찾지 못했습니다")
+    frame = _mp3_frame(data, position)
+    offset += position
+
+    # VBR 파일은 첫 프레임의 Xing/Info(또는 VBRI) 헤더에 전체 프레임 수가 기록됨
+    mono = frame["channels"] == 1
+    side_info = (17 if mono else 32) if frame["version"] == 3 else (9 if mono else 17)
+    frames = None
+    xing = position + 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        if flags & 1:
+            frames = struct.unpack(">I", data[xing + 8:xing + 12])[0]
+    elif data[position + 36:position + 40] == b"VBRI":
+        frames = struct.unpack(">I", data[position + 50:position + 54])[0]
+
+    if frames:
+        duration = frames * frame["samples_per_frame"] / frame["sample_rate"]
+    elif source.size is not None:
+        duration = (source.size - offset) * 8 / frame["bitrate"]
+    else:
+        duration = None
+    return AudioInfo("mp3", "mp3", duration, frame["channels"], frame["sample_rate"])
+
+
+# ==================== MP4 / M4A ====================
+
+_MP4_CODECS = {"mp4a": "aac", "opus": "opus", "alac": "alac", "samr": "amr_nb", "sawb": "amr_wb", "ac-3": "ac3", "flac": "flac"}
+_MP4_CONTAINERS = {b"trak", b"mdia", b"minf", b"stbl"}
+
+
+def _mp4_boxes(data: bytes, start: int = 0, end: Optional[int] = None):
+    """data[start:end] 안의 박스 (type, 본문 시작, 본문 끝) 순회"""
+    end = len(data) if end is None else end
+    offset = start
+    while offset + 8 <= end:
+        size, box_type = struct.unpack(">I4s", data[offset:offset + 8])
+        header = 8
+        if size == 1:
+            size = struct.unpack(">Q", data[offset + 8:offset + 16])[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            raise AudioProbeError(f"MP4 {box_type!r} 박스 크기가 올바르지 않습니다")
+        yield box_type, offset + header, offset + size
+        offset += size
+
+
+def _mp4_time(data: bytes, body: int) -> tuple:
+    """mvhd/mdhd 본문에서 (timescale, duration)"""
+    if data[body] == 1:
+        return struct.unpack(">IQ", data[body + 20:body + 32])
+    return struct.unpack(">II", data[body + 12:body + 20])
+
+
+async def _probe_mp4(source: ByteSource, head: bytes) -> AudioInfo:
+    # moov가 파일 끝(mdat 뒤)에 있으면 최상위 박스 헤더만 따라가며 위치를 찾음
+    offset = 0
+    moov = None
+    while moov is None:
+        header = await source.read(offset, 16)
+        if len(header) < 8:
+            raise AudioProbeError("MP4 moov 박스가 없습니다 (녹음이 정상적으로 종료되지 않았을 수 있음)")
+        size, box_type = struct.unpack(">I4s", header[:8])
+        if size == 1:
+            size = struct.unpack(">Q", header[8:16])[0]
+        elif size == 0 and source.size is not None:
+            size = source.size - offset
+        if size < 8:
+            raise AudioProbeError(f"MP4 {box_type!r} 박스 크기가 올바르지 않습니다")
+        if box_type == b"moov":
+            moov = await source.read(offset, size)
+            if len(moov) < size:
+                raise AudioProbeError("MP4 moov 박스가 잘렸습니다")
+        offset += size
+
+    movie_duration = None
+    audio = None
+    for box_type, body, end in _mp4_boxes(moov, 8):
+        if box_type == b"mvhd":
+            timescale, duration = _mp4_time(moov, body)
+            movie_duration = duration / timescale if timescale else None
+        elif box_type == b"trak" and audio is None:
+            audio = _mp4_audio_track(moov, body, end)
+    if audio is None:
+        raise AudioProbeError("MP4에 오디오 트랙이 없습니다", reason="no_audio")
+
+    codec, channels, sample_rate, track_duration = audio
+    return AudioInfo("mp4", codec, track_duration or movie_duration, channels, sample_rate)
+
+
+def _mp4_audio_track(data: bytes, start: int, end: int) -> Optional[tuple]:
+    """trak 박스가 오디오 트랙이면 (codec, channels, sample_rate, duration)"""
+    found: Dict[bytes, int] = {}
+
+    def walk(box_start: int, box_end: int) -> None:
+        for box_type, body, box_stop in _mp4_boxes(data, box_start, box_end):
+            if box_type in _MP4_CONTAINERS:
+                walk(body, box_stop)
+            elif box_type in (b"hdlr", b"mdhd", b"stsd"):
+                found[box_type] = body
+
+    walk(start, end)
+    if b"hdlr" not in found or data[found[b"hdlr"] + 8:found[b"hdlr"] + 12] != b"soun":
+        return None
+    if b"stsd" not in found:
+        raise AudioProbeError("MP4 오디오 트랙에 stsd 박스가 없습니다")
+
+    entry = found[b"stsd"] + 8
+    codec_tag = data[entry + 4:entry + 8].decode("latin-1").lower()
+    channels = struct.unpack(">H", data[entry + 24:entry + 26])[0]
+    sample_rate = struct.unpack(">I", data[entry + 32:entry + 36])[0] >> 16
+    duration = None
+    if b"mdhd" in found:
+        timescale, units = _mp4_time(data, found[b"mdhd"])
+        duration = units / timescale if timescale else None
+    return _MP4_CODECS.get(codec_tag, codec_tag), channels, sample_rate, duration
+
+
+# ==================== FLAC ====================
+
+async def _probe_flac(source: ByteSource, head: bytes) -> AudioInfo:
+    # 첫 메타데이터 블록은 항상 STREAMINFO (34바이트)
+    if head[4] & 0x7F != 0:
+        raise AudioProbeError("FLAC STREAMINFO 블록이 없습니다")
+    packed = int.from_bytes(head[18:26], "big")
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    total_samples = packed & ((1 << 36) - 1)
+    if not sample_rate:
+        raise AudioProbeError("FLAC 샘플레이트가 0입니다")
+    duration = total_samples / sample_rate if total_samples else None
+    return AudioInfo("flac", "flac", duration, channels, sample_rate)
+
+
+# ==================== Ogg (Opus / Vorbis) ====================
+
+_OGG_TAIL_BYTES = 64 * 1024
+
+
+async def _probe_ogg(source: ByteSource, head: bytes) -> AudioInfo:
+    segments = head[26]
+    packet = head[27 + segments:]
+    serial = head[14:18]
+    if packet[:8] == b"OpusHead":
+        # Opus의 granule position은 항상 48kHz 기준, pre-skip만큼 앞부분은 재생되지 않음
+        codec, channels, granule_rate = "opus", packet[9], 48000
+        sample_rate = struct.unpack("<I", packet[12:16])[0] or 48000
+        pre_skip = struct.unpack("<H", packet[10:12])[0]
+    elif packet[:7] == b"\x01vorbis":
+        codec, channels = "vorbis", packet[11]
+        sample_rate = granule_rate = struct.unpack("<I", packet[12:16])[0]
+        pre_skip = 0
+    else:
+        raise AudioProbeError("Ogg 첫 패킷이 Opus/Vorbis 헤더가 아닙니다")
+    if not channels or not granule_rate:
+        raise AudioProbeError("Ogg 오디오 헤더 값이 올바르지 않습니다")
+
+    # 길이는 같은 스트림의 마지막 페이지 granule position으로 계산
+    duration = None
+    if source.size is not None:
+        tail_start = max(source.size - _OGG_TAIL_BYTES, 0)
+        tail = await source.read(tail_start, source.size - tail_start)
+        position = tail.rfind(b"OggS")
+        while position >= 0:
+            if tail[position + 14:position + 18] == serial:
+                granule = struct.unpack("<q", tail[position + 6:position + 14])[0]
+                if granule > 0:
+                    duration = max(granule - pre_skip, 0) / granule_rate
+                break
+            position = tail.rfind(b"OggS", 0, position)
+    return AudioInfo("ogg", codec, duration, channels, sample_rate)
+
+
+# ==================== WebM / Matroska ====================
+
+_EBML_SEGMENT = 0x18538067
+_EBML_INFO = 0x1549A966
+_EBML_TRACKS = 0x1654AE6B
+_EBML_CLUSTER = 0x1F43B675
+_EBML_TRACK_ENTRY = 0xAE
+_EBML_TIMECODE_SCALE = 0x2AD7B1
+_EBML_DURATION = 0x4489
+_EBML_TRACK_TYPE = 0x83
+_EBML_CODEC_ID = 0x86
+_EBML_AUDIO = 0xE1
+_EBML_SAMPLING_FREQUENCY = 0xB5
+_EBML_CHANNELS = 0x9F
+_WEBM_CODECS = {"A_OPUS": "opus", "A_VORBIS": "vorbis", "A_AAC": "aac", "A_PCM/INT/LIT": "pcm", "A_FLAC": "flac"}
+
+
+def _ebml_vint(data: bytes, offset: int, keep_marker: bool) -> tuple:
+    """EBML 가변 길이 정수 (값, 길이). 크기 필드의 모든 비트가 1이면 크기 미지정(None)"""
+    first = data[offset]
+    length = 1
+    while length <= 8 and not first & (0x80 >> (length - 1)):
+        length += 1
+    if length > 8:
+        raise ValueError("EBML 가변 길이 정수가 올바르지 않습니다")
+    if len(data) < offset + length:
+        raise IndexError("EBML 요소가 잘렸습니다")
+    value = first if keep_marker else first & (0xFF >> length)
+    for byte in data[offset + 1:offset + length]:
+        value = (value << 8) | byte
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        return None, length
+    return value, length
+
+
+def _ebml_elements(data: bytes, start: int, end: int):
+    offset = start
+    while offset < end:
+        element_id, id_length = _ebml_vint(data, offset, keep_marker=True)
+        size, size_length = _ebml_vint(data, offset + id_length, keep_marker=False)
+        body = offset + id_length + size_length
+        yield element_id, body, size
+        if size is None:
+            # 크기 미지정 요소(스트리밍 녹음의 Segment/Cluster)는 자식으로 이어서 해석
+            offset = body
+        else:
+            offset = body + size
+
+
+def _ebml_number(data: bytes, body: int, size: int, is_float: bool = False) -> float:
+    raw = data[body:body + size]
+    if is_float:
+        return struct.unpack(">f" if size == 4 else ">d", raw)[0]
+    return int.from_bytes(raw, "big")
+
+
+async def _probe_webm(source: ByteSource, head: bytes) -> AudioInfo:
+    timecode_scale = 1_000_000
+    duration = None
+    audio = None
+    end = len(head)
+    for element_id, body, size in _ebml_elements(head, 0, end):
+        if element_id == _EBML_CLUSTER:
+            break
+        if element_id == _EBML_SEGMENT or size is None:
+            continue
+        if body + size > end:
+            break
+        if element_id == _EBML_INFO:
+            for child_id, child_body, child_size in _ebml_elements(head, body, body + size):
+                if child_id == _EBML_TIMECODE_SCALE:
+                    timecode_scale = _ebml_number(head, child_body, child_size)
+                elif child_id == _EBML_DURATION:
+                    duration = _ebml_number(head, child_body, child_size, is_float=True)
+        elif element_id == _EBML_TRACKS:
+            for entry_id, entry_body, entry_size in _ebml_elements(head, body, body + size):
+                if entry_id == _EBML_TRACK_ENTRY and audio is None:
+                    audio = _webm_audio_track(head, entry_body, entry_body + entry_size)
+    if audio is None:
+        raise AudioProbeError("WebM에 오디오 트랙이 없습니다", reason="no_audio")
+    codec, channels, sample_rate = audio
+    # MediaRecorder로 만든 WebM은 Duration이 없는 경우가 많음 (길이 미확인)
+    duration_seconds = duration * timecode_scale / 1e9 if duration else None
+    return AudioInfo("webm", codec, duration_seconds, channels, sample_rate)
+
+
+def _webm_audio_track(data: bytes, start: int, end: int) -> Optional[tuple]:
+    track_type = codec = None
+    channels, sample_rate = 1, None
+    for element_id, body, size in _ebml_elements(data, start, end):
+        if element_id == _EBML_TRACK_TYPE:
+            track_type = _ebml_number(data, body, size)
+        elif element_id == _EBML_CODEC_ID:
+            codec_id = data[body:body + size].decode("ascii", "replace").rstrip("\0")
+            codec = _WEBM_CODECS.get(codec_id, codec_id.lower())
+        elif element_id == _EBML_AUDIO:
+            for child_id, child_body, child_size in _ebml_elements(data, body, body + size):
+                if child_id == _EBML_SAMPLING_FREQUENCY:
+                    sample_rate = int(_ebml_number(data, child_body, child_size, is_float=True))
+                elif child_id == _EBML_CHANNELS:
+                    channels = _ebml_number(data, child_body, child_size)
+    if track_type != 2:
+        return None
+    return codec, channels, sample_rate
+
+
+_PROBES: Dict[str, Callable[[ByteSource, bytes], Awaitable[AudioInfo]]] = {
+    "wav": _probe_wav,
+    "mp3": _probe_mp3,
+    "mp4": _probe_mp4,
+    "flac": _probe_flac,
+    "ogg": _probe_ogg,
+    "webm": _probe_webm,
+}
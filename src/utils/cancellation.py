@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional, Tuple
+
+from starlette.requests import Request
+
+from src.utils.cost_ledger import current_usage
+from src.utils.metrics import CANCELLATION_SAVED_SECONDS, CANCELLATION_SAVED_TOKENS, CLIENT_DISCONNECTS
+
+logger = logging.getLogger("cancellation")
+
+# 완료된 작업의 평균 처리 시간/토큰 (지수 이동 평균). 취소 시 절약량 추정에 사용
+_EWMA_ALPHA = 0.2
+_completion_stats: Dict[str, Tuple[float, float]] = {}
+
+
+class ClientDisconnected(Exception):
+    """작업 완료 전에 클라이언트 연결이 끊김"""
+
+
+def _tokens_used() -> int:
+    usage = current_usage()
+    if usage is None:
+        return 0
+    return sum(
+        model["input_tokens"] + model["output_tokens"] + model["thinking_tokens"] for model in usage.llm.values()
+    )
+
+
+def record_completion(operation: str, seconds: float, tokens: int) -> None:
+    """끝까지 완료된 작업의 처리 시간/토큰을 평균에 반영"""
+    previous = _completion_stats.get(operation)
+    if previous is None:
+        _completion_stats[operation] = (seconds, float(tokens))
+    else:
+        _completion_stats[operation] = (
+            previous[0] + _EWMA_ALPHA * (seconds - previous[0]),
+            previous[1] + _EWMA_ALPHA * (tokens - previous[1]),
+        )
+
+
+def record_cancellation(operation: str, elapsed_seconds: float, action: str = "cancelled") -> None:
+    """
+    연결 종료 기록. 작업을 취소한 경우 완료 작업 평균 대비 남은 시간과,
+    그 시간 동안 (선형으로) 소비되었을 토큰을 절약량으로 추정합니다.
+    """
+    CLIENT_DISCONNECTS.labels(operation, action).inc()
+    usage = current_usage()
+    if usage is not None:
+        usage.finish(action)
+    expected = _completion_stats.get(operation)
+    if action != "cancelled" or expected is None or expected[0] <= 0:
+        return
+    saved_seconds = max(expected[0] - elapsed_seconds, 0.0)
+    CANCELLATION_SAVED_SECONDS.labels(operation).inc(saved_seconds)
+    CANCELLATION_SAVED_TOKENS.labels(operation).inc(expected[1] * saved_seconds / expected[0])
+    logger.info(f"연결 종료로 작업 취소: {operation} ({elapsed_seconds:.1f}초 경과, 약 {saved_seconds:.1f}초 절약)")
+
+
+async def wait_for_disconnect(request: Request) -> None:
+    """요청 본문을 모두 읽은 뒤 클라이언트 연결 종료(http.disconnect)까지 대기"""
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def cancel_on_disconnect(
+    request: Request,
+    awaitable: Awaitable[Any],
+    operation: str,
+    keep_running: bool = False,
+) -> Any:
+    """
+    작업과 클라이언트 연결 종료 중 먼저 일어나는 쪽을 기다립니다.
+    연결이 먼저 끊기면 작업을 취소하고(keep_running=True이면 계속 실행) ClientDisconnected를 발생시킵니다.
+    """
+    started = time.perf_counter()
+    task = asyncio.ensure_future(awaitable)
+    watcher = asyncio.create_task(wait_for_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        if not keep_running:
+            task.cancel()
+        raise
+    finally:
+        watcher.cancel()
+
+    if task.done():
+        result = task.result()
+        record_completion(operation, time.perf_counter() - started, _tokens_used())
+        return result
+
+    record_cancellation(operation, time.perf_counter() - started, "detached" if keep_running else "cancelled")
+    if not keep_running:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    raise ClientDisconnected(operation)
+
+
+async def cancel_stream_on_disconnect(
+    request: Request,
+    stream: AsyncIterator[str],
+    operation: str,
+) -> AsyncIterator[str]:
+    """
+    스트리밍 응답 생성기를 감싸 클라이언트 연결이 끊기면 다음 청크를 기다리던 LLM 스트림까지 즉시 취소합니다.
+    서버(Starlette)가 먼저 응답 전송을 취소한 경우도 같은 지표로 기록합니다.
+    """
+    started = time.perf_counter()
+    iterator = stream.__aiter__()
+    watcher = asyncio.create_task(wait_for_disconnect(request))
+    next_chunk: Optional[asyncio.Future] = None
+    try:
+        while True:
+            next_chunk = asyncio.ensure_future(iterator.__anext__())
+            await asyncio.wait({next_chunk, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_chunk.done():
+                record_cancellation(operation, time.perf_counter() - started)
+                return
+            try:
+                chunk = next_chunk.result()
+            except StopAsyncIteration:
+                break
+            next_chunk = None
+            yield chunk
+        record_completion(operation, time.perf_counter() - started, _tokens_used())
+    except asyncio.CancelledError:
+        record_cancellation(operation, time.perf_counter() - started)
+        raise
+    finally:
+        watcher.cancel()
+        if next_chunk is not None and not next_chunk.done():
+            next_chunk.cancel()
+            await asyncio.gather(next_chunk, return_exceptions=True)
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
@@ -0,0 +1,337 @@
+import asyncio
+import ipaddress
+import logging
+import re
+import socket
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+from urllib.parse import unquote, urlsplit
+
+import assemblyai as aai
+import httpx
+from supabase import Client, ClientOptions, create_client
+
+from src.config.config import (
+    ASSEMBLYAI_API_KEY,
+    ASSEMBLYAI_BASE_URL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_POOL_MAX_CONNECTIONS,
+    HTTP_POOL_MAX_KEEPALIVE,
+    HTTP_READ_TIMEOUT,
+    PREFLIGHT_ALLOWED_HOSTS,
+    PREFLIGHT_MAX_REDIRECTS,
+    SUPABASE_BUCKET_NAME,
+    SUPABASE_KEY,
+    SUPABASE_URL,
+)
+from src.utils import model
+
+logger = logging.getLogger("provider_clients")
+
+# httpcore trace 이벤트 중 새 TCP 커넥션이 수립되었음을 나타내는 이벤트
+_NEW_CONNECTION_EVENT = "connection.connect_tcp.complete"
+
+
+class UnsafeURLError(httpx.RequestError):
+    """허용되지 않은 호스트나 내부망 주소로 보내려는 요청"""
+
+
+class MediaURLGuard:
+    """
+    녹음 파일 클라이언트의 요청 훅. 사용자가 보낸 URL로 내부 서비스에 요청하지 않도록(SSRF)
+    https이면서 허용 호스트인 URL만 통과시키고, 호스트가 사설/루프백/링크 로컬 등 공인 인터넷이 아닌 주소로
+    해석되면 거부합니다. 리다이렉트도 단계마다 요청 훅이 실행되므로 같은 규칙으로 다시 확인합니다.
+    """
+
+    def __init__(self, allowed_hosts: Iterable[str]) -> None:
+        self.allowed_hosts = {host.lower() for host in allowed_hosts if host}
+
+    async def __call__(self, request: httpx.Request) -> None:
+        url = request.url
+        if url.scheme != "https" or url.host.lower() not in self.allowed_hosts:
+            raise UnsafeURLError("허용되지 않은 녹음 파일 주소입니다", request=request)
+        for address in await self._resolve(url.host, url.port or 443):
+            if not _is_public_address(address):
+                raise UnsafeURLError("허용되지 않은 녹음 파일 주소입니다", request=request)
+
+    async def _resolve(self, host: str, port: int) -> List[str]:
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise httpx.ConnectError(f"호스트를 찾을 수 없습니다 ({host})") from e
+        return [info[4][0] for info in infos]
+
+
+def _is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+class ConnectionStats:
+    """httpx trace 확장을 이용해 요청 수와 새 커넥션 수를 집계하는 통계"""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.new_connections = 0
+
+    def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == _NEW_CONNECTION_EVENT:
+            self.new_connections += 1
+
+    async def _atrace(self, event_name: str, info: Dict[str, Any]) -> None:
+        self._trace(event_name, info)
+
+    def on_request(self, request: httpx.Request) -> None:
+        """동기 httpx 클라이언트용 request 이벤트 훅"""
+        self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def on_request_async(self, request: httpx.Request) -> None:
+        """비동기 httpx 클라이언트용 request 이벤트 훅"""
+        self.requests += 1
+        request.extensions["trace"] = self._atrace
+
+    def snapshot(self) -> Dict[str, Any]:
+        reused = max(self.requests - self.new_connections, 0)
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": reused,
+            "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+        }
+
+
+class AssemblyAIClient:
+    """공유 커넥션 풀을 사용하는 AssemblyAI REST API 비동기 클라이언트"""
+
+    def __init__(self, http_client: httpx.AsyncClient, config: aai.TranscriptionConfig) -> None:
+        self.http_client = http_client
+        self.config = config
+
+    async def submit(self, audio_url: str) -> aai.types.TranscriptResponse:
+        """전사 작업을 등록하고 완료를 기다리지 않고 반환"""
+        request = aai.types.TranscriptRequest(
+            audio_url=audio_url,
+            **self.config.raw.dict(exclude_none=True),
+        )
+        response = await self.http_client.post(
+            "/v2/transcript",
+            json=request.dict(exclude_none=True, by_alias=True),
+        )
+        if response.status_code != httpx.codes.OK:
+            raise aai.types.TranscriptError(
+                f"전사 요청 실패 ({audio_url}): {_get_error_message(response)}"
+            )
+        return aai.types.TranscriptResponse.parse_obj(response.json())
+
+    async def upload(self, chunks: AsyncIterator[bytes]) -> str:
+        """오디오 본문을 청크 단위로 업로드하고 전사 요청에 사용할 upload_url 반환"""
+        response = await self.http_client.post(
+            "/v2/upload",
+            content=chunks,
+            headers={"content-type": "application/octet-stream"},
+        )
+        if response.status_code != httpx.codes.OK:
+            raise aai.types.TranscriptError(f"오디오 업로드 실패: {_get_error_message(response)}")
+        return response.json()["upload_url"]
+
+    async def get_transcript(self, transcript_id: str) -> aai.types.TranscriptResponse:
+        """전사 작업의 현재 상태 조회"""
+        response = await self.http_client.get(f"/v2/transcript/{transcript_id}")
+        if response.status_code != httpx.codes.OK:
+            raise aai.types.TranscriptError(
+                f"전사 결과 조회 실패 ({transcript_id}): {_get_error_message(response)}"
+            )
+        return aai.types.TranscriptResponse.parse_obj(response.json())
+
+
+class StorageError(Exception):
+    """Supabase Storage API 호출 실패"""
+
+
+class SupabaseStorageClient:
+    """
+    공유 커넥션 풀을 사용하는 Supabase Storage REST API 비동기 클라이언트.
+    supabase-py의 Storage 업로드는 파일 전체를 bytes로 받으므로, 스트리밍 업로드는 REST API를 직접 호출합니다.
+    """
+
+    def __init__(self, http_client: httpx.AsyncClient, bucket: str = SUPABASE_BUCKET_NAME) -> None:
+        self.http_client = http_client
+        self.bucket = bucket
+
+    async def upload(self, path: str, chunks: AsyncIterator[bytes], content_type: str) -> str:
+        """청크 단위로 객체를 업로드하고 버킷 내 경로 반환 (같은 경로가 있으면 실패)"""
+        response = await self.http_client.post(
+            f"/storage/v1/object/{self.bucket}/{path}",
+            content=chunks,
+            headers={"content-type": content_type, "x-upsert": "false"},
+        )
+        if response.status_code != httpx.codes.OK:
+            raise StorageError(f"Storage 업로드 실패 ({path}): {_get_error_message(response)}")
+        return path
+
+    async def signed_url(self, path: str, expires_in: int) -> str:
+        """비공개 버킷의 객체도 외부(STT 제공자)에서 내려받을 수 있는 서명 URL 발급"""
+        response = await self.http_client.post(
+            f"/storage/v1/object/sign/{self.bucket}/{path}",
+            json={"expiresIn": int(expires_in)},
+        )
+        if response.status_code != httpx.codes.OK:
+            raise StorageError(f"Storage 서명 URL 발급 실패 ({path}): {_get_error_message(response)}")
+        # 응답의 signedURL은 /storage/v1 기준 상대 경로
+        return f"{str(self.http_client.base_url).rstrip('/')}/storage/v1{response.json()['signedURL']}"
+
+    def public_url(self, path: str) -> str:
+        return f"{str(self.http_client.base_url).rstrip('/')}/storage/v1/object/public/{self.bucket}/{path}"
+
+    def object_path(self, url: str) -> Optional[str]:
+        """이 Storage의 버킷 객체 URL(공개/서명/인증)이면 버킷 내 경로, 다른 호스트/버킷이면 None"""
+        parsed = urlsplit(url)
+        base_url = self.http_client.base_url
+        if parsed.scheme != base_url.scheme or parsed.hostname != base_url.host or parsed.port != base_url.port:
+            return None
+        match = _STORAGE_OBJECT_URL.match(parsed.path)
+        if match is None or unquote(match["bucket"]) != self.bucket:
+            return None
+        return unquote(match["path"])
+
+
+# Storage 객체 URL 경로: /storage/v1/object/[public/|sign/|authenticated/]{bucket}/{path}
+_STORAGE_OBJECT_URL = re.compile(r"^/storage/v1/object/(?:public/|sign/|authenticated/)?(?P<bucket>[^/]+)/(?P<path>.+)$")
+
+
+def _get_error_message(response: httpx.Response) -> str:
+    try:
+        body = response.json()
+        return body.get("error") or body.get("message") or response.text
+    except Exception:
+        return response.text
+
+
+class ProviderClients:
+    """
+    워커 단위로 한 번 생성되어 모든 요청이 공유하는 외부 API 클라이언트 풀.
+    keep-alive 커넥션을 재사용하며, 파이프라인 노드에 주입되어 모듈 전역 대신 사용됩니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        assemblyai_api_key: Optional[str] = None,
+        supabase_url: Optional[str] = None,
+        supabase_key: Optional[str] = None,
+        max_connections: int = HTTP_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections: int = HTTP_POOL_MAX_KEEPALIVE,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = HTTP_READ_TIMEOUT,
+        stt: Optional[AssemblyAIClient] = None,
+        supabase: Optional[Client] = None,
+        storage: Optional[SupabaseStorageClient] = None,
+        media: Optional[httpx.AsyncClient] = None,
+        meeting_llm: Any = None,
+        meeting_fallback_llm: Any = None,
+        title_llm: Any = None,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.stats: Dict[str, ConnectionStats] = {
+            "assemblyai": ConnectionStats(),
+            "supabase": ConnectionStats(),
+            "media": ConnectionStats(),
+        }
+        self._http_clients = []
+
+        self.stt = stt or self._create_stt_client(assemblyai_api_key or ASSEMBLYAI_API_KEY)
+        self.supabase = supabase or self._create_supabase_client(
+            supabase_url or SUPABASE_URL, supabase_key or SUPABASE_KEY
+        )
+        self.storage = storage or self._create_storage_client(
+            supabase_url or SUPABASE_URL, supabase_key or SUPABASE_KEY
+        )
+        self.media = media or self._create_media_client(supabase_url or SUPABASE_URL)
+        self.meeting_llm = meeting_llm or model.meeting_llm
+        self.meeting_fallback_llm = meeting_fallback_llm or model.meeting_fallback_llm
+        self.title_llm = title_llm or model.title_llm
+
+        logger.info(
+            f"ProviderClients 초기화 완료 (max_connections={max_connections}, "
+            f"keepalive={max_keepalive_connections})"
+        )
+
+    def _create_stt_client(self, api_key: Optional[str]) -> Optional[AssemblyAIClient]:
+        if not api_key:
+            logger.warning("AssemblyAI API 키가 없어 STT 클라이언트를 생성하지 않습니다")
+            return None
+
+        http_client = httpx.AsyncClient(
+            base_url=ASSEMBLYAI_BASE_URL,
+            headers={"authorization": api_key},
+            limits=self.limits,
+            timeout=self.timeout,
+            event_hooks={"request": [self.stats["assemblyai"].on_request_async]},
+        )
+        self._http_clients.append(http_client)
+        return AssemblyAIClient(http_client, model.SpeechTranscriber(api_key).config)
+
+    def _create_supabase_client(self, url: Optional[str], key: Optional[str]) -> Optional[Client]:
+        if not url or not key:
+            logger.warning("Supabase 설정이 없어 Supabase 클라이언트를 생성하지 않습니다")
+            return None
+
+        http_client = httpx.Client(
+            limits=self.limits,
+            timeout=self.timeout,
+            event_hooks={"request": [self.stats["supabase"].on_request]},
+        )
+        self._http_clients.append(http_client)
+        return create_client(url, key, options=ClientOptions(httpx_client=http_client))
+
+    def _create_storage_client(self, url: Optional[str], key: Optional[str]) -> Optional[SupabaseStorageClient]:
+        if not url or not key:
+            return None
+
+        http_client = httpx.AsyncClient(
+            base_url=url,
+            headers={"apikey": key, "authorization": f"Bearer {key}"},
+            limits=self.limits,
+            timeout=self.timeout,
+            event_hooks={"request": [self.stats["supabase"].on_request_async]},
+        )
+        self._http_clients.append(http_client)
+        return SupabaseStorageClient(http_client)
+
+    def _create_media_client(self, supabase_url: Optional[str]) -> httpx.AsyncClient:
+        """
+        녹음 파일 URL(Storage 서명 URL, CDN 등)에 Range 요청을 보내는 클라이언트 (녹음 사전 점검용).
+        Supabase 호스트와 PREFLIGHT_ALLOWED_HOSTS의 공인 주소에만 요청합니다.
+        """
+        guard = MediaURLGuard([httpx.URL(supabase_url).host if supabase_url else "", *PREFLIGHT_ALLOWED_HOSTS])
+        http_client = httpx.AsyncClient(
+            follow_redirects=True,
+            max_redirects=PREFLIGHT_MAX_REDIRECTS,
+            limits=self.limits,
+            timeout=self.timeout,
+            event_hooks={"request": [guard, self.stats["media"].on_request_async]},
+        )
+        self._http_clients.append(http_client)
+        return http_client
+
+    def connection_stats(self) -> Dict[str, Dict[str, Any]]:
+        """제공자별 커넥션 재사용 통계"""
+        return {name: stats.snapshot() for name, stats in self.stats.items()}
+
+    async def aclose(self) -> None:
+        """워커 종료 시 keep-alive 커넥션 정리"""
+        for http_client in self._http_clients:
+            if isinstance(http_client, httpx.AsyncClient):
+                await http_client.aclose()
+            else:
+                http_client.close()
+        self._http_clients.clear()
@@ -0,0 +1,384 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set
+
+from src.config.config import ASSEMBLYAI_SPEECH_MODEL, LLM_PRICES_PER_MILLION_TOKENS, STT_PRICES_PER_HOUR
+from src.utils.tracing import current_trace_id
+
+logger = logging.getLogger("cost_ledger")
+
+# 롤업 기준 → 집계 컬럼
+_GROUP_COLUMNS = {
+    "user": "COALESCE(r.user_id, '(anonymous)')",
+    "endpoint": "r.endpoint",
+    "day": "r.day",
+}
+
+_TOKEN_FIELDS = ("input_tokens", "output_tokens", "cached_tokens", "thinking_tokens")
+
+_warned_unknown_prices: Set[str] = set()
+
+
+def _price_for(table: Dict[str, Any], key: str) -> Optional[Any]:
+    price = table.get(key)
+    if price is None and key not in _warned_unknown_prices:
+        _warned_unknown_prices.add(key)
+        logger.warning(f"단가표에 없는 항목입니다 (비용 0으로 집계): {key}")
+    return price
+
+
+def calculate_llm_cost(
+    model: str,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    cached_tokens: int = 0,
+    thinking_tokens: int = 0,
+) -> float:
+    """모델 단가표 기준 LLM 호출 비용 (USD). 캐시 적중 입력 토큰은 캐시 단가로 과금"""
+    price = _price_for(LLM_PRICES_PER_MILLION_TOKENS, model)
+    if not price:
+        return 0.0
+    uncached = max(input_tokens - cached_tokens, 0)
+    cost = (
+        uncached * price["input"]
+        + cached_tokens * price.get("cached", price["input"])
+        + output_tokens * price["output"]
+        + thinking_tokens * price.get("thinking", price["output"])
+    )
+    return cost / 1_000_000
+
+
+def calculate_stt_cost(speech_model: str, audio_seconds: float) -> float:
+    """음성 모델 단가표 기준 STT 비용 (USD)"""
+    price = _price_for(STT_PRICES_PER_HOUR, speech_model)
+    if not price:
+        return 0.0
+    return audio_seconds / 3600 * price
+
+
+class RequestUsage:
+    """요청 하나가 소비한 LLM 토큰과 STT 오디오 길이 누적기"""
+
+    def __init__(self, endpoint: str, user_id: Optional[str] = None) -> None:
+        self.request_id = uuid.uuid4().hex
+        self.endpoint = endpoint
+        self.user_id = user_id
+        self.trace_id = current_trace_id()
+        self.started_at = time.time()
+        self.latency_ms: Optional[float] = None
+        self.status = "ok"
+        self.llm: Dict[str, Dict[str, int]] = {}
+        self.audio_seconds = 0.0
+        self.speech_model = ASSEMBLYAI_SPEECH_MODEL
+        self._start = time.perf_counter()
+
+    def add_llm(
+        self,
+        model: str,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cached_tokens: int = 0,
+        thinking_tokens: int = 0,
+    ) -> None:
+        usage = self.llm.setdefault(model, {"calls": 0, **{field: 0 for field in _TOKEN_FIELDS}})
+        usage["calls"] += 1
+        usage["input_tokens"] += input_tokens
+        usage["output_tokens"] += output_tokens
+        usage["cached_tokens"] += cached_tokens
+        usage["thinking_tokens"] += thinking_tokens
+
+    def add_audio(self, seconds: float, speech_model: Optional[str] = None) -> None:
+        self.audio_seconds += seconds
+        if speech_model:
+            self.speech_model = speech_model
+
+    def finish(self, status: str = "ok") -> None:
+        if self.latency_ms is None:
+            self.latency_ms = (time.perf_counter() - self._start) * 1000
+            self.status = status
+
+    @property
+    def stt_cost_usd(self) -> float:
+        return calculate_stt_cost(self.speech_model, self.audio_seconds) if self.audio_seconds else 0.0
+
+    def llm_cost_usd(self, model: str) -> float:
+        usage = self.llm[model]
+        return calculate_llm_cost(model, *(usage[field] for field in _TOKEN_FIELDS))
+
+    @property
+    def total_cost_usd(self) -> float:
+        return self.stt_cost_usd + sum(self.llm_cost_usd(model) for model in self.llm)
+
+
+_current_usage: ContextVar[Optional[RequestUsage]] = ContextVar("current_usage", default=None)
+
+
+def current_usage() -> Optional[RequestUsage]:
+    return _current_usage.get()
+
+
+def record_llm_tokens(
+    model: str,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    cached_tokens: int = 0,
+    thinking_tokens: int = 0,
+) -> None:
+    """현재 요청의 사용량에 LLM 토큰 추가 (사용량 추적 범위 밖이면 무시)"""
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.add_llm(model, input_tokens, output_tokens, cached_tokens, thinking_tokens)
+
+
+@contextmanager
+def shared_llm_usage(targets: List[Optional[RequestUsage]]) -> Iterator[None]:
+    """
+    여러 요청이 LLM 호출 하나를 공유할 때(micro-batching) 블록 안에서 발생한 토큰을
+    요청 수로 나누어 각 요청의 사용량에 기록 (나머지는 앞 요청부터 1씩 배분)
+    """
+    shared = RequestUsage("shared")
+    token = _current_usage.set(shared)
+    try:
+        yield
+    finally:
+        _current_usage.reset(token)
+        for model, usage in shared.llm.items():
+            splits = {field: divmod(usage[field], len(targets)) for field in _TOKEN_FIELDS}
+            for position, target in enumerate(targets):
+                if target is not None:
+                    target.add_llm(model, **{
+                        field: share + (1 if position < remainder else 0) for field, (share, remainder) in splits.items()
+                    })
+
+
+def record_stt_audio(seconds: float, speech_model: Optional[str] = None) -> None:
+    """현재 요청의 사용량에 STT 오디오 길이 추가 (사용량 추적 범위 밖이면 무시)"""
+    usage = _current_usage.get()
+    if usage is not None and seconds:
+        usage.add_audio(seconds, speech_model)
+
+
+class CostLedger:
+    """
+    요청별 사용량/비용을 로컬 SQLite 파일에 적재하고 사용자·엔드포인트·일자별로 집계하는 원장.
+    여러 워커 프로세스가 같은 파일에 기록할 수 있도록 WAL 모드를 사용합니다.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS usage_requests (
+                request_id TEXT PRIMARY KEY,
+                recorded_at REAL NOT NULL,
+                day TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                user_id TEXT,
+                trace_id TEXT,
+                status TEXT NOT NULL,
+                latency_ms REAL NOT NULL,
+                speech_model TEXT,
+                audio_seconds REAL NOT NULL DEFAULT 0,
+                stt_cost_usd REAL NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS usage_llm (
+                request_id TEXT NOT NULL,
+                model TEXT NOT NULL,
+                calls INTEGER NOT NULL,
+                input_tokens INTEGER NOT NULL,
+                output_tokens INTEGER NOT NULL,
+                cached_tokens INTEGER NOT NULL,
+                thinking_tokens INTEGER NOT NULL,
+                cost_usd REAL NOT NULL,
+                PRIMARY KEY (request_id, model)
+            );
+            CREATE INDEX IF NOT EXISTS idx_usage_requests_day ON usage_requests (day);
+            CREATE INDEX IF NOT EXISTS idx_usage_requests_user ON usage_requests (user_id, day);
+            CREATE INDEX IF NOT EXISTS idx_usage_requests_endpoint ON usage_requests (endpoint, day);
+            """
+        )
+        self._lock = threading.Lock()
+        self._pending: Set[asyncio.Task] = set()
+
+    def _execute(self, func, *args):
+        with self._lock:
+            return func(*args)
+
+    def _insert(self, usage: RequestUsage) -> None:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO usage_requests VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    usage.request_id,
+                    usage.started_at,
+                    datetime.fromtimestamp(usage.started_at).date().isoformat(),
+                    usage.endpoint,
+                    usage.user_id,
+                    usage.trace_id,
+                    usage.status,
+                    usage.latency_ms or 0.0,
+                    usage.speech_model if usage.audio_seconds else None,
+                    usage.audio_seconds,
+                    usage.stt_cost_usd,
+                ),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO usage_llm VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        usage.request_id,
+                        model,
+                        tokens["calls"],
+                        *(tokens[field] for field in _TOKEN_FIELDS),
+                        usage.llm_cost_usd(model),
+                    )
+                    for model, tokens in usage.llm.items()
+                ],
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    async def record(self, usage: RequestUsage) -> None:
+        usage.finish()
+        await asyncio.to_thread(self._execute, self._insert, usage)
+
+    def record_nowait(self, usage: RequestUsage) -> None:
+        """응답 지연 없이 백그라운드에서 원장에 기록"""
+        usage.finish()
+        task = asyncio.get_running_loop().create_task(self.record(usage))
+        self._pending.add(task)
+        task.add_done_callback(self._on_recorded)
+
+    def _on_recorded(self, task: asyncio.Task) -> None:
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"사용량 원장 기록 실패: {task.exception()}")
+
+    @contextmanager
+    def track(self, endpoint: str, user_id: Optional[str] = None) -> Iterator[RequestUsage]:
+        """블록 안에서 발생한 LLM/STT 사용량을 모아 블록 종료 시 원장에 기록"""
+        usage = RequestUsage(endpoint, user_id)
+        token = _current_usage.set(usage)
+        status = "ok"
+        try:
+            yield usage
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            try:
+                _current_usage.reset(token)
+            except ValueError:
+                # 스트리밍 응답이 다른 컨텍스트에서 정리되는 경우
+                _current_usage.set(None)
+            usage.finish(status)
+            self.record_nowait(usage)
+
+    async def track_stream(
+        self, stream: AsyncIterator[str], endpoint: str, user_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """스트리밍 응답 생성기를 감싸 스트림이 끝날 때까지의 사용량을 기록"""
+        with self.track(endpoint, user_id):
+            async for chunk in stream:
+                yield chunk
+
+    def _rollup(self, group_by: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        conditions, params = [], []
+        if filters.get("since"):
+            conditions.append("r.day >= ?")
+            params.append(filters["since"])
+        if filters.get("until"):
+            conditions.append("r.day <= ?")
+            params.append(filters["until"])
+        if filters.get("user_id"):
+            conditions.append("r.user_id = ?")
+            params.append(filters["user_id"])
+        if filters.get("endpoint"):
+            conditions.append("r.endpoint = ?")
+            params.append(filters["endpoint"])
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        if group_by == "model":
+            query = f"""
+                SELECT l.model AS key,
+                       COUNT(DISTINCT l.request_id) AS requests,
+                       SUM(l.calls) AS llm_calls,
+                       SUM(l.input_tokens), SUM(l.output_tokens), SUM(l.cached_tokens), SUM(l.thinking_tokens),
+                       0.0 AS audio_seconds,
+                       SUM(l.cost_usd) AS cost_usd,
+                       AVG(r.latency_ms), MAX(r.latency_ms)
+                FROM usage_llm l JOIN usage_requests r ON r.request_id = l.request_id
+                {where}
+                GROUP BY l.model ORDER BY cost_usd DESC
+            """
+        else:
+            query = f"""
+                SELECT {_GROUP_COLUMNS[group_by]} AS key,
+                       COUNT(*) AS requests,
+                       COALESCE(SUM(l.calls), 0) AS llm_calls,
+                       COALESCE(SUM(l.input_tokens), 0), COALESCE(SUM(l.output_tokens), 0),
+                       COALESCE(SUM(l.cached_tokens), 0), COALESCE(SUM(l.thinking_tokens), 0),
+                       SUM(r.audio_seconds) AS audio_seconds,
+                       SUM(r.stt_cost_usd) + COALESCE(SUM(l.cost_usd), 0) AS cost_usd,
+                       AVG(r.latency_ms), MAX(r.latency_ms)
+                FROM usage_requests r
+                LEFT JOIN (
+                    SELECT request_id, SUM(calls) AS calls,
+                           SUM(input_tokens) AS input_tokens, SUM(output_tokens) AS output_tokens,
+                           SUM(cached_tokens) AS cached_tokens, SUM(thinking_tokens) AS thinking_tokens,
+                           SUM(cost_usd) AS cost_usd
+                    FROM usage_llm GROUP BY request_id
+                ) l ON l.request_id = r.request_id
+                {where}
+                GROUP BY key ORDER BY {"key" if group_by == "day" else "cost_usd DESC"}
+            """
+
+        columns = (
+            "key", "requests", "llm_calls", *_TOKEN_FIELDS,
+            "audio_seconds", "cost_usd", "avg_latency_ms", "max_latency_ms",
+        )
+        return [dict(zip(columns, row)) for row in self._conn.execute(query, params).fetchall()]
+
+    async def rollup(
+        self,
+        group_by: str = "user",
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        user_id: Optional[str] = None,
+        endpoint: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        사용량/비용 집계.
+        group_by: user | endpoint | day | model, since/until: YYYY-MM-DD (양 끝 포함)
+        """
+        if group_by not in _GROUP_COLUMNS and group_by != "model":
+            raise ValueError(f"지원하지 않는 집계 기준입니다: {group_by}")
+        filters = {"since": since, "until": until, "user_id": user_id, "endpoint": endpoint}
+        return await asyncio.to_thread(self._execute, self._rollup, group_by, filters)
+
+    async def flush(self) -> None:
+        """백그라운드 기록이 모두 끝날 때까지 대기"""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        await self.flush()
+        await asyncio.to_thread(self._execute, self._conn.close)
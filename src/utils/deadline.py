@@ -0,0 +1,62 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Optional
+
+from src.config.config import REQUEST_DEADLINE_MAX_MS
+
+# 남은 처리 시간(밀리초)을 전달하는 요청 헤더
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+
+
+class DeadlineExceeded(Exception):
+    """요청 마감 시간 안에 단계를 끝낼 수 없음"""
+
+    def __init__(self, stage: str) -> None:
+        super().__init__(f"요청 마감 시간 초과 ({stage})")
+        self.stage = stage
+
+
+class Deadline:
+    """
+    요청 단위 마감 시각. 파이프라인 state에 실려 각 노드, STT 폴링, LLM 호출까지 전달되며
+    각 단계는 남은 시간을 보고 건너뛰기/저렴한 모델로 변경/조기 중단을 결정합니다.
+    """
+
+    def __init__(self, budget_seconds: float) -> None:
+        self.budget_seconds = budget_seconds
+        self.expires_at = time.monotonic() + budget_seconds
+
+    @classmethod
+    def from_ms(cls, budget_ms: Optional[int]) -> Optional["Deadline"]:
+        """밀리초 단위 예산으로 생성 (None이면 마감 시간 없음)"""
+        if budget_ms is None:
+            return None
+        if not 0 < budget_ms <= REQUEST_DEADLINE_MAX_MS:
+            raise ValueError(f"deadline은 1~{REQUEST_DEADLINE_MAX_MS}ms 사이여야 합니다: {budget_ms}")
+        return cls(budget_ms / 1000)
+
+    def remaining(self) -> float:
+        """남은 시간 (초, 0 이상)"""
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def cap(self, seconds: float, reserve: float = 0.0) -> float:
+        """고정 타임아웃을 (남은 시간 - reserve)로 제한"""
+        return max(min(seconds, self.remaining() - reserve), 0.0)
+
+    def check(self, stage: str) -> None:
+        if self.expired:
+            raise DeadlineExceeded(stage)
+
+
+async def run_within(deadline: Optional[Deadline], awaitable: Awaitable[Any], stage: str) -> Any:
+    """마감 시간이 있으면 남은 시간 안에 끝나지 않는 작업을 취소하고 DeadlineExceeded 발생"""
+    if deadline is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout=deadline.remaining())
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(stage) from None
@@ -0,0 +1,260 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+
+from src.config.config import (
+    LLM_SCHEDULER_CHARS_PER_TOKEN,
+    LLM_SCHEDULER_DEFAULT_WEIGHT,
+    LLM_SCHEDULER_EXPECTED_OUTPUT_TOKENS,
+    LLM_SCHEDULER_MAX_CONCURRENCY,
+    LLM_SCHEDULER_STATS_MAX_USERS,
+    LLM_SCHEDULER_WEIGHTS,
+)
+from src.utils.cost_ledger import current_usage
+from src.utils.metrics import LLM_SCHEDULER_QUEUED, LLM_SCHEDULER_WAIT
+from src.utils.user_quota import UserQuota
+
+_ANONYMOUS = "(anonymous)"
+
+
+class _UserStats:
+    __slots__ = ("calls", "waited_calls", "total_wait", "max_wait", "quota_wait", "queued")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.waited_calls = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.quota_wait = 0.0
+        self.queued = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "waited_calls": self.waited_calls,
+            "queued": self.queued,
+            "avg_wait_ms": round(self.total_wait / self.calls * 1000, 1) if self.calls else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "quota_wait_ms": round(self.quota_wait * 1000, 1),
+        }
+
+
+class SchedulerGrant:
+    """LLM 호출 1회의 실행 자리. release는 여러 번 호출해도 한 번만 반납"""
+
+    __slots__ = ("scheduler", "user_id", "wait_seconds", "_task", "_released")
+
+    def __init__(self, scheduler: "FairScheduler", user_id: Optional[str], wait_seconds: float) -> None:
+        self.scheduler = scheduler
+        self.user_id = user_id
+        self.wait_seconds = wait_seconds
+        self._released = False
+        # on_llm_end/on_llm_error 없이 호출 태스크가 끝나도(취소 등) 자리가 새지 않도록 태스크 종료 시 반납
+        self._task = asyncio.current_task()
+        if self._task is not None:
+            self._task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, _: asyncio.Task) -> None:
+        self.release()
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        if self._task is not None:
+            self._task.remove_done_callback(self._on_task_done)
+        self.scheduler._release()
+
+
+class FairScheduler:
+    """
+    워커 프로세스의 동시 LLM 호출 수를 max_concurrency로 제한하고, 자리가 없으면 사용자별 가중 공정 큐로 순서를 정하는 스케줄러.
+    호출마다 시작 태그 = max(현재 가상 시각, 그 사용자의 직전 종료 태그)를 매기고 종료 태그를 예상 토큰 수 / 가중치만큼 늘려
+    시작 태그가 작은 호출부터 실행합니다(start-time fair queuing). 호출을 몰아 보내는 사용자는 자기 차례가 뒤로 밀리고,
+    가끔 호출하는 사용자는 대기열 앞에서 바로 실행됩니다. 가중치는 엔드포인트로 정하며 대화형 요청이 일괄 작업보다 큽니다.
+    사용자 한도(UserQuota)가 있으면 LLM 토큰 한도를 넘긴 사용자는 버킷이 다시 찰 때까지 대기열에 들어가지 않습니다.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_SCHEDULER_MAX_CONCURRENCY,
+        weights: Optional[Dict[str, float]] = None,
+        default_weight: float = LLM_SCHEDULER_DEFAULT_WEIGHT,
+        quota: Optional[UserQuota] = None,
+        stats_max_users: int = LLM_SCHEDULER_STATS_MAX_USERS,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.weights = weights if weights is not None else LLM_SCHEDULER_WEIGHTS
+        self.default_weight = default_weight
+        self.quota = quota
+        self.stats_max_users = stats_max_users
+        self.callback_handler = FairSchedulingCallbackHandler(self)
+        self._in_flight = 0
+        self._virtual_time = 0.0
+        self._last_finish: Dict[str, float] = {}
+        self._queue: List[Tuple[float, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._stats: "OrderedDict[str, _UserStats]" = OrderedDict()
+        self._debits: set = set()
+
+    def weight_for(self, endpoint: Optional[str]) -> float:
+        return self.weights.get(endpoint, self.default_weight) if endpoint else self.default_weight
+
+    def _user_stats(self, key: str) -> _UserStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _UserStats()
+            if len(self._stats) > self.stats_max_users:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(key)
+        return stats
+
+    async def acquire(self, user_id: Optional[str], endpoint: Optional[str], cost: float) -> SchedulerGrant:
+        """실행 자리를 받을 때까지 대기 (자리가 남아 있고 대기열이 비어 있으면 바로 반환)"""
+        started = time.perf_counter()
+        quota_wait = await self.quota.wait_for_llm_tokens(user_id) if self.quota is not None else 0.0
+
+        key = user_id or _ANONYMOUS
+        stats = self._user_stats(key)
+        start_tag = max(self._virtual_time, self._last_finish.get(key, 0.0))
+        self._last_finish[key] = start_tag + cost / self.weight_for(endpoint)
+
+        queued = not (self._in_flight < self.max_concurrency and not self._queue)
+        if not queued:
+            self._in_flight += 1
+            self._virtual_time = start_tag
+        else:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._queue, (start_tag, next(self._sequence), future))
+            stats.queued += 1
+            LLM_SCHEDULER_QUEUED.inc()
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # 자리를 받은 직후 취소되면 바로 반납
+                    self._release()
+                raise
+            finally:
+                stats.queued -= 1
+                LLM_SCHEDULER_QUEUED.dec()
+
+        waited = time.perf_counter() - started
+        stats.calls += 1
+        stats.total_wait += waited
+        stats.max_wait = max(stats.max_wait, waited)
+        stats.quota_wait += quota_wait
+        if queued or quota_wait > 0:
+            stats.waited_calls += 1
+        LLM_SCHEDULER_WAIT.labels(endpoint or "unknown").observe(waited)
+        return SchedulerGrant(self, user_id, waited)
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        while self._queue and self._in_flight < self.max_concurrency:
+            start_tag, _, future = heapq.heappop(self._queue)
+            if future.done():
+                # 대기 중 취소된 호출
+                continue
+            self._in_flight += 1
+            self._virtual_time = max(self._virtual_time, start_tag)
+            future.set_result(None)
+        if self._in_flight == 0 and not self._queue:
+            # 유휴 상태에서는 모든 사용자가 같은 위치에서 다시 시작
+            self._last_finish.clear()
+
+    def debit_nowait(self, user_id: Optional[str], tokens: int) -> None:
+        """호출이 끝난 뒤 실제 사용 토큰을 응답 지연 없이 사용자 한도에서 차감"""
+        if self.quota is None or not user_id or tokens <= 0:
+            return
+        task = asyncio.get_running_loop().create_task(self.quota.debit_llm_tokens(user_id, tokens))
+        self._debits.add(task)
+        task.add_done_callback(self._debits.discard)
+
+    @contextmanager
+    def activate(self) -> Iterator[None]:
+        """블록 안(여기서 시작한 태스크 포함)의 모든 LangChain LLM 호출이 이 스케줄러를 거치도록 설정"""
+        token = _scheduler_handler_var.set(self.callback_handler)
+        try:
+            yield
+        finally:
+            _scheduler_handler_var.reset(token)
+
+    def stats(self) -> Dict[str, Any]:
+        """워커의 실행/대기 중인 호출 수와 최근 사용자별 대기 시간"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "queued": sum(1 for _, _, future in self._queue if not future.done()),
+            "users": {key: stats.to_dict() for key, stats in self._stats.items()},
+        }
+
+    async def aclose(self) -> None:
+        """워커 종료 시 남은 토큰 차감 완료 대기"""
+        if self._debits:
+            await asyncio.gather(*self._debits, return_exceptions=True)
+
+
+def estimate_tokens(messages: List[List[Any]]) -> int:
+    """프롬프트 글자 수로 추정한 입력 토큰 수 + 예상 출력 토큰 수 (대기열 순서 계산용)"""
+    chars = sum(len(str(getattr(message, "content", message))) for batch in messages for message in batch)
+    return int(chars / LLM_SCHEDULER_CHARS_PER_TOKEN) + LLM_SCHEDULER_EXPECTED_OUTPUT_TOKENS
+
+
+def _used_tokens(response: LLMResult) -> int:
+    tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                tokens += (usage.get("input_tokens") or 0) + (usage.get("output_tokens") or 0)
+    return tokens
+
+
+class FairSchedulingCallbackHandler(AsyncCallbackHandler):
+    """
+    LLM 호출 시작 시 스케줄러의 실행 자리를 받을 때까지 대기하고, 끝나면 자리를 반납하며 사용 토큰을 사용자 한도에서 차감하는 콜백.
+    사용자와 엔드포인트는 요청의 사용량 추적 범위(CostLedger.track)에서 가져옵니다.
+    """
+
+    # 호출 시작 전에 반드시 대기가 끝나야 하므로 다른 콜백과 병렬로 실행하지 않음
+    run_inline = True
+
+    def __init__(self, scheduler: FairScheduler) -> None:
+        self.scheduler = scheduler
+        self._grants: Dict[UUID, SchedulerGrant] = {}
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any) -> None:
+        usage = current_usage()
+        user_id = usage.user_id if usage is not None else None
+        endpoint = usage.endpoint if usage is not None else None
+        self._grants[run_id] = await self.scheduler.acquire(user_id, endpoint, estimate_tokens(messages))
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        grant = self._grants.pop(run_id, None)
+        if grant is not None:
+            grant.release()
+            self.scheduler.debit_nowait(grant.user_id, _used_tokens(response))
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        grant = self._grants.pop(run_id, None)
+        if grant is not None:
+            grant.release()
+
+
+_scheduler_handler_var: ContextVar[Optional[FairSchedulingCallbackHandler]] = ContextVar(
+    "fair_scheduling_callback_handler", default=None
+)
+# 스케줄러가 활성화된 요청의 모든 LangChain LLM 호출에 스케줄링 콜백을 자동으로 붙임
+register_configure_hook(_scheduler_handler_var, inheritable=True)
@@ -0,0 +1,341 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config.config import (
+    HISTORY_CACHE_MAX_ENTRIES,
+    HISTORY_CACHE_TTL_SECONDS,
+    HISTORY_DIGEST_MAX_ACTION_ITEMS,
+    HISTORY_DIGEST_MAX_HIGHLIGHTS,
+    HISTORY_DIGEST_RECENT_MEETINGS,
+)
+from src.utils.metrics import record_cache_lookup
+
+logger = logging.getLogger("history_store")
+
+
+def _normalize_item(text: str) -> str:
+    return " ".join(text.split()).rstrip(".").lower()
+
+
+def _empty_digest(user_id: str, name: Optional[str]) -> Dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "name": name,
+        "meeting_count": 0,
+        "last_meeting_date": None,
+        "recent_meetings": [],
+        "open_action_items": [],
+    }
+
+
+def summary_to_record(summary: Dict[str, Dict[str, List[str]]]) -> Tuple[List[str], List[str], List[str]]:
+    """주제별 Done/ToDo 요약을 (하이라이트, 새 액션 아이템, 완료된 항목)으로 변환"""
+    highlights, todo, done = [], [], []
+    for topic, items in summary.items():
+        for item in items.get("Done", []):
+            highlights.append(f"{topic}: {item}")
+            done.append(item)
+        todo.extend(items.get("ToDo", []))
+    return highlights, todo, done
+
+
+def analysis_to_record(analysis: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """미팅 분석 결과를 (하이라이트, 새 액션 아이템)으로 변환"""
+    core = analysis.get("ai_core_summary") or {}
+    highlights = [core["core_content"]] if core.get("core_content") else []
+    highlights += core.get("decisions_made") or []
+    action_items = list(analysis.get("leader_action_items") or []) + list(analysis.get("member_action_items") or [])
+    return highlights, action_items
+
+
+class MeetingHistoryStore:
+    """
+    사용자별 1on1 기록 저장소 (SQLite, user_id/date 인덱스).
+    미팅이 추가될 때마다 최근 요약과 미완료 액션 아이템으로 이루어진 고정 크기 digest를 같은 트랜잭션에서
+    갱신하므로, 템플릿 생성은 기록 전체 대신 digest 한 행만 읽습니다 (워커 단위 read-through LRU 캐시).
+    다른 워커의 기록은 캐시 TTL(HISTORY_CACHE_TTL_SECONDS) 안에 반영됩니다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        cache_size: int = HISTORY_CACHE_MAX_ENTRIES,
+        cache_ttl_seconds: float = HISTORY_CACHE_TTL_SECONDS,
+        recent_meetings: int = HISTORY_DIGEST_RECENT_MEETINGS,
+        max_highlights: int = HISTORY_DIGEST_MAX_HIGHLIGHTS,
+        max_action_items: int = HISTORY_DIGEST_MAX_ACTION_ITEMS,
+    ) -> None:
+        self.path = path
+        self.cache_size = cache_size
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.recent_meetings = recent_meetings
+        self.max_highlights = max_highlights
+        self.max_action_items = max_action_items
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS users (
+                user_id TEXT PRIMARY KEY,
+                name TEXT
+            );
+            CREATE TABLE IF NOT EXISTS meetings (
+                meeting_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                date TEXT NOT NULL,
+                title TEXT,
+                highlights TEXT NOT NULL,
+                action_items TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS user_digests (
+                user_id TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_meetings_user_date ON meetings (user_id, date);
+            CREATE INDEX IF NOT EXISTS idx_meetings_date ON meetings (date);
+            """
+        )
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+
+    # ==================== 캐시 ====================
+
+    def _cache_get(self, key: Tuple[str, str]) -> Tuple[bool, Any]:
+        entry = self._cache.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self._cache.pop(key, None)
+            record_cache_lookup("history", hit=False)
+            return False, None
+        self._cache.move_to_end(key)
+        record_cache_lookup("history", hit=True)
+        return True, entry[1]
+
+    def _cache_put(self, key: Tuple[str, str], value: Any) -> None:
+        self._cache[key] = (time.monotonic() + self.cache_ttl_seconds, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _cached(self, kind: str, user_id: str, load) -> Any:
+        hit, value = self._cache_get((kind, user_id))
+        if hit:
+            return value
+        value = await asyncio.to_thread(self._execute, load, user_id)
+        self._cache_put((kind, user_id), value)
+        return value
+
+    # ==================== 조회 ====================
+
+    def _execute(self, func, *args):
+        with self._lock:
+            return func(*args)
+
+    def _load_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT user_id, name FROM users WHERE user_id = ?", (user_id,)).fetchone()
+        return {"user_id": row[0], "name": row[1]} if row else None
+
+    def _load_digest(self, user_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT digest FROM user_digests WHERE user_id = ?", (user_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _load_meetings(self, user_id: str, since: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT meeting_id, date, title, highlights, action_items FROM meetings "
+            "WHERE user_id = ? AND date >= ? ORDER BY date DESC LIMIT ?",
+            (user_id, since or "", limit),
+        ).fetchall()
+        return [
+            {
+                "meeting_id": meeting_id,
+                "date": date,
+                "title": title,
+                "highlights": json.loads(highlights),
+                "action_items": json.loads(action_items),
+            }
+            for meeting_id, date, title, highlights, action_items in rows
+        ]
+
+    async def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        if not user_id:
+            return None
+        return await self._cached("user", user_id, self._load_user)
+
+    async def get_digest(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """최근 요약/미완료 액션 아이템 digest (기록이 없으면 None)"""
+        if not user_id:
+            return None
+        return await self._cached("digest", user_id, self._load_digest)
+
+    async def list_meetings(self, user_id: str, since: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._execute, self._load_meetings, user_id, since, limit)
+
+    # ==================== 기록 ====================
+
+    def _merge_digest(
+        self,
+        digest: Dict[str, Any],
+        meeting: Dict[str, Any],
+        done: List[str],
+    ) -> Dict[str, Any]:
+        """이전 digest에 미팅 하나를 반영 (전체 기록을 다시 읽지 않는 증분 갱신)"""
+        recent = [m for m in digest["recent_meetings"] if m["meeting_id"] != meeting["meeting_id"]]
+        recent.append({
+            "meeting_id": meeting["meeting_id"],
+            "date": meeting["date"],
+            "title": meeting["title"],
+            "highlights": meeting["highlights"][:self.max_highlights],
+        })
+        recent.sort(key=lambda m: m["date"], reverse=True)
+
+        closed = {_normalize_item(item) for item in done}
+        open_items = [
+            item for item in digest["open_action_items"]
+            if _normalize_item(item["item"]) not in closed and item["meeting_id"] != meeting["meeting_id"]
+        ]
+        known = {_normalize_item(item["item"]) for item in open_items}
+        for text in meeting["action_items"]:
+            if _normalize_item(text) not in known:
+                known.add(_normalize_item(text))
+                open_items.append({"item": text, "date": meeting["date"], "meeting_id": meeting["meeting_id"]})
+        open_items.sort(key=lambda item: item["date"], reverse=True)
+
+        dates = [digest["last_meeting_date"], meeting["date"]]
+        return {
+            **digest,
+            "last_meeting_date": max(date for date in dates if date),
+            "recent_meetings": recent[:self.recent_meetings],
+            "open_action_items": open_items[:self.max_action_items],
+        }
+
+    def _insert_meeting(self, meeting: Dict[str, Any], done: List[str]) -> Dict[str, Any]:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            user_id = meeting["user_id"]
+            existing = self._conn.execute(
+                "SELECT 1 FROM meetings WHERE meeting_id = ?", (meeting["meeting_id"],)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meetings VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    meeting["meeting_id"],
+                    user_id,
+                    meeting["date"],
+                    meeting["title"],
+                    json.dumps(meeting["highlights"], ensure_ascii=False),
+                    json.dumps(meeting["action_items"], ensure_ascii=False),
+                    time.time(),
+                ),
+            )
+            user = self._load_user(user_id)
+            digest = self._load_digest(user_id) or _empty_digest(user_id, user["name"] if user else None)
+            digest = self._merge_digest(digest, meeting, done)
+            if not existing:
+                # 같은 미팅을 다시 기록한 경우 횟수는 그대로 유지
+                digest["meeting_count"] += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO user_digests VALUES (?, ?, ?)",
+                (user_id, json.dumps(digest, ensure_ascii=False), time.time()),
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return digest
+
+    async def add_meeting(
+        self,
+        user_id: str,
+        meeting_id: str,
+        date: str,
+        title: Optional[str] = None,
+        highlights: Optional[List[str]] = None,
+        action_items: Optional[List[str]] = None,
+        done: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        미팅 하나를 기록하고 갱신된 digest를 반환합니다.
+        done에 포함된 항목과 같은 미완료 액션 아이템은 digest에서 제거됩니다.
+        """
+        meeting = {
+            "user_id": user_id,
+            "meeting_id": meeting_id,
+            "date": date,
+            "title": title,
+            "highlights": highlights or [],
+            "action_items": action_items or [],
+        }
+        digest = await asyncio.to_thread(self._execute, self._insert_meeting, meeting, done or [])
+        self._cache_put(("digest", user_id), digest)
+        return digest
+
+    async def upsert_user(self, user_id: str, name: Optional[str]) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            self._conn.execute,
+            "INSERT INTO users VALUES (?, ?) ON CONFLICT(user_id) DO UPDATE SET name = excluded.name",
+            (user_id, name),
+        )
+        self._cache_put(("user", user_id), {"user_id": user_id, "name": name})
+
+    async def seed(self, users: List[Dict[str, Any]]) -> int:
+        """사용자 목록(mock_db 형식)으로 비어 있는 저장소를 초기화. 이미 사용자가 있으면 건너뜀"""
+        count = await asyncio.to_thread(
+            self._execute, lambda: self._conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+        )
+        if count:
+            return 0
+        for user in users:
+            await self.upsert_user(user["user_id"], user.get("name"))
+            for meeting in user.get("one_on_one_history", []):
+                highlights, todo, done = summary_to_record(meeting.get("summary", {}))
+                await self.add_meeting(
+                    user["user_id"], meeting["meeting_id"], meeting["date"],
+                    highlights=highlights, action_items=todo, done=done,
+                )
+        logger.info(f"1on1 기록 저장소 초기화: 사용자 {len(users)}명")
+        return len(users)
+
+    async def record_analysis(
+        self,
+        user_id: str,
+        meeting_id: str,
+        analysis: Dict[str, Any],
+        meeting_datetime: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """완료된 미팅 분석 결과를 기록하고 digest를 증분 갱신"""
+        highlights, action_items = analysis_to_record(analysis)
+        date = (meeting_datetime or datetime.now().isoformat())[:10]
+        return await self.add_meeting(
+            user_id, meeting_id, date, title=analysis.get("title"), highlights=highlights, action_items=action_items,
+        )
+
+    async def aclose(self) -> None:
+        await asyncio.to_thread(self._execute, self._conn.close)
+
+
+def render_digest(digest: Dict[str, Any]) -> str:
+    """digest를 previous_summary 프롬프트 섹션 텍스트로 변환 (길이는 digest 크기로 제한됨)"""
+    lines = ["[Done - 최근 1on1 요약]"]
+    for meeting in digest["recent_meetings"]:
+        header = f"- {meeting['date']}" + (f" {meeting['title']}" if meeting.get("title") else "")
+        lines.append(header)
+        lines.extend(f"  - {highlight}" for highlight in meeting["highlights"])
+    if digest["open_action_items"]:
+        lines.append("[ToDo - 미완료 액션 아이템]")
+        lines.extend(f"- {item['item']} ({item['date']})" for item in digest["open_action_items"])
+    return "\n".join(lines)
@@ -0,0 +1,63 @@
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from src.config.config import JOB_TTL_SECONDS
+
+logger = logging.getLogger("job_store")
+
+
+class JobStore:
+    """공유 상태 저장소 위에서 워커 간에 조회 가능한 작업 상태를 관리"""
+
+    def __init__(self, backend, ttl_seconds: int = JOB_TTL_SECONDS, prefix: str = "job") -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}"
+
+    async def create(self, job_type: str, job_id: Optional[str] = None, **metadata: Any) -> Optional[Dict[str, Any]]:
+        """작업 생성. 같은 job_id의 작업이 이미 있으면 덮어쓰지 않고 None 반환 (워커 간 동시 생성에도 하나만 성공)"""
+        now = datetime.now().isoformat()
+        job = {
+            "job_id": job_id or uuid.uuid4().hex,
+            "job_type": job_type,
+            "status": "queued",
+            "result": None,
+            "error": None,
+            "metadata": metadata,
+            "created_at": now,
+            "updated_at": now,
+        }
+        if not await self._save(job, nx=True):
+            logger.warning(f"이미 존재하는 작업 생성 시도: {job['job_id']}")
+            return None
+        logger.info(f"작업 생성: {job['job_id']} ({job_type})")
+        return job
+
+    async def update(self, job_id: str, **fields: Any) -> Optional[Dict[str, Any]]:
+        # 작업은 생성한 워커만 갱신하므로 별도 락 없이 읽기-수정-쓰기
+        job = await self.get(job_id)
+        if job is None:
+            logger.warning(f"존재하지 않는 작업 갱신 시도: {job_id}")
+            return None
+        job.update(fields)
+        job["updated_at"] = datetime.now().isoformat()
+        await self._save(job)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.backend.get(self._key(job_id))
+        return json.loads(raw) if raw else None
+
+    async def _save(self, job: Dict[str, Any], nx: bool = False) -> bool:
+        return bool(await self.backend.set(
+            self._key(job["job_id"]),
+            json.dumps(job, ensure_ascii=False),
+            ex=self.ttl_seconds,
+            nx=nx,
+        ))
@@ -0,0 +1,32 @@
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.utils.cost_ledger import record_llm_tokens
+from src.utils.metrics import record_llm_usage
+
+
+class UsageMetricsCallbackHandler(BaseCallbackHandler):
+    """LLM 호출 종료 시 usage_metadata의 토큰 수를 모델별 지표와 요청별 비용 원장에 기록하는 콜백"""
+
+    # 카운터 증가만 하므로 스레드 풀로 넘기지 않고 호출 스레드에서 바로 실행
+    run_inline = True
+
+    def __init__(self, model_name: str) -> None:
+        self.model_name = model_name
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if usage:
+                    record_llm_usage(self.model_name, usage.get("input_tokens"), usage.get("output_tokens"))
+                    record_llm_tokens(
+                        self.model_name,
+                        input_tokens=usage.get("input_tokens") or 0,
+                        output_tokens=usage.get("output_tokens") or 0,
+                        cached_tokens=(usage.get("input_token_details") or {}).get("cache_read") or 0,
+                        thinking_tokens=(usage.get("output_token_details") or {}).get("reasoning") or 0,
+                    )
@@ -0,0 +1,427 @@
+import math
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 지연 시간 히스토그램 기본 버킷 (초) - STT/LLM처럼 수 분 걸리는 작업까지 포함
+DEFAULT_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0
+)
+
+# 관측 경로에서는 락을 잡지 않는다. 이벤트 루프 단일 스레드 + GIL 하에서 정수/실수 덧셈은
+# 사실상 원자적으로 동작하며, 스레드 풀 노드에서 드물게 발생할 수 있는 경합 손실은 지표 용도로 허용한다.
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._default = self._new_child()
+            self._children[()] = self._default
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """라벨 조합별 자식 지표 반환 (최초 1회만 생성, 이후 관측 시 할당 없음)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: 라벨 개수가 맞지 않습니다 ({self.labelnames})")
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._samples())
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    metric_type = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.value += amount
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class Gauge(_Metric):
+    """증감 가능한 현재값 지표 (큐 길이, 처리 중 요청 수 등)"""
+
+    metric_type = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.value -= amount
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class DerivedGauge(_Metric):
+    """스크레이프 시점에 다른 지표로부터 계산되는 게이지 (예: 캐시 적중률)"""
+
+    metric_type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        compute: Callable[[], Dict[Tuple[str, ...], float]],
+    ) -> None:
+        self.compute = compute
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return None
+
+    def _samples(self) -> Iterable[str]:
+        for values, value in self.compute().items():
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}"
+
+
+class _HistogramChild:
+    __slots__ = ("upper_bounds", "bucket_counts", "sum", "count")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]) -> None:
+        self.upper_bounds = upper_bounds
+        # 마지막 칸은 +Inf 버킷. 누적 합은 렌더링 시점에 계산하여 관측 비용을 O(log n)으로 유지
+        self.bucket_counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    """고정 버킷 히스토그램 (버킷 배열은 라벨 조합별로 미리 할당)"""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        self.upper_bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in list(self._children.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.upper_bounds + (math.inf,), list(child.bucket_counts)):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {child.count}"
+
+
+class MetricsRegistry:
+    """Prometheus 텍스트 포맷으로 노출할 지표 모음"""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 지표입니다: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REGISTRY = MetricsRegistry()
+
+# ==================== 파이프라인 / 엔드포인트 지연 시간 ====================
+
+PIPELINE_NODE_DURATION = REGISTRY.histogram(
+    "pipeline_node_duration_seconds", "파이프라인 노드별 실행 시간", ("node", "status")
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "엔드포인트별 요청 처리 시간", ("method", "route", "status")
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "현재 처리 중인 HTTP 요청 수")
+
+# ==================== LLM / STT 사용량 ====================
+
+LLM_TOKENS = REGISTRY.counter("llm_tokens_total", "모델별 LLM 입력/출력 토큰 수", ("model", "direction"))
+STT_AUDIO_SECONDS = REGISTRY.counter("stt_audio_seconds_total", "STT로 처리한 오디오 길이 (초)")
+
+# ==================== 작업 큐 ====================
+
+ANALYSIS_JOB_QUEUE_DEPTH = REGISTRY.gauge("analysis_job_queue_depth", "완료되지 않은 비동기 분석 작업 수")
+
+# ==================== 캐시 ====================
+
+CACHE_LOOKUPS = REGISTRY.counter("cache_lookups_total", "캐시 조회 수", ("cache", "result"))
+
+
+def _cache_hit_ratios() -> Dict[Tuple[str, ...], float]:
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), child in list(CACHE_LOOKUPS._children.items()):
+        hits_and_total = totals.setdefault(cache, [0.0, 0.0])
+        if result == "hit":
+            hits_and_total[0] += child.value
+        hits_and_total[1] += child.value
+    return {(cache,): hits / total for cache, (hits, total) in totals.items() if total}
+
+
+CACHE_HIT_RATIO = REGISTRY.register(
+    DerivedGauge("cache_hit_ratio", "캐시별 적중률 (0~1)", ("cache",), _cache_hit_ratios)
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """캐시 조회 결과 기록 (적중률은 스크레이프 시점에 계산)"""
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+# ==================== 사전 생성 ====================
+
+GUIDE_SPECULATIONS = REGISTRY.counter(
+    "guide_speculations_total", "가이드 사전 생성 결과 (used: 사용됨, expired: 시간 초과 취소, evicted: 용량 초과 취소)", ("result",)
+)
+
+
+def record_guide_speculation(result: str) -> None:
+    """가이드 사전 생성 결과 기록"""
+    GUIDE_SPECULATIONS.labels(result).inc()
+
+
+EAGER_STT = REGISTRY.counter(
+    "eager_stt_total",
+    "업로드 완료 시 미리 시작한 STT 결과 (started: 시작, completed: 전사 완료, failed: 전사 실패, used: 분석 요청이 사용, expired: 사용되지 않고 폐기)",
+    ("result",),
+)
+
+
+def record_eager_stt(result: str) -> None:
+    """STT 사전 전사 결과 기록"""
+    EAGER_STT.labels(result).inc()
+
+
+# ==================== 녹음 사전 점검 ====================
+
+RECORDING_PREFLIGHT = REGISTRY.counter(
+    "recording_preflight_total",
+    "STT 전 녹음 헤더 점검 결과 (usable: 길이 확인, unknown: 헤더 미확인으로 그대로 진행, 그 외: 거부 사유)",
+    ("result",),
+)
+RECORDING_PREFLIGHT_DURATION = REGISTRY.histogram(
+    "recording_preflight_duration_seconds", "녹음 사전 점검 소요 시간 (Range 요청 포함)", ("container",)
+)
+
+
+def record_recording_preflight(result: str, container: Optional[str], seconds: float) -> None:
+    """녹음 사전 점검 결과/소요 시간 기록"""
+    RECORDING_PREFLIGHT.labels(result).inc()
+    RECORDING_PREFLIGHT_DURATION.labels(container or "unknown").observe(seconds)
+
+
+# ==================== 분석 결과 저장소 ====================
+
+ANALYSIS_STORE_WRITES = REGISTRY.counter(
+    "analysis_store_writes_total", "분석 결과 저장 (written: 저장 완료, failed: 저장 실패, dropped: 기록 대기 초과로 버림)", ("result",)
+)
+ANALYSIS_STORE_BYTES = REGISTRY.counter(
+    "analysis_store_bytes_total", "저장한 분석 결과 크기 (raw: 직렬화 JSON, stored: 압축 후)", ("kind",)
+)
+ANALYSIS_STORE_WRITE_DURATION = REGISTRY.histogram(
+    "analysis_store_write_duration_seconds", "분석 결과 1건의 직렬화/압축/원자적 기록 시간"
+)
+
+
+def record_analysis_store_write(result: str, raw_bytes: int = 0, stored_bytes: int = 0, seconds: float = 0.0) -> None:
+    """분석 결과 저장 결과/크기 기록"""
+    ANALYSIS_STORE_WRITES.labels(result).inc()
+    if result == "written":
+        ANALYSIS_STORE_BYTES.labels("raw").inc(raw_bytes)
+        ANALYSIS_STORE_BYTES.labels("stored").inc(stored_bytes)
+        ANALYSIS_STORE_WRITE_DURATION.observe(seconds)
+
+
+# ==================== 응답 압축 ====================
+
+RESPONSE_COMPRESSION_BYTES = REGISTRY.counter(
+    "response_compression_bytes_total", "압축한 응답 크기 (raw: 압축 전, sent: 전송한 압축 본문)", ("encoding", "kind")
+)
+
+
+def record_response_compression(encoding: str, raw_bytes: int, sent_bytes: int) -> None:
+    """응답 압축 전/후 크기 기록"""
+    RESPONSE_COMPRESSION_BYTES.labels(encoding, "raw").inc(raw_bytes)
+    RESPONSE_COMPRESSION_BYTES.labels(encoding, "sent").inc(sent_bytes)
+
+
+# ==================== 연결 종료 시 조기 취소 ====================
+
+CLIENT_DISCONNECTS = REGISTRY.counter(
+    "client_disconnects_total", "처리 중 클라이언트 연결 종료 (cancelled: 작업 취소, detached: 작업 ID로 계속 실행)",
+    ("operation", "action"),
+)
+CANCELLATION_SAVED_SECONDS = REGISTRY.counter(
+    "cancellation_saved_seconds_total", "조기 취소로 절약한 처리 시간 추정치 (초)", ("operation",)
+)
+CANCELLATION_SAVED_TOKENS = REGISTRY.counter(
+    "cancellation_saved_tokens_total", "조기 취소로 절약한 LLM 토큰 추정치", ("operation",)
+)
+
+# ==================== 요청 마감 시간 ====================
+
+DEADLINE_ACTIONS = REGISTRY.counter(
+    "deadline_actions_total", "마감 시간 때문에 바뀐 단계 처리 (downgraded: 빠른 모델로 변경, exceeded: 중단)",
+    ("stage", "action"),
+)
+
+
+# ==================== 요청 묶음 처리 (micro-batching) ====================
+
+MICRO_BATCH_SIZE = REGISTRY.histogram(
+    "micro_batch_size", "LLM 호출 1회로 묶어 처리한 요청 수", ("batcher",), buckets=(1, 2, 4, 8, 16, 32)
+)
+MICRO_BATCH_FALLBACKS = REGISTRY.counter(
+    "micro_batch_fallbacks_total", "묶음 응답에서 결과를 얻지 못해 단독 호출로 다시 처리한 요청 수 (error: 호출 실패, missing: 항목 누락/형식 오류)",
+    ("batcher", "reason"),
+)
+
+
+# ==================== 중복 요청 처리 ====================
+
+REQUEST_DEDUP = REGISTRY.counter(
+    "request_dedup_total",
+    "중복 요청 처리 결과 (new: 직접 실행, joined: 진행 중인 실행 공유, replayed: 보관된 응답 반환, conflict: 다른 본문에 키 재사용)",
+    ("endpoint", "result"),
+)
+
+
+# ==================== 2단계 분석 미리보기 ====================
+
+ANALYSIS_PREVIEWS = REGISTRY.counter(
+    "analysis_previews_total",
+    "미리보기 생성 결과 (ready: 생성, skipped: 빠른 모델 분석/마감 임박으로 생략, failed: 실패/시간 초과)",
+    ("result",),
+)
+
+
+# ==================== 사용자별 한도 / LLM 공정 스케줄러 ====================
+
+USER_QUOTA_THROTTLED = REGISTRY.counter(
+    "user_quota_throttled_total", "사용자 한도 초과 수 (requests: 429로 거절, llm_tokens: LLM 호출 지연)", ("kind",)
+)
+LLM_SCHEDULER_WAIT = REGISTRY.histogram(
+    "llm_scheduler_wait_seconds", "LLM 호출이 실행 자리를 받기까지 대기한 시간 (토큰 한도 대기 포함)", ("endpoint",)
+)
+LLM_SCHEDULER_QUEUED = REGISTRY.gauge("llm_scheduler_queued", "공정 스케줄러 대기열에서 기다리는 LLM 호출 수")
+
+
+def record_llm_usage(model: str, input_tokens: Optional[int], output_tokens: Optional[int]) -> None:
+    """모델별 LLM 토큰 사용량 기록"""
+    if input_tokens:
+        LLM_TOKENS.labels(model, "input").inc(input_tokens)
+    if output_tokens:
+        LLM_TOKENS.labels(model, "output").inc(output_tokens)
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from src.config.config import MICRO_BATCH_MAX_SIZE, MICRO_BATCH_WINDOW_MS
+from src.utils.cost_ledger import RequestUsage, current_usage, shared_llm_usage
+from src.utils.metrics import MICRO_BATCH_FALLBACKS, MICRO_BATCH_SIZE
+
+logger = logging.getLogger("micro_batch")
+
+# 묶음 호출: 입력 목록 → 같은 순서의 결과 목록 (결과를 얻지 못한 항목은 None)
+BatchFn = Callable[[List[Any]], Awaitable[List[Optional[Any]]]]
+SingleFn = Callable[[Any], Awaitable[Any]]
+
+
+class _Pending:
+    __slots__ = ("items", "futures", "usages", "timer")
+
+    def __init__(self) -> None:
+        self.items: List[Any] = []
+        self.futures: List[asyncio.Future] = []
+        self.usages: List[Optional[RequestUsage]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class MicroBatcher:
+    """
+    짧은 LLM 요청을 모아 한 번의 호출로 처리하는 결합기 (워커 프로세스 단위).
+
+    첫 요청이 들어온 뒤 window_ms 동안(또는 max_batch_size에 도달할 때까지) 같은 key의 요청을 모아
+    run_batch로 한 번에 처리하고, 결과를 각 호출자에게 돌려줍니다. 묶음 호출이 실패하거나
+    응답에서 빠진 항목은 run_single로 개별 호출하여 처리합니다. 모인 요청이 하나뿐이면 run_single을 바로 사용합니다.
+    묶음 호출의 토큰 사용량은 참여한 요청 수로 나누어 각 요청의 비용 원장에 기록합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run_batch: BatchFn,
+        run_single: SingleFn,
+        key: Callable[[Any], Hashable] = lambda item: None,
+        window_ms: float = MICRO_BATCH_WINDOW_MS,
+        max_batch_size: int = MICRO_BATCH_MAX_SIZE,
+    ) -> None:
+        self.name = name
+        self.run_batch = run_batch
+        self.run_single = run_single
+        self.key = key
+        self.window_seconds = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[Hashable, _Pending] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """요청을 현재 묶음에 추가하고 결과를 기다림 (호출자가 취소되면 해당 항목만 결과를 버림)"""
+        loop = asyncio.get_running_loop()
+        key = self.key(item)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _Pending()
+            pending.timer = loop.call_later(self.window_seconds, self._flush, key, pending)
+
+        future = loop.create_future()
+        pending.items.append(item)
+        pending.futures.append(future)
+        pending.usages.append(current_usage())
+        if len(pending.items) >= self.max_batch_size:
+            self._flush(key, pending)
+        return await future
+
+    def _flush(self, key: Hashable, pending: _Pending) -> None:
+        if self._pending.get(key) is not pending:
+            return  # 이미 크기 제한으로 처리 시작됨
+        del self._pending[key]
+        pending.timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._run(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: _Pending) -> None:
+        # 기다리는 동안 취소된 호출자는 제외
+        live = [
+            (item, future, usage)
+            for item, future, usage in zip(pending.items, pending.futures, pending.usages)
+            if not future.done()
+        ]
+        try:
+            if live:
+                await self._process(live)
+        finally:
+            # 워커 종료 등으로 처리가 중단되면 기다리는 호출자도 취소
+            for _, future, _ in live:
+                if not future.done():
+                    future.cancel()
+
+    async def _process(self, live: List[Tuple[Any, asyncio.Future, Optional[RequestUsage]]]) -> None:
+        MICRO_BATCH_SIZE.labels(self.name).observe(len(live))
+        if len(live) == 1:
+            await self._run_single(*live[0])
+            return
+
+        items = [item for item, _, _ in live]
+        try:
+            with shared_llm_usage([usage for _, _, usage in live]):
+                results = list(await self.run_batch(items))
+            results += [None] * (len(items) - len(results))
+            reason = "missing"
+        except Exception as e:
+            logger.warning(f"{self.name} 묶음 호출 실패, 개별 호출로 처리합니다 ({len(items)}건): {e}")
+            results, reason = [None] * len(items), "error"
+
+        retries: List[Tuple[Any, asyncio.Future, Optional[RequestUsage]]] = []
+        for (item, future, usage), result in zip(live, results):
+            if result is None:
+                retries.append((item, future, usage))
+            elif not future.done():
+                future.set_result(result)
+        if retries:
+            MICRO_BATCH_FALLBACKS.labels(self.name, reason).inc(len(retries))
+            await asyncio.gather(*(self._run_single(*retry) for retry in retries))
+
+    async def _run_single(self, item: Any, future: asyncio.Future, usage: Optional[RequestUsage]) -> None:
+        try:
+            with shared_llm_usage([usage]):
+                result = await self.run_single(item)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+    async def aclose(self) -> None:
+        """워커 종료 시 대기 중인 묶음과 진행 중인 호출 취소"""
+        for pending in self._pending.values():
+            pending.timer.cancel()
+            for future in pending.futures:
+                future.cancel()
+        self._pending.clear()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
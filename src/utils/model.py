@@ -3,6 +3,8 @@ import logging
 from typing import Optional
 from langchain_google_vertexai import ChatVertexAI
 
+from src.utils.llm_callbacks import UsageMetricsCallbackHandler
+
 from src.config.config import (
     GOOGLE_CLOUD_PROJECT,
     GOOGLE_CLOUD_LOCATION,
@@ -17,6 +19,7 @@ from src.config.config import (
     VERTEX_AI_MODEL,
     VERTEX_AI_TEMPERATURE,
     VERTEX_AI_MAX_TOKENS,
+    VERTEX_AI_FALLBACK_MODEL,
     ASSEMBLYAI_API_KEY,
     ASSEMBLYAI_LANGUAGE,
     ASSEMBLYAI_PUNCTUATE,
@@ -37,6 +40,7 @@ llm = ChatVertexAI(
     max_output_tokens=GEMINI_MAX_TOKENS,
     temperature=GEMINI_TEMPERATURE,
     thinking_budget=GEMINI_THINKING_BUDGET,
+    callbacks=[UsageMetricsCallbackHandler(GEMINI_MODEL)],
 )
 
 # 제목 생성용 LLM (config에서 설정 가져오기)
@@ -47,6 +51,7 @@ title_llm = ChatVertexAI(
     max_output_tokens=TITLE_GEMINI_MAX_TOKENS,
     temperature=TITLE_GEMINI_TEMPERATURE,
     thinking_budget=TITLE_GEMINI_THINKING_BUDGET,
+    callbacks=[UsageMetricsCallbackHandler(TITLE_GEMINI_MODEL)],
 )
 
 # Vertex AI Gemini 분석 모델 (STT 분석용)
@@ -56,6 +61,17 @@ meeting_llm = ChatVertexAI(
     model_name=VERTEX_AI_MODEL,
     temperature=VERTEX_AI_TEMPERATURE,
     max_output_tokens=VERTEX_AI_MAX_TOKENS,
+    callbacks=[UsageMetricsCallbackHandler(VERTEX_AI_MODEL)],
+)
+
+# 마감 시간이 촉박한 요청용 분석 모델 (같은 출력 한도, 더 빠른 모델)
+meeting_fallback_llm = ChatVertexAI(
+    project=GOOGLE_CLOUD_PROJECT,
+    location=GOOGLE_CLOUD_LOCATION,
+    model_name=VERTEX_AI_FALLBACK_MODEL,
+    temperature=VERTEX_AI_TEMPERATURE,
+    max_output_tokens=VERTEX_AI_MAX_TOKENS,
+    callbacks=[UsageMetricsCallbackHandler(VERTEX_AI_FALLBACK_MODEL)],
 )
 
 class SpeechTranscriber:
@@ -67,9 +83,8 @@ class SpeechTranscriber:
         
         if not self.api_key:
             raise ValueError("AssemblyAI API 키가 필요합니다")
-            
-        aai.settings.api_key = self.api_key
         
+        # 전역 aai.settings를 건드리지 않고, 인증은 ProviderClients의 HTTP 클라이언트가 담당
         # 1on1 미팅용 전사 설정 생성 (timeout 연장)
         self.config = aai.TranscriptionConfig(
             language_code=ASSEMBLYAI_LANGUAGE,
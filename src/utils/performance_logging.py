@@ -1,47 +1,78 @@
+import inspect
 import time
 import logging
-from typing import Dict, Any, Callable
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Optional
 from functools import wraps
 from datetime import datetime
 
+from src.utils.metrics import PIPELINE_NODE_DURATION
+from src.utils.tracing import current_trace_id, start_span
+
 logger = logging.getLogger("performance_logging")
 
 def time_node_execution(node_name: str):
-    """노드 실행 시간 측정 데코레이터"""
+    """노드 실행을 span으로 감싸 실행 시간을 측정하는 데코레이터 (동기/비동기 노드 모두 지원)"""
     def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(state, *args, **kwargs):
+                with _node_span(state, node_name):
+                    return await func(state, *args, **kwargs)
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(state, *args, **kwargs):
-            # state에서 performance_metrics 가져오기 또는 생성
-            if "performance_metrics" not in state or state["performance_metrics"] is None:
-                state["performance_metrics"] = {}
-                
-            start_time = time.time()
-            
-            try:
-                result = func(state, *args, **kwargs)
-                
-                # 실행 시간 계산 및 기록
-                duration = time.time() - start_time
-                state["performance_metrics"][f"{node_name}_duration"] = duration
-                state["performance_metrics"][f"{node_name}_status"] = "success"
-                
-                logger.info(f"⏱️ {node_name} 실행 시간: {duration:.2f}초")
-                
-                return result
-                
-            except Exception as e:
-                # 에러 발생 시에도 시간 기록
-                duration = time.time() - start_time
-                state["performance_metrics"][f"{node_name}_duration"] = duration
-                state["performance_metrics"][f"{node_name}_status"] = "failed"
-                state["performance_metrics"][f"{node_name}_error"] = str(e)
-                
-                logger.error(f"❌ {node_name} 실행 실패 ({duration:.2f}초): {e}")
-                raise
-                
+            with _node_span(state, node_name):
+                return func(state, *args, **kwargs)
+
         return wrapper
     return decorator
 
+
+@contextmanager
+def _node_span(state, node_name: str):
+    # state에서 performance_metrics 가져오기 또는 생성
+    if "performance_metrics" not in state or state["performance_metrics"] is None:
+        state["performance_metrics"] = {}
+
+    # 요청 마감 시간이 있으면 노드 시작 시점의 남은 예산 기록
+    deadline = state.get("deadline")
+    if deadline is not None:
+        state["performance_metrics"][f"{node_name}_budget_remaining"] = deadline.remaining()
+
+    start_time = time.perf_counter()
+    with start_span(f"node.{node_name}") as span:
+        try:
+            yield
+        except Exception as e:
+            _record_node_timing(state, node_name, _end_span(span, start_time, e), e)
+            raise
+        _record_node_timing(state, node_name, _end_span(span, start_time))
+
+
+def _end_span(span, start_time: float, error: Optional[Exception] = None) -> float:
+    # 트레이싱이 켜져 있으면 span의 측정값을, 꺼져 있으면 직접 측정한 값을 사용
+    if span is None:
+        return time.perf_counter() - start_time
+    span.end(error=error)
+    return span.duration_ms / 1000
+
+
+def _record_node_timing(state, node_name: str, duration: float, error: Optional[Exception] = None) -> None:
+    status = "failed" if error else "success"
+    state["performance_metrics"][f"{node_name}_duration"] = duration
+    state["performance_metrics"][f"{node_name}_status"] = status
+    PIPELINE_NODE_DURATION.labels(node_name, status).observe(duration)
+
+    if error:
+        # 에러 발생 시에도 시간 기록
+        state["performance_metrics"][f"{node_name}_error"] = str(error)
+        logger.error(f"❌ {node_name} 실행 실패 ({duration:.2f}초): {error}")
+    else:
+        logger.info(f"⏱️ {node_name} 실행 시간: {duration:.2f}초")
+
 def generate_performance_report(state: Dict) -> Dict[str, Any]:
     """성능 리포트 생성 (시간 추적만) 및 state에 저장"""
     
@@ -59,12 +90,24 @@ def generate_performance_report(state: Dict) -> Dict[str, Any]:
         duration = performance_metrics[duration_key]
         status = performance_metrics.get(f"{node_name}_status", "unknown")
         error = performance_metrics.get(f"{node_name}_error", None)
+        budget_remaining = performance_metrics.get(f"{node_name}_budget_remaining")
+        model_name = performance_metrics.get(f"{node_name}_model")
+        source = performance_metrics.get(f"{node_name}_source")
         
         node_detail = {
             "실행시간": f"{duration:.2f}초",
             "상태": status
         }
         
+        if budget_remaining is not None:
+            node_detail["시작시_남은예산"] = f"{budget_remaining:.2f}초"
+        
+        if model_name:
+            node_detail["모델"] = model_name
+        
+        if source:
+            node_detail["결과_출처"] = source
+        
         if error:
             node_detail["에러"] = str(error)
         
@@ -81,6 +124,7 @@ def generate_performance_report(state: Dict) -> Dict[str, Any]:
     
     report = {
         "timestamp": datetime.now().isoformat(),
+        "trace_id": current_trace_id(),
         "파이프라인_상태": state.get("status", "unknown"),
         "노드별_상세정보": node_info
     }
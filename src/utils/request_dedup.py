@@ -0,0 +1,256 @@
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from starlette.responses import Response
+
+from src.config.config import (
+    IDEMPOTENCY_TTL_SECONDS,
+    SINGLEFLIGHT_LEASE_SECONDS,
+    SINGLEFLIGHT_POLL_INTERVAL,
+    SINGLEFLIGHT_RESULT_TTL_SECONDS,
+)
+from src.utils.metrics import REQUEST_DEDUP
+
+logger = logging.getLogger("request_dedup")
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+# 중복 요청 처리 결과 (X-Dedup 헤더 값)
+DEDUP_HEADER = "X-Dedup"
+DEDUP_NEW = "NEW"  # 이 요청이 직접 실행
+DEDUP_JOINED = "JOINED"  # 같은 요청의 진행 중인 실행(다른 워커 포함) 결과를 공유
+DEDUP_REPLAYED = "REPLAYED"  # Idempotency-Key로 보관된 완료 응답을 반환
+
+# 보관된 응답을 복원할 때 다시 계산되는 헤더
+_RECOMPUTED_HEADERS = {"content-length", "content-type"}
+
+
+class IdempotencyKeyConflict(Exception):
+    """같은 Idempotency-Key를 다른 요청 본문에 재사용"""
+
+
+def request_fingerprint(endpoint: str, payload: Any) -> str:
+    """엔드포인트와 요청 본문의 정규(canonical) 해시 (같은 요청이면 워커와 관계없이 같은 값)"""
+    canonical = json.dumps(
+        {"endpoint": endpoint, "payload": payload},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class StoredResponse:
+    """워커 간에 공유/보관하는 응답 (상태 코드, 본문, 헤더)"""
+
+    status_code: int
+    body: str
+    media_type: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_response(cls, response: Response) -> "StoredResponse":
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in _RECOMPUTED_HEADERS}
+        return cls(response.status_code, bytes(response.body).decode("utf-8"), response.media_type, headers)
+
+    def to_response(self, dedup_status: str) -> Response:
+        return Response(
+            self.body,
+            status_code=self.status_code,
+            headers={**self.headers, DEDUP_HEADER: dedup_status},
+            media_type=self.media_type,
+        )
+
+    def dumps(self, fingerprint: str) -> str:
+        return json.dumps(
+            {"fingerprint": fingerprint, "status_code": self.status_code, "body": self.body,
+             "media_type": self.media_type, "headers": self.headers},
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def loads(cls, raw: bytes, fingerprint: str) -> "StoredResponse":
+        data = json.loads(raw)
+        if data["fingerprint"] != fingerprint:
+            raise IdempotencyKeyConflict("Idempotency-Key was already used with a different request body.")
+        return cls(data["status_code"], data["body"], data["media_type"], data["headers"])
+
+
+class _Flight:
+    __slots__ = ("task", "fingerprint", "waiters")
+
+    def __init__(self, task: asyncio.Task, fingerprint: str) -> None:
+        self.task = task
+        self.fingerprint = fingerprint
+        self.waiters = 0
+
+
+class RequestDeduplicator:
+    """
+    공유 상태 저장소 위에서 동작하는 중복 요청 처리기 (singleflight + Idempotency-Key).
+
+    - 같은 요청(정규 해시 기준)이 동시에 들어오면 실행 1회를 공유합니다. 같은 워커에서는 실행 태스크에 바로 합류하고,
+      다른 워커에서 실행 중이면 저장소의 실행 표시(lease)를 보고 결과가 기록될 때까지 기다립니다.
+      실행이 결과 없이 끝나면(실패/취소/워커 종료) 기다리던 요청 중 하나가 이어서 실행합니다.
+    - Idempotency-Key가 있으면 키 단위로 실행을 공유하고, 완료된 응답(5xx 제외)을 idempotency_ttl_seconds 동안 보관해
+      재시도에 그대로 돌려줍니다. 같은 키를 다른 본문에 쓰면 IdempotencyKeyConflict를 발생시킵니다.
+    - 실행을 기다리던 요청이 모두 취소(연결 종료)되면 실행도 취소합니다.
+    키가 없는 요청은 진행 중인 실행에만 합류하며, 완료 후 다시 보낸 요청(재생성 등)은 새로 실행합니다.
+    """
+
+    def __init__(
+        self,
+        backend,
+        lease_seconds: float = SINGLEFLIGHT_LEASE_SECONDS,
+        result_ttl_seconds: float = SINGLEFLIGHT_RESULT_TTL_SECONDS,
+        idempotency_ttl_seconds: float = IDEMPOTENCY_TTL_SECONDS,
+        poll_interval: float = SINGLEFLIGHT_POLL_INTERVAL,
+        prefix: str = "dedup",
+    ) -> None:
+        self.backend = backend
+        self.lease_seconds = lease_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self.idempotency_ttl_seconds = idempotency_ttl_seconds
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+        self._flights: Dict[str, _Flight] = {}
+
+    async def run(
+        self,
+        endpoint: str,
+        fingerprint: str,
+        produce: Callable[[], Awaitable[Response]],
+        idempotency_key: Optional[str] = None,
+        scope: Optional[str] = None,
+    ) -> Response:
+        """
+        produce를 중복 없이 실행하고 X-Dedup 헤더를 붙인 응답 반환.
+        scope는 Idempotency-Key의 적용 범위 (예: 사용자 ID)로, 다른 범위의 같은 키는 서로 무관합니다.
+        """
+        if idempotency_key is not None:
+            key = "idem:" + hashlib.sha256(f"{endpoint}\0{scope}\0{idempotency_key}".encode("utf-8")).hexdigest()
+        else:
+            key = f"flight:{fingerprint}"
+
+        flight = self._flights.get(key)
+        joined = flight is not None
+        if flight is None:
+            flight = _Flight(asyncio.create_task(self._lead(key, fingerprint, produce, idempotency_key is not None)), fingerprint)
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._flights.pop(key, None) if self._flights.get(key) is flight else None)
+        elif flight.fingerprint != fingerprint:
+            REQUEST_DEDUP.labels(endpoint, "conflict").inc()
+            raise IdempotencyKeyConflict("Idempotency-Key is already in use by a different request body.")
+
+        flight.waiters += 1
+        try:
+            stored, status = await asyncio.shield(flight.task)
+        except IdempotencyKeyConflict:
+            REQUEST_DEDUP.labels(endpoint, "conflict").inc()
+            raise
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # 결과를 기다리는 요청이 없으면 실행 취소
+                flight.task.cancel()
+
+        if joined and status == DEDUP_NEW:
+            status = DEDUP_JOINED
+        REQUEST_DEDUP.labels(endpoint, status.lower()).inc()
+        return stored.to_response(status)
+
+    def _key(self, key: str, suffix: str) -> str:
+        return f"{self.prefix}:{key}:{suffix}"
+
+    async def _lead(
+        self, key: str, fingerprint: str, produce: Callable[[], Awaitable[Response]], durable: bool
+    ) -> Tuple[StoredResponse, str]:
+        """이 워커의 대표 실행: 보관된 응답 확인 → 실행 표시 획득 시 직접 실행, 실패 시 다른 워커의 결과 대기"""
+        record_key = self._key(key, "response")
+        if durable:
+            raw = await self.backend.get(record_key)
+            if raw is not None:
+                return StoredResponse.loads(raw, fingerprint), DEDUP_REPLAYED
+
+        lease_key = self._key(key, "lease")
+        while True:
+            token = uuid.uuid4().hex
+            if await self.backend.set(lease_key, token, ex=self.lease_seconds, nx=True):
+                stored = await self._execute(key, lease_key, token, fingerprint, produce, record_key if durable else None)
+                return stored, DEDUP_NEW
+            stored = await self._wait_for_other(key, lease_key, fingerprint)
+            if stored is not None:
+                return stored, DEDUP_JOINED
+            # 다른 워커의 실행이 결과 없이 끝남 → 실행 표시 획득부터 다시 시도
+
+    async def _execute(
+        self,
+        key: str,
+        lease_key: str,
+        token: str,
+        fingerprint: str,
+        produce: Callable[[], Awaitable[Response]],
+        record_key: Optional[str],
+    ) -> StoredResponse:
+        heartbeat = asyncio.create_task(self._renew(lease_key, token))
+        try:
+            stored = StoredResponse.from_response(await produce())
+            if stored.status_code < 500:
+                payload = stored.dumps(fingerprint)
+                # 기다리는 다른 워커는 실행 표시의 토큰으로 이번 실행의 결과를 찾음
+                await self.backend.set(self._key(key, f"run:{token}"), payload, ex=self.result_ttl_seconds)
+                if record_key is not None:
+                    await self.backend.set(record_key, payload, ex=self.idempotency_ttl_seconds)
+            return stored
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+            await self._release(lease_key, token)
+
+    async def _renew(self, lease_key: str, token: str) -> None:
+        """실행하는 동안 실행 표시 만료 시간을 주기적으로 연장"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if await self.backend.get(lease_key) != token.encode("utf-8"):
+                logger.warning(f"실행 표시를 잃었습니다 ({lease_key}), 다른 워커가 같은 요청을 실행할 수 있습니다")
+                return
+            await self.backend.expire(lease_key, self.lease_seconds)
+
+    async def _release(self, lease_key: str, token: str) -> None:
+        # 조회와 삭제 사이에 만료되어 다른 워커가 획득하는 경우는 연장 주기상 사실상 발생하지 않음
+        try:
+            if await self.backend.get(lease_key) == token.encode("utf-8"):
+                await self.backend.delete(lease_key)
+        except Exception as e:
+            logger.warning(f"실행 표시 해제 실패 ({lease_key}): {e}")
+
+    async def _wait_for_other(self, key: str, lease_key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """다른 워커의 실행 결과 대기 (결과 없이 실행 표시가 사라지면 None)"""
+        owner = await self.backend.get(lease_key)
+        if owner is None:
+            return None
+        result_key = self._key(key, f"run:{owner.decode('utf-8')}")
+        while True:
+            raw = await self.backend.get(result_key)
+            if raw is not None:
+                return StoredResponse.loads(raw, fingerprint)
+            if await self.backend.get(lease_key) != owner:
+                # 실행이 끝나면서 결과를 기록했을 수 있으므로 한 번 더 확인
+                raw = await self.backend.get(result_key)
+                return StoredResponse.loads(raw, fingerprint) if raw is not None else None
+            await asyncio.sleep(self.poll_interval)
+
+    async def aclose(self) -> None:
+        """워커 종료 시 진행 중인 실행 취소"""
+        tasks = [flight.task for flight in self._flights.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,259 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.config.config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_VARIANTS
+from src.utils.metrics import record_cache_lookup
+from src.utils.similarity_cache import SimilarLookup
+
+logger = logging.getLogger("response_cache")
+
+# 응답 헤더(X-Cache)에 표시할 캐시 처리 결과
+CACHE_HIT = "HIT"
+CACHE_MISS = "MISS"
+CACHE_BYPASS = "BYPASS"
+CACHE_SPECULATIVE = "SPECULATIVE"  # 미리 생성해 둔(진행 중 포함) 가이드 스트림 사용
+CACHE_SIMILAR = "SIMILAR"  # 유사 요청(similarity_cache.py)의 최근 결과 재사용
+
+
+def _normalize(value: Any) -> Any:
+    """공백 차이 등 결과에 영향이 없는 입력 차이를 제거"""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def prompt_fingerprint(*prompts: str) -> str:
+    """프롬프트 원문 해시. 프롬프트가 수정되면 자동으로 이전 캐시 항목과 키가 달라짐"""
+    digest = hashlib.sha256()
+    for prompt in prompts:
+        digest.update(prompt.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def model_fingerprint(llm: Any) -> Dict[str, Any]:
+    """응답에 영향을 주는 모델 설정"""
+    return {
+        "model": getattr(llm, "model_name", type(llm).__name__),
+        "temperature": getattr(llm, "temperature", None),
+        "max_output_tokens": getattr(llm, "max_output_tokens", None),
+        "thinking_budget": getattr(llm, "thinking_budget", None),
+    }
+
+
+def make_cache_key(
+    generation_type: str,
+    user_id: Optional[str],
+    prompt_variables: Dict[str, Any],
+    llm: Any,
+    prompt_version: str,
+) -> str:
+    """생성 타입, 정규화된 프롬프트 입력, 모델 설정, 프롬프트 버전의 정규(canonical) 해시"""
+    canonical = json.dumps(
+        {
+            "generation_type": generation_type,
+            "user_id": user_id,
+            "inputs": _normalize(prompt_variables),
+            "model": model_fingerprint(llm),
+            "prompt_version": prompt_version,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return f"{generation_type}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+
+
+class _CacheEntry:
+    __slots__ = ("variants", "expires_at", "next_index")
+
+    def __init__(self, expires_at: float) -> None:
+        self.variants: List[Any] = []
+        self.expires_at = expires_at
+        self.next_index = 0
+
+
+class ResponseCache:
+    """
+    생성 결과의 정확 일치(exact-match) 캐시 (워커 프로세스 단위, TTL + LRU).
+    생성 타입별로 최대 N개의 응답 변형을 모은 뒤에는 모은 변형을 번갈아 반환합니다.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+        variants: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.variants = variants if variants is not None else dict(RESPONSE_CACHE_VARIANTS)
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        """만료되지 않은 항목 존재 여부 (변형 풀을 채우는 중인 항목 포함)"""
+        entry = self._entries.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    def _pool_size(self, key: str) -> int:
+        return max(self.variants.get(key.split(":", 1)[0], 1), 1)
+
+    def get(self, key: str) -> Optional[Any]:
+        """저장된 변형을 순서대로 반환. 없거나 만료되었거나 변형 풀이 아직 덜 찼으면 None"""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            entry = None
+        if entry is None or len(entry.variants) < self._pool_size(key):
+            return None
+
+        self._entries.move_to_end(key)
+        value = entry.variants[entry.next_index % len(entry.variants)]
+        entry.next_index += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            entry = _CacheEntry(time.monotonic() + self.ttl_seconds)
+            self._entries[key] = entry
+        if len(entry.variants) < self._pool_size(key):
+            entry.variants.append(value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _cache_name(key: str) -> str:
+    return f"response_{key.split(':', 1)[0]}"
+
+
+def _lookup_similar(cache: ResponseCache, key: str, similar: Optional[SimilarLookup]) -> Optional[Any]:
+    """
+    정확 일치 미스 후 유사 요청 결과 조회.
+    같은 키의 변형 풀을 채우는 중이면(동일 요청 반복) 새 변형을 생성하도록 조회하지 않습니다.
+    """
+    if similar is None or key in cache:
+        return None
+    value = similar.get()
+    record_cache_lookup(f"similar_{key.split(':', 1)[0]}", hit=value is not None)
+    return value
+
+
+def _store(cache: ResponseCache, key: str, value: Any, similar: Optional[SimilarLookup]) -> None:
+    """정확 일치 캐시에 저장. 키의 첫 결과는 유사 요청 캐시에도 등록"""
+    if similar is not None and key not in cache:
+        similar.put(value)
+    cache.put(key, value)
+
+
+async def cached_call(
+    cache: Optional[ResponseCache],
+    key: str,
+    produce: Callable[[], Awaitable[Any]],
+    similar: Optional[SimilarLookup] = None,
+) -> Tuple[Any, str]:
+    """
+    캐시에 있으면 저장된 결과를, 없으면 produce() 결과를 저장 후 반환. (결과, 캐시 상태) 튜플
+    similar가 주어지면 정확 일치 미스 시 유사 요청 결과를 먼저 찾습니다.
+    """
+    if cache is None:
+        return await produce(), CACHE_BYPASS
+
+    value = cache.get(key)
+    record_cache_lookup(_cache_name(key), hit=value is not None)
+    if value is not None:
+        return value, CACHE_HIT
+    value = _lookup_similar(cache, key, similar)
+    if value is not None:
+        return value, CACHE_SIMILAR
+
+    value = await produce()
+    _store(cache, key, value, similar)
+    return value, CACHE_MISS
+
+
+def cached_stream(
+    cache: Optional[ResponseCache],
+    key: str,
+    produce: Callable[[], AsyncIterator[str]],
+    is_error_event: Callable[[str], bool] = lambda event: False,
+) -> Tuple[AsyncIterator[str], str]:
+    """
+    SSE 스트림 캐시. 적중 시 저장된 이벤트를 그대로 재생하고,
+    미스 시 스트림을 흘려보내면서 이벤트를 모아 오류 없이 끝까지 전송된 경우에만 저장합니다.
+    """
+    if cache is None:
+        return produce(), CACHE_BYPASS
+
+    events = cache.get(key)
+    record_cache_lookup(_cache_name(key), hit=events is not None)
+    if events is not None:
+        async def replay() -> AsyncIterator[str]:
+            for event in events:
+                yield event
+
+        return replay(), CACHE_HIT
+
+    async def record() -> AsyncIterator[str]:
+        collected: List[str] = []
+        failed = False
+        async for event in produce():
+            failed = failed or is_error_event(event)
+            collected.append(event)
+            yield event
+        if not failed:
+            cache.put(key, tuple(collected))
+
+    return record(), CACHE_MISS
+
+
+def cached_event_stream(
+    cache: Optional[ResponseCache],
+    key: str,
+    produce: Callable[[], AsyncIterator[Tuple[str, Any]]],
+    replay: Callable[[Any], Iterable[Tuple[str, Any]]],
+    similar: Optional[SimilarLookup] = None,
+) -> Tuple[AsyncIterator[Tuple[str, Any]], str]:
+    """
+    (이벤트명, 데이터) 스트림 캐시. 같은 키의 비스트리밍 요청과 최종 결과 객체를 공유합니다.
+    적중 시 replay(결과)로 이벤트를 재구성하고, 미스 시 "done" 이벤트의 결과를 저장합니다.
+    """
+    if cache is None:
+        return produce(), CACHE_BYPASS
+
+    value = cache.get(key)
+    record_cache_lookup(_cache_name(key), hit=value is not None)
+    cache_status = CACHE_HIT
+    if value is None:
+        value = _lookup_similar(cache, key, similar)
+        cache_status = CACHE_SIMILAR
+    if value is not None:
+        async def replay_events() -> AsyncIterator[Tuple[str, Any]]:
+            for event in replay(value):
+                yield event
+
+        return replay_events(), cache_status
+
+    async def record() -> AsyncIterator[Tuple[str, Any]]:
+        async for event, data in produce():
+            if event == "done":
+                _store(cache, key, data, similar)
+            yield event, data
+
+    return record(), CACHE_MISS
@@ -1,6 +1,9 @@
-from typing import List, Optional, Dict, TypedDict, Literal
+from typing import Any, Awaitable, Callable, List, Optional, Dict, TypedDict, Literal
 from pydantic import BaseModel, Field
 
+from src.config.config import TEAM_TEMPLATE_MAX_MEMBERS
+from src.utils.deadline import Deadline
+
 
 # ==================== STT & Meeting Analysis Schemas ====================
 
@@ -37,6 +40,14 @@ class MeetingAnalysis(BaseModel):
     leader_feedback: LeaderFeedback = Field(description="매니저 피드백 (긍정적/개선 피드백)")
     qa_summary: List[QAItem] = Field(description="질문별 답변 리스트 - 모든 질문에 대해 완전한 답변 필수")
 
+class MeetingPreview(BaseModel):
+    """빠른 모델로 먼저 생성하는 미리보기 분석 결과 (전체 분석이 끝나면 MeetingAnalysis로 대체)"""
+    title: str = Field(description="회의를 한 줄로 요약한 제목")
+    speaker_mapping: List[str] = Field(description="화자 매핑 정보 - ['A의 실제이름', 'B의 실제이름'] 순서")
+    leader_action_items: List[str] = Field(description="리더(매니저)가 수행할 액션 아이템 리스트")
+    member_action_items: List[str] = Field(description="멤버(팀원)가 수행할 액션 아이템 리스트")
+    ai_core_summary: AiCoreSummary = Field(description="핵심 요약 정보")
+
 # 랭그래프 스키마 
 class MeetingPipelineState(TypedDict):
     """LangGraph 파이프라인 상태 스키마"""
@@ -45,14 +56,20 @@ class MeetingPipelineState(TypedDict):
     participants_info: Optional[Dict]
     meeting_datetime: Optional[str]  # "2024-12-08T14:30:00" 형식
     only_title: Optional[bool]  # 제목만 생성할지 여부
+    preview: Optional[bool]  # 전사 직후 빠른 모델로 미리보기를 먼저 생성할지 여부 (2단계 분석)
+    on_preview: Optional[Callable[[Dict], Awaitable[None]]]  # 미리보기가 생성되면 호출 (작업 상태 기록, 스트림 전송)
+    deadline: Optional[Deadline]  # 요청 마감 시각 (없으면 단계별 고정 타임아웃만 적용)
+    user_id: Optional[str]  # 요청 사용자 ID (제목 묶음 처리는 같은 사용자의 요청끼리만 묶음)
     
     # Supabase 조회 결과 (내부 처리용)
     file_url: Optional[str]
     file_path: Optional[str]
+    recording_probe: Optional[Dict]  # 녹음 사전 점검 결과 (RecordingProbe)
     
     transcript: Optional[Dict]
     speaker_stats_percent: Optional[Dict]
     
+    analysis_preview: Optional[Dict]  # 미리보기 결과 (MeetingPreview)
     analysis_result: Optional[Dict]
     
     # 성능 측정 필드
@@ -60,7 +77,7 @@ class MeetingPipelineState(TypedDict):
     performance_report: Optional[Dict]
     
     errors: List[str]
-    status: str  # "pending", "processing", "completed", "failed"
+    status: str  # "pending", "processing", "completed", "failed", "deadline_exceeded", "rejected"
 
 
 # 미팅 분석 요청
@@ -71,6 +88,93 @@ class AnalyzeMeetingInput(BaseModel):
     participants_info: Optional[str] = Field(default=None, description="참가자 정보 (JSON 문자열, 예: {\"leader\": \"김지현\", \"member\": \"김준희\"})")
     meeting_datetime: Optional[str] = Field(default=None, description="회의 일시 (ISO 8601 형식, 예: 2024-12-08T14:30:00)")
     only_title: Optional[bool] = Field(default=False, description="제목만 생성할지 여부 (기본값: False)")
+    preview: Optional[bool] = Field(
+        default=False,
+        description="(선택) 전사 직후 빠른 모델로 제목/핵심 요약/액션 아이템 미리보기를 먼저 생성 (작업 상태의 preview, 스트림의 preview 이벤트로 전달)",
+    )
+    user_id: Optional[str] = Field(default=None, description="요청한 사용자 ID (사용량/비용 집계용)")
+    member_id: Optional[str] = Field(
+        default=None,
+        description="(선택) 미팅 대상 멤버의 사용자 ID. 분석 결과를 이 사용자의 1on1 기록에 추가 (없으면 user_id, 기록 저장소에 없는 사용자는 기록하지 않음)",
+    )
+    job_id: Optional[str] = Field(
+        default=None,
+        description="(선택) 클라이언트가 발급한 작업 ID. 지정하면 연결이 끊겨도 분석을 계속하고 /api/analyze/jobs/{job_id}로 결과 조회",
+    )
+
+
+# 오디오 스트리밍 업로드 결과
+class AudioUploadResult(BaseModel):
+    """/api/audio/upload 응답 (audio_url을 /api/analyze의 recording_url로 사용)"""
+    audio_url: str = Field(description="STT 제공자에 업로드된 오디오 URL (/api/analyze의 recording_url로 전달)")
+    storage_path: Optional[str] = Field(default=None, description="Storage 버킷 내 저장 경로 (Storage 미설정 시 None)")
+    storage_url: Optional[str] = Field(default=None, description="Storage 공개 URL")
+    content_sha256: str = Field(description="오디오 내용의 SHA-256 해시 (무결성 확인, 같은 내용을 다시 올리면 사전 전사 재사용)")
+    size_bytes: int = Field(description="오디오 크기 (바이트)")
+    elapsed_ms: float = Field(description="업로드 소요 시간 (밀리초)")
+
+
+# 녹음 업로드 완료 알림 (STT 사전 시작)
+class StorageObjectRecord(BaseModel):
+    """Supabase Storage 웹훅(storage.objects INSERT)의 객체 정보"""
+    bucket_id: str = Field(description="버킷 이름")
+    name: str = Field(description="버킷 내 객체 경로")
+
+
+class AudioUploadedHook(BaseModel):
+    """/api/audio/uploaded 요청. 프론트 알림은 recording_url을, Supabase Storage 웹훅은 record를 보냄"""
+    recording_url: Optional[str] = Field(default=None, description="이후 /api/analyze에 보낼 녹음 파일 URL")
+    user_id: Optional[str] = Field(default=None, description="요청 사용자 ID (사전 전사 사용량/비용 집계용)")
+    record: Optional[StorageObjectRecord] = Field(default=None, description="Storage 웹훅의 생성된 객체 정보")
+
+
+class EagerTranscriptionStatus(BaseModel):
+    """STT 사전 시작 결과"""
+    status: Literal["started", "pending", "completed", "ignored", "disabled"] = Field(
+        description="started: 새로 시작, pending/completed: 이미 진행 중/완료, ignored: 다른 버킷의 객체, disabled: 기능 꺼짐"
+    )
+    recording_url: Optional[str] = Field(default=None, description="전사를 시작한 녹음 파일 URL")
+
+
+# 녹음 파일 사전 점검 (STT 전 헤더 확인)
+class RecordingPreflightInput(BaseModel):
+    """/api/analyze/preflight 요청"""
+    recording_url: str = Field(description="점검할 녹음 파일 URL (/api/analyze에 보낼 URL과 동일)")
+
+
+class RecordingProbe(BaseModel):
+    """녹음 파일 컨테이너 헤더만 읽어 확인한 사전 점검 결과"""
+    usable: bool = Field(description="분석 가능 여부 (헤더를 확인하지 못한 경우에도 True, 길이 미확인)")
+    reason: Optional[Literal["not_found", "empty", "not_audio", "corrupt", "no_audio", "too_short", "too_long"]] = Field(
+        default=None, description="사용할 수 없는 경우 거부 사유"
+    )
+    detail: Optional[str] = Field(default=None, description="거부 사유 또는 헤더를 확인하지 못한 이유")
+    container: Optional[str] = Field(default=None, description="컨테이너 형식 (wav, mp3, mp4, flac, ogg, webm)")
+    codec: Optional[str] = Field(default=None, description="오디오 코덱")
+    duration_seconds: Optional[float] = Field(default=None, description="오디오 길이 (초, 확인하지 못하면 None)")
+    channels: Optional[int] = Field(default=None, description="채널 수")
+    sample_rate: Optional[int] = Field(default=None, description="샘플레이트 (Hz)")
+    size_bytes: Optional[int] = Field(default=None, description="파일 크기 (바이트)")
+    model_profile: Literal["default", "fast"] = Field(default="default", description="녹음 길이로 고른 분석 모델 프로필")
+    estimated_stt_seconds: Optional[float] = Field(default=None, description="예상 STT 소요 시간 (초)")
+    estimated_completion_seconds: Optional[float] = Field(default=None, description="예상 분석 완료까지 걸리는 시간 (초)")
+    probe_ms: float = Field(default=0.0, description="사전 점검 소요 시간 (밀리초)")
+
+
+# 비동기 분석 작업 상태
+class AnalysisJobStatus(BaseModel):
+    """비동기 분석 작업의 상태 조회 결과 (워커 간 공유 저장소 기반)"""
+    job_id: str = Field(description="작업 ID")
+    status: Literal["queued", "running", "completed", "failed", "cancelled"] = Field(description="작업 상태")
+    result: Optional[Dict[str, Any]] = Field(default=None, description="완료 시 분석 결과 (/api/analyze 응답과 동일)")
+    preview: Optional[Dict[str, Any]] = Field(
+        default=None, description="preview=true 작업의 미리보기 결과 (전체 분석 완료 전에 먼저 기록, 완료 후에는 result가 우선)"
+    )
+    error: Optional[str] = Field(default=None, description="실패 시 오류 메시지")
+    created_at: str = Field(description="작업 생성 시각 (ISO 8601)")
+    updated_at: str = Field(description="마지막 상태 변경 시각 (ISO 8601)")
+    preflight: Optional[RecordingProbe] = Field(default=None, description="작업 생성 시 수행한 녹음 사전 점검 결과")
+    estimated_completion_at: Optional[str] = Field(default=None, description="녹음 길이로 예측한 완료 시각 (ISO 8601)")
 
 
 # ==================== Template Generator Schemas ====================
@@ -107,6 +211,32 @@ class TemplateGeneratorOutput(BaseModel):
     템플릿 생성 결과 모델.
     """
     generated_questions: Dict[str, str]
+    cache_status: Optional[str] = Field(default=None, description="응답 캐시 처리 결과 (HIT, SIMILAR, MISS, BYPASS)")
+
+# 팀 단위 템플릿 일괄 생성
+class TeamMemberInput(BaseModel):
+    """팀 템플릿 일괄 생성 요청의 팀원별 입력"""
+    target_info: str = Field(..., description="1on1 대상자에 대한 정보 (팀, 직급, 이름 등)")
+    detailed_context: str = Field(default="Not specified", description="대상자별 상세 맥락, 논의할 핵심 이슈")
+    previous_summary: Optional[str] = Field(default=None, description="대상자별 이전 1on1 요약 (없고 use_previous_data=true이면 user_id의 기록 사용)")
+    user_id: Optional[str] = Field(default=None, description="(선택) 대상자 기록 조회용 사용자 ID (기본: 요청의 user_id)")
+
+class TeamTemplateInput(BaseModel):
+    """
+    리더 한 명이 여러 팀원의 1on1 템플릿을 한 번에 생성하기 위한 입력.
+    공통 설정은 한 번만 보내고, 팀원별 입력은 members에 담습니다.
+    """
+    user_id: str = Field(..., description="요청한 리더의 사용자 ID")
+    purpose: str = Field(..., description="1on1 목적 카테고리 (쉼표로 구분된 값들, 전체 팀원 공통)")
+    num_questions: Literal['Simple', 'Standard', 'Advanced'] = Field(default="Standard", description="생성할 질문 수")
+    question_composition: str = Field(default="Experience/Story-based", description="질문 유형 조합 (쉼표로 구분된 값들)")
+    tone_and_manner: str = Field(..., description="원하는 어조와 말투 (e.g., 'Formal', 'Casual')")
+    language: str = Field(default="Korean", description="출력 언어")
+    use_previous_data: bool = Field(default=False, description="팀원별 이전 1on1 요약 활용 여부")
+    packed: bool = Field(default=False, description="입력이 짧은 팀원 여러 명을 LLM 호출 1회로 묶어 생성")
+    members: List[TeamMemberInput] = Field(
+        ..., min_length=1, max_length=TEAM_TEMPLATE_MAX_MEMBERS, description="팀원별 입력 목록"
+    )
 
 # 이메일 생성
 class EmailGeneratorInput(BaseModel):
@@ -140,4 +270,30 @@ class UsageGuideInput(BaseModel):
     generated_questions: Dict[str, str] = Field(..., description="생성된 질문들 (key: 질문 번호, value: 질문 내용)")
     
     # 추가 메타데이터
-    language: Optional[str] = Field(default=None, description="사용자가 선택한 출력 언어 (미선택시 기본값 사용)")
\ No newline at end of file
+    language: Optional[str] = Field(default=None, description="사용자가 선택한 출력 언어 (미선택시 기본값 사용)")
+
+
+# ==================== Usage Ledger Schemas ====================
+
+class UsageRollupItem(BaseModel):
+    """사용량/비용 집계 항목 (집계 기준 값 하나에 대한 합계)"""
+    key: str = Field(description="집계 기준 값 (사용자 ID, 엔드포인트, 일자 또는 모델명)")
+    requests: int = Field(description="요청 수")
+    llm_calls: int = Field(description="LLM 호출 수")
+    input_tokens: int = Field(description="입력 토큰 수 (캐시 적중분 포함)")
+    output_tokens: int = Field(description="출력 토큰 수 (thinking 제외)")
+    cached_tokens: int = Field(description="캐시 적중 입력 토큰 수")
+    thinking_tokens: int = Field(description="thinking 토큰 수")
+    audio_seconds: float = Field(description="STT 처리 오디오 길이 (초)")
+    cost_usd: float = Field(description="추정 비용 (USD)")
+    avg_latency_ms: Optional[float] = Field(default=None, description="평균 요청 처리 시간 (ms)")
+    max_latency_ms: Optional[float] = Field(default=None, description="최대 요청 처리 시간 (ms)")
+
+
+class UsageRollupResponse(BaseModel):
+    """사용량/비용 집계 조회 결과"""
+    group_by: Literal["user", "endpoint", "day", "model"] = Field(description="집계 기준")
+    since: Optional[str] = Field(default=None, description="집계 시작일 (YYYY-MM-DD)")
+    until: Optional[str] = Field(default=None, description="집계 종료일 (YYYY-MM-DD)")
+    total_cost_usd: float = Field(description="집계 항목 비용 합계 (USD, model 기준일 때는 LLM 비용만)")
+    items: List[UsageRollupItem] = Field(description="집계 항목 목록")
@@ -0,0 +1,182 @@
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config.config import (
+    SIMILARITY_CACHE_BANDS,
+    SIMILARITY_CACHE_MAX_ENTRIES,
+    SIMILARITY_CACHE_NGRAM,
+    SIMILARITY_CACHE_NUM_PERM,
+    SIMILARITY_CACHE_THRESHOLD,
+    SIMILARITY_CACHE_TTL_SECONDS,
+)
+
+# MinHash 순열 해시 (a * h + b) mod p 에 사용하는 메르센 소수와 32비트 마스크
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def normalize_text(text: str) -> str:
+    """대소문자/공백 차이 제거"""
+    return " ".join(text.lower().split())
+
+
+def char_ngrams(text: str, n: int) -> List[str]:
+    """문자 n-gram 목록. 형태소 분석 없이 한국어 어미/조사 변화에 강함"""
+    text = normalize_text(text)
+    if len(text) <= n:
+        return [text]
+    return list({text[i:i + n] for i in range(len(text) - n + 1)})
+
+
+class MinHasher:
+    """문자 n-gram 집합의 MinHash 서명 계산기 (Jaccard 유사도 추정)"""
+
+    def __init__(self, num_perm: int = SIMILARITY_CACHE_NUM_PERM, ngram: int = SIMILARITY_CACHE_NGRAM, seed: int = 1):
+        self.num_perm = num_perm
+        self.ngram = ngram
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        shingles = char_ngrams(text, self.ngram)
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64, count=len(shingles)
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+class _Entry:
+    __slots__ = ("partition", "band_keys", "value", "expires_at")
+
+    def __init__(self, partition: str, band_keys: List[int], value: Any, expires_at: float) -> None:
+        self.partition = partition
+        self.band_keys = band_keys
+        self.value = value
+        self.expires_at = expires_at
+
+
+class SimilarityCache:
+    """
+    유사 요청(near-duplicate) 캐시 (워커 프로세스 단위, TTL + LRU).
+    정확히 같아야 하는 입력(partition)이 같고, 자유 서술 텍스트의 문자 n-gram MinHash 유사도가
+    threshold 이상인 최근 결과를 반환합니다. LSH 밴드 버킷으로 후보만 골라 서명 행렬에서 한 번에 비교하므로
+    조회 비용은 저장 항목 수와 거의 무관합니다.
+    """
+
+    def __init__(
+        self,
+        threshold: float = SIMILARITY_CACHE_THRESHOLD,
+        num_perm: int = SIMILARITY_CACHE_NUM_PERM,
+        bands: int = SIMILARITY_CACHE_BANDS,
+        ngram: int = SIMILARITY_CACHE_NGRAM,
+        max_entries: int = SIMILARITY_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = SIMILARITY_CACHE_TTL_SECONDS,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm})은 bands({bands})의 배수여야 합니다")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hasher = MinHasher(num_perm, ngram)
+        # 항목 id = 서명 행렬의 행 번호 (제거된 행은 재사용)
+        self._signatures = np.zeros((min(max_entries, 1024), num_perm), dtype=np.uint32)
+        self._free_slots: List[int] = []
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._buckets: Dict[int, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _band_keys(self, partition: str, signature: np.ndarray) -> List[int]:
+        rows = self.rows
+        return [hash((partition, band, signature[band * rows:(band + 1) * rows].tobytes())) for band in range(self.bands)]
+
+    def get(self, partition: str, text: str) -> Optional[Tuple[Any, float]]:
+        """유사도가 threshold 이상인 가장 비슷한 결과와 추정 유사도. 없으면 None"""
+        signature = self.hasher.signature(text)
+        candidates = set()
+        for key in self._band_keys(partition, signature):
+            candidates.update(self._buckets.get(key, ()))
+        if not candidates:
+            return None
+
+        slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        scores = np.count_nonzero(self._signatures[slots] == signature, axis=1) / signature.size
+        now = time.monotonic()
+        for index in np.argsort(-scores, kind="stable"):
+            if scores[index] < self.threshold:
+                break
+            slot = int(slots[index])
+            entry = self._entries[slot]
+            if entry.partition != partition or entry.expires_at <= now:
+                continue
+            self._entries.move_to_end(slot)
+            return entry.value, float(scores[index])
+        return None
+
+    def put(self, partition: str, text: str, value: Any) -> None:
+        signature = self.hasher.signature(text)
+        while len(self._entries) >= self.max_entries:
+            self._remove(next(iter(self._entries)))
+        slot = self._allocate_slot()
+        self._signatures[slot] = signature
+        band_keys = self._band_keys(partition, signature)
+        self._entries[slot] = _Entry(partition, band_keys, value, time.monotonic() + self.ttl_seconds)
+        for key in band_keys:
+            self._buckets.setdefault(key, []).append(slot)
+
+    def _allocate_slot(self) -> int:
+        if self._free_slots:
+            return self._free_slots.pop()
+        slot = len(self._entries)
+        if slot >= len(self._signatures):
+            # 행렬이 가득 차면 두 배로 확장 (max_entries까지)
+            grown = np.zeros((min(len(self._signatures) * 2, self.max_entries), self._signatures.shape[1]), dtype=np.uint32)
+            grown[:len(self._signatures)] = self._signatures
+            self._signatures = grown
+        return slot
+
+    def _remove(self, slot: int) -> None:
+        entry = self._entries.pop(slot)
+        for key in entry.band_keys:
+            bucket = self._buckets[key]
+            bucket.remove(slot)
+            if not bucket:
+                del self._buckets[key]
+        self._free_slots.append(slot)
+
+    def bind(self, partition: str, text: str) -> "SimilarLookup":
+        return SimilarLookup(self, partition, text)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._buckets.clear()
+        self._free_slots.clear()
+
+
+class SimilarLookup:
+    """요청 하나의 유사 캐시 조회/저장 (응답 캐시 함수에 전달)"""
+
+    def __init__(self, cache: SimilarityCache, partition: str, text: str) -> None:
+        self.cache = cache
+        self.partition = partition
+        self.text = text
+        self.score: Optional[float] = None
+
+    def get(self) -> Optional[Any]:
+        found = self.cache.get(self.partition, self.text)
+        if found is None:
+            return None
+        value, self.score = found
+        return value
+
+    def put(self, value: Any) -> None:
+        self.cache.put(self.partition, self.text, value)
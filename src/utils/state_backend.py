@@ -0,0 +1,262 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Optional, Union
+
+logger = logging.getLogger("state_backend")
+
+# 만료된 키를 정리하는 주기 (쓰기 횟수 기준)
+_PURGE_EVERY_N_WRITES = 500
+
+
+class LockError(Exception):
+    """락 획득/해제 실패"""
+
+
+def _encode(value: Any) -> bytes:
+    # Redis와 동일하게 모든 값을 bytes로 저장
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(value).encode("utf-8")
+    raise TypeError(f"지원하지 않는 값 타입입니다: {type(value).__name__}")
+
+
+class SQLiteLock:
+    """redis.asyncio.lock.Lock과 같은 사용법을 제공하는 SQLite 기반 분산 락"""
+
+    def __init__(
+        self,
+        backend: "SQLiteStateBackend",
+        name: str,
+        timeout: Optional[float] = None,
+        sleep: float = 0.1,
+        blocking_timeout: Optional[float] = None,
+    ) -> None:
+        self.backend = backend
+        self.name = name
+        self.timeout = timeout
+        self.sleep = sleep
+        self.blocking_timeout = blocking_timeout
+        self.token: Optional[bytes] = None
+
+    async def acquire(self, blocking: bool = True, blocking_timeout: Optional[float] = None) -> bool:
+        token = uuid.uuid4().hex.encode("utf-8")
+        blocking_timeout = blocking_timeout if blocking_timeout is not None else self.blocking_timeout
+        deadline = time.monotonic() + blocking_timeout if blocking_timeout is not None else None
+
+        while True:
+            if await self.backend.set(self.name, token, ex=self.timeout, nx=True):
+                self.token = token
+                return True
+            if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                return False
+            await asyncio.sleep(self.sleep)
+
+    async def release(self) -> None:
+        if self.token is None:
+            raise LockError("획득하지 않은 락은 해제할 수 없습니다")
+        token, self.token = self.token, None
+        if not await self.backend._delete_if_equals(self.name, token):
+            raise LockError(f"락 '{self.name}'이(가) 이미 만료되었거나 다른 소유자에게 넘어갔습니다")
+
+    async def locked(self) -> bool:
+        return await self.backend.exists(self.name) > 0
+
+    async def __aenter__(self) -> "SQLiteLock":
+        if await self.acquire():
+            return self
+        raise LockError(f"락 '{self.name}'을(를) 획득하지 못했습니다")
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.release()
+
+
+class SQLiteStateBackend:
+    """
+    여러 워커 프로세스가 하나의 파일을 공유하는 SQLite 기반 상태 저장소.
+    redis.asyncio.Redis의 메서드 시그니처(get/set/delete/exists/incrby/expire/ttl/lock)를
+    그대로 따르므로, STATE_BACKEND_URL만 바꾸면 Redis로 교체할 수 있습니다.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 동일 프로세스 내 스레드 간 커넥션 공유는 threading.Lock으로 직렬화하고,
+        # 프로세스 간 동시성은 SQLite 파일 락(WAL)에 맡긴다
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    async def _run(self, func, *args):
+        return await asyncio.to_thread(self._execute, func, *args)
+
+    def _execute(self, func, *args):
+        with self._lock:
+            return func(*args)
+
+    def _transaction(self, func, *args):
+        # 읽기-수정-쓰기 연산은 IMMEDIATE 트랜잭션으로 다른 프로세스와 직렬화
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(*args)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._writes += 1
+        if self._writes % _PURGE_EVERY_N_WRITES == 0:
+            self._conn.execute("DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+        return result
+
+    def _get_row(self, name: str):
+        row = self._conn.execute("SELECT value, expires_at FROM kv WHERE key = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        if row[1] is not None and row[1] <= time.time():
+            self._conn.execute("DELETE FROM kv WHERE key = ?", (name,))
+            return None
+        return row
+
+    async def get(self, name: str) -> Optional[bytes]:
+        def _get():
+            row = self._get_row(name)
+            return bytes(row[0]) if row else None
+
+        return await self._run(_get)
+
+    async def set(
+        self,
+        name: str,
+        value: Union[bytes, str, int, float],
+        ex: Optional[float] = None,
+        px: Optional[int] = None,
+        nx: bool = False,
+        xx: bool = False,
+    ) -> Optional[bool]:
+        encoded = _encode(value)
+        ttl = ex if ex is not None else (px / 1000 if px is not None else None)
+
+        def _set():
+            exists = self._get_row(name) is not None
+            if (nx and exists) or (xx and not exists):
+                return None
+            expires_at = time.time() + ttl if ttl is not None else None
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (name, encoded, expires_at),
+            )
+            return True
+
+        return await self._run(self._transaction, _set)
+
+    async def delete(self, *names: str) -> int:
+        def _delete():
+            deleted = 0
+            for name in names:
+                if self._get_row(name) is not None:
+                    self._conn.execute("DELETE FROM kv WHERE key = ?", (name,))
+                    deleted += 1
+            return deleted
+
+        return await self._run(self._transaction, _delete)
+
+    async def _delete_if_equals(self, name: str, expected: bytes) -> bool:
+        def _delete():
+            row = self._get_row(name)
+            if row is None or bytes(row[0]) != expected:
+                return False
+            self._conn.execute("DELETE FROM kv WHERE key = ?", (name,))
+            return True
+
+        return await self._run(self._transaction, _delete)
+
+    async def exists(self, *names: str) -> int:
+        def _exists():
+            return sum(1 for name in names if self._get_row(name) is not None)
+
+        return await self._run(_exists)
+
+    async def incrby(self, name: str, amount: int = 1) -> int:
+        def _incr():
+            row = self._get_row(name)
+            value = (int(row[0]) if row else 0) + amount
+            expires_at = row[1] if row else None
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (name, _encode(value), expires_at),
+            )
+            return value
+
+        return await self._run(self._transaction, _incr)
+
+    async def incr(self, name: str, amount: int = 1) -> int:
+        return await self.incrby(name, amount)
+
+    async def expire(self, name: str, time_seconds: float) -> bool:
+        def _expire():
+            if self._get_row(name) is None:
+                return False
+            self._conn.execute(
+                "UPDATE kv SET expires_at = ? WHERE key = ?", (time.time() + time_seconds, name)
+            )
+            return True
+
+        return await self._run(self._transaction, _expire)
+
+    async def ttl(self, name: str) -> int:
+        def _ttl():
+            row = self._get_row(name)
+            if row is None:
+                return -2
+            if row[1] is None:
+                return -1
+            return max(int(row[1] - time.time()), 0)
+
+        return await self._run(_ttl)
+
+    def lock(
+        self,
+        name: str,
+        timeout: Optional[float] = None,
+        sleep: float = 0.1,
+        blocking_timeout: Optional[float] = None,
+    ) -> SQLiteLock:
+        return SQLiteLock(self, name, timeout=timeout, sleep=sleep, blocking_timeout=blocking_timeout)
+
+    async def aclose(self) -> None:
+        await self._run(self._conn.close)
+
+
+def create_state_backend(url: str):
+    """
+    STATE_BACKEND_URL에 맞는 공유 상태 저장소를 생성합니다.
+    - sqlite:///data/state.sqlite3 : 로컬 파일 기반 (단일 호스트 멀티 워커)
+    - redis://host:6379/0          : Redis (redis 패키지 필요)
+    """
+    if url.startswith("sqlite:///"):
+        return SQLiteStateBackend(url[len("sqlite:///"):])
+
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise ImportError("Redis 상태 저장소를 사용하려면 'redis' 패키지를 설치해야 합니다") from e
+        return redis.from_url(url)
+
+    raise ValueError(f"지원하지 않는 상태 저장소 URL입니다: {url}")
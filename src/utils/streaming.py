@@ -0,0 +1,270 @@
+import json
+import logging
+import re
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel
+
+logger = logging.getLogger("streaming")
+
+# 문자열 안에서 특별히 처리해야 하는 문자 (닫는 따옴표, 이스케이프)
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+# 파서 상태
+_BEFORE_OBJECT = 0   # 여는 중괄호 이전 (코드 펜스 등 무시)
+_KEY_OR_END = 1      # 키 문자열 또는 닫는 중괄호 대기
+_KEY = 2             # 키 문자열 내부
+_COLON = 3           # 콜론 대기
+_VALUE = 4           # 값 시작 대기
+_STRING_VALUE = 5    # 문자열 값 내부
+_RAW_VALUE = 6       # 숫자/불리언/null/중첩 객체·배열 값 내부
+_COMMA = 7           # 쉼표 또는 닫는 중괄호 대기
+_DONE = 8            # 최상위 객체 종료 (이후 텍스트 무시)
+
+
+class JsonEvent(NamedTuple):
+    """증분 파서 이벤트. kind: "delta"(문자열 값의 새 조각) 또는 "value"(완성된 값)"""
+    kind: str
+    key: str
+    value: Any
+
+
+class IncrementalJsonParser:
+    """
+    LLM이 스트리밍하는 최상위 JSON 객체를 청크 단위로 파싱하는 증분 파서.
+
+    각 문자는 한 번만 처리하며(버퍼 전체를 매 청크마다 다시 파싱하지 않음),
+    최상위 키의 값이 완성되는 즉시 "value" 이벤트를, 문자열 값이 만들어지는 중에는
+    디코딩된 새 조각을 "delta" 이벤트로 반환합니다.
+    객체 앞뒤의 코드 펜스(```json) 등 JSON 이외의 텍스트는 무시합니다.
+    """
+
+    def __init__(self) -> None:
+        self.result: Dict[str, Any] = {}
+        self._state = _BEFORE_OBJECT
+        self._offset = 0
+        self._key = ""
+        self._parts: List[str] = []
+        self._delta_start = 0
+        self._escape: Optional[str] = None
+        self._high_surrogate: Optional[int] = None
+        self._raw: List[str] = []
+        self._raw_depth = 0
+        self._raw_in_string = False
+        self._raw_escape = False
+
+    @property
+    def done(self) -> bool:
+        """최상위 객체의 닫는 중괄호까지 파싱했는지 여부"""
+        return self._state == _DONE
+
+    def feed(self, chunk: str) -> List[JsonEvent]:
+        """새 청크를 처리하고 이번 청크에서 발생한 이벤트 목록을 반환"""
+        events: List[JsonEvent] = []
+        i, n = 0, len(chunk)
+        while i < n:
+            state = self._state
+            if state == _KEY or state == _STRING_VALUE:
+                i = self._scan_string(chunk, i, events)
+                continue
+            if state == _RAW_VALUE:
+                if self._scan_raw(chunk[i], events):
+                    i += 1
+                continue
+            if state == _DONE:
+                break
+
+            ch = chunk[i]
+            i += 1
+            if state == _BEFORE_OBJECT:
+                if ch == "{":
+                    self._state = _KEY_OR_END
+            elif ch.isspace():
+                continue
+            elif state == _KEY_OR_END:
+                if ch == '"':
+                    self._start_string(_KEY)
+                elif ch == "}":
+                    self._state = _DONE
+                else:
+                    self._fail(ch, i)
+            elif state == _COLON:
+                if ch != ":":
+                    self._fail(ch, i)
+                self._state = _VALUE
+            elif state == _VALUE:
+                if ch == '"':
+                    self._start_string(_STRING_VALUE)
+                else:
+                    self._state = _RAW_VALUE
+                    self._raw = [ch]
+                    self._raw_depth = 1 if ch in "{[" else 0
+                    self._raw_in_string = False
+                    self._raw_escape = False
+            elif state == _COMMA:
+                if ch == ",":
+                    self._state = _KEY_OR_END
+                elif ch == "}":
+                    self._state = _DONE
+                else:
+                    self._fail(ch, i)
+
+        self._offset += n
+        if self._state == _STRING_VALUE:
+            self._emit_delta(events)
+        return events
+
+    def _fail(self, ch: str, index: int) -> None:
+        raise ValueError(f"Invalid JSON near offset {self._offset + index - 1}: unexpected {ch!r}")
+
+    def _start_string(self, state: int) -> None:
+        self._state = state
+        self._parts = []
+        self._delta_start = 0
+        self._escape = None
+        self._high_surrogate = None
+
+    def _append(self, text: str) -> None:
+        if self._high_surrogate is not None:
+            self._parts.append(chr(self._high_surrogate))
+            self._high_surrogate = None
+        self._parts.append(text)
+
+    def _emit_delta(self, events: List[JsonEvent]) -> None:
+        if len(self._parts) > self._delta_start:
+            events.append(JsonEvent("delta", self._key, "".join(self._parts[self._delta_start:])))
+            self._delta_start = len(self._parts)
+
+    def _scan_string(self, chunk: str, i: int, events: List[JsonEvent]) -> int:
+        """문자열 내부를 처리하고 다음 처리 위치를 반환. 일반 문자 구간은 한 번에 복사"""
+        n = len(chunk)
+        while i < n:
+            if self._escape is not None:
+                i = self._scan_escape(chunk, i)
+                continue
+            match = _STRING_SPECIAL.search(chunk, i)
+            end = match.start() if match else n
+            if end > i:
+                self._append(chunk[i:end])
+            if match is None:
+                return n
+            i = end + 1
+            if match.group() == "\\":
+                self._escape = ""
+                continue
+
+            # 닫는 따옴표: 문자열 완성
+            if self._high_surrogate is not None:
+                self._append("")
+            text = "".join(self._parts)
+            if self._state == _KEY:
+                self._key = text
+                self._state = _COLON
+            else:
+                self._emit_delta(events)
+                self.result[self._key] = text
+                events.append(JsonEvent("value", self._key, text))
+                self._state = _COMMA
+            return i
+        return i
+
+    def _scan_escape(self, chunk: str, i: int) -> int:
+        ch = chunk[i]
+        if self._escape == "":
+            if ch == "u":
+                self._escape = "u"
+            else:
+                self._escape = None
+                self._append(_ESCAPES.get(ch, ch))
+            return i + 1
+
+        self._escape += ch
+        if len(self._escape) < 5:
+            return i + 1
+        code = int(self._escape[1:], 16)
+        self._escape = None
+        if 0xD800 <= code < 0xDC00:
+            if self._high_surrogate is not None:
+                self._append("")
+            self._high_surrogate = code
+        elif 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+            high, self._high_surrogate = self._high_surrogate, None
+            self._parts.append(chr(0x10000 + ((high - 0xD800) << 10) + (code - 0xDC00)))
+        else:
+            self._append(chr(code))
+        return i + 1
+
+    def _scan_raw(self, ch: str, events: List[JsonEvent]) -> bool:
+        """
+        문자열 이외의 값을 모아 값이 끝나면 json.loads로 한 번만 디코딩.
+        값 뒤의 구분자(쉼표/중괄호)를 소비했으면 True, 다음 상태에서 처리해야 하면 False
+        """
+        if self._raw_depth == 0 and (ch in ",}" or ch.isspace()):
+            self._finish_raw(events)
+            return False
+
+        self._raw.append(ch)
+        if self._raw_depth == 0:
+            return True
+        if self._raw_in_string:
+            if self._raw_escape:
+                self._raw_escape = False
+            elif ch == "\\":
+                self._raw_escape = True
+            elif ch == '"':
+                self._raw_in_string = False
+        elif ch == '"':
+            self._raw_in_string = True
+        elif ch in "{[":
+            self._raw_depth += 1
+        elif ch in "}]":
+            self._raw_depth -= 1
+            if self._raw_depth == 0:
+                self._finish_raw(events)
+        return True
+
+    def _finish_raw(self, events: List[JsonEvent]) -> None:
+        value = json.loads("".join(self._raw))
+        self.result[self._key] = value
+        events.append(JsonEvent("value", self._key, value))
+        self._state = _COMMA
+
+
+class ParagraphBuffer:
+    """문자열 조각을 모아 빈 줄로 구분된 문단이 완성될 때마다 반환 (완성된 문단은 버퍼에서 제거)"""
+
+    def __init__(self) -> None:
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        *complete, self._buffer = (self._buffer + text).split("\n\n")
+        return [paragraph.strip() for paragraph in complete if paragraph.strip()]
+
+    def flush(self) -> List[str]:
+        """마지막 문단 반환 (문자열 값이 끝났을 때 호출)"""
+        rest, self._buffer = self._buffer.strip(), ""
+        return [rest] if rest else []
+
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """SSE 메시지 직렬화. ensure_ascii=False로 한글을 그대로 전송"""
+    if isinstance(data, BaseModel):
+        data = data.model_dump()
+    payload = f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+    return f"event: {event}\n{payload}" if event else payload
+
+
+async def to_sse(events: AsyncIterator[Tuple[str, Any]]) -> AsyncIterator[str]:
+    """
+    (이벤트명, 데이터) 스트림을 SSE 메시지로 변환.
+    생성 중 오류는 가이드 스트림과 같이 연결을 끊지 않고 error 이벤트로 전달합니다.
+    """
+    try:
+        async for event, data in events:
+            yield format_sse(data, event)
+    except Exception as e:
+        error_message = f"Error during stream generation: {e}"
+        logger.error(error_message)
+        yield format_sse({"error": error_message}, "error")
@@ -0,0 +1,402 @@
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+import httpx
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+
+from src.config.config import (
+    TRACING_ENABLED,
+    TRACING_EXPORTER,
+    TRACING_JSONL_PATH,
+    TRACING_OTLP_ENDPOINT,
+    TRACING_SERVICE_NAME,
+)
+
+logger = logging.getLogger("tracing")
+
+# Server-Timing 메트릭 이름에 허용되지 않는 문자 (RFC 7230 token)
+_SERVER_TIMING_INVALID_CHARS = re.compile(r"[^A-Za-z0-9!#$%&'*+\-.^_`|~]")
+
+
+class Span:
+    """하나의 작업 구간 (부모-자식 관계로 요청 단위 span 트리를 구성)"""
+
+    __slots__ = (
+        "trace", "span_id", "parent_id", "name", "attributes",
+        "start_time_ns", "_start_perf", "duration_ms", "status", "error",
+    )
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]) -> None:
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start_time_ns = time.time_ns()
+        self._start_perf = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start_perf) * 1000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        if self.duration_ms is not None:
+            return
+        self.duration_ms = self.elapsed_ms()
+        if error is not None:
+            self.status = "error"
+            self.error = str(error)
+        self.trace.spans.append(self)
+        get_exporter().export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time_ns": self.start_time_ns,
+            "duration_ms": round(self.duration_ms or 0.0, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class Trace:
+    """요청 하나에 속한 span 모음"""
+
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self, trace_id: Optional[str] = None) -> None:
+        self.trace_id = trace_id or os.urandom(16).hex()
+        self.spans: List[Span] = []
+
+    def server_timing(self) -> str:
+        """완료된 span을 이름별로 합산해 Server-Timing 헤더 값으로 요약"""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            if span.parent_id is None:
+                continue
+            name = _SERVER_TIMING_INVALID_CHARS.sub("_", span.name)
+            totals[name] = totals.get(name, 0.0) + (span.duration_ms or 0.0)
+        return ", ".join(f"{name};dur={duration:.1f}" for name, duration in totals.items())
+
+
+# asyncio 태스크/스레드 풀 실행 시 contextvars가 복사되므로 trace id가 자동으로 전파된다
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+
+def begin_span(name: str, **attributes: Any) -> Optional[Span]:
+    """현재 span의 자식 span 생성 (컨텍스트는 바꾸지 않음, 직접 end() 호출 필요)"""
+    parent = _current_span.get()
+    if parent is None:
+        return None
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+
+@contextmanager
+def start_span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """현재 span의 자식 span을 열고 블록 실행 동안 현재 span으로 설정 (동기/비동기 코드 공용)"""
+    span = begin_span(name, **attributes)
+    if span is None:
+        yield None
+        return
+
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.end(error=e)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+
+@contextmanager
+def start_trace(name: str, trace_id: Optional[str] = None, **attributes: Any) -> Iterator[Optional[Span]]:
+    """요청 단위 루트 span 시작 (트레이싱 비활성화 시 아무것도 하지 않음)"""
+    if not TRACING_ENABLED:
+        yield None
+        return
+
+    span = Span(Trace(trace_id), name, None, attributes)
+    token = _current_span.set(span)
+    handler_token = _langchain_handler_var.set(_LANGCHAIN_HANDLER)
+    try:
+        yield span
+    except BaseException as e:
+        span.end(error=e)
+        raise
+    finally:
+        _langchain_handler_var.reset(handler_token)
+        _current_span.reset(token)
+        span.end()
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[str]:
+    """W3C traceparent 헤더에서 trace id 추출 (상위 서비스의 trace 이어가기)"""
+    if not header:
+        return None
+    parts = header.split("-")
+    if len(parts) == 4 and len(parts[1]) == 32 and parts[1] != "0" * 32:
+        return parts[1]
+    return None
+
+
+# ==================== LangChain 연동 ====================
+
+class SpanCallbackHandler(BaseCallbackHandler):
+    """
+    LangChain 실행(프롬프트 렌더링, LLM 호출, 출력 파서)을 span으로 기록하는 콜백.
+    LLM span에는 첫 토큰까지의 시간(TTFT)과 초당 출력 토큰 수를 함께 기록합니다.
+    """
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        self._spans: Dict[UUID, Span] = {}
+        self._first_token_ms: Dict[UUID, float] = {}
+        self._token_chunks: Dict[UUID, int] = {}
+
+    def _begin(self, run_id: UUID, parent_run_id: Optional[UUID], name: str, **attributes: Any) -> None:
+        parent = self._spans.get(parent_run_id) if parent_run_id else None
+        if parent is not None:
+            span = Span(parent.trace, name, parent.span_id, attributes)
+        else:
+            span = begin_span(name, **attributes)
+        if span is not None:
+            self._spans[run_id] = span
+
+    def _finish(self, run_id: UUID, error: Optional[BaseException] = None) -> Optional[Span]:
+        span = self._spans.pop(run_id, None)
+        if span is not None:
+            span.end(error=error)
+        return span
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name", "chain")
+        # LangGraph 그래프/노드 실행은 time_node_execution의 node span과 중복되므로 건너뜀
+        metadata = kwargs.get("metadata") or {}
+        if name == "LangGraph" or name.startswith("__") or metadata.get("langgraph_node") == name:
+            return
+        if "langsmith:hidden" in (kwargs.get("tags") or []):
+            return
+        self._begin(run_id, parent_run_id, f"chain.{name}")
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id, **kwargs: Any) -> None:
+        self._finish(run_id, error)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs: Any) -> None:
+        model = (kwargs.get("metadata") or {}).get("ls_model_name") or (serialized or {}).get("name", "llm")
+        self._begin(run_id, parent_run_id, "llm", model=model)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs: Any) -> None:
+        model = (kwargs.get("metadata") or {}).get("ls_model_name") or (serialized or {}).get("name", "llm")
+        self._begin(run_id, parent_run_id, "llm", model=model)
+
+    def on_llm_new_token(self, token: str, *, run_id, **kwargs: Any) -> None:
+        span = self._spans.get(run_id)
+        if span is None:
+            return
+        if run_id not in self._first_token_ms:
+            self._first_token_ms[run_id] = span.elapsed_ms()
+        self._token_chunks[run_id] = self._token_chunks.get(run_id, 0) + 1
+
+    def on_llm_end(self, response: LLMResult, *, run_id, **kwargs: Any) -> None:
+        span = self._spans.get(run_id)
+        first_token_ms = self._first_token_ms.pop(run_id, None)
+        chunks = self._token_chunks.pop(run_id, 0)
+        if span is None:
+            return
+
+        output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                output_tokens += usage.get("output_tokens", 0)
+                span.set_attribute("input_tokens", usage.get("input_tokens"))
+        span.set_attribute("output_tokens", output_tokens or None)
+        span.set_attribute("stream_chunks", chunks)
+
+        elapsed_ms = span.elapsed_ms()
+        # 스트리밍이 아닌 호출은 전체 응답이 첫 토큰 시점
+        first_token_ms = first_token_ms if first_token_ms is not None else elapsed_ms
+        span.set_attribute("time_to_first_token_ms", round(first_token_ms, 1))
+        generation_seconds = (elapsed_ms - first_token_ms) / 1000
+        if output_tokens and generation_seconds > 0:
+            span.set_attribute("tokens_per_second", round(output_tokens / generation_seconds, 1))
+        self._finish(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id, **kwargs: Any) -> None:
+        self._first_token_ms.pop(run_id, None)
+        self._token_chunks.pop(run_id, None)
+        self._finish(run_id, error)
+
+
+_LANGCHAIN_HANDLER = SpanCallbackHandler()
+_langchain_handler_var: ContextVar[Optional[SpanCallbackHandler]] = ContextVar(
+    "span_callback_handler", default=None
+)
+# trace가 열려 있는 동안 모든 LangChain 실행에 span 콜백을 자동으로 붙임
+register_configure_hook(_langchain_handler_var, inheritable=True)
+
+
+# ==================== Exporters ====================
+
+class _BackgroundExporter:
+    """요청 경로를 막지 않도록 별도 스레드에서 span을 모아 내보내는 기본 exporter"""
+
+    batch_size = 100
+
+    def __init__(self) -> None:
+        self._queue: "queue.SimpleQueue[Span]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        self._queue.put(span)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception as e:
+                logger.warning(f"span 내보내기 실패 ({len(batch)}개): {e}")
+
+    def _write(self, spans: List[Span]) -> None:
+        raise NotImplementedError
+
+
+class JsonlSpanExporter(_BackgroundExporter):
+    """span을 한 줄에 하나씩 JSON으로 로컬 파일에 기록"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        super().__init__()
+
+    def _write(self, spans: List[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpHttpSpanExporter(_BackgroundExporter):
+    """OTLP/HTTP(JSON) 수집기(OpenTelemetry Collector, Jaeger, Tempo 등)로 span 전송"""
+
+    def __init__(self, endpoint: str, service_name: str) -> None:
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self._client = httpx.Client(timeout=5.0)
+        super().__init__()
+
+    def _write(self, spans: List[Span]) -> None:
+        otlp_spans = []
+        for span in spans:
+            otlp_span = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_time_ns),
+                "endTimeUnixNano": str(span.start_time_ns + int((span.duration_ms or 0) * 1_000_000)),
+                "attributes": [
+                    {"key": key, "value": _otlp_value(value)}
+                    for key, value in span.attributes.items() if value is not None
+                ],
+                "status": {"code": 2, "message": span.error or ""} if span.status == "error" else {"code": 1},
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            otlp_spans.append(otlp_span)
+
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": "src.utils.tracing"}, "spans": otlp_spans}],
+            }]
+        }
+        self._client.post(self.url, json=payload).raise_for_status()
+
+
+class _NoopExporter:
+    def export(self, span: Span) -> None:
+        pass
+
+
+def _create_exporter():
+    if not TRACING_ENABLED or TRACING_EXPORTER == "none":
+        return _NoopExporter()
+    if TRACING_EXPORTER == "otlp":
+        return OtlpHttpSpanExporter(TRACING_OTLP_ENDPOINT, TRACING_SERVICE_NAME)
+    return JsonlSpanExporter(TRACING_JSONL_PATH)
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter():
+    """설정에 맞는 exporter를 최초 사용 시점에 생성 (임포트만으로 스레드를 띄우지 않음)"""
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = _create_exporter()
+    return _exporter
+
+
+def set_exporter(exporter) -> None:
+    """span exporter 교체 (테스트/벤치마크용)"""
+    global _exporter
+    _exporter = exporter
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from src.config.config import (
+    USER_QUOTA_LLM_TOKEN_BURST,
+    USER_QUOTA_LLM_TOKENS_PER_MINUTE,
+    USER_QUOTA_LOCK_TIMEOUT_SECONDS,
+    USER_QUOTA_REQUEST_BURST,
+    USER_QUOTA_REQUESTS_PER_MINUTE,
+)
+from src.utils.metrics import USER_QUOTA_THROTTLED
+
+logger = logging.getLogger("user_quota")
+
+QUOTA_REQUESTS = "requests"
+QUOTA_LLM_TOKENS = "llm_tokens"
+
+
+class QuotaExceeded(Exception):
+    """사용자의 요청 수 한도 초과 (retry_after초 뒤 다시 시도 가능)"""
+
+    def __init__(self, kind: str, retry_after: float) -> None:
+        super().__init__(f"User quota exceeded ({kind}). Retry after {retry_after:.1f}s.")
+        self.kind = kind
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class TokenBucket:
+    """초당 rate개씩 최대 capacity개까지 채워지는 토큰 버킷 (상태는 (남은 토큰, 갱신 시각)으로 저장소에 보관)"""
+
+    capacity: float
+    rate: float
+
+    def refill(self, tokens: float, updated_at: float, now: float) -> float:
+        return min(self.capacity, tokens + max(now - updated_at, 0.0) * self.rate)
+
+    def wait_seconds(self, tokens: float, needed: float) -> float:
+        """needed개가 모일 때까지 남은 시간"""
+        if tokens >= needed:
+            return 0.0
+        return (needed - tokens) / self.rate
+
+    def ttl_seconds(self, tokens: float) -> int:
+        # 다시 가득 차는 시간이 지나면 상태가 없는 것(가득 참)과 같으므로 만료
+        return int((self.capacity - tokens) / self.rate) + 60
+
+
+def _decode(raw: Optional[bytes]) -> Optional[Tuple[float, float]]:
+    if raw is None:
+        return None
+    tokens, _, updated_at = raw.decode("utf-8").partition(":")
+    return float(tokens), float(updated_at)
+
+
+class UserQuota:
+    """
+    공유 상태 저장소에 보관하는 사용자별 토큰 버킷 (분당 요청 수, 분당 LLM 토큰 수).
+    버킷 갱신은 사용자·종류별 락 안에서 읽기-수정-쓰기로 처리해 모든 워커가 같은 한도를 공유합니다.
+    - 요청 수: take_request로 요청마다 차감하고, 부족하면 QuotaExceeded(retry_after)를 발생시킵니다.
+    - LLM 토큰: 호출이 끝난 뒤 실제 사용량을 debit_llm_tokens로 차감해(음수 허용) 한도를 넘긴 사용자의 다음 호출은
+      llm_token_wait초 동안 대기합니다. 토큰 수는 호출 전에 알 수 없으므로 거절 대신 다음 호출을 늦춥니다.
+    저장소 오류나 락 대기 초과 시에는 서비스를 막지 않도록 한도 검사 없이 통과시킵니다.
+    """
+
+    def __init__(
+        self,
+        backend,
+        requests_per_minute: float = USER_QUOTA_REQUESTS_PER_MINUTE,
+        request_burst: float = USER_QUOTA_REQUEST_BURST,
+        llm_tokens_per_minute: float = USER_QUOTA_LLM_TOKENS_PER_MINUTE,
+        llm_token_burst: float = USER_QUOTA_LLM_TOKEN_BURST,
+        lock_timeout: float = USER_QUOTA_LOCK_TIMEOUT_SECONDS,
+        prefix: str = "quota",
+    ) -> None:
+        self.backend = backend
+        self.buckets: Dict[str, TokenBucket] = {
+            QUOTA_REQUESTS: TokenBucket(request_burst, requests_per_minute / 60),
+            QUOTA_LLM_TOKENS: TokenBucket(llm_token_burst, llm_tokens_per_minute / 60),
+        }
+        self.lock_timeout = lock_timeout
+        self.prefix = prefix
+
+    def _key(self, user_id: str, kind: str) -> str:
+        return f"{self.prefix}:{kind}:{user_id}"
+
+    async def _update(self, user_id: str, kind: str, amount: float, allow_debt: bool) -> float:
+        """버킷에서 amount만큼 차감하고 0을 반환. 부족하면(allow_debt=False) 차감하지 않고 대기해야 할 시간 반환"""
+        bucket = self.buckets[kind]
+        key = self._key(user_id, kind)
+        lock = self.backend.lock(f"{key}:lock", timeout=5, sleep=0.01, blocking_timeout=self.lock_timeout)
+        try:
+            if not await lock.acquire():
+                logger.warning(f"사용량 한도 락을 얻지 못해 검사 없이 통과합니다: {key}")
+                return 0.0
+        except Exception as e:
+            logger.warning(f"사용량 한도 확인 실패, 검사 없이 통과합니다 ({key}): {e}")
+            return 0.0
+
+        try:
+            now = time.time()
+            state = _decode(await self.backend.get(key))
+            tokens = bucket.refill(*state, now) if state else bucket.capacity
+            if not allow_debt and tokens < amount:
+                return bucket.wait_seconds(tokens, amount)
+            tokens -= amount
+            await self.backend.set(key, f"{tokens:.3f}:{now:.3f}", ex=bucket.ttl_seconds(tokens))
+            return 0.0
+        except Exception as e:
+            logger.warning(f"사용량 한도 갱신 실패, 검사 없이 통과합니다 ({key}): {e}")
+            return 0.0
+        finally:
+            try:
+                await lock.release()
+            except Exception as e:
+                logger.warning(f"사용량 한도 락 해제 실패 ({key}): {e}")
+
+    async def take_request(self, user_id: Optional[str], cost: float = 1) -> None:
+        """요청 cost건을 차감 (한도를 넘으면 QuotaExceeded)"""
+        if not user_id:
+            return
+        cost = min(cost, self.buckets[QUOTA_REQUESTS].capacity)
+        retry_after = await self._update(user_id, QUOTA_REQUESTS, cost, allow_debt=False)
+        if retry_after > 0:
+            USER_QUOTA_THROTTLED.labels(QUOTA_REQUESTS).inc()
+            raise QuotaExceeded(QUOTA_REQUESTS, retry_after)
+
+    async def debit_llm_tokens(self, user_id: Optional[str], tokens: int) -> None:
+        """LLM 호출에서 실제로 사용한 토큰 수 차감 (한도를 넘어도 차감하고 다음 호출을 늦춤)"""
+        if user_id and tokens > 0:
+            await self._update(user_id, QUOTA_LLM_TOKENS, tokens, allow_debt=True)
+
+    async def llm_token_wait(self, user_id: Optional[str]) -> float:
+        """LLM 토큰 버킷이 다시 양수가 될 때까지 남은 시간 (한도 안이면 0)"""
+        if not user_id:
+            return 0.0
+        try:
+            state = _decode(await self.backend.get(self._key(user_id, QUOTA_LLM_TOKENS)))
+        except Exception as e:
+            logger.warning(f"LLM 토큰 한도 확인 실패, 검사 없이 통과합니다 ({user_id}): {e}")
+            return 0.0
+        if state is None:
+            return 0.0
+        bucket = self.buckets[QUOTA_LLM_TOKENS]
+        tokens = bucket.refill(*state, time.time())
+        return bucket.wait_seconds(tokens, 1) if tokens < 0 else 0.0
+
+    async def wait_for_llm_tokens(self, user_id: Optional[str]) -> float:
+        """LLM 토큰 한도를 넘긴 사용자는 버킷이 다시 찰 때까지 대기하고 대기한 시간 반환"""
+        started = time.perf_counter()
+        throttled = False
+        while True:
+            wait = await self.llm_token_wait(user_id)
+            if wait <= 0:
+                return time.perf_counter() - started if throttled else 0.0
+            if not throttled:
+                throttled = True
+                USER_QUOTA_THROTTLED.labels(QUOTA_LLM_TOKENS).inc()
+            # 대기하는 동안 다른 워커가 더 차감했을 수 있으므로 깨어나서 다시 확인
+            await asyncio.sleep(wait)
+
+    async def snapshot(self, user_id: str) -> Dict[str, Dict[str, float]]:
+        """사용자의 버킷별 현재 남은 양과 한도"""
+        now = time.time()
+        result = {}
+        for kind, bucket in self.buckets.items():
+            state = _decode(await self.backend.get(self._key(user_id, kind)))
+            tokens = bucket.refill(*state, now) if state else bucket.capacity
+            result[kind] = {
+                "remaining": round(tokens, 1),
+                "capacity": bucket.capacity,
+                "per_minute": round(bucket.rate * 60, 1),
+                "retry_after": round(bucket.wait_seconds(tokens, 1), 2) if tokens < 1 else 0.0,
+            }
+        return result
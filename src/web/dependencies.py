@@ -0,0 +1,93 @@
+from typing import Optional
+
+from fastapi import Header, HTTPException, Query, Request
+
+from src.services.meeting_generator.eager_stt import EagerTranscriber
+from src.services.meeting_generator.workflow import MeetingPipeline
+from src.services.template_generator.guide_speculation import GuideSpeculator
+from src.utils.analysis_store import AnalysisStore
+from src.utils.clients import ProviderClients
+from src.utils.cost_ledger import CostLedger
+from src.utils.deadline import DEADLINE_HEADER, Deadline
+from src.utils.fair_scheduler import FairScheduler
+from src.utils.history_store import MeetingHistoryStore
+from src.utils.job_store import JobStore
+from src.utils.micro_batch import MicroBatcher
+from src.utils.request_dedup import RequestDeduplicator
+from src.utils.response_cache import ResponseCache
+from src.utils.similarity_cache import SimilarityCache
+from src.utils.user_quota import UserQuota
+
+
+# lifespan에서 app.state에 등록한 워커 단위 객체들을 엔드포인트에 주입
+
+def get_provider_clients(request: Request) -> ProviderClients:
+    return request.app.state.provider_clients
+
+
+def get_meeting_pipeline(request: Request) -> MeetingPipeline:
+    return request.app.state.meeting_pipeline
+
+
+def get_state_backend(request: Request):
+    return request.app.state.state_backend
+
+
+def get_job_store(request: Request) -> JobStore:
+    return request.app.state.job_store
+
+
+def get_cost_ledger(request: Request) -> CostLedger:
+    return request.app.state.cost_ledger
+
+
+def get_response_cache(request: Request) -> Optional[ResponseCache]:
+    # 캐시는 설정으로 켜는 기능이므로 비활성화 시 None
+    return getattr(request.app.state, "response_cache", None)
+
+
+def get_similarity_cache(request: Request) -> Optional[SimilarityCache]:
+    return getattr(request.app.state, "similarity_cache", None)
+
+
+def get_history_store(request: Request) -> Optional[MeetingHistoryStore]:
+    return getattr(request.app.state, "history_store", None)
+
+
+def get_email_batcher(request: Request) -> Optional[MicroBatcher]:
+    return getattr(request.app.state, "email_batcher", None)
+
+
+def get_request_deduplicator(request: Request) -> Optional[RequestDeduplicator]:
+    return getattr(request.app.state, "request_deduplicator", None)
+
+
+def get_guide_speculator(request: Request) -> Optional[GuideSpeculator]:
+    return getattr(request.app.state, "guide_speculator", None)
+
+
+def get_eager_transcriber(request: Request) -> Optional[EagerTranscriber]:
+    return getattr(request.app.state, "eager_transcriber", None)
+
+
+def get_analysis_store(request: Request) -> Optional[AnalysisStore]:
+    return getattr(request.app.state, "analysis_store", None)
+
+
+def get_user_quota(request: Request) -> Optional[UserQuota]:
+    return getattr(request.app.state, "user_quota", None)
+
+
+def get_llm_scheduler(request: Request) -> Optional[FairScheduler]:
+    return getattr(request.app.state, "llm_scheduler", None)
+
+
+def get_request_deadline(
+    deadline_ms: Optional[int] = Query(None, description=f"(선택) 요청 마감 시간 (밀리초). {DEADLINE_HEADER} 헤더로도 지정 가능"),
+    header_deadline_ms: Optional[int] = Header(None, alias=DEADLINE_HEADER),
+) -> Optional[Deadline]:
+    """쿼리 파라미터 또는 헤더로 받은 요청 마감 시간 (둘 다 없으면 None)"""
+    try:
+        return Deadline.from_ms(deadline_ms if deadline_ms is not None else header_deadline_ms)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,119 @@
+"""
+멀티 워커 서버 런처.
+
+부모 프로세스에서 앱 모듈(LangChain, Vertex AI 등 무거운 의존성)을 한 번만 임포트(preload)한 뒤
+리슨 소켓을 열고 fork하여, 각 워커가 같은 소켓을 공유하며 요청을 처리합니다.
+워커별 상태(클라이언트 풀 등)는 각 워커의 lifespan에서 생성되고,
+작업 상태, 락, 중복 요청 공유, 사용자 한도, 사전 전사 캐시는 STATE_BACKEND_URL의 공유 저장소를 통해 워커 간에 공유되며,
+응답/유사 요청 캐시와 가이드 사전 생성은 워커마다 따로 둡니다.
+
+실행 예:
+    poetry run python -m src.web.launcher --workers 4 --port 8000
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Dict
+
+import uvicorn
+from uvicorn.importer import import_from_string
+
+from src.config.config import SERVER_HOST, SERVER_PORT, SERVER_WORKERS
+
+logger = logging.getLogger("launcher")
+
+# 워커가 비정상 종료되었을 때 재시작 전 대기 시간 (초)
+_RESTART_BACKOFF_SECONDS = 1.0
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _serve(app, sock: socket.socket, log_level: str) -> None:
+    config = uvicorn.Config(app, lifespan="on", log_level=log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn_worker(app, sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid == 0:
+        # 자식 프로세스: 부모의 시그널 핸들러를 기본값으로 되돌린 뒤 서버 실행
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        try:
+            _serve(app, sock, log_level)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def run(app_path: str, host: str, port: int, workers: int, log_level: str = "info") -> None:
+    """앱을 프리로드한 뒤 워커 N개를 fork하여 실행하고, 종료된 워커는 재시작"""
+    app = import_from_string(app_path)
+    if hasattr(app, "state"):
+        # 워커 메모리에만 두는 최적화(가이드 사전 생성 등)가 워커 수에 따라 켜고 끌 수 있도록 전달
+        app.state.server_workers = workers
+    sock = _bind_socket(host, port)
+    logger.info(f"{app_path} 프리로드 완료 - http://{host}:{port} (워커 {workers}개)")
+
+    if workers <= 1:
+        _serve(app, sock, log_level)
+        return
+
+    children: Dict[int, int] = {}
+    shutting_down = False
+
+    def _shutdown(signum, frame):
+        nonlocal shutting_down
+        shutting_down = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    for index in range(workers):
+        children[_spawn_worker(app, sock, log_level)] = index
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = children.pop(pid, None)
+        if index is None or shutting_down:
+            continue
+        logger.warning(f"워커 {index} (pid={pid})가 종료되어 재시작합니다 (status={status})")
+        time.sleep(_RESTART_BACKOFF_SECONDS)
+        children[_spawn_worker(app, sock, log_level)] = index
+
+    sock.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="1on1 AI API 멀티 워커 런처")
+    parser.add_argument("--app", default="src.web.main:app", help="ASGI 앱 경로 (module:attr)")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper())
+    run(args.app, args.host, args.port, args.workers, args.log_level)
+
+
+if __name__ == "__main__":
+    main()
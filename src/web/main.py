@@ -1,65 +1,229 @@
+import asyncio
+import math
 import os
 from contextlib import asynccontextmanager
-from typing import Union, Literal
-import assemblyai as aai
-from fastapi import FastAPI, HTTPException, Query
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple, Union, Literal
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
-from supabase import create_client, Client
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.requests import ClientDisconnect
+import hmac
 import traceback
 
+import assemblyai as aai
+import httpx
+
+from src.services.meeting_generator.analysis_jobs import start_analysis_job
+from src.services.meeting_generator.audio_upload import AudioUploadTooLarge, stream_upload
+from src.services.meeting_generator.eager_stt import EagerTranscriber
+from src.services.meeting_generator.generate_meeting import create_title_batcher
+from src.services.meeting_generator.preflight import probe_recording
 from src.services.meeting_generator.workflow import MeetingPipeline
 
-from src.services.template_generator.generate_email import generate_email
-from src.services.template_generator.generate_template import generate_template
-from src.services.template_generator.generate_usage_guide import generate_usage_guide
+from src.services.template_generator.generate_bundle import stream_bundle, to_email_input, to_guide_input
+from src.services.template_generator.generate_email import (
+    create_email_batcher,
+    generate_email,
+    get_cache_key as get_email_cache_key,
+    replay_email,
+    stream_email,
+)
+from src.services.template_generator.generate_template import (
+    generate_template,
+    get_cache_key as get_template_cache_key,
+    get_similar_lookup as get_template_similar_lookup,
+    replay_template,
+    stream_template,
+)
+from src.services.template_generator.generate_team import stream_team_templates, to_member_input
+from src.services.template_generator.guide_speculation import GuideSpeculator, speculate_guide
+from src.services.template_generator.generate_usage_guide import (
+    generate_usage_guide,
+    get_cache_key as get_guide_cache_key,
+    is_error_event as is_guide_error_event,
+)
+from src.utils.analysis_store import AnalysisStore, etag_matches, make_etag
+from src.utils.cancellation import ClientDisconnected, cancel_on_disconnect, cancel_stream_on_disconnect
+from src.utils.clients import ProviderClients, StorageError
+from src.utils.cost_ledger import CostLedger
+from src.utils.deadline import Deadline
+from src.utils.fair_scheduler import FairScheduler
+from src.utils.history_store import MeetingHistoryStore, render_digest
+from src.utils.job_store import JobStore
+from src.utils.mock_db import MOCK_USER_DATA
+from src.utils.metrics import PROMETHEUS_CONTENT_TYPE, REGISTRY
+from src.utils.micro_batch import MicroBatcher
+from src.utils.request_dedup import (
+    DEDUP_HEADER,
+    IDEMPOTENCY_KEY_HEADER,
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    IdempotencyKeyConflict,
+    RequestDeduplicator,
+    request_fingerprint,
+)
+from src.utils.response_cache import (
+    CACHE_HIT,
+    CACHE_SIMILAR,
+    CACHE_SPECULATIVE,
+    ResponseCache,
+    cached_call,
+    cached_event_stream,
+    cached_stream,
+)
+from src.utils.serialization import FastJSONResponse, parse_field_list, select_fields
+from src.utils.similarity_cache import SimilarityCache
+from src.utils.state_backend import create_state_backend
+from src.utils.streaming import to_sse
+from src.utils.tracing import start_span
+from src.utils.user_quota import QuotaExceeded, UserQuota
 from src.utils.schemas import (
+    AnalysisJobStatus,
     AnalyzeMeetingInput,
-    EmailGeneratorInput,
+    AudioUploadedHook,
+    AudioUploadResult,
+    EagerTranscriptionStatus,
     EmailGeneratorOutput,
+    RecordingPreflightInput,
+    RecordingProbe,
+    TeamTemplateInput,
     TemplateGeneratorInput,
     TemplateGeneratorOutput,
-    UsageGuideInput,
+    UsageRollupResponse,
 )
 
 from src.config.config import (
-    ASSEMBLYAI_API_KEY,
     GOOGLE_APPLICATION_CREDENTIALS,
+    AUDIO_UPLOAD_MAX_BYTES,
+    EAGER_STT_ENABLED,
+    GUIDE_SPECULATION_ENABLED,
+    PREFLIGHT_ENABLED,
+    ANALYSIS_STORE_ENABLED,
+    ANALYSIS_STORE_DIR,
+    EAGER_STT_HOOK_SECRET,
+    EAGER_STT_TTL_SECONDS,
     SUPABASE_URL,
     SUPABASE_KEY,
-    SUPABASE_BUCKET_NAME
+    SUPABASE_BUCKET_NAME,
+    SERVER_WORKERS,
+    STATE_BACKEND_URL,
+    COST_LEDGER_PATH,
+    HISTORY_DB_PATH,
+    MICRO_BATCH_ENABLED,
+    REQUEST_DEDUP_ENABLED,
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_COMPRESSION_ENABLED,
+    SIMILARITY_CACHE_ENABLED,
+    USER_QUOTA_ENABLED,
+    LLM_SCHEDULER_ENABLED
+)
+from src.web.dependencies import (
+    get_analysis_store,
+    get_cost_ledger,
+    get_eager_transcriber,
+    get_email_batcher,
+    get_guide_speculator,
+    get_history_store,
+    get_job_store,
+    get_llm_scheduler,
+    get_request_deduplicator,
+    get_meeting_pipeline,
+    get_provider_clients,
+    get_request_deadline,
+    get_response_cache,
+    get_similarity_cache,
+    get_user_quota,
 )
+from src.web.middleware import CompressionMiddleware, LLMSchedulerMiddleware, MetricsMiddleware, TracingMiddleware
 from src.web.test_endpoints import router as test_router # 테스트용 라우터 import
 
-meeting_pipeline = None
-supabase: Client = None
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """애플리케이션 시작/종료 시 실행되는 라이프사이클 관리"""
-    global meeting_pipeline, supabase
-    
+    """애플리케이션 시작/종료 시 실행되는 라이프사이클 관리 (워커 프로세스마다 1회)"""
     # Google Cloud 인증 설정
     if GOOGLE_APPLICATION_CREDENTIALS:
         os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = GOOGLE_APPLICATION_CREDENTIALS
     
-    # Supabase 클라이언트 초기화
-    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-    
-    # AssemblyAI 설정
-    aai.settings.api_key = ASSEMBLYAI_API_KEY
+    # 외부 API 클라이언트 풀 초기화 (워커당 1회, 요청 간 keep-alive 커넥션 재사용)
+    app.state.provider_clients = ProviderClients()
         
-    # MeetingPipeline 초기화
-    meeting_pipeline = MeetingPipeline(supabase)
+    # 사용자별 1on1 기록 저장소 (비어 있으면 mock 사용자 데이터로 초기화)
+    app.state.history_store = MeetingHistoryStore(HISTORY_DB_PATH)
+    await app.state.history_store.seed(MOCK_USER_DATA)
     
-    yield    
+    # 제목/이메일 같은 짧은 LLM 요청 묶음 처리 (MICRO_BATCH_ENABLED=true일 때만)
+    app.state.title_batcher = create_title_batcher(app.state.provider_clients) if MICRO_BATCH_ENABLED else None
+    app.state.email_batcher = create_email_batcher() if MICRO_BATCH_ENABLED else None
+    
+    # 워커 간 공유 상태 저장소 (작업 상태, 캐시, 락)
+    app.state.state_backend = create_state_backend(STATE_BACKEND_URL)
+    app.state.job_store = JobStore(app.state.state_backend)
+    app.state.background_tasks = set()
+    # 동시 중복 요청의 실행 공유(singleflight)와 Idempotency-Key 응답 보관 (REQUEST_DEDUP_ENABLED=true일 때만)
+    app.state.request_deduplicator = RequestDeduplicator(app.state.state_backend) if REQUEST_DEDUP_ENABLED else None
+    # 사용자별 분당 요청 수/LLM 토큰 한도 (버킷은 공유 상태 저장소에 보관, USER_QUOTA_ENABLED=true일 때만)
+    app.state.user_quota = UserQuota(app.state.state_backend) if USER_QUOTA_ENABLED else None
+    # 워커의 동시 LLM 호출 수 제한 + 사용자별 가중 공정 큐 (LLM_SCHEDULER_ENABLED=true일 때만)
+    app.state.llm_scheduler = FairScheduler(quota=app.state.user_quota) if LLM_SCHEDULER_ENABLED else None
+    
+    # 요청별 토큰/오디오 사용량 및 비용 원장
+    app.state.cost_ledger = CostLedger(COST_LEDGER_PATH)
+    
+    # 녹음 업로드 완료 시 STT 사전 시작 (전사 캐시는 공유 상태 저장소에 보관, EAGER_STT_ENABLED=true일 때만)
+    app.state.eager_transcriber = (
+        EagerTranscriber(app.state.provider_clients, app.state.state_backend, app.state.cost_ledger)
+        if EAGER_STT_ENABLED else None
+    )
+    
+    # 완료된 분석 결과/전사 보관 (백그라운드 압축 기록, ANALYSIS_STORE_ENABLED=true일 때만)
+    app.state.analysis_store = AnalysisStore(ANALYSIS_STORE_DIR) if ANALYSIS_STORE_ENABLED else None
+    
+    # MeetingPipeline 초기화 (완료된 분석은 기록/결과 저장소에 추가, 사전 전사 결과가 있으면 사용)
+    app.state.meeting_pipeline = MeetingPipeline(
+        app.state.provider_clients, app.state.history_store, app.state.title_batcher, app.state.eager_transcriber,
+        app.state.analysis_store,
+    )
+    
+    # 템플릿/이메일/가이드 정확 일치 응답 캐시 (RESPONSE_CACHE_ENABLED=true일 때만)
+    app.state.response_cache = ResponseCache() if RESPONSE_CACHE_ENABLED else None
+    # 템플릿 유사 요청 캐시 (정확 일치 캐시 미스 시 조회, SIMILARITY_CACHE_ENABLED=true일 때만)
+    app.state.similarity_cache = SimilarityCache() if RESPONSE_CACHE_ENABLED and SIMILARITY_CACHE_ENABLED else None
+    
+    # include_guide=true 템플릿 요청의 가이드 사전 생성 (워커 메모리에 보관하므로 auto는 단일 워커에서만 사용)
+    workers = getattr(app.state, "server_workers", SERVER_WORKERS)
+    speculate = GUIDE_SPECULATION_ENABLED == "true" or (GUIDE_SPECULATION_ENABLED == "auto" and workers <= 1)
+    app.state.guide_speculator = GuideSpeculator(app.state.cost_ledger) if speculate else None
+    
+    yield
+    
+    for task in list(app.state.background_tasks):
+        task.cancel()
+    await asyncio.gather(*app.state.background_tasks, return_exceptions=True)
+    if app.state.request_deduplicator is not None:
+        await app.state.request_deduplicator.aclose()
+    if app.state.llm_scheduler is not None:
+        await app.state.llm_scheduler.aclose()
+    if app.state.guide_speculator is not None:
+        await app.state.guide_speculator.aclose()
+    if app.state.analysis_store is not None:
+        await app.state.analysis_store.aclose()
+    if app.state.eager_transcriber is not None:
+        await app.state.eager_transcriber.aclose()
+    for batcher in (app.state.title_batcher, app.state.email_batcher):
+        if batcher is not None:
+            await batcher.aclose()
+    await app.state.provider_clients.aclose()
+    await app.state.state_backend.aclose()
+    await app.state.cost_ledger.aclose()
+    await app.state.history_store.aclose()
 
 # FastAPI 앱 생성
 app = FastAPI(
     title="1on1 Meeting AI Analysis & Template Generator API",
     description="1on1 미팅 분석 및 템플릿 생성을 위한 통합 API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 app.include_router(test_router, tags=["Test"]) # 테스트용 라우터 추가
@@ -71,8 +235,52 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Trace-Id", "X-Cache", DEDUP_HEADER, "Retry-After"],
 )
 
+# Accept-Encoding에 따른 응답 압축 (SSE 스트림은 제외)
+if RESPONSE_COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# 요청 중 LLM 호출을 워커의 공정 스케줄러로 보냄 (app.state.llm_scheduler가 없으면 통과)
+app.add_middleware(LLMSchedulerMiddleware)
+
+# 요청 단위 span 트리 / Server-Timing 헤더
+app.add_middleware(TracingMiddleware)
+
+# 엔드포인트별 지연 시간 / 처리 중 요청 수 지표 수집 (가장 바깥에서 전체 처리 시간 측정)
+app.add_middleware(MetricsMiddleware)
+
+# ==================== Monitoring Endpoints ====================
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus 텍스트 포맷 지표 (워커 프로세스 단위)"""
+    return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+@app.get("/api/usage",
+        response_model=UsageRollupResponse,
+        summary="사용자/엔드포인트/일자/모델별 토큰·오디오 사용량과 추정 비용을 집계하는 엔드포인트")
+async def get_usage(
+    group_by: Literal["user", "endpoint", "day", "model"] = Query("user", description="집계 기준"),
+    since: Optional[date] = Query(None, description="집계 시작일 (YYYY-MM-DD, 포함)"),
+    until: Optional[date] = Query(None, description="집계 종료일 (YYYY-MM-DD, 포함)"),
+    user_id: Optional[str] = Query(None, description="특정 사용자로 한정"),
+    endpoint: Optional[str] = Query(None, description="특정 엔드포인트로 한정 (예: analyze, template:email)"),
+    cost_ledger: CostLedger = Depends(get_cost_ledger),
+):
+    """사용량/비용 집계 API (모든 워커의 기록 포함)"""
+    since_str = since.isoformat() if since else None
+    until_str = until.isoformat() if until else None
+    items = await cost_ledger.rollup(group_by, since_str, until_str, user_id=user_id, endpoint=endpoint)
+    return {
+        "group_by": group_by,
+        "since": since_str,
+        "until": until_str,
+        "total_cost_usd": sum(item["cost_usd"] for item in items),
+        "items": items,
+    }
+
 # ==================== STT & Analysis Endpoints ====================
 
 @app.get("/api/config")
@@ -84,60 +292,576 @@ async def get_config():
         "bucket_name": SUPABASE_BUCKET_NAME
     }
 
+@app.get("/api/stats/connections")
+async def get_connection_stats(provider_clients: ProviderClients = Depends(get_provider_clients)):
+    """외부 API 제공자별 커넥션 재사용 통계 반환"""
+    return provider_clients.connection_stats()
+
+@app.get("/api/stats/scheduler")
+async def get_scheduler_stats(llm_scheduler: Optional[FairScheduler] = Depends(get_llm_scheduler)):
+    """LLM 공정 스케줄러의 실행/대기 중인 호출 수와 사용자별 대기 시간 반환 (워커 프로세스 단위)"""
+    if llm_scheduler is None:
+        raise HTTPException(status_code=404, detail="LLM scheduler is disabled.")
+    return llm_scheduler.stats()
+
+@app.get("/api/stats/quota/{user_id}")
+async def get_quota_stats(user_id: str, user_quota: Optional[UserQuota] = Depends(get_user_quota)):
+    """사용자의 남은 요청 수/LLM 토큰 한도 반환 (모든 워커 공유)"""
+    if user_quota is None:
+        raise HTTPException(status_code=404, detail="User quota is disabled.")
+    return await user_quota.snapshot(user_id)
+
+async def _take_request_quota(user_quota: Optional[UserQuota], user_id: Optional[str], cost: int = 1) -> None:
+    """사용자의 분당 요청 한도에서 cost건 차감 (초과 시 Retry-After 헤더와 함께 429)"""
+    if user_quota is None:
+        return
+    try:
+        await user_quota.take_request(user_id, cost)
+    except QuotaExceeded as e:
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+        )
+
+async def _deduplicated(
+    request: Request,
+    deduplicator: Optional[RequestDeduplicator],
+    endpoint: str,
+    user_id: Optional[str],
+    payload: Any,
+    produce: Callable[[], Awaitable[Response]],
+) -> Response:
+    """
+    같은 요청의 동시 실행을 하나로 합치고(singleflight), Idempotency-Key 헤더가 있으면 완료된 응답을 재사용합니다.
+    중복 처리가 꺼져 있으면 produce를 그대로 실행합니다.
+    """
+    if deduplicator is None:
+        return await produce()
+    idempotency_key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+    if idempotency_key is not None and not 0 < len(idempotency_key) <= IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise HTTPException(
+            status_code=400, detail=f"{IDEMPOTENCY_KEY_HEADER} must be 1-{IDEMPOTENCY_KEY_MAX_LENGTH} characters."
+        )
+    try:
+        return await deduplicator.run(
+            endpoint, request_fingerprint(endpoint, payload), produce, idempotency_key, scope=user_id
+        )
+    except IdempotencyKeyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@app.post("/api/audio/upload",
+         response_model=AudioUploadResult,
+         summary="녹음 파일 본문을 STT 제공자와 Storage에 동시에 스트리밍 업로드하는 엔드포인트")
+async def upload_audio(
+    request: Request,
+    filename: Optional[str] = Query(None, description="원본 파일명 (Storage 경로의 확장자에만 사용)"),
+    user_id: Optional[str] = Query(None, description="요청 사용자 ID (사전 전사 사용량/비용 집계용)"),
+    provider_clients: ProviderClients = Depends(get_provider_clients),
+    eager_stt: Optional[EagerTranscriber] = Depends(get_eager_transcriber),
+):
+    """
+    오디오 업로드 API. 요청 본문(raw bytes)을 받는 대로 STT 업로드 API와 Storage로 전달하며 파일 전체를 버퍼링하지 않습니다.
+    응답의 audio_url을 /api/analyze의 recording_url로 보내면 Storage 선업로드 없이 바로 분석할 수 있습니다.
+    업로드가 끝나면 분석 요청을 기다리지 않고 STT를 미리 시작합니다.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > AUDIO_UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Audio must be at most {AUDIO_UPLOAD_MAX_BYTES} bytes.")
+    if provider_clients.stt is None:
+        raise HTTPException(status_code=503, detail="STT provider is not configured.")
+    try:
+        result = await stream_upload(
+            request.stream(),
+            provider_clients,
+            filename,
+            request.headers.get("content-type", "application/octet-stream"),
+        )
+    except ClientDisconnect:
+        return Response(status_code=499)
+    except AudioUploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except (aai.types.TranscriptError, StorageError, httpx.HTTPError) as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    
+    if eager_stt is not None:
+        # 같은 파일을 다시 올려도 전사를 재사용하도록 내용 해시로 보관 (Storage URL로 분석해도 같은 전사 사용)
+        await eager_stt.try_start(
+            result.audio_url, user_id, result.content_sha256, [result.storage_url] if result.storage_url else []
+        )
+    return result
+
+@app.post("/api/audio/uploaded",
+         status_code=202,
+         response_model=EagerTranscriptionStatus,
+         summary="녹음 업로드 완료 알림을 받아 분석 요청 전에 STT를 미리 시작하는 엔드포인트")
+async def audio_uploaded(
+    request: Request,
+    hook: AudioUploadedHook,
+    provider_clients: ProviderClients = Depends(get_provider_clients),
+    eager_stt: Optional[EagerTranscriber] = Depends(get_eager_transcriber),
+):
+    """
+    업로드 완료 훅. 프론트엔드 알림(recording_url) 또는 Supabase Storage 웹훅(storage.objects INSERT의 record)을 받습니다.
+    전사 결과는 공유 전사 캐시에 보관되어, 같은 녹음의 /api/analyze 요청은 STT 대기 없이 LLM 분석부터 실행합니다.
+    Storage URL은 공개/서명 URL 형태와 관계없이 같은 객체면 같은 전사를 사용합니다.
+    X-Hook-Secret 헤더가 EAGER_STT_HOOK_SECRET과 일치해야 하며, 비밀 값이 설정되지 않았으면 알림을 받지 않습니다.
+    recording_url은 설정된 Storage 버킷의 객체 URL만 허용합니다.
+    """
+    if not EAGER_STT_HOOK_SECRET:
+        # 인증 없이 외부 URL로 유료 STT를 시작할 수 없도록 비밀 값이 없으면 알림 API 비활성화
+        raise HTTPException(status_code=503, detail="Upload hook is not configured.")
+    if not hmac.compare_digest(request.headers.get("x-hook-secret", ""), EAGER_STT_HOOK_SECRET):
+        raise HTTPException(status_code=401, detail="Invalid hook secret.")
+    if eager_stt is None:
+        return EagerTranscriptionStatus(status="disabled", recording_url=hook.recording_url)
+    if provider_clients.stt is None:
+        raise HTTPException(status_code=503, detail="STT provider is not configured.")
+    
+    try:
+        recording_url = hook.recording_url
+        storage = provider_clients.storage
+        if recording_url is not None and (storage is None or storage.object_path(recording_url) is None):
+            # Storage 버킷 밖의 URL은 전사하지 않음
+            return EagerTranscriptionStatus(status="ignored")
+        if recording_url is None and hook.record is not None:
+            if storage is None or hook.record.bucket_id != storage.bucket:
+                return EagerTranscriptionStatus(status="ignored")
+            # 비공개 버킷이어도 STT 제공자가 내려받을 수 있도록 서명 URL 사용
+            recording_url = await storage.signed_url(hook.record.name, EAGER_STT_TTL_SECONDS)
+        if recording_url is None:
+            raise HTTPException(status_code=422, detail="recording_url or record is required.")
+        status = await eager_stt.start(recording_url, hook.user_id)
+    except (aai.types.TranscriptError, StorageError, httpx.HTTPError) as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    return EagerTranscriptionStatus(status=status, recording_url=recording_url)
+
+def _analysis_response(result: Dict, fields: Tuple[str, ...] = (), exclude: Tuple[str, ...] = ()) -> Response:
+    if result.get("status") == "deadline_exceeded":
+        raise HTTPException(status_code=504, detail="; ".join(result.get("errors", [])))
+    if result.get("status") == "rejected":
+        raise HTTPException(status_code=422, detail="; ".join(result.get("errors", [])))
+    # 저장된 결과는 /api/analyze/results/{analysis_id}로 다시 조회 가능
+    headers = {"X-Analysis-Id": result["analysis_id"]} if result.get("analysis_id") else None
+    with start_span("serialize_response"):
+        content = select_fields(result.get("analysis_result", {}), fields, exclude)
+        return FastJSONResponse(content=content, headers=headers)
+
+async def _analysis_events(
+    events: AsyncIterator[Tuple[str, Dict]], fields: Tuple[str, ...] = (), exclude: Tuple[str, ...] = ()
+) -> AsyncIterator[Tuple[str, Any]]:
+    """2단계 분석 스트림의 done 이벤트를 필드 선택한 analysis_result로, 실패한 실행은 error 이벤트로 변환"""
+    async for event, data in events:
+        if event == "done":
+            if data.get("status") != "completed":
+                yield "error", {
+                    "status": data.get("status"),
+                    "error": "; ".join(data.get("errors", [])) or f"파이프라인 상태: {data.get('status')}",
+                }
+                continue
+            data = select_fields(data.get("analysis_result", {}), fields, exclude)
+        yield event, data
+
 @app.post("/api/analyze",
          summary="1on1 미팅 오디오를 STT로 전사하고 LLM으로 분석 결과를 반환하는 엔드포인트")
-async def analyze_meeting_with_storage(input_data: AnalyzeMeetingInput):
-    """1on1 미팅 분석 API"""
-    # LangGraph 파이프라인 실행 
-    result = await meeting_pipeline.run(
-        recording_url=input_data.recording_url,
-        qa_pairs=input_data.qa_pairs,
-        participants_info=input_data.participants_info,
-        meeting_datetime=input_data.meeting_datetime,
-        only_title=input_data.only_title
+async def analyze_meeting_with_storage(
+    request: Request,
+    input_data: AnalyzeMeetingInput,
+    fields: Optional[str] = Query(
+        None, description="(선택) 쉼표로 구분한 반환 필드 (예: title,ai_core_summary). 생략하면 전체"
+    ),
+    exclude: Optional[str] = Query(
+        None, description="(선택) 쉼표로 구분한 제외 필드 (예: transcript,ai_summary)"
+    ),
+    stream: bool = Query(
+        False, description="(선택) 2단계 분석을 SSE로 스트리밍 (전사 직후 preview 이벤트, 전체 분석 완료 시 done 이벤트)"
+    ),
+    meeting_pipeline: MeetingPipeline = Depends(get_meeting_pipeline),
+    job_store: JobStore = Depends(get_job_store),
+    cost_ledger: CostLedger = Depends(get_cost_ledger),
+    deadline: Optional[Deadline] = Depends(get_request_deadline),
+    request_deduplicator: Optional[RequestDeduplicator] = Depends(get_request_deduplicator),
+    user_quota: Optional[UserQuota] = Depends(get_user_quota),
+):
+    """
+    1on1 미팅 분석 API.
+    클라이언트 연결이 끊기면 STT/LLM 파이프라인을 취소합니다.
+    job_id를 지정한 요청은 연결이 끊겨도 계속 실행하며 결과는 /api/analyze/jobs/{job_id}로 조회합니다.
+    마감 시간(deadline_ms)을 지정하면 STT 대기와 LLM 호출을 남은 시간 안으로 제한하고, 넘기면 504를 반환합니다.
+    job_id가 없는 같은 요청이 동시에 들어오면 먼저 시작한 분석 결과를 공유하며(마감 시간도 먼저 시작한 요청 기준),
+    Idempotency-Key 헤더를 보내면 완료된 분석 결과를 재시도에 그대로 돌려줍니다.
+    fields/exclude로 필요한 필드만 받으면(예: title만) 대화록을 직렬화/전송하지 않습니다.
+    stream=true이면 빠른 모델의 미리보기(제목, 핵심 요약, 액션 아이템)를 preview 이벤트로 먼저 보내고
+    전체 분석 결과를 done 이벤트로 보냅니다. job_id 요청의 preview=true 미리보기는 작업 상태로 조회합니다.
+    """
+    selected, excluded = tuple(parse_field_list(fields)), tuple(parse_field_list(exclude))
+    await _take_request_quota(user_quota, input_data.user_id)
+    
+    if stream:
+        if input_data.job_id:
+            raise HTTPException(status_code=400, detail="stream=true cannot be combined with job_id.")
+        events = meeting_pipeline.stream(
+            recording_url=input_data.recording_url,
+            qa_pairs=input_data.qa_pairs,
+            participants_info=input_data.participants_info,
+            meeting_datetime=input_data.meeting_datetime,
+            only_title=input_data.only_title,
+            deadline=deadline,
+            user_id=input_data.user_id,
+            member_id=input_data.member_id,
+        )
+        return _event_stream_response(
+            request, to_sse(_analysis_events(events, selected, excluded)), "analyze", input_data.user_id, cost_ledger
+        )
+
+    async def run_pipeline() -> Response:
+        # LangGraph 파이프라인 실행 
+        result = await meeting_pipeline.run(
+            recording_url=input_data.recording_url,
+            qa_pairs=input_data.qa_pairs,
+            participants_info=input_data.participants_info,
+            meeting_datetime=input_data.meeting_datetime,
+            only_title=input_data.only_title,
+            deadline=deadline,
+            user_id=input_data.user_id,
+            member_id=input_data.member_id,
+        )
+        return _analysis_response(result, selected, excluded)
+
+    try:
+        if input_data.job_id:
+            # 같은 job_id의 동시 요청(중복 클릭) 중 하나만 작업을 만들고 실행
+            if await job_store.create("analyze", job_id=input_data.job_id, recording_url=input_data.recording_url) is None:
+                raise HTTPException(status_code=409, detail=f"Job '{input_data.job_id}' already exists.")
+            task = start_analysis_job(
+                meeting_pipeline, job_store, input_data.job_id, input_data,
+                request.app.state.background_tasks, cost_ledger, deadline,
+            )
+            result = await cancel_on_disconnect(request, asyncio.shield(task), "analyze", keep_running=True)
+            return _analysis_response(result, selected, excluded)
+        payload = input_data.model_dump(exclude={"job_id"})
+        if selected or excluded:
+            # 공유한 응답 본문은 이미 필드가 선택된 상태이므로 필드 선택이 다른 요청끼리는 합치지 않음
+            payload["response_fields"] = {"fields": selected, "exclude": excluded}
+        with cost_ledger.track("analyze", input_data.user_id):
+            return await cancel_on_disconnect(
+                request,
+                _deduplicated(
+                    request, request_deduplicator, "analyze", input_data.user_id, payload, run_pipeline,
+                ),
+                "analyze",
+            )
+    except ClientDisconnected:
+        # 응답을 받을 클라이언트가 없으므로 본문 없이 종료 (nginx 관례의 499)
+        return Response(status_code=499)
+
+@app.post("/api/analyze/jobs",
+         response_model=AnalysisJobStatus,
+         status_code=202,
+         summary="미팅 분석을 비동기 작업으로 등록하고 작업 ID를 반환하는 엔드포인트")
+async def create_analysis_job(
+    request: Request,
+    input_data: AnalyzeMeetingInput,
+    meeting_pipeline: MeetingPipeline = Depends(get_meeting_pipeline),
+    job_store: JobStore = Depends(get_job_store),
+    cost_ledger: CostLedger = Depends(get_cost_ledger),
+    deadline: Optional[Deadline] = Depends(get_request_deadline),
+    provider_clients: ProviderClients = Depends(get_provider_clients),
+    user_quota: Optional[UserQuota] = Depends(get_user_quota),
+):
+    """
+    비동기 분석 작업 등록 API (상태는 모든 워커에서 조회 가능).
+    등록 전에 녹음 헤더를 점검해 사용할 수 없는 파일은 작업을 만들지 않고 422를 반환하며,
+    녹음 길이로 예측한 완료 시각(estimated_completion_at)을 함께 돌려줍니다.
+    """
+    await _take_request_quota(user_quota, input_data.user_id)
+    probe = None
+    if PREFLIGHT_ENABLED and input_data.recording_url and not input_data.only_title:
+        probe = await probe_recording(provider_clients.media, input_data.recording_url)
+        if not probe.usable:
+            raise HTTPException(status_code=422, detail=f"Recording rejected ({probe.reason}): {probe.detail}")
+    
+    job = await job_store.create("analyze", recording_url=input_data.recording_url)
+    if probe is not None:
+        estimated_at = None
+        if probe.estimated_completion_seconds is not None:
+            estimated_at = (datetime.now() + timedelta(seconds=probe.estimated_completion_seconds)).isoformat()
+        job = await job_store.update(job["job_id"], preflight=probe.model_dump(), estimated_completion_at=estimated_at)
+    start_analysis_job(
+        meeting_pipeline, job_store, job["job_id"], input_data, request.app.state.background_tasks, cost_ledger,
+        deadline, probe.model_dump() if probe is not None else None,
     )
-    return JSONResponse(content=result.get("analysis_result", {}))
+    return job
+
+@app.post("/api/analyze/preflight",
+         response_model=RecordingProbe,
+         summary="녹음 파일 헤더만 읽어 분석 가능 여부와 길이, 예상 처리 시간을 반환하는 엔드포인트")
+async def preflight_recording(
+    input_data: RecordingPreflightInput,
+    provider_clients: ProviderClients = Depends(get_provider_clients),
+):
+    """
+    녹음 사전 점검 API. 파일 전체를 받지 않고 Range 요청으로 컨테이너 헤더(코덱, 길이, 채널, 샘플레이트)만 읽습니다.
+    사용할 수 없는 파일은 usable=false와 거부 사유를 반환하며(응답 코드는 200), 업로드 직후 화면에서 바로 안내할 수 있습니다.
+    """
+    return await probe_recording(provider_clients.media, input_data.recording_url)
+
+@app.get("/api/analyze/jobs/{job_id}",
+        response_model=AnalysisJobStatus,
+        summary="비동기 분석 작업의 상태와 결과를 조회하는 엔드포인트")
+async def get_analysis_job(job_id: str, job_store: JobStore = Depends(get_job_store)):
+    """비동기 분석 작업 조회 API"""
+    job = await job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    return job
+
+@app.get("/api/analyze/results/{analysis_id}",
+        summary="저장된 분석 결과를 ETag 조건부 요청과 필드 선택으로 조회하는 엔드포인트")
+async def get_analysis_result(
+    request: Request,
+    analysis_id: str,
+    fields: Optional[str] = Query(
+        None, description="(선택) 쉼표로 구분한 반환 필드 (예: analysis_result.title,speaker_stats_percent). 생략하면 전체"
+    ),
+    exclude: Optional[str] = Query(
+        None, description="(선택) 쉼표로 구분한 제외 필드 (예: transcript)"
+    ),
+    analysis_store: Optional[AnalysisStore] = Depends(get_analysis_store),
+):
+    """
+    분석 결과 조회 API. /api/analyze 응답의 X-Analysis-Id(작업은 job_id)로 다시 계산하지 않고 결과를 엽니다.
+    ETag가 If-None-Match와 같으면 본문 없이 304를 반환합니다. 필드를 선택/제외하면 선택한 필드별로 다른 ETag를 씁니다.
+    """
+    if analysis_store is None:
+        raise HTTPException(status_code=503, detail="Analysis store is disabled.")
+    stored = await analysis_store.get(analysis_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"Analysis '{analysis_id}' not found.")
+    
+    record, body = stored
+    selected, excluded = parse_field_list(fields), parse_field_list(exclude)
+    variant = ",".join(selected)
+    if excluded:
+        variant += "-" + ",".join(excluded)
+    etag = make_etag(body, variant or None)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if not selected and not excluded:
+        # 저장된 직렬화 본문을 그대로 전송 (다시 직렬화하지 않음)
+        return Response(content=body, media_type="application/json", headers=headers)
+    return FastJSONResponse(content=select_fields(record, selected, excluded), headers=headers)
+
+# ==================== History Endpoints ====================
+
+@app.get("/api/history/{user_id}", summary="사용자의 1on1 기록 digest와 최근 미팅 목록을 조회하는 엔드포인트")
+async def get_meeting_history(
+    user_id: str,
+    limit: int = Query(20, ge=1, le=100, description="반환할 최근 미팅 수"),
+    history_store: MeetingHistoryStore = Depends(get_history_store),
+):
+    """1on1 기록 조회 API (digest는 use_previous_data 템플릿 생성에 사용되는 요약)"""
+    if await history_store.get_user(user_id) is None:
+        raise HTTPException(status_code=404, detail=f"User with ID '{user_id}' not found.")
+    return {
+        "digest": await history_store.get_digest(user_id),
+        "meetings": await history_store.list_meetings(user_id, limit=limit),
+    }
 
 # ==================== Template Generator Endpoints ====================
 
+def _event_stream_response(
+    request: Request,
+    stream: AsyncIterator[str],
+    endpoint: str,
+    user_id: Optional[str],
+    cost_ledger: CostLedger,
+    headers: Optional[Dict[str, str]] = None,
+) -> StreamingResponse:
+    """SSE 응답. 클라이언트 연결이 끊기면 생성을 취소하고, 스트림이 끝날 때까지의 사용량을 원장에 기록"""
+    stream = cancel_stream_on_disconnect(request, stream, endpoint)
+    stream = cost_ledger.track_stream(stream, endpoint, user_id)
+    return StreamingResponse(stream, media_type="text/event-stream", headers=headers)
+
+async def _with_previous_summary(
+    input_data: TemplateGeneratorInput,
+    history_store: Optional[MeetingHistoryStore],
+) -> TemplateGeneratorInput:
+    """기록 저장소에서 사용자를 확인하고, use_previous_data인데 previous_summary가 없으면 digest로 채움"""
+    if history_store is None:
+        return input_data
+    if await history_store.get_user(input_data.user_id) is None:
+        raise HTTPException(status_code=404, detail=f"User with ID '{input_data.user_id}' not found.")
+    if input_data.use_previous_data and not input_data.previous_summary:
+        digest = await history_store.get_digest(input_data.user_id)
+        if digest is not None and digest["recent_meetings"]:
+            input_data = input_data.model_copy(update={"previous_summary": render_digest(digest)})
+    return input_data
+
+# 캐시에서 재사용한 템플릿은 같은 질문의 가이드도 이미 생성된 적이 있어 가이드 요청이 캐시로 처리되므로 사전 생성하지 않음
+_REUSED_TEMPLATE = (CACHE_HIT, CACHE_SIMILAR)
+
+async def _with_cache_status(
+    events: AsyncIterator[Tuple[str, Any]], cache_status: str
+) -> AsyncIterator[Tuple[str, Any]]:
+    """템플릿 스트림의 done 이벤트 결과에 캐시 처리 결과 표시 (캐시된 객체는 변경하지 않음)"""
+    async for event, data in events:
+        if event == "done":
+            data = data.model_copy(update={"cache_status": cache_status})
+        yield event, data
+
 @app.post(
     "/api/template",
     response_model=Union[TemplateGeneratorOutput, EmailGeneratorOutput],
     summary="1on1 미팅 템플릿, 이메일, 가이드 생성하는 엔드포인트")
 async def generate_endpoint(
+    request: Request,
     input_data: TemplateGeneratorInput,
     generation_type: Literal["template", "email", "guide"] = Query(
         "template", description="생성할 콘텐츠 타입"
     ),
+    stream: bool = Query(False, description="템플릿/이메일을 SSE로 스트리밍 (가이드는 항상 스트리밍)"),
+    cost_ledger: CostLedger = Depends(get_cost_ledger),
+    response_cache: Optional[ResponseCache] = Depends(get_response_cache),
+    similarity_cache: Optional[SimilarityCache] = Depends(get_similarity_cache),
+    email_batcher: Optional[MicroBatcher] = Depends(get_email_batcher),
+    guide_speculator: Optional[GuideSpeculator] = Depends(get_guide_speculator),
+    history_store: Optional[MeetingHistoryStore] = Depends(get_history_store),
+    request_deduplicator: Optional[RequestDeduplicator] = Depends(get_request_deduplicator),
+    user_quota: Optional[UserQuota] = Depends(get_user_quota),
 ):
-    """템플릿/이메일/가이드 생성 API"""
+    """
+    템플릿/이메일/가이드 생성 API (X-Cache 헤더로 응답 캐시 적중 여부 표시)
+    템플릿 결과에는 cache_status 필드도 포함합니다 (SIMILAR: 유사 요청의 최근 결과 재사용).
+    비스트리밍 템플릿/이메일은 같은 요청의 동시 실행을 공유하고 Idempotency-Key 헤더를 지원합니다 (X-Dedup 헤더로 표시).
+    """
+    endpoint = f"template:{generation_type}"
+    await _take_request_quota(user_quota, input_data.user_id)
+    input_data = await _with_previous_summary(input_data, history_store)
     try:
-        if generation_type == "template":
-            result = await generate_template(input_data)
-        elif generation_type == "email":
-            email_input = EmailGeneratorInput(
-                user_id=input_data.user_id,
-                target_info=input_data.target_info,
-                purpose=input_data.purpose,
-                detailed_context=input_data.detailed_context,
-                use_previous_data=input_data.use_previous_data,
-                previous_summary=input_data.previous_summary,
-                language=input_data.language or "Korean"  # 사용자 선택 우선, 없으면 기본값
+        if generation_type == "template" and stream:
+            # 질문 하나가 완성될 때마다 question 이벤트, 마지막에 TemplateGeneratorOutput 형태의 done 이벤트
+            events, cache_status = cached_event_stream(
+                response_cache,
+                get_template_cache_key(input_data),
+                lambda: stream_template(input_data),
+                replay_template,
+                get_template_similar_lookup(similarity_cache, input_data),
             )
-            result = await generate_email(email_input)
+            events = _with_cache_status(events, cache_status)
+            if input_data.include_guide and guide_speculator is not None and cache_status not in _REUSED_TEMPLATE:
+                events = speculate_guide(events, guide_speculator, input_data)
+            return _event_stream_response(
+                request, to_sse(events), endpoint, input_data.user_id, cost_ledger, {"X-Cache": cache_status}
+            )
+        elif generation_type == "template":
+            async def produce_template() -> Response:
+                result, cache_status = await cached_call(
+                    response_cache,
+                    get_template_cache_key(input_data),
+                    lambda: generate_template(input_data),
+                    get_template_similar_lookup(similarity_cache, input_data),
+                )
+                result = result.model_copy(update={"cache_status": cache_status})
+                if input_data.include_guide and guide_speculator is not None and cache_status not in _REUSED_TEMPLATE:
+                    # 클라이언트가 이어서 요청할 가이드를 미리 생성 (질문 목록 해시로 보관)
+                    guide_speculator.start(to_guide_input(input_data, result.generated_questions))
+                with start_span("serialize_response"):
+                    return FastJSONResponse(content=result.model_dump(), headers={"X-Cache": cache_status})
+
+            with cost_ledger.track(endpoint, input_data.user_id):
+                return await _deduplicated(
+                    request, request_deduplicator, endpoint, input_data.user_id, input_data.model_dump(), produce_template
+                )
+        elif generation_type == "email":
+            email_input = to_email_input(input_data)
+            if stream:
+                # 문단이 완성될 때마다 paragraph 이벤트, 마지막에 EmailGeneratorOutput 형태의 done 이벤트
+                events, cache_status = cached_event_stream(
+                    response_cache,
+                    get_email_cache_key(email_input),
+                    lambda: stream_email(email_input),
+                    replay_email,
+                )
+                return _event_stream_response(
+                    request, to_sse(events), endpoint, input_data.user_id, cost_ledger, {"X-Cache": cache_status}
+                )
+            async def produce_email() -> Response:
+                result, cache_status = await cached_call(
+                    response_cache,
+                    get_email_cache_key(email_input),
+                    # 묶음 처리가 켜져 있으면 동시에 들어온 다른 이메일 요청과 함께 생성
+                    lambda: email_batcher.submit(email_input) if email_batcher is not None else generate_email(email_input),
+                )
+                with start_span("serialize_response"):
+                    return FastJSONResponse(content=result.model_dump(), headers={"X-Cache": cache_status})
+
+            with cost_ledger.track(endpoint, input_data.user_id):
+                return await _deduplicated(
+                    request, request_deduplicator, endpoint, input_data.user_id, email_input.model_dump(), produce_email
+                )
         elif generation_type == 'guide':
             if not input_data.generated_questions:
                 raise HTTPException(status_code=400, detail="Usage guide generation requires 'generated_questions'.")
             
-            guide_input = UsageGuideInput(
-                user_id=input_data.user_id,
-                target_info=input_data.target_info,
-                purpose=input_data.purpose,
-                detailed_context=input_data.detailed_context,
-                generated_questions=input_data.generated_questions,
-                language=input_data.language or "Korean"  # 사용자 선택 우선, 없으면 기본값
+            guide_input = to_guide_input(input_data, input_data.generated_questions)
+            # 사전 생성된(진행 중 포함) 가이드가 있으면 버퍼된 이벤트부터 바로 전송
+            stream = guide_speculator.claim(guide_input) if guide_speculator is not None else None
+            cache_status = CACHE_SPECULATIVE
+            if stream is None:
+                # 캐시 적중 시 저장된 SSE 이벤트를 재생, 미스 시 생성하면서 저장
+                stream, cache_status = cached_stream(
+                    response_cache,
+                    get_guide_cache_key(guide_input),
+                    lambda: generate_usage_guide(guide_input),
+                    is_guide_error_event,
+                )
+            return _event_stream_response(
+                request, stream, endpoint, input_data.user_id, cost_ledger, {"X-Cache": cache_status}
             )
-            return StreamingResponse(generate_usage_guide(guide_input), media_type="text/event-stream")
-        return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/template/bundle", summary="템플릿, 이메일, 가이드를 한 번에 생성하는 SSE 엔드포인트")
+async def generate_bundle_endpoint(
+    request: Request,
+    input_data: TemplateGeneratorInput,
+    cost_ledger: CostLedger = Depends(get_cost_ledger),
+    response_cache: Optional[ResponseCache] = Depends(get_response_cache),
+    similarity_cache: Optional[SimilarityCache] = Depends(get_similarity_cache),
+    history_store: Optional[MeetingHistoryStore] = Depends(get_history_store),
+    user_quota: Optional[UserQuota] = Depends(get_user_quota),
+):
+    """
+    템플릿 → 가이드 → 이메일 순차 호출 3회를 하나의 SSE 스트림으로 대체합니다.
+    이메일은 템플릿과 동시에, 가이드는 질문이 완성되는 즉시 시작합니다.
+    """
+    await _take_request_quota(user_quota, input_data.user_id)
+    input_data = await _with_previous_summary(input_data, history_store)
+    events = stream_bundle(input_data, response_cache, similarity_cache)
+    return _event_stream_response(request, to_sse(events), "template:bundle", input_data.user_id, cost_ledger)
+
+
+@app.post("/api/template/team", summary="리더의 여러 팀원 템플릿을 한 번에 생성하는 SSE 엔드포인트")
+async def generate_team_endpoint(
+    request: Request,
+    team_input: TeamTemplateInput,
+    cost_ledger: CostLedger = Depends(get_cost_ledger),
+    response_cache: Optional[ResponseCache] = Depends(get_response_cache),
+    similarity_cache: Optional[SimilarityCache] = Depends(get_similarity_cache),
+    history_store: Optional[MeetingHistoryStore] = Depends(get_history_store),
+    user_quota: Optional[UserQuota] = Depends(get_user_quota),
+):
+    """
+    공통 설정 1개와 팀원별 입력 목록으로 팀원 수만큼의 /api/template 호출을 대체합니다.
+    제한된 동시성으로 생성하며 완료되는 순서대로 member 이벤트를 보냅니다 (packed=true이면 짧은 입력을 묶어 호출).
+    """
+    # 팀원 수만큼의 /api/template 호출을 대체하므로 팀원 수만큼 차감
+    await _take_request_quota(user_quota, team_input.user_id, len(team_input.members))
+    inputs = await asyncio.gather(*(
+        _with_previous_summary(to_member_input(team_input, member), history_store) for member in team_input.members
+    ))
+    events = stream_team_templates(team_input, list(inputs), response_cache, similarity_cache)
+    return _event_stream_response(request, to_sse(events), "template:team", team_input.user_id, cost_ledger)
@@ -0,0 +1,295 @@
+import asyncio
+import gzip
+import time
+import zlib
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+
+from src.config.config import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MIN_BYTES,
+    COMPRESSION_THREAD_MIN_BYTES,
+)
+from src.utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT, record_response_compression
+from src.utils.tracing import parse_traceparent, start_trace
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 사용
+    brotli = None
+
+# 압축 효과가 있는 Content-Type (text/event-stream은 이벤트가 버퍼링되지 않도록 제외)
+_COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "application/xml", "image/svg+xml", "text/")
+_COMPRESSIBLE_SUFFIXES = ("+json", "+xml")
+
+
+class MetricsMiddleware:
+    """
+    엔드포인트별 지연 시간과 처리 중 요청 수를 기록하는 순수 ASGI 미들웨어.
+    BaseHTTPMiddleware와 달리 응답 본문을 감싸지 않아 SSE 스트리밍에 부담을 주지 않으며,
+    스트리밍 응답은 마지막 본문 전송 시점까지를 처리 시간으로 기록합니다.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # 경로 파라미터로 라벨이 폭증하지 않도록 매칭된 라우트 템플릿을 사용
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            HTTP_REQUEST_DURATION.labels(scope["method"], route_path, str(status_code)).observe(
+                time.perf_counter() - start_time
+            )
+
+
+class TracingMiddleware:
+    """
+    요청마다 루트 span을 열어 trace id를 전파하고, 응답 헤더에
+    X-Trace-Id와 Server-Timing(하위 span 이름별 소요 시간 요약)을 추가하는 ASGI 미들웨어.
+    스트리밍 응답은 헤더 전송 시점까지 완료된 span만 요약됩니다.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        trace_id = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+
+        with start_trace(f"{scope['method']} {scope['path']}", trace_id=trace_id) as root_span:
+            if root_span is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message) -> None:
+                if message["type"] == "http.response.start":
+                    response_headers = list(message.get("headers", []))
+                    response_headers.append((b"x-trace-id", root_span.trace_id.encode("latin-1")))
+                    server_timing = root_span.trace.server_timing()
+                    total = f"total;dur={root_span.elapsed_ms():.1f}"
+                    response_headers.append(
+                        (b"server-timing", (f"{server_timing}, {total}" if server_timing else total).encode("latin-1"))
+                    )
+                    root_span.set_attribute("http.status_code", message["status"])
+                    message = {**message, "headers": response_headers}
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+
+class LLMSchedulerMiddleware:
+    """
+    요청 처리 중(스트리밍 응답 생성, 요청에서 시작한 백그라운드 작업 포함)의 모든 LangChain LLM 호출이
+    워커의 공정 스케줄러(app.state.llm_scheduler)를 거치도록 하는 ASGI 미들웨어. 스케줄러가 없으면 그대로 통과합니다.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        scheduler = getattr(scope["app"].state, "llm_scheduler", None) if scope["type"] == "http" else None
+        if scheduler is None:
+            await self.app(scope, receive, send)
+            return
+        with scheduler.activate():
+            await self.app(scope, receive, send)
+
+
+def select_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Accept-Encoding 헤더(q 값 포함)에서 사용할 인코딩 선택.
+    brotli가 설치되어 있으면 br을 gzip보다 우선하며, 둘 다 허용되지 않으면 None (압축하지 않음)
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if name.strip():
+            weights[name.strip()] = weight
+
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best = None
+    for encoding in candidates:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > 0 and (best is None or weight > best[1]):
+            best = (encoding, weight)
+    return best[0] if best else None
+
+
+def compress_body(
+    body: bytes,
+    encoding: str,
+    gzip_level: int = COMPRESSION_GZIP_LEVEL,
+    brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    # mtime=0: 같은 본문은 항상 같은 압축 바이트열
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class _StreamCompressor:
+    """여러 본문 메시지로 나뉘어 전송되는 응답을 조각마다 flush하며 압축 (조각이 도착하는 대로 전송)"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int) -> None:
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes, last: bool) -> bytes:
+        if self._brotli is not None:
+            data = self._brotli.process(chunk)
+            return data + (self._brotli.finish() if last else self._brotli.flush())
+        return self._zlib.compress(chunk) + self._zlib.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def _is_compressible(message, headers: MutableHeaders) -> bool:
+    if message["status"] < 200 or message["status"] in (204, 304) or "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "text/event-stream":
+        return False
+    return content_type.startswith(_COMPRESSIBLE_TYPES) or content_type.endswith(_COMPRESSIBLE_SUFFIXES)
+
+
+class CompressionMiddleware:
+    """
+    Accept-Encoding에 따라 응답 본문을 br(brotli 설치 시) 또는 gzip으로 압축하는 순수 ASGI 미들웨어.
+    SSE 스트림, 이미 인코딩된 응답, 압축 효과가 없는 형식(오디오 등), minimum_size보다 작은 응답은 그대로 보냅니다.
+    한 번에 보내는 본문은 통째로 압축하고(thread_min_size 이상이면 스레드에서), 압축해도 작아지지 않으면 원본을 보냅니다.
+    여러 조각으로 나뉜 스트리밍 응답은 조각마다 flush해 도착하는 대로 전송합니다.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MIN_BYTES,
+        gzip_level: int = COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+        thread_min_size: int = COMPRESSION_THREAD_MIN_BYTES,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.thread_min_size = thread_min_size
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        encoding = select_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[_StreamCompressor] = None
+        passthrough = False
+        raw_bytes = sent_bytes = 0
+
+        async def send_wrapper(message) -> None:
+            nonlocal start_message, compressor, passthrough, raw_bytes, sent_bytes
+            if message["type"] == "http.response.start":
+                # 본문 첫 조각을 보고 압축 여부를 정할 때까지 헤더 전송을 미룸
+                start_message = message
+                return
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] != "http.response.body":
+                # 파일 전송(pathsend) 등 본문 메시지가 아닌 응답은 그대로 전송
+                if compressor is None:
+                    passthrough = True
+                    await send(start_message)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                response_headers = MutableHeaders(raw=list(start_message.get("headers", [])))
+                response_headers.add_vary_header("Accept-Encoding")
+                start_message = {**start_message, "headers": response_headers.raw}
+                if not _is_compressible(start_message, response_headers) or (
+                    not more_body and len(body) < self.minimum_size
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                if not more_body:
+                    compressed = await self._compress(body, encoding)
+                    if len(compressed) >= len(body):
+                        passthrough = True
+                        await send(start_message)
+                        await send(message)
+                        return
+                    _set_encoding_headers(response_headers, encoding)
+                    response_headers["content-length"] = str(len(compressed))
+                    record_response_compression(encoding, len(body), len(compressed))
+                    await send(start_message)
+                    await send({**message, "body": compressed})
+                    return
+
+                compressor = _StreamCompressor(encoding, self.gzip_level, self.brotli_quality)
+                _set_encoding_headers(response_headers, encoding)
+                del response_headers["content-length"]
+                await send(start_message)
+
+            data = compressor.compress(body, last=not more_body)
+            raw_bytes += len(body)
+            sent_bytes += len(data)
+            if not more_body:
+                record_response_compression(encoding, raw_bytes, sent_bytes)
+            await send({**message, "body": data})
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _compress(self, body: bytes, encoding: str) -> bytes:
+        if len(body) >= self.thread_min_size:
+            return await asyncio.to_thread(compress_body, body, encoding, self.gzip_level, self.brotli_quality)
+        return compress_body(body, encoding, self.gzip_level, self.brotli_quality)
+
+
+def _set_encoding_headers(headers: MutableHeaders, encoding: str) -> None:
+    headers["content-encoding"] = encoding
+    # 압축된 표현은 원본과 바이트가 다르므로 강한 ETag를 약한 ETag로 (If-None-Match 비교는 약한 비교)
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["etag"] = f"W/{etag}"
@@ -0,0 +1,61 @@
+import os
+
+# 외부 API 없이 모듈을 임포트할 수 있도록 최소한의 환경변수 설정
+os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "test-project")
+os.environ.setdefault("TRACING_EXPORTER", "none")
+
+# 공용 fixture 모듈은 위 환경변수 설정 이후에 임포트
+from typing import Callable, Optional
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.fakes import (
+    FakeAssemblyAIClient,
+    FakeChatModel,
+    LatencyDistribution,
+    fake_media_client,
+    meeting_analysis_responder,
+)
+from src.utils.clients import ProviderClients
+
+# 미팅 분석 LangGraph 노드 모듈 (STT 폴링 간격, 마감 시간 설정 등을 테스트에서 교체)
+NODES = "src.services.meeting_generator.generate_meeting"
+
+
+@pytest.fixture
+def patch_nodes():
+    """분석 노드 모듈 설정을 교체하는 컨텍스트 매니저 생성 함수 (예: patch_nodes(STT_CHECK_INTERVAL=0.01))"""
+    return lambda **values: patch.multiple(NODES, **values)
+
+
+@pytest.fixture
+def fake_clients() -> Callable[..., ProviderClients]:
+    """
+    외부 API 없이 분석 파이프라인을 실행하는 ProviderClients 생성 함수.
+    STT/미디어/분석 모델은 benchmarks.fakes의 가짜 구현이며, 기본 모델은 gemini-2.5-pro, 대체 모델은 gemini-2.5-flash 이름을 씁니다.
+    duration_minutes는 STT 결과 길이이고, media를 지정하지 않으면 사전 검사는 30분 녹음으로 읽습니다(기본 모델 프로필).
+    """
+    def make(
+        duration_minutes: float = 5,
+        stt_latency_ms: Optional[float] = None,
+        stt=None,
+        media=None,
+        storage=None,
+        responder=meeting_analysis_responder,
+        fallback_responder=meeting_analysis_responder,
+    ) -> ProviderClients:
+        if stt is None:
+            latency = LatencyDistribution() if stt_latency_ms is None else LatencyDistribution(mean_ms=stt_latency_ms)
+            stt = FakeAssemblyAIClient(processing_latency=latency, duration_minutes=duration_minutes)
+        return ProviderClients(
+            stt=stt,
+            supabase=object(),
+            storage=storage,
+            media=media or fake_media_client(),
+            meeting_llm=FakeChatModel(model_name="gemini-2.5-pro", responder=responder),
+            meeting_fallback_llm=FakeChatModel(model_name="gemini-2.5-flash", responder=fallback_responder),
+            title_llm=object(),
+        )
+
+    return make
@@ -0,0 +1,122 @@
+import json
+
+import httpx
+import pytest
+
+from benchmarks.fakes import meeting_analysis_responder
+from src.services.meeting_generator.analysis_jobs import run_analysis_job
+from src.services.meeting_generator.workflow import MeetingPipeline
+from src.utils.cost_ledger import CostLedger
+from src.utils.job_store import JobStore
+from src.utils.metrics import ANALYSIS_PREVIEWS
+from src.utils.schemas import AnalyzeMeetingInput
+from src.utils.state_backend import create_state_backend
+from src.web.main import app
+
+
+class PromptRecorder:
+    """분석 모델이 받은 마지막 프롬프트를 기록하는 응답 생성 함수"""
+
+    def __init__(self) -> None:
+        self.prompts = []
+
+    def __call__(self, messages) -> str:
+        self.prompts.append(str(messages[-1].content))
+        return meeting_analysis_responder(messages)
+
+
+def _pipeline(fake_clients, full: PromptRecorder, fast: PromptRecorder) -> MeetingPipeline:
+    return MeetingPipeline(fake_clients(duration_minutes=30, responder=full, fallback_responder=fast))
+
+
+@pytest.mark.asyncio
+async def test_preview_is_published_and_used_as_analysis_hint(fake_clients, patch_nodes):
+    full, fast = PromptRecorder(), PromptRecorder()
+    previews = []
+
+    async def on_preview(preview):
+        # 전체 분석 시작 전에 전달됨
+        assert full.prompts == []
+        previews.append(preview)
+
+    ready_before = ANALYSIS_PREVIEWS.labels("ready").value
+    with patch_nodes(STT_CHECK_INTERVAL=0.01):
+        result = await _pipeline(fake_clients, full, fast).run(
+            recording_url="https://cdn.test/a.wav",
+            participants_info=json.dumps({"leader": "김지현", "member": "김준희"}),
+            preview=True,
+            on_preview=on_preview,
+        )
+
+    assert result["status"] == "completed"
+    assert len(previews) == 1 and len(fast.prompts) == 1 and len(full.prompts) == 1
+    assert previews[0]["speaker_mapping"] == ["김지현", "김준희"]
+    assert set(previews[0]) == {"title", "speaker_mapping", "leader_action_items", "member_action_items", "ai_core_summary"}
+    # 전체 분석 프롬프트에 미리보기의 화자 매핑과 액션 아이템 초안 포함
+    assert "Preview Draft" in full.prompts[0] and "디자인 리뷰 일정 재조정" in full.prompts[0]
+    assert result["analysis_result"]["ai_summary"] and "speaker_mapping" not in result["analysis_result"]
+    assert ANALYSIS_PREVIEWS.labels("ready").value == ready_before + 1
+
+    # preview를 요청하지 않으면 빠른 모델을 호출하지 않음
+    full, fast = PromptRecorder(), PromptRecorder()
+    with patch_nodes(STT_CHECK_INTERVAL=0.01):
+        await _pipeline(fake_clients, full, fast).run(recording_url="https://cdn.test/a.wav")
+    assert fast.prompts == [] and "Preview Draft" not in full.prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_job_records_preview_until_full_result(tmp_path, fake_clients, patch_nodes):
+    backend = create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}")
+    job_store = JobStore(backend)
+    job = await job_store.create("analyze", recording_url="https://cdn.test/a.wav")
+    snapshots = []
+    update = job_store.update
+
+    async def recording_update(job_id, **fields):
+        snapshots.append(dict(fields))
+        return await update(job_id, **fields)
+
+    job_store.update = recording_update
+    input_data = AnalyzeMeetingInput(recording_url="https://cdn.test/a.wav", preview=True)
+    with patch_nodes(STT_CHECK_INTERVAL=0.01):
+        pipeline = _pipeline(fake_clients, PromptRecorder(), PromptRecorder())
+        await run_analysis_job(pipeline, job_store, job["job_id"], input_data)
+    stored = await job_store.get(job["job_id"])
+    await backend.aclose()
+
+    assert [snapshot.get("status") for snapshot in snapshots] == ["running", None, "completed"]
+    assert snapshots[1]["preview"]["title"]
+    assert stored["status"] == "completed" and stored["preview"] is None and stored["result"]["ai_summary"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_stream_sends_preview_then_done(tmp_path, fake_clients, patch_nodes):
+    app.state.meeting_pipeline = _pipeline(fake_clients, PromptRecorder(), PromptRecorder())
+    app.state.job_store = None
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            with patch_nodes(STT_CHECK_INTERVAL=0.01):
+                response = await client.post(
+                    "/api/analyze", json={"recording_url": "https://cdn.test/a.wav"},
+                    params={"stream": "true", "exclude": "transcript"},
+                )
+            conflict = await client.post(
+                "/api/analyze", json={"recording_url": "https://cdn.test/a.wav", "job_id": "job_1"},
+                params={"stream": "true"},
+            )
+    finally:
+        await app.state.cost_ledger.aclose()
+        for name in ("meeting_pipeline", "job_store", "cost_ledger"):
+            delattr(app.state, name)
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [
+        (block.split("\n")[0][len("event: "):], json.loads(block.split("\n")[1][len("data: "):]))
+        for block in response.text.strip().split("\n\n")
+    ]
+    assert [event for event, _ in events] == ["preview", "done"]
+    assert events[0][1]["ai_core_summary"]["core_content"]
+    assert events[1][1]["ai_summary"] and "transcript" not in events[1][1]
+    assert conflict.status_code == 400
@@ -0,0 +1,98 @@
+import gzip
+import json
+import os
+
+import httpx
+import pytest
+
+from src.services.meeting_generator.workflow import MeetingPipeline
+from src.utils.analysis_store import AnalysisStore, etag_matches
+from src.utils.serialization import project_fields
+from src.utils.metrics import ANALYSIS_STORE_WRITES
+from src.web.main import app
+
+ANALYSIS = {"title": "3분기 목표 점검", "ai_summary": "요약", "ai_core_summary": {"core_content": "핵심", "decisions_made": ["결정"]}}
+TRANSCRIPT = {"utterances": [{"speaker": "A", "text": "안녕하세요"}], "total_duration": 300}
+
+
+def test_field_projection_and_etag_matching():
+    record = {"analysis_id": "a1", "analysis_result": ANALYSIS, "transcript": TRANSCRIPT}
+
+    assert project_fields(record, ["analysis_result.title", "analysis_result.ai_core_summary.core_content", "missing.x"]) == {
+        "analysis_result": {"title": "3분기 목표 점검", "ai_core_summary": {"core_content": "핵심"}}
+    }
+    assert project_fields(record, ["transcript"]) == {"transcript": TRANSCRIPT}
+    assert etag_matches('"abc", W/"def"', '"def"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abc"', '"abd"') and not etag_matches(None, '"abc"')
+
+
+@pytest.mark.asyncio
+async def test_results_are_written_in_background_and_atomically(tmp_path):
+    store = AnalysisStore(str(tmp_path))
+    written_before = ANALYSIS_STORE_WRITES.labels("written").value
+
+    assert store.save_nowait("job_1", ANALYSIS, TRANSCRIPT, {"A": 100.0}, user_id="user_001")
+    # 기록 전에도 같은 워커에서는 바로 조회
+    pending_record, pending_body = await store.get("job_1")
+    await store.flush()
+
+    path = tmp_path / "jo" / "job_1.json.gz"
+    assert json.loads(gzip.decompress(path.read_bytes())) == pending_record
+    assert os.listdir(path.parent) == ["job_1.json.gz"]
+    assert ANALYSIS_STORE_WRITES.labels("written").value == written_before + 1
+    # 다른 워커(같은 디렉터리)에서도 같은 본문 조회
+    record, body = await AnalysisStore(str(tmp_path)).get("job_1")
+    assert body == pending_body and record["transcript"] == TRANSCRIPT and record["user_id"] == "user_001"
+
+    assert await store.get("../etc/passwd") is None
+    with pytest.raises(ValueError):
+        store.save_nowait("../escape", ANALYSIS)
+    await store.aclose()
+
+
+@pytest.mark.asyncio
+async def test_result_endpoint_serves_etag_and_projection(tmp_path):
+    store = AnalysisStore(str(tmp_path))
+    store.save_nowait("job_1", ANALYSIS, TRANSCRIPT)
+    await store.flush()
+    app.state.analysis_store = store
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            full = await client.get("/api/analyze/results/job_1")
+            cached = await client.get("/api/analyze/results/job_1", headers={"if-none-match": full.headers["etag"]})
+            projected = await client.get(
+                "/api/analyze/results/job_1", params={"fields": "analysis_result.title, speaker_stats_percent"}
+            )
+            reordered = await client.get(
+                "/api/analyze/results/job_1", params={"fields": "speaker_stats_percent,analysis_result.title"},
+                headers={"if-none-match": projected.headers["etag"]},
+            )
+            missing = await client.get("/api/analyze/results/unknown")
+    finally:
+        await store.aclose()
+        del app.state.analysis_store
+
+    assert full.status_code == 200 and full.json()["analysis_result"] == ANALYSIS
+    assert full.headers["cache-control"] == "private, no-cache"
+    assert cached.status_code == 304 and cached.content == b"" and cached.headers["etag"] == full.headers["etag"]
+    assert projected.json() == {"analysis_result": {"title": "3분기 목표 점검"}, "speaker_stats_percent": None}
+    assert projected.headers["etag"] != full.headers["etag"]
+    assert reordered.status_code == 304
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_completed_pipeline_result_is_stored(tmp_path, fake_clients, patch_nodes):
+    store = AnalysisStore(str(tmp_path))
+    clients = fake_clients()
+    pipeline = MeetingPipeline(clients, analysis_store=store)
+    with patch_nodes(STT_CHECK_INTERVAL=0.01):
+        result = await pipeline.run(recording_url="https://cdn.test/a.m4a", user_id="user_001", meeting_id="job_2")
+    await store.aclose()
+
+    assert result["analysis_id"] == "job_2"
+    record, _ = await AnalysisStore(str(tmp_path)).get("job_2")
+    assert record["analysis_result"] == result["analysis_result"]
+    assert len(record["transcript"]["utterances"]) == len(result["transcript"]["utterances"])
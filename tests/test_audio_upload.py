@@ -0,0 +1,123 @@
+import asyncio
+import hashlib
+
+import assemblyai as aai
+import httpx
+import pytest
+
+from benchmarks.bench_upload import build_parser, run_benchmark
+from src.services.meeting_generator.audio_upload import AudioUploadTooLarge, stream_upload
+from src.utils.clients import AssemblyAIClient, ProviderClients, StorageError, SupabaseStorageClient
+from src.web.main import app
+
+
+def _provider_clients(received, storage_status=200, storage_delay=0.0):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = b""
+        async for chunk in request.stream:
+            body += chunk
+            await asyncio.sleep(storage_delay if request.url.path.startswith("/storage") else 0)
+        if request.url.path == "/v2/upload":
+            received["stt"] = body
+            return httpx.Response(200, json={"upload_url": "https://cdn.assemblyai.test/upload/abc"})
+        if storage_status != 200:
+            return httpx.Response(storage_status, json={"message": "The resource already exists"})
+        received["storage"] = (request.url.path, request.headers["content-type"], body)
+        return httpx.Response(200, json={"Key": request.url.path})
+
+    transport = httpx.MockTransport(handler)
+    return ProviderClients(
+        stt=AssemblyAIClient(httpx.AsyncClient(transport=transport, base_url="https://stt.test"), aai.TranscriptionConfig()),
+        storage=SupabaseStorageClient(httpx.AsyncClient(transport=transport, base_url="https://supabase.test"), "audio"),
+        supabase=object(),
+        meeting_llm=object(),
+        title_llm=object(),
+    )
+
+
+async def _chunks(count, size=1024):
+    for index in range(count):
+        yield bytes([index % 256]) * size
+
+
+@pytest.mark.asyncio
+async def test_body_is_teed_to_stt_and_storage_with_content_hash():
+    received = {}
+    clients = _provider_clients(received)
+    expected = b"".join([bytes([index]) * 1024 for index in range(20)])
+
+    result = await stream_upload(_chunks(20), clients, "meeting.M4A", "audio/mp4", buffer_chunks=2)
+    await clients.aclose()
+
+    assert received["stt"] == expected
+    path, content_type, body = received["storage"]
+    assert body == expected and content_type == "audio/mp4"
+    assert path == f"/storage/v1/object/audio/{result.storage_path}" and result.storage_path.endswith(".m4a")
+    assert result.audio_url == "https://cdn.assemblyai.test/upload/abc"
+    assert result.storage_url == f"https://supabase.test/storage/v1/object/public/audio/{result.storage_path}"
+    assert result.content_sha256 == hashlib.sha256(expected).hexdigest()
+    assert result.size_bytes == len(expected)
+
+
+@pytest.mark.asyncio
+async def test_upload_without_storage_goes_to_stt_only():
+    received = {}
+    clients = _provider_clients(received)
+    clients.storage = None
+
+    result = await stream_upload(_chunks(3), clients)
+    await clients.aclose()
+
+    assert len(received["stt"]) == 3 * 1024 and "storage" not in received
+    assert result.storage_path is None and result.storage_url is None
+
+
+@pytest.mark.asyncio
+async def test_oversized_or_failed_upload_cancels_other_target():
+    received = {}
+    clients = _provider_clients(received)
+    with pytest.raises(AudioUploadTooLarge):
+        await stream_upload(_chunks(10), clients, max_bytes=4 * 1024)
+    assert received == {}
+
+    clients = _provider_clients(received, storage_status=409)
+    with pytest.raises(StorageError, match="already exists"):
+        await stream_upload(_chunks(10), clients)
+    await clients.aclose()
+
+
+@pytest.mark.asyncio
+async def test_upload_endpoint_streams_request_body():
+    received = {}
+    app.state.provider_clients = _provider_clients(received)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/api/audio/upload", params={"filename": "meeting.wav"},
+                content=_chunks(5), headers={"content-type": "audio/wav"},
+            )
+            too_large = await client.post(
+                "/api/audio/upload", content=b"x", headers={"content-length": str(2**40)},
+            )
+    finally:
+        await app.state.provider_clients.aclose()
+        del app.state.provider_clients
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["size_bytes"] == 5 * 1024 and len(received["stt"]) == 5 * 1024
+    assert body["storage_path"].endswith(".wav")
+    assert too_large.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_benchmark_memory_stays_flat_as_size_grows():
+    args = build_parser().parse_args(["--sizes-mb", "2", "16"])
+    results = await run_benchmark(args)
+
+    assert all(result["verified"] for result in results)
+    small, large = results
+    # 8배 큰 파일도 파일 크기만큼 메모리를 쓰지 않아야 함
+    assert large["peak_alloc_mb"] < 8
+    assert large["peak_alloc_mb"] < small["peak_alloc_mb"] + 4
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+from unittest.mock import patch
+
+from benchmarks.fakes import (
+    FakeAssemblyAIClient,
+    FakeChatModel,
+    FakeProviderError,
+    LatencyDistribution,
+    guide_responder,
+    meeting_analysis_responder,
+)
+from benchmarks.synthetic import generate_utterances
+from src.services.meeting_generator.generate_meeting import process_with_assemblyai
+from src.utils.clients import ProviderClients
+from src.utils.schemas import MeetingAnalysis
+
+
+def test_synthetic_utterances_are_deterministic_and_cover_duration():
+    utterances = generate_utterances(duration_minutes=10, utterances_per_minute=6, seed=7)
+    assert utterances == generate_utterances(duration_minutes=10, utterances_per_minute=6, seed=7)
+    assert len(utterances) == 60
+    assert {utterance["speaker"] for utterance in utterances} == {"A", "B"}
+    assert utterances[-1]["end"] <= 10 * 60_000
+
+
+def test_latency_distribution_is_seeded():
+    distribution = LatencyDistribution(mean_ms=100, kind="lognormal")
+    first = [distribution.sample(random.Random(1)) for _ in range(3)]
+    assert first == [distribution.sample(random.Random(1)) for _ in range(3)]
+    assert LatencyDistribution(mean_ms=0).sample(random.Random(1)) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_fake_chat_model_structured_output_stream_and_failures():
+    """가짜 모델은 구조화 출력/스트리밍을 지원하고 실패율만큼 오류를 주입"""
+    model = FakeChatModel(model_name="gemini-2.5-pro", responder=meeting_analysis_responder)
+    analysis = await model.with_structured_output(MeetingAnalysis).ainvoke("회의록")
+    assert isinstance(analysis, MeetingAnalysis)
+
+    streaming = FakeChatModel(responder=guide_responder, chunk_tokens=4)
+    chunks = [chunk.content async for chunk in streaming.astream("가이드")]
+    assert "".join(chunks) == guide_responder([])
+    assert len(chunks) > 10
+
+    failing = FakeChatModel(responder=guide_responder, failure_rate=1.0)
+    with pytest.raises(FakeProviderError):
+        await failing.ainvoke("가이드")
+
+
+@pytest.mark.asyncio
+async def test_fake_stt_runs_through_transcribe_node():
+    stt = FakeAssemblyAIClient(processing_latency=LatencyDistribution(mean_ms=30), duration_minutes=5)
+    clients = ProviderClients(stt=stt, supabase=object(), meeting_llm=object(), title_llm=object())
+    state = {"file_url": "https://bench.invalid/a.m4a", "errors": [], "performance_metrics": None}
+
+    with patch("src.services.meeting_generator.generate_meeting.STT_CHECK_INTERVAL", 0.01):
+        state = await process_with_assemblyai(state, clients=clients)
+
+    assert state["transcript"]["total_duration"] == 300
+    assert len(state["transcript"]["utterances"]) == 40
+    assert sum(state["speaker_stats_percent"].values()) == pytest.approx(100.0)
@@ -0,0 +1,33 @@
+from benchmarks.bench_hotpaths import compare, run
+from benchmarks.synthetic import generate_analysis_dict
+from src.utils.schemas import MeetingAnalysis
+
+
+def test_synthetic_analysis_matches_schema_and_scales():
+    small = generate_analysis_dict(10)
+    large = generate_analysis_dict(240)
+    MeetingAnalysis.model_validate(large)
+    assert len(large["ai_summary"]) > 10 * len(small["ai_summary"])
+
+
+def test_run_records_timing_and_memory_per_function():
+    results = run(["10m"], ["map_speaker_data", "response_encode"], repeat=2, utterances_per_minute=4, seed=0)
+    assert [result["name"] for result in results] == ["map_speaker_data[10m]", "response_encode[10m]"]
+    assert all(result["min_ms"] > 0 and result["peak_kb"] > 0 for result in results)
+    assert results[0]["utterances"] == 40
+    assert "output_bytes" not in results[0] and results[1]["output_bytes"] > 0
+
+
+def test_compare_flags_time_and_memory_regressions():
+    baseline = [
+        {"name": "a[1h]", "min_ms": 1.0, "peak_kb": 100.0},
+        {"name": "b[1h]", "min_ms": 1.0, "peak_kb": 100.0},
+        {"name": "c[1h]", "min_ms": 0.01, "peak_kb": 100.0},
+    ]
+    results = [
+        {"name": "a[1h]", "min_ms": 1.5, "peak_kb": 100.0},  # 시간 회귀
+        {"name": "b[1h]", "min_ms": 1.0, "peak_kb": 200.0},  # 메모리 회귀
+        {"name": "c[1h]", "min_ms": 0.02, "peak_kb": 100.0},  # 절대 차이가 작아 잡음으로 간주
+    ]
+    regressions = compare(results, baseline, threshold=0.15)
+    assert [regression["name"] for regression in regressions] == ["a[1h]", "b[1h]"]
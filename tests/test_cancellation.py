@@ -0,0 +1,116 @@
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock
+
+from src.utils.cancellation import (
+    ClientDisconnected,
+    cancel_on_disconnect,
+    cancel_stream_on_disconnect,
+    record_completion,
+)
+from src.utils.cost_ledger import CostLedger
+from src.utils.job_store import JobStore
+from src.utils.metrics import CANCELLATION_SAVED_SECONDS, CANCELLATION_SAVED_TOKENS, CLIENT_DISCONNECTS
+from src.utils.state_backend import create_state_backend
+from src.web.main import app
+
+
+class _DisconnectingRequest:
+    """disconnect_after초 뒤 http.disconnect를 보내는 요청 대역"""
+
+    def __init__(self, disconnect_after: float) -> None:
+        self.disconnect_after = disconnect_after
+
+    async def receive(self):
+        await asyncio.sleep(self.disconnect_after)
+        return {"type": "http.disconnect"}
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_work_and_records_estimated_savings():
+    record_completion("test_analyze", seconds=2.0, tokens=1000)
+    cancelled = asyncio.Event()
+
+    async def long_analysis():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(ClientDisconnected):
+        await cancel_on_disconnect(_DisconnectingRequest(0.05), long_analysis(), "test_analyze")
+
+    assert cancelled.is_set()
+    assert CLIENT_DISCONNECTS.labels("test_analyze", "cancelled").value == 1
+    saved_seconds = CANCELLATION_SAVED_SECONDS.labels("test_analyze").value
+    assert 1.8 < saved_seconds < 1.96
+    assert CANCELLATION_SAVED_TOKENS.labels("test_analyze").value == pytest.approx(saved_seconds / 2.0 * 1000)
+
+
+@pytest.mark.asyncio
+async def test_keep_running_detaches_instead_of_cancelling():
+    task = asyncio.create_task(asyncio.sleep(0.2, result="done"))
+
+    with pytest.raises(ClientDisconnected):
+        await cancel_on_disconnect(_DisconnectingRequest(0.01), asyncio.shield(task), "test_job", keep_running=True)
+
+    assert await task == "done"
+    assert CLIENT_DISCONNECTS.labels("test_job", "detached").value == 1
+
+
+@pytest.mark.asyncio
+async def test_completed_work_is_returned_without_waiting_for_disconnect():
+    async def quick():
+        return {"title": "ok"}
+
+    assert await cancel_on_disconnect(_DisconnectingRequest(60), quick(), "test_quick") == {"title": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_stream_is_closed_while_waiting_for_next_llm_chunk():
+    closed = asyncio.Event()
+
+    async def guide():
+        try:
+            yield 'data: "첫 청크"\n\n'
+            await asyncio.sleep(10)  # 다음 LLM 청크 대기 중
+            yield 'data: "도달하지 않음"\n\n'
+        finally:
+            closed.set()
+
+    chunks = [chunk async for chunk in cancel_stream_on_disconnect(_DisconnectingRequest(0.05), guide(), "test_guide")]
+
+    assert chunks == ['data: "첫 청크"\n\n']
+    assert closed.is_set()
+    assert CLIENT_DISCONNECTS.labels("test_guide", "cancelled").value == 1
+
+
+@pytest.mark.asyncio
+async def test_analyze_with_job_id_records_result_in_job_store(tmp_path):
+    pipeline = AsyncMock()
+    pipeline.run.return_value = {"status": "completed", "analysis_result": {"title": "회의"}}
+    backend = create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}")
+    app.state.meeting_pipeline = pipeline
+    app.state.job_store = JobStore(backend)
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    app.state.background_tasks = set()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            body = {"recording_url": "https://storage.test/a.m4a", "job_id": "client-job-1"}
+            response = await client.post("/api/analyze", json=body)
+            duplicate = await client.post("/api/analyze", json=body)
+            job = await client.get("/api/analyze/jobs/client-job-1")
+    finally:
+        await app.state.cost_ledger.aclose()
+        await backend.aclose()
+        for name in ("meeting_pipeline", "job_store", "cost_ledger", "background_tasks"):
+            delattr(app.state, name)
+
+    assert response.json() == {"title": "회의"}
+    assert duplicate.status_code == 409
+    assert job.json()["status"] == "completed"
+    assert job.json()["result"] == {"title": "회의"}
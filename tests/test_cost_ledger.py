@@ -0,0 +1,90 @@
+import httpx
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from src.utils.cost_ledger import CostLedger, calculate_llm_cost, calculate_stt_cost, record_stt_audio
+from src.utils.llm_callbacks import UsageMetricsCallbackHandler
+from src.web.main import app
+
+
+def _llm_result(input_tokens, output_tokens, cached=0, reasoning=0):
+    message = AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens + reasoning,
+            "input_token_details": {"cache_read": cached},
+            "output_token_details": {"reasoning": reasoning},
+        },
+    )
+    return LLMResult(generations=[[ChatGeneration(message=message)]])
+
+
+def test_price_table_charges_cached_and_thinking_tokens():
+    # gemini-2.5-pro: 입력 1.25, 캐시 0.31, 출력 10.0, thinking 10.0 (100만 토큰당)
+    cost = calculate_llm_cost("gemini-2.5-pro", 1_000_000, 100_000, cached_tokens=400_000, thinking_tokens=50_000)
+    assert cost == pytest.approx(0.6 * 1.25 + 0.4 * 0.31 + 0.1 * 10.0 + 0.05 * 10.0)
+    assert calculate_stt_cost("best", 3600) == pytest.approx(0.37)
+    assert calculate_llm_cost("unknown-model", 1000, 1000) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_track_collects_llm_and_stt_usage_and_rolls_up(tmp_path):
+    """추적 범위 안의 콜백/STT 사용량이 요청 단위로 적재되고 기준별로 집계됨"""
+    ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    handler = UsageMetricsCallbackHandler("gemini-2.5-flash")
+
+    with ledger.track("analyze", "user-a") as usage:
+        handler.on_llm_end(_llm_result(1000, 200, cached=100, reasoning=50))
+        handler.on_llm_end(_llm_result(500, 100))
+        record_stt_audio(1800)
+    with ledger.track("template:email", "user-b"):
+        handler.on_llm_end(_llm_result(300, 300))
+    # 추적 범위 밖 호출은 원장에 남지 않음
+    handler.on_llm_end(_llm_result(10_000, 10_000))
+    await ledger.flush()
+
+    assert usage.llm["gemini-2.5-flash"]["calls"] == 2
+    assert usage.llm["gemini-2.5-flash"]["thinking_tokens"] == 50
+    assert usage.latency_ms is not None
+
+    by_user = {item["key"]: item for item in await ledger.rollup("user")}
+    assert by_user["user-a"]["input_tokens"] == 1500
+    assert by_user["user-a"]["cached_tokens"] == 100
+    assert by_user["user-a"]["audio_seconds"] == 1800
+    assert by_user["user-a"]["cost_usd"] == pytest.approx(usage.total_cost_usd)
+    assert by_user["user-b"]["llm_calls"] == 1
+
+    by_model = await ledger.rollup("model")
+    assert [item["key"] for item in by_model] == ["gemini-2.5-flash"]
+    assert by_model[0]["requests"] == 2
+
+    by_day = await ledger.rollup("day", user_id="user-b")
+    assert len(by_day) == 1 and by_day[0]["requests"] == 1
+    with pytest.raises(ValueError):
+        await ledger.rollup("team")
+    await ledger.aclose()
+
+
+@pytest.mark.asyncio
+async def test_usage_endpoint_returns_rollup(tmp_path):
+    ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    with ledger.track("template:template", "user-c"):
+        UsageMetricsCallbackHandler("gemini-2.5-flash").on_llm_end(_llm_result(1000, 1000))
+    await ledger.flush()
+    app.state.cost_ledger = ledger
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/api/usage", params={"group_by": "endpoint", "user_id": "user-c"})
+    finally:
+        await ledger.aclose()
+        del app.state.cost_ledger
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["group_by"] == "endpoint"
+    assert body["items"][0]["key"] == "template:template"
+    assert body["total_cost_usd"] == pytest.approx(calculate_llm_cost("gemini-2.5-flash", 1000, 1000))
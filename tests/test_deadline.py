@@ -0,0 +1,96 @@
+from contextlib import contextmanager
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock
+
+from src.services.meeting_generator.workflow import MeetingPipeline
+from src.utils.cost_ledger import CostLedger
+from src.utils.deadline import Deadline
+from src.utils.metrics import DEADLINE_ACTIONS
+from src.web.main import app
+
+
+def test_deadline_from_ms_validates_and_caps_timeouts():
+    assert Deadline.from_ms(None) is None
+    with pytest.raises(ValueError):
+        Deadline.from_ms(0)
+
+    deadline = Deadline.from_ms(5000)
+    assert 4.9 < deadline.remaining() <= 5.0
+    assert deadline.cap(900) <= 5.0
+    assert deadline.cap(900, reserve=10) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_stt_wait_stops_early_and_skips_analysis(fake_clients, patch_nodes):
+    """STT 대기는 분석에 필요한 시간을 남기고 중단하며, 이후 분석 노드는 실행하지 않음"""
+    pipeline = MeetingPipeline(fake_clients(stt_latency_ms=5000))
+    with patch_nodes(STT_CHECK_INTERVAL=0.02, DEADLINE_ANALYSIS_MIN_SECONDS=0.1):
+        result = await pipeline.run(recording_url="https://storage.test/a.m4a", deadline=Deadline(0.3))
+
+    assert result["status"] == "deadline_exceeded"
+    assert result["errors"] == ["요청 마감 시간 초과 (transcribe)"]
+    assert "analyze_duration" not in result["performance_metrics"]
+    report = result["performance_report"]["노드별_상세정보"]
+    assert "시작시_남은예산" in report["retrieve"]
+    assert "시작시_남은예산" in report["transcribe"]
+    assert DEADLINE_ACTIONS.labels("transcribe", "exceeded").value >= 1
+
+
+@pytest.mark.asyncio
+async def test_analysis_downgrades_to_fallback_model_when_budget_is_short(fake_clients, patch_nodes):
+    pipeline = MeetingPipeline(fake_clients(stt_latency_ms=0))
+    with patch_nodes(STT_CHECK_INTERVAL=0.01, DEADLINE_ANALYSIS_MIN_SECONDS=0.1, DEADLINE_ANALYSIS_DOWNGRADE_SECONDS=60):
+        short = await pipeline.run(recording_url="https://storage.test/a.m4a", deadline=Deadline(30))
+        relaxed = await pipeline.run(recording_url="https://storage.test/a.m4a", deadline=Deadline(120))
+
+    assert short["status"] == "completed"
+    assert short["performance_metrics"]["analyze_model"] == "gemini-2.5-flash"
+    assert short["performance_report"]["노드별_상세정보"]["analyze"]["모델"] == "gemini-2.5-flash"
+    assert relaxed["performance_metrics"]["analyze_model"] == "gemini-2.5-pro"
+    assert relaxed["performance_metrics"]["analyze_budget_remaining"] > 60
+
+
+@pytest.mark.asyncio
+async def test_analyze_endpoint_reads_deadline_header_and_returns_504(tmp_path):
+    pipeline = AsyncMock()
+    pipeline.run.return_value = {"status": "deadline_exceeded", "errors": ["요청 마감 시간 초과 (transcribe)"]}
+    app.state.meeting_pipeline = pipeline
+    app.state.job_store = None  # job_id 없는 요청은 작업 저장소를 사용하지 않음
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            body = {"recording_url": "https://storage.test/a.m4a"}
+            response = await client.post("/api/analyze", json=body, headers={"X-Request-Deadline-Ms": "20000"})
+            invalid = await client.post("/api/analyze", json=body, params={"deadline_ms": -1})
+    finally:
+        await app.state.cost_ledger.aclose()
+        for name in ("meeting_pipeline", "job_store", "cost_ledger"):
+            delattr(app.state, name)
+
+    assert response.status_code == 504
+    assert response.json()["detail"] == "요청 마감 시간 초과 (transcribe)"
+    deadline = pipeline.run.call_args.kwargs["deadline"]
+    assert 19 < deadline.budget_seconds <= 20
+    assert invalid.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_stt_poll_counts_only_the_capped_wait(fake_clients, patch_nodes):
+    """마감 시간으로 줄어든 폴링 대기는 줄어든 만큼만 경과 시간에 반영"""
+    spans = []
+
+    @contextmanager
+    def recording_span(name, **attributes):
+        spans.append((name, attributes))
+        yield
+
+    pipeline = MeetingPipeline(fake_clients(stt_latency_ms=100))
+    with patch_nodes(STT_CHECK_INTERVAL=10, DEADLINE_ANALYSIS_MIN_SECONDS=0.1, start_span=recording_span):
+        result = await pipeline.run(recording_url="https://storage.test/a.m4a", deadline=Deadline(0.5))
+
+    polls = [attributes["elapsed_seconds"] for name, attributes in spans if name == "stt.poll"]
+    assert result["status"] in ("completed", "deadline_exceeded")
+    assert polls and polls[0] < 0.5
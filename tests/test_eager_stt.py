@@ -0,0 +1,231 @@
+import asyncio
+
+import assemblyai as aai
+import httpx
+import pytest
+from unittest.mock import patch
+
+from benchmarks.fakes import (
+    FakeAssemblyAIClient,
+    LatencyDistribution,
+)
+from src.services.meeting_generator.eager_stt import EagerTranscriber, recording_key
+from src.services.meeting_generator.workflow import MeetingPipeline
+from src.utils.clients import ProviderClients, SupabaseStorageClient
+from src.utils.cost_ledger import CostLedger
+from src.utils.metrics import EAGER_STT
+from src.utils.state_backend import create_state_backend
+from src.web.main import app
+
+RECORDING_URL = "https://project.supabase.co/storage/v1/object/public/audio-recordings/2026/10/19/a.m4a"
+
+
+class CountingSTT(FakeAssemblyAIClient):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.submitted = []
+
+    async def submit(self, audio_url: str) -> aai.types.TranscriptResponse:
+        self.submitted.append(audio_url)
+        return await super().submit(audio_url)
+
+
+@pytest.fixture
+def clients_with(fake_clients):
+    """제출한 오디오 URL을 기록하는 STT를 쓰는 가짜 ProviderClients 생성 함수"""
+    def make(stt_latency_ms: float, storage=None) -> ProviderClients:
+        stt = CountingSTT(processing_latency=LatencyDistribution(mean_ms=stt_latency_ms), duration_minutes=5)
+        return fake_clients(stt=stt, storage=storage)
+    return make
+
+
+def test_storage_urls_of_same_object_share_cache_key():
+    signed = "https://project.supabase.co/storage/v1/object/sign/audio-recordings/2026/10/19/a.m4a?token=abc"
+    assert recording_key(RECORDING_URL) == recording_key(signed)
+    assert recording_key(RECORDING_URL) != recording_key(RECORDING_URL.replace("a.m4a", "b.m4a"))
+    assert recording_key("https://cdn.test/a.m4a?v=1") != recording_key("https://cdn.test/a.m4a?v=2")
+
+
+@pytest.mark.asyncio
+async def test_analysis_uses_completed_eager_transcript(tmp_path, clients_with, patch_nodes):
+    clients = clients_with(stt_latency_ms=20)
+    backend = create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}")
+    ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    eager = EagerTranscriber(clients, backend, ledger, check_interval=0.01)
+    pipeline = MeetingPipeline(clients, eager_stt=eager)
+
+    assert await eager.start(RECORDING_URL, "user_001") == "started"
+    # 같은 녹음의 알림이 다시 와도(다른 워커 포함) 전사는 한 번만 등록
+    assert await eager.start(RECORDING_URL) == "pending"
+    await asyncio.sleep(0.1)
+    assert await eager.start(RECORDING_URL) == "completed"
+
+    with patch_nodes(STT_CHECK_INTERVAL=0.01):
+        result = await pipeline.run(recording_url=RECORDING_URL.replace("/public/", "/sign/") + "?token=abc")
+
+    assert result["status"] == "completed"
+    assert result["performance_metrics"]["transcribe_source"] == "eager"
+    assert result["performance_report"]["노드별_상세정보"]["transcribe"]["결과_출처"] == "eager"
+    assert result["transcript"]["utterances"] and result["speaker_stats_percent"]
+    assert clients.stt.submitted == [RECORDING_URL]
+
+    await ledger.flush()
+    rows = await ledger.rollup("endpoint")
+    assert [row["key"] for row in rows] == ["analyze:stt_speculative"]
+    assert rows[0]["audio_seconds"] == 300
+    await eager.aclose()
+    await ledger.aclose()
+    await backend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_analysis_resumes_pending_eager_transcript(tmp_path, clients_with, patch_nodes):
+    clients = clients_with(stt_latency_ms=200)
+    backend = create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}")
+    eager = EagerTranscriber(clients, backend, check_interval=0.01)
+    # 알림을 받은 워커와 분석 요청을 받은 워커가 달라도 공유 저장소로 전사를 이어받음
+    other_worker = EagerTranscriber(clients, create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}"))
+    pipeline = MeetingPipeline(clients, eager_stt=other_worker)
+
+    await eager.start(RECORDING_URL)
+    with patch_nodes(STT_CHECK_INTERVAL=0.01):
+        result = await pipeline.run(recording_url=RECORDING_URL)
+
+    assert result["status"] == "completed"
+    assert result["performance_metrics"]["transcribe_source"] == "eager_pending"
+    assert len(clients.stt.submitted) == 1
+    await eager.aclose()
+    await backend.aclose()
+    await other_worker.backend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_claim_waits_for_transcript_id_while_submit_is_in_flight(tmp_path, clients_with):
+    clients = clients_with(stt_latency_ms=10)
+    submit = clients.stt.submit
+    released = asyncio.Event()
+
+    async def blocked_submit(audio_url):
+        await released.wait()
+        return await submit(audio_url)
+
+    clients.stt.submit = blocked_submit
+    backend = create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}")
+    eager = EagerTranscriber(clients, backend, check_interval=1.0)
+    hits_before = EAGER_STT.labels("used").value
+
+    starting = asyncio.create_task(eager.start(RECORDING_URL))
+    await asyncio.sleep(0.05)
+    claiming = asyncio.create_task(eager.claim(RECORDING_URL))
+    await asyncio.sleep(0.05)
+    assert not claiming.done()
+    released.set()
+
+    assert await starting == "started"
+    record = await claiming
+    # 분석 요청이 STT를 다시 등록하지 않고 진행 중인 사전 전사를 이어받음
+    assert record is not None and record["transcript_id"]
+    assert clients.stt.submitted == [RECORDING_URL]
+    assert EAGER_STT.labels("used").value == hits_before + 1
+    await eager.aclose()
+    await backend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_reuploaded_content_reuses_transcript_by_hash(tmp_path, clients_with):
+    clients = clients_with(stt_latency_ms=10)
+    backend = create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}")
+    eager = EagerTranscriber(clients, backend, check_interval=0.01)
+    digest = "ab" * 32
+
+    assert await eager.start("https://cdn.test/upload/1", content_sha256=digest, aliases=[RECORDING_URL]) == "started"
+    await asyncio.sleep(0.05)
+    # 같은 내용을 다시 올려 업로드 URL이 바뀌어도 STT를 다시 실행하지 않음
+    assert await eager.start("https://cdn.test/upload/2", content_sha256=digest) == "completed"
+    assert (await eager.claim("https://cdn.test/upload/2"))["status"] == "completed"
+    # Storage URL(서명 URL 포함)로 분석해도 같은 전사 사용
+    assert (await eager.claim(RECORDING_URL.replace("/public/", "/sign/") + "?token=t"))["status"] == "completed"
+    assert await eager.start(RECORDING_URL) == "completed"
+    assert clients.stt.submitted == ["https://cdn.test/upload/1"]
+    await eager.aclose()
+    await backend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unclaimed_transcript_expires_and_is_counted(tmp_path, clients_with):
+    clients = clients_with(stt_latency_ms=10)
+    backend = create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}")
+    eager = EagerTranscriber(clients, backend, ttl_seconds=0.3, check_interval=0.01)
+    expired_before = EAGER_STT.labels("expired").value
+    used_before = EAGER_STT.labels("used").value
+
+    await eager.start(RECORDING_URL)
+    await eager.start("https://cdn.test/b.m4a")
+    await asyncio.sleep(0.05)
+    assert (await eager.claim("https://cdn.test/b.m4a"))["status"] == "completed"
+    await asyncio.gather(*eager._tasks.values())
+
+    assert EAGER_STT.labels("expired").value == expired_before + 1
+    assert EAGER_STT.labels("used").value == used_before + 1
+    assert await eager.claim(RECORDING_URL) is None
+    assert len(eager) == 0
+    await backend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_storage_webhook_starts_transcription_with_signed_url(tmp_path, clients_with):
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/storage/v1/object/sign/audio-recordings/2026/10/19/a.m4a"
+        return httpx.Response(200, json={"signedURL": "/object/sign/audio-recordings/2026/10/19/a.m4a?token=t"})
+
+    storage = SupabaseStorageClient(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="https://project.supabase.co"),
+        "audio-recordings",
+    )
+    clients = clients_with(stt_latency_ms=10, storage=storage)
+    backend = create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}")
+    app.state.provider_clients = clients
+    app.state.eager_transcriber = EagerTranscriber(clients, backend, check_interval=0.01)
+    webhook = {
+        "type": "INSERT", "table": "objects", "schema": "storage",
+        "record": {"bucket_id": "audio-recordings", "name": "2026/10/19/a.m4a"},
+    }
+    try:
+        transport = httpx.ASGITransport(app=app)
+        headers = {"X-Hook-Secret": "s3cret"}
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+            with patch("src.web.main.EAGER_STT_HOOK_SECRET", "s3cret"):
+                started = await client.post("/api/audio/uploaded", json=webhook)
+                repeated = await client.post("/api/audio/uploaded", json={"recording_url": RECORDING_URL})
+                other_bucket = await client.post(
+                    "/api/audio/uploaded", json={"record": {"bucket_id": "avatars", "name": "a.png"}}
+                )
+                # Storage 버킷 밖의 URL은 STT 제공자에 보내지 않음
+                foreign_urls = [
+                    await client.post("/api/audio/uploaded", json={"recording_url": url})
+                    for url in (
+                        "https://attacker.test/storage/v1/object/public/audio-recordings/a.m4a",
+                        "https://project.supabase.co/storage/v1/object/public/avatars/a.m4a",
+                        "http://project.supabase.co/storage/v1/object/public/audio-recordings/a.m4a",
+                    )
+                ]
+                unauthorized = await client.post("/api/audio/uploaded", json=webhook, headers={"X-Hook-Secret": "x"})
+            with patch("src.web.main.EAGER_STT_HOOK_SECRET", None):
+                unconfigured = await client.post("/api/audio/uploaded", json=webhook)
+    finally:
+        await app.state.eager_transcriber.aclose()
+        await clients.aclose()
+        await backend.aclose()
+        del app.state.provider_clients, app.state.eager_transcriber
+
+    assert started.status_code == 202
+    assert started.json() == {
+        "status": "started",
+        "recording_url": "https://project.supabase.co/storage/v1/object/sign/audio-recordings/2026/10/19/a.m4a?token=t",
+    }
+    assert repeated.json()["status"] in ("pending", "completed")
+    assert other_bucket.json()["status"] == "ignored"
+    assert [response.json()["status"] for response in foreign_urls] == ["ignored"] * 3
+    assert unauthorized.status_code == 401
+    assert unconfigured.status_code == 503
+    assert len(clients.stt.submitted) == 1
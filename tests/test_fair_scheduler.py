@@ -0,0 +1,155 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from benchmarks.fakes import FakeChatModel, LatencyDistribution
+from src.utils.cost_ledger import CostLedger
+from src.utils.fair_scheduler import FairScheduler
+from src.utils.metrics import USER_QUOTA_THROTTLED
+from src.utils.state_backend import SQLiteStateBackend
+from src.utils.user_quota import QUOTA_LLM_TOKENS, QUOTA_REQUESTS, QuotaExceeded, TokenBucket, UserQuota
+from src.web.main import app
+
+
+def test_token_bucket_refill_and_wait():
+    bucket = TokenBucket(capacity=10, rate=2)
+
+    assert bucket.refill(4, updated_at=100.0, now=101.5) == 7
+    assert bucket.refill(4, updated_at=100.0, now=200.0) == 10
+    assert bucket.wait_seconds(7, 1) == 0.0
+    assert bucket.wait_seconds(-3, 1) == 2.0
+
+
+@pytest.mark.asyncio
+async def test_request_quota_is_shared_and_token_debt_delays_calls(tmp_path):
+    backend = SQLiteStateBackend(str(tmp_path / "state.sqlite3"))
+    quota = UserQuota(backend, requests_per_minute=60, request_burst=2, llm_tokens_per_minute=60_000, llm_token_burst=100)
+    other_worker = UserQuota(backend, requests_per_minute=60, request_burst=2)
+    throttled_before = USER_QUOTA_THROTTLED.labels(QUOTA_REQUESTS).value
+
+    await quota.take_request("user_001")
+    await other_worker.take_request("user_001")
+    with pytest.raises(QuotaExceeded) as exc_info:
+        await quota.take_request("user_001")
+    assert 0 < exc_info.value.retry_after <= 1.0
+    # 다른 사용자와 사용자 없는 요청은 영향 없음
+    await quota.take_request("user_002")
+    await quota.take_request(None)
+    assert USER_QUOTA_THROTTLED.labels(QUOTA_REQUESTS).value == throttled_before + 1
+
+    # 한도를 넘긴 토큰 사용은 거절하지 않고 다음 호출을 버킷이 양수가 될 때까지 늦춤 (초당 1000개)
+    await quota.debit_llm_tokens("user_001", 150)
+    assert 0 < await quota.llm_token_wait("user_001") <= 0.051
+    assert await quota.wait_for_llm_tokens("user_001") > 0.02
+    assert await quota.llm_token_wait("user_001") == 0.0
+
+    snapshot = await quota.snapshot("user_002")
+    assert 1 <= snapshot[QUOTA_REQUESTS]["remaining"] < 1.5 and snapshot[QUOTA_LLM_TOKENS]["capacity"] == 100
+    await backend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_light_user_overtakes_heavy_users_queue():
+    scheduler = FairScheduler(max_concurrency=1, weights={"template:team": 1}, default_weight=4)
+    holder = await scheduler.acquire("holder", "analyze", 100)
+    order = []
+
+    async def call(user_id, endpoint):
+        grant = await scheduler.acquire(user_id, endpoint, 100)
+        order.append(user_id)
+        await asyncio.sleep(0)
+        grant.release()
+
+    heavy = [asyncio.create_task(call("heavy", "analyze")) for _ in range(3)]
+    await asyncio.sleep(0)
+    batch = [asyncio.create_task(call("batch", "template:team")) for _ in range(2)]
+    light = asyncio.create_task(call("light", "analyze"))
+    await asyncio.sleep(0)
+    assert scheduler.stats()["queued"] == 6
+
+    holder.release()
+    await asyncio.gather(*heavy, *batch, light)
+
+    # 늦게 온 사용자도 먼저 몰아 보낸 사용자의 대기열을 기다리지 않고, 가중치가 낮은 일괄 작업은 대화형 호출에 양보
+    assert order == ["heavy", "batch", "light", "heavy", "heavy", "batch"]
+    stats = scheduler.stats()
+    assert stats["in_flight"] == 0 and stats["queued"] == 0
+    assert stats["users"]["heavy"]["calls"] == 3 and stats["users"]["light"]["waited_calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot():
+    scheduler = FairScheduler(max_concurrency=1)
+    holder = await scheduler.acquire("user_001", "analyze", 10)
+    waiter = asyncio.create_task(scheduler.acquire("user_002", "analyze", 10))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    holder.release()
+    grant = await scheduler.acquire("user_003", "analyze", 10)
+    assert scheduler.stats()["in_flight"] == 1
+    grant.release()
+    grant.release()
+    assert scheduler.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_are_scheduled_and_debited(tmp_path):
+    backend = SQLiteStateBackend(str(tmp_path / "state.sqlite3"))
+    ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    quota = UserQuota(backend, llm_tokens_per_minute=60)
+    scheduler = FairScheduler(max_concurrency=1, quota=quota)
+    model = FakeChatModel(
+        responder=lambda messages: "질문 목록", first_token_latency=LatencyDistribution(20, kind="constant")
+    )
+
+    async def call():
+        with ledger.track("template:template", "user_001"):
+            return await model.ainvoke("팀원과의 1on1 질문을 만들어 주세요")
+
+    with scheduler.activate():
+        results = await asyncio.gather(call(), call(), call())
+    await scheduler.aclose()
+
+    assert [result.content for result in results] == ["질문 목록"] * 3
+    user_stats = scheduler.stats()["users"]["user_001"]
+    assert user_stats["calls"] == 3 and user_stats["waited_calls"] == 2 and user_stats["max_wait_ms"] >= 30
+    assert scheduler.stats()["in_flight"] == 0
+    used = sum(result.usage_metadata["input_tokens"] + result.usage_metadata["output_tokens"] for result in results)
+    remaining = (await quota.snapshot("user_001"))[QUOTA_LLM_TOKENS]
+    assert remaining["capacity"] - used <= remaining["remaining"] < remaining["capacity"] - used + 1
+    await ledger.aclose()
+    await backend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_analyze_endpoint_rejects_over_quota_user(tmp_path):
+    backend = SQLiteStateBackend(str(tmp_path / "state.sqlite3"))
+    pipeline = AsyncMock()
+    pipeline.run.return_value = {"status": "completed", "analysis_result": {"title": "3분기 목표 점검"}}
+    app.state.meeting_pipeline = pipeline
+    app.state.job_store = None
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    app.state.user_quota = UserQuota(backend, requests_per_minute=6, request_burst=1)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            body = {"recording_url": "https://storage.test/a.m4a", "user_id": "user_001"}
+            first = await client.post("/api/analyze", json=body)
+            second = await client.post("/api/analyze", json=body)
+            quota = await client.get("/api/stats/quota/user_001")
+            scheduler = await client.get("/api/stats/scheduler")
+    finally:
+        await app.state.cost_ledger.aclose()
+        await backend.aclose()
+        for name in ("meeting_pipeline", "job_store", "cost_ledger", "user_quota"):
+            delattr(app.state, name)
+
+    assert first.status_code == 200
+    assert second.status_code == 429 and second.headers["retry-after"] == "10"
+    assert pipeline.run.await_count == 1
+    assert quota.json()[QUOTA_REQUESTS]["retry_after"] > 9
+    assert scheduler.status_code == 404
@@ -0,0 +1,132 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from benchmarks.fakes import FakeChatModel, LatencyDistribution, guide_responder, template_responder
+from src.services.template_generator import generate_template, generate_usage_guide
+from src.services.template_generator.generate_bundle import to_guide_input
+from src.services.template_generator.guide_speculation import GuideSpeculator
+from src.utils.cost_ledger import CostLedger
+from src.utils.response_cache import ResponseCache
+from src.utils.schemas import TemplateGeneratorInput
+from src.web.main import app
+
+PAYLOAD = {
+    "user_id": "user_001",
+    "target_info": "(가상)김수연",
+    "purpose": "Growth, Work",
+    "tone_and_manner": "Casual",
+    "include_guide": True,
+}
+QUESTIONS = json.loads(template_responder([]))
+
+
+def _counting_guide_llm(latency_ms=0):
+    calls = []
+
+    def responder(messages):
+        calls.append(messages)
+        return guide_responder(messages)
+
+    llm = FakeChatModel(responder=responder, first_token_latency=LatencyDistribution(mean_ms=latency_ms))
+    return llm, calls
+
+
+def _guide_text(body):
+    return "".join(json.loads(line[6:]) for line in body.split("\n\n") if line.startswith("data: "))
+
+
+@pytest.mark.asyncio
+async def test_guide_request_reuses_speculation_started_by_template(tmp_path):
+    guide_llm, calls = _counting_guide_llm()
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    app.state.guide_speculator = GuideSpeculator(app.state.cost_ledger)
+    try:
+        with patch.object(generate_template, "llm", FakeChatModel(responder=template_responder)), \
+                patch.object(generate_usage_guide, "llm", guide_llm), \
+                patch.object(generate_template, "chain", generate_template.get_chain()):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                template = await client.post("/api/template", json=PAYLOAD)
+                questions = template.json()["generated_questions"]
+                guide = await client.post(
+                    "/api/template",
+                    params={"generation_type": "guide"},
+                    json={**PAYLOAD, "generated_questions": questions},
+                )
+    finally:
+        await app.state.guide_speculator.aclose()
+        await app.state.cost_ledger.aclose()
+        del app.state.guide_speculator
+        del app.state.cost_ledger
+
+    assert guide.headers["x-cache"] == "SPECULATIVE"
+    assert _guide_text(guide.text) == guide_responder([])
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_template_does_not_start_speculation(tmp_path):
+    guide_llm, calls = _counting_guide_llm()
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    app.state.guide_speculator = speculator = GuideSpeculator(app.state.cost_ledger)
+    app.state.response_cache = ResponseCache(variants={"template": 1, "guide": 1})
+    try:
+        with patch.object(generate_template, "llm", FakeChatModel(responder=template_responder)), \
+                patch.object(generate_usage_guide, "llm", guide_llm), \
+                patch.object(generate_template, "chain", generate_template.get_chain()):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                first = await client.post("/api/template", json=PAYLOAD)
+                guide = await client.post(
+                    "/api/template",
+                    params={"generation_type": "guide"},
+                    json={**PAYLOAD, "generated_questions": first.json()["generated_questions"]},
+                )
+                cached = await client.post("/api/template", json=PAYLOAD)
+                streamed = await client.post("/api/template", params={"stream": "true"}, json=PAYLOAD)
+                pending = len(speculator)
+    finally:
+        await app.state.guide_speculator.aclose()
+        await app.state.cost_ledger.aclose()
+        del app.state.guide_speculator, app.state.cost_ledger, app.state.response_cache
+
+    assert first.headers["x-cache"] == "MISS" and guide.headers["x-cache"] == "SPECULATIVE"
+    # 재사용한 템플릿의 가이드는 이미 생성되어 캐시되었으므로 다시 사전 생성하지 않음
+    assert cached.headers["x-cache"] == "HIT" and streamed.headers["x-cache"] == "HIT"
+    assert pending == 0 and len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_claim_follows_in_progress_speculation():
+    guide_llm, calls = _counting_guide_llm(latency_ms=100)
+    guide_input = to_guide_input(TemplateGeneratorInput(**PAYLOAD), QUESTIONS)
+    speculator = GuideSpeculator()
+    with patch.object(generate_usage_guide, "llm", guide_llm):
+        speculator.start(guide_input)
+        speculator.start(guide_input)  # 같은 질문 목록은 중복 생성하지 않음
+        stream = speculator.claim(guide_input)
+        assert stream is not None
+        events = [event async for event in stream]
+
+    assert _guide_text("".join(events)) == guide_responder([])
+    assert len(calls) == 1
+    assert speculator.claim(guide_input) is None  # 한 번만 사용 가능
+
+
+@pytest.mark.asyncio
+async def test_unused_speculation_is_cancelled_after_ttl():
+    guide_llm, _ = _counting_guide_llm(latency_ms=1000)
+    guide_input = to_guide_input(TemplateGeneratorInput(**PAYLOAD), QUESTIONS)
+    speculator = GuideSpeculator(ttl_seconds=0.05)
+    with patch.object(generate_usage_guide, "llm", guide_llm):
+        speculator.start(guide_input)
+        task = next(iter(speculator._entries.values())).task
+        await asyncio.sleep(0.1)
+
+    assert len(speculator) == 0
+    assert task.cancelled()
+    assert speculator.claim(guide_input) is None
@@ -0,0 +1,138 @@
+import json
+
+import httpx
+import pytest
+import pytest_asyncio
+from unittest.mock import patch
+
+from benchmarks.fakes import FakeChatModel, template_responder
+from src.services.meeting_generator.workflow import MeetingPipeline
+from src.services.template_generator import generate_template
+from src.utils.cost_ledger import CostLedger
+from src.utils.history_store import MeetingHistoryStore, render_digest
+from src.utils.metrics import CACHE_LOOKUPS
+from src.utils.mock_db import MOCK_USER_DATA
+from src.web.main import app
+
+PAYLOAD = {
+    "user_id": "user_001",
+    "target_info": "(가상)김수연",
+    "purpose": "Growth, Work",
+    "tone_and_manner": "Casual",
+    "use_previous_data": True,
+}
+
+
+@pytest_asyncio.fixture
+async def history_store(tmp_path):
+    store = MeetingHistoryStore(str(tmp_path / "history.sqlite3"), recent_meetings=2, max_action_items=3)
+    await store.seed(MOCK_USER_DATA)
+    yield store
+    await store.aclose()
+
+
+@pytest.mark.asyncio
+async def test_seed_builds_digest_from_mock_history(history_store):
+    digest = await history_store.get_digest("user_001")
+
+    assert digest["name"] == "(가상)김수연"
+    assert digest["meeting_count"] == 1
+    assert digest["recent_meetings"][0]["highlights"][0] == "디자인 시스템 운영: 컴포넌트 가이드라인 1차 배포 완료."
+    assert [item["item"] for item in digest["open_action_items"]] == [
+        "디자인 시스템 기여 가이드 제작",
+        "개발과 디자인 간 네이밍 컨벤션 정리",
+        "프로젝트 종료 후 회복 기간 필요성에 대해 논의.",
+    ]
+    assert await history_store.get_digest("user_004") is None
+    assert await history_store.seed(MOCK_USER_DATA) == 0  # 이미 초기화된 저장소는 건너뜀
+
+
+@pytest.mark.asyncio
+async def test_digest_is_updated_incrementally_and_stays_bounded(history_store):
+    for day in range(1, 5):
+        digest = await history_store.add_meeting(
+            "user_001", f"mtg_new_{day}", f"2025-08-0{day}",
+            title=f"{day}차 미팅", highlights=[f"진행 상황 {day}"], action_items=[f"후속 작업 {day}"],
+            done=["디자인 시스템 기여 가이드 제작"] if day == 1 else None,
+        )
+
+    assert digest["meeting_count"] == 5
+    assert digest["last_meeting_date"] == "2025-08-04"
+    assert [m["meeting_id"] for m in digest["recent_meetings"]] == ["mtg_new_4", "mtg_new_3"]
+    assert [item["item"] for item in digest["open_action_items"]] == ["후속 작업 4", "후속 작업 3", "후속 작업 2"]
+    assert len(await history_store.list_meetings("user_001", since="2025-08-01")) == 4
+
+    # 기록 직후 digest는 캐시에 반영되어 DB를 다시 읽지 않음
+    hits = CACHE_LOOKUPS.labels("history", "hit").value
+    assert await history_store.get_digest("user_001") == digest
+    assert CACHE_LOOKUPS.labels("history", "hit").value == hits + 1
+
+    rendered = render_digest(digest)
+    assert "2025-08-04 4차 미팅" in rendered
+    assert "디자인 시스템 운영" not in rendered
+
+
+@pytest.mark.asyncio
+async def test_completed_analysis_is_added_to_history(history_store, fake_clients, patch_nodes):
+    clients = fake_clients()
+    pipeline = MeetingPipeline(clients, history_store)
+    with patch_nodes(STT_CHECK_INTERVAL=0.01):
+        result = await pipeline.run(
+            recording_url="https://storage.test/a.m4a",
+            meeting_datetime="2025-08-10T14:30:00",
+            user_id="leader_001",
+            member_id="user_002",
+            meeting_id="job-1",
+        )
+
+    assert result["status"] == "completed"
+    digest = await history_store.get_digest("user_002")
+    assert digest["recent_meetings"][0]["meeting_id"] == "job-1"
+    assert digest["recent_meetings"][0]["date"] == "2025-08-10"
+    assert "디자인 리뷰 일정 재조정" in [item["item"] for item in digest["open_action_items"]]
+    assert await history_store.get_digest("leader_001") is None  # 요청자가 아닌 미팅 대상 멤버의 기록에 추가
+
+
+@pytest.mark.asyncio
+async def test_analysis_for_unknown_user_is_not_recorded(history_store, fake_clients, patch_nodes):
+    clients = fake_clients()
+    pipeline = MeetingPipeline(clients, history_store)
+    with patch_nodes(STT_CHECK_INTERVAL=0.01):
+        result = await pipeline.run(
+            recording_url="https://storage.test/a.m4a",
+            user_id="unknown_user",
+            meeting_id="job-2",
+        )
+
+    assert result["status"] == "completed"
+    assert await history_store.get_user("unknown_user") is None
+    assert await history_store.get_digest("unknown_user") is None
+    assert await history_store.list_meetings("unknown_user") == []
+
+
+@pytest.mark.asyncio
+async def test_template_uses_digest_for_previous_data(history_store, tmp_path):
+    prompts = []
+
+    def responder(messages):
+        prompts.append(messages[-1].content)
+        return template_responder(messages)
+
+    app.state.history_store = history_store
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    try:
+        with patch.object(generate_template, "llm", FakeChatModel(responder=responder)), \
+                patch.object(generate_template, "chain", generate_template.get_chain()):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/api/template", json=PAYLOAD)
+                unknown = await client.post("/api/template", json={**PAYLOAD, "user_id": "user_999"})
+    finally:
+        await app.state.cost_ledger.aclose()
+        del app.state.history_store
+        del app.state.cost_ledger
+
+    assert response.json()["generated_questions"] == json.loads(template_responder([]))
+    assert "[ToDo - 미완료 액션 아이템]" in prompts[0]
+    assert "디자인 시스템 기여 가이드 제작" in prompts[0]
+    assert unknown.status_code == 404
@@ -0,0 +1,46 @@
+import httpx
+import pytest
+
+from src.utils.metrics import Counter, MetricsRegistry, record_cache_lookup, REGISTRY
+from src.web.main import app
+
+
+def test_histogram_renders_cumulative_buckets():
+    """버킷은 관측 시 개별 증가, 렌더링 시 누적값으로 출력"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("node_seconds", "노드 실행 시간", ("node",), buckets=(0.1, 1.0))
+    child = histogram.labels("analyze")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        child.observe(value)
+
+    output = registry.render()
+    assert 'node_seconds_bucket{node="analyze",le="0.1"} 2' in output
+    assert 'node_seconds_bucket{node="analyze",le="1"} 3' in output
+    assert 'node_seconds_bucket{node="analyze",le="+Inf"} 4' in output
+    assert 'node_seconds_count{node="analyze"} 4' in output
+    assert "# TYPE node_seconds histogram" in output
+
+
+def test_labels_reuse_child_and_validate_arity():
+    counter = Counter("tokens_total", "토큰 수", ("model", "direction"))
+    assert counter.labels("gemini", "input") is counter.labels("gemini", "input")
+    with pytest.raises(ValueError):
+        counter.labels("gemini")
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_request_latency_and_cache_ratio():
+    """/metrics는 엔드포인트 지연 시간과 캐시 적중률을 Prometheus 포맷으로 노출"""
+    record_cache_lookup("test_cache", hit=True)
+    record_cache_lookup("test_cache", hit=False)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/api/config")
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/config",status="200"}' in response.text
+    assert 'cache_hit_ratio{cache="test_cache"} 0.5' in response.text
+    assert "http_requests_in_flight" in REGISTRY.render()
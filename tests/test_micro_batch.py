@@ -0,0 +1,172 @@
+import asyncio
+import json
+
+import pytest
+from unittest.mock import patch
+
+from benchmarks.bench_microbatch import build_parser, run_case
+from benchmarks.fakes import FakeChatModel, batch_email_responder, batch_title_responder, title_responder
+from src.services.meeting_generator.generate_meeting import create_title_batcher
+from src.services.meeting_generator.workflow import MeetingPipeline
+from src.services.template_generator import generate_email
+from src.utils.clients import ProviderClients
+from src.utils.cost_ledger import RequestUsage, _current_usage
+from src.utils.llm_callbacks import UsageMetricsCallbackHandler
+from src.utils.micro_batch import MicroBatcher
+from src.utils.schemas import EmailGeneratorInput
+
+
+def _batcher(batches, singles, window_ms=20, max_batch_size=16, missing=(), fail=False):
+    async def run_batch(items):
+        batches.append(list(items))
+        if fail:
+            raise ValueError("JSON 파싱 실패")
+        return [None if item in missing else item * 10 for item in items]
+
+    async def run_single(item):
+        singles.append(item)
+        return item * 10
+
+    return MicroBatcher(
+        "test", run_batch, run_single, key=lambda item: item % 2, window_ms=window_ms, max_batch_size=max_batch_size
+    )
+
+
+@pytest.mark.asyncio
+async def test_requests_within_window_share_one_call_per_key():
+    batches, singles = [], []
+    batcher = _batcher(batches, singles)
+
+    results = await asyncio.gather(*(batcher.submit(item) for item in range(5)))
+
+    assert results == [0, 10, 20, 30, 40]
+    assert sorted(batches) == [[0, 2, 4], [1, 3]]
+    assert singles == []
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_flushed_without_waiting_for_window():
+    batches, singles = [], []
+    batcher = _batcher(batches, singles, window_ms=10_000, max_batch_size=2)
+
+    results = await asyncio.wait_for(asyncio.gather(batcher.submit(0), batcher.submit(2)), timeout=1)
+
+    assert results == [0, 20]
+    assert batches == [[0, 2]]
+    await batcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_missing_items_and_batch_errors_fall_back_to_single_calls():
+    batches, singles = [], []
+    batcher = _batcher(batches, singles, missing={2})
+    assert await asyncio.gather(*(batcher.submit(item) for item in (0, 2, 4))) == [0, 20, 40]
+    assert singles == [2]
+
+    batches, singles = [], []
+    batcher = _batcher(batches, singles, fail=True)
+    assert await asyncio.gather(*(batcher.submit(item) for item in (0, 2))) == [0, 20]
+    assert len(batches) == 1 and sorted(singles) == [0, 2]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_is_dropped_from_batch():
+    batches, singles = [], []
+    batcher = _batcher(batches, singles, window_ms=50)
+
+    cancelled = asyncio.create_task(batcher.submit(0))
+    kept = [asyncio.create_task(batcher.submit(item)) for item in (2, 4)]
+    await asyncio.sleep(0.01)
+    cancelled.cancel()
+
+    assert await asyncio.gather(*kept) == [20, 40]
+    assert batches == [[2, 4]]
+
+
+@pytest.mark.asyncio
+async def test_shared_call_tokens_are_split_across_requests():
+    handler = UsageMetricsCallbackHandler("gemini-2.5-flash")
+    llm = FakeChatModel(responder=batch_email_responder, callbacks=[handler])
+    inputs = [
+        EmailGeneratorInput(
+            user_id="user_001", target_info=f"구성원{index}", purpose="Growth",
+            detailed_context="다음 분기 목표 논의", use_previous_data=False,
+        )
+        for index in range(3)
+    ]
+
+    async def submit(batcher, input_data):
+        usage = RequestUsage("template:email", input_data.user_id)
+        _current_usage.set(usage)
+        await batcher.submit(input_data)
+        return usage
+
+    with patch.object(generate_email, "llm", llm):
+        batcher = generate_email.create_email_batcher()
+        usages = await asyncio.gather(*(submit(batcher, input_data) for input_data in inputs))
+
+    assert llm.calls == 1
+    totals = [usage.llm["gemini-2.5-flash"]["input_tokens"] for usage in usages]
+    assert max(totals) - min(totals) <= 1
+    assert all(usage.llm["gemini-2.5-flash"]["calls"] == 1 for usage in usages)
+
+
+@pytest.mark.asyncio
+async def test_title_only_pipeline_runs_are_batched():
+    llm = FakeChatModel(responder=batch_title_responder)
+    clients = ProviderClients(stt=object(), supabase=object(), meeting_llm=object(), title_llm=llm)
+    batcher = create_title_batcher(clients)
+    pipeline = MeetingPipeline(clients, title_batcher=batcher)
+    qa_pairs = json.dumps([{"question": "요즘 어떠세요?", "answer": "괜찮습니다"}], ensure_ascii=False)
+
+    results = await asyncio.gather(
+        *(pipeline.run(qa_pairs=qa_pairs, only_title=True, user_id="user_001") for _ in range(4))
+    )
+
+    assert [result["status"] for result in results] == ["completed"] * 4
+    assert {result["analysis_result"]["title"] for result in results} == {title_responder([])}
+    assert llm.calls == 1
+
+    # 다른 사용자나 사용자를 알 수 없는 요청은 한 프롬프트로 묶지 않음
+    await asyncio.gather(
+        pipeline.run(qa_pairs=qa_pairs, only_title=True, user_id="user_001"),
+        pipeline.run(qa_pairs=qa_pairs, only_title=True, user_id="user_002"),
+        pipeline.run(qa_pairs=qa_pairs, only_title=True),
+        pipeline.run(qa_pairs=qa_pairs, only_title=True),
+    )
+    assert llm.calls == 5
+    await batcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_email_requests_are_batched_per_user():
+    llm = FakeChatModel(responder=batch_email_responder)
+    inputs = [
+        EmailGeneratorInput(
+            user_id=user_id, target_info="구성원", purpose="Growth", detailed_context="다음 분기 목표 논의",
+            use_previous_data=False, language=language,
+        )
+        for user_id, language in [("user_001", None), ("user_001", None), ("user_002", None), ("user_001", "en")]
+    ]
+
+    with patch.object(generate_email, "llm", llm):
+        batcher = generate_email.create_email_batcher()
+        results = await asyncio.gather(*(batcher.submit(input_data) for input_data in inputs))
+
+    assert all(result.generated_email for result in results)
+    # user_001의 기본 언어 요청 2건만 한 번에 생성
+    assert llm.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_benchmark_batched_mode_uses_fewer_llm_calls():
+    args = build_parser().parse_args(["--requests", "40", "--llm-latency-ms", "20", "--distribution", "constant"])
+    unbatched = await run_case(args, "title", rate=400, window_ms=None)
+    batched = await run_case(args, "email", rate=400, window_ms=20)
+    per_user = await run_case(args, "email", rate=400, window_ms=20, users=40)
+
+    assert unbatched["llm_calls"] == 40 and unbatched["errors"] == 0
+    assert batched["llm_calls"] < 40 and batched["errors"] == 0
+    assert batched["mean_batch_size"] > 1
+    # 요청마다 사용자가 다르면 묶을 요청이 없음
+    assert per_user["llm_calls"] == 40 and per_user["users"] == 40
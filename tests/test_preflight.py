@@ -0,0 +1,283 @@
+import struct
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from benchmarks.fakes import fake_media_client, wav_header
+from src.config.config import PREFLIGHT_MAX_RANGE_REQUESTS
+from src.services.meeting_generator.preflight import next_poll_delay, probe_recording, select_model_profile
+from src.services.meeting_generator.workflow import MeetingPipeline
+from src.utils.audio_probe import BytesSource, probe_audio
+from src.utils.clients import MediaURLGuard, _is_public_address
+from src.utils.cost_ledger import CostLedger
+from src.utils.job_store import JobStore
+from src.utils.state_backend import create_state_backend
+from src.web.main import app
+
+
+def _box(box_type: bytes, *children: bytes) -> bytes:
+    payload = b"".join(children)
+    return struct.pack(">I", 8 + len(payload)) + box_type + payload
+
+
+def _mp4(seconds: float, mdat_bytes: int = 0, handler: bytes = b"soun") -> bytes:
+    mvhd = _box(b"mvhd", bytes(12) + struct.pack(">II", 1000, int(seconds * 1000)) + bytes(80))
+    mdhd = _box(b"mdhd", bytes(12) + struct.pack(">II", 44100, int(seconds * 44100)) + bytes(4))
+    hdlr = _box(b"hdlr", bytes(8) + handler + bytes(12))
+    entry = struct.pack(">I", 36) + b"mp4a" + bytes(16) + struct.pack(">HH", 2, 16) + bytes(4) + struct.pack(">I", 44100 << 16)
+    stsd = _box(b"stsd", bytes(4) + struct.pack(">I", 1) + entry)
+    trak = _box(b"trak", _box(b"mdia", mdhd, hdlr, _box(b"minf", _box(b"stbl", stsd))))
+    ftyp = _box(b"ftyp", b"M4A " + bytes(4))
+    # 스마트폰 녹음처럼 moov가 오디오 데이터(mdat) 뒤에 있는 파일
+    return ftyp + _box(b"mdat", bytes(mdat_bytes)) + _box(b"moov", mvhd, trak)
+
+
+def _mp3_vbr(frames: int) -> bytes:
+    # MPEG1 Layer III, 128kbps, 44.1kHz, mono 프레임 + Xing 헤더 (사이드 정보 17바이트 뒤)
+    frame = b"\xff\xfb\x90\xc0" + bytes(17) + b"Xing" + struct.pack(">II", 1, frames)
+    return b"ID3\x04\x00\x00\x00\x00\x00\x0a" + bytes(10) + frame + bytes(400)
+
+
+def _flac(seconds: float, sample_rate: int = 48000) -> bytes:
+    packed = (sample_rate << 44) | (1 << 41) | (15 << 36) | int(seconds * sample_rate)
+    return b"fLaC" + b"\x80" + (34).to_bytes(3, "big") + bytes(10) + packed.to_bytes(8, "big") + bytes(16)
+
+
+def _ogg_opus(seconds: float) -> bytes:
+    def page(granule: int, header_type: int, packet: bytes) -> bytes:
+        return b"OggS\x00" + bytes([header_type]) + struct.pack("<qII", granule, 7, 0) + bytes(4) + bytes([1, len(packet)]) + packet
+
+    head = b"OpusHead\x01\x01" + struct.pack("<HIH", 312, 16000, 0) + b"\x00"
+    return page(0, 2, head) + bytes(1000) + page(int(seconds * 48000) + 312, 4, b"\x00")
+
+
+def _ebml(element_id: bytes, payload: bytes) -> bytes:
+    return element_id + b"\x01" + len(payload).to_bytes(7, "big") + payload
+
+
+def _webm(seconds: float) -> bytes:
+    info = _ebml(b"\x15\x49\xa9\x66", _ebml(b"\x2a\xd7\xb1", (1_000_000).to_bytes(3, "big")) + _ebml(b"\x44\x89", struct.pack(">d", seconds * 1000)))
+    audio = _ebml(b"\xe1", _ebml(b"\xb5", struct.pack(">f", 48000.0)) + _ebml(b"\x9f", b"\x01"))
+    tracks = _ebml(b"\x16\x54\xae\x6b", _ebml(b"\xae", _ebml(b"\x83", b"\x02") + _ebml(b"\x86", b"A_OPUS") + audio))
+    # MediaRecorder처럼 Segment 크기를 기록하지 않은 스트리밍 형태
+    return _ebml(b"\x1a\x45\xdf\xa3", _ebml(b"\x42\x82", b"webm")) + b"\x18\x53\x80\x67\x01\xff\xff\xff\xff\xff\xff\xff" + info + tracks
+
+
+def _media(data: bytes, requests=None, content_type: str = "audio/mp4") -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if requests is not None:
+            requests.append(request.headers["range"])
+        if request.url.path == "/missing.m4a":
+            return httpx.Response(404)
+        if not data:
+            return httpx.Response(416, headers={"content-range": "bytes */0"})
+        start, end = (int(value) for value in request.headers["range"][6:].split("-"))
+        end = min(end, len(data) - 1)
+        return httpx.Response(
+            206, content=data[start:end + 1],
+            headers={"content-type": content_type, "content-range": f"bytes {start}-{end}/{len(data)}"},
+        )
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (wav_header(90, sample_rate=16000), ("wav", "pcm", 90, 1, 16000)),
+        (_mp3_vbr(frames=3828), ("mp3", "mp3", 3828 * 1152 / 44100, 1, 44100)),
+        (_mp4(61.5), ("mp4", "aac", 61.5, 2, 44100)),
+        (_flac(42), ("flac", "flac", 42, 2, 48000)),
+        (_ogg_opus(10), ("ogg", "opus", 10, 1, 16000)),
+        (_webm(12), ("webm", "opus", 12, 1, 48000)),
+    ],
+    ids=["wav", "mp3", "mp4", "flac", "ogg", "webm"],
+)
+async def test_container_headers_are_parsed(data, expected):
+    # WAV는 헤더만 두고 전체 크기는 헤더에 기록된 크기로 지정
+    size = 44 + 90 * 32000 if data.startswith(b"RIFF") else len(data)
+    info = await probe_audio(BytesSource(data, size), data[:4096])
+
+    container, codec, duration, channels, sample_rate = expected
+    assert (info.container, info.codec, info.channels, info.sample_rate) == (container, codec, channels, sample_rate)
+    assert info.duration_seconds == pytest.approx(duration, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_moov_at_end_is_read_with_few_range_requests():
+    data = _mp4(1800, mdat_bytes=3 * 1024 * 1024)
+    requests = []
+
+    probe = await probe_recording(_media(data, requests), "https://cdn.test/a.m4a")
+
+    assert probe.usable and probe.container == "mp4" and probe.duration_seconds == 1800
+    assert probe.size_bytes == len(data)
+    # 앞부분 1회 + mdat 뒤 moov 1회만 요청하고 오디오 데이터는 내려받지 않음
+    assert len(requests) == 2 and requests[1].startswith(f"bytes={len(data) - len(_mp4(1800)) + 24}-")
+    assert probe.model_profile == "default"
+    assert probe.estimated_stt_seconds == 15 + 1800 * 0.25
+    assert probe.estimated_completion_seconds == probe.estimated_stt_seconds + 60
+
+
+@pytest.mark.asyncio
+async def test_range_requests_stop_at_limit():
+    # moov까지 가는 동안 큰 박스가 이어져 박스 헤더마다 새 Range 요청이 필요한 파일
+    data = _mp4(60, mdat_bytes=1024)
+    padding = _box(b"free", bytes(200 * 1024)) * 8
+    data = data[:16] + padding + data[16:]
+    requests = []
+
+    probe = await probe_recording(_media(data, requests), "https://cdn.test/a.m4a")
+
+    assert probe.usable and probe.duration_seconds is None
+    assert len(requests) <= PREFLIGHT_MAX_RANGE_REQUESTS
+
+
+@pytest.mark.asyncio
+async def test_unusable_recordings_are_rejected():
+    async def probe(data: bytes, url: str = "https://cdn.test/a.m4a", **kwargs):
+        return await probe_recording(_media(data, **kwargs), url)
+
+    assert (await probe(b"", url="https://cdn.test/missing.m4a")).reason == "not_found"
+    assert (await probe(b"")).reason == "empty"
+    assert (await probe(b"<html>403 Forbidden</html>", content_type="text/html")).reason == "not_audio"
+    # 녹음 앱이 비정상 종료되어 moov가 기록되지 않은 파일
+    assert (await probe(_mp4(60)[:-200])).reason == "corrupt"
+    assert (await probe(_mp4(60, handler=b"vide"))).reason == "no_audio"
+    too_short = await probe(wav_header(0.4) + bytes(12800))
+    assert too_short.reason == "too_short" and too_short.duration_seconds == 0.4
+
+
+@pytest.mark.asyncio
+async def test_unreadable_header_does_not_block_analysis():
+    unknown = await probe_recording(_media(bytes(range(256)) * 10, content_type="audio/amr"), "https://cdn.test/a.amr")
+    assert unknown.usable and unknown.duration_seconds is None and unknown.estimated_stt_seconds is None
+
+    def unreachable(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused")
+
+    offline = await probe_recording(httpx.AsyncClient(transport=httpx.MockTransport(unreachable)), "https://cdn.test/a.m4a")
+    # 상대 서버의 오류 내용은 응답에 포함하지 않음
+    assert offline.usable and offline.duration_seconds is None and "connection refused" not in offline.detail
+
+
+@pytest.mark.asyncio
+async def test_media_client_only_reads_allowed_public_hosts():
+    resolved = {"storage.test": ["93.184.216.34"], "internal.test": ["10.0.0.5"], "169.254.169.254": ["169.254.169.254"]}
+    requested = []
+
+    async def resolve(self, host, port):
+        return resolved[host]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        if request.url.path == "/moved":
+            return httpx.Response(302, headers={"location": "https://169.254.169.254/latest/meta-data"})
+        header = wav_header(120)
+        size = len(header) + struct.unpack("<I", header[40:44])[0]
+        return httpx.Response(
+            206, content=header, headers={"content-type": "audio/wav", "content-range": f"bytes 0-{len(header) - 1}/{size}"}
+        )
+
+    guard = MediaURLGuard(["storage.test", "internal.test", "169.254.169.254"])
+    media = httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True, event_hooks={"request": [guard]})
+    with patch.object(MediaURLGuard, "_resolve", resolve):
+        allowed = await probe_recording(media, "https://storage.test/a.wav")
+        blocked = [
+            await probe_recording(media, url)
+            for url in (
+                "http://storage.test/a.wav",  # https만 허용
+                "https://other.test/a.wav",  # 허용 호스트가 아님
+                "https://internal.test/a.wav",  # 사설 주소로 해석됨
+                "https://169.254.169.254/latest/meta-data",  # 링크 로컬(메타데이터 서버)
+                "https://storage.test/moved",  # 리다이렉트 대상도 다시 확인
+            )
+        ]
+
+    assert allowed.duration_seconds == 120
+    assert all(probe.usable and probe.duration_seconds is None for probe in blocked)
+    assert "허용되지 않은" in blocked[0].detail
+    assert requested == ["https://storage.test/a.wav", "https://storage.test/moved"]
+    assert not _is_public_address("127.0.0.1") and not _is_public_address("::ffff:192.168.0.1")
+    assert _is_public_address("93.184.216.34")
+
+
+def test_poll_delay_tracks_expected_completion():
+    # 예상 완료 시간을 모르면 고정 간격
+    assert next_poll_delay(0, None, check_interval=10) == 10
+    # 멀면 간격 상한까지, 가까워지면 남은 시간의 절반씩 줄여 완료 직후 확인
+    assert next_poll_delay(0, 300, check_interval=10) == 30
+    assert next_poll_delay(280, 300, check_interval=10) == 10
+    assert next_poll_delay(299.5, 300, check_interval=10) == 1
+    # 예상보다 늦어지면 최소 간격부터 다시 늘림
+    assert next_poll_delay(302, 300, check_interval=10) == 1
+    assert next_poll_delay(340, 300, check_interval=10) == 10
+
+    assert select_model_profile(120) == "fast"
+    assert select_model_profile(1800) == select_model_profile(None) == "default"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_rejects_before_stt_and_short_recording_uses_fast_profile(tmp_path, fake_clients, patch_nodes):
+    rejected_clients = fake_clients(media=_media(_mp4(60)[:-200]))
+    with patch.object(rejected_clients.stt, "submit") as submit:
+        rejected = await MeetingPipeline(rejected_clients).run(recording_url="https://cdn.test/a.m4a")
+    assert rejected["status"] == "rejected" and "corrupt" in rejected["errors"][0]
+    submit.assert_not_called()
+
+    clients = fake_clients(stt_latency_ms=20, duration_minutes=2, media=fake_media_client(duration_minutes=2))
+    with patch_nodes(STT_CHECK_INTERVAL=0.01):
+        result = await MeetingPipeline(clients).run(recording_url="https://cdn.test/a.m4a")
+    assert result["status"] == "completed"
+    assert result["recording_probe"]["duration_seconds"] == 120
+    assert result["performance_metrics"]["analyze_model"] == "gemini-2.5-flash"
+
+    backend = create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}")
+    app.state.meeting_pipeline = MeetingPipeline(rejected_clients)
+    app.state.job_store = JobStore(backend)
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/analyze", json={"recording_url": "https://cdn.test/a.m4a"})
+    finally:
+        await app.state.cost_ledger.aclose()
+        await backend.aclose()
+        del app.state.meeting_pipeline, app.state.job_store, app.state.cost_ledger
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_job_endpoint_returns_preflight_and_estimated_completion(tmp_path, fake_clients, patch_nodes):
+    backend = create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}")
+    clients = fake_clients(stt_latency_ms=20, duration_minutes=30)
+    app.state.provider_clients = clients
+    app.state.job_store = JobStore(backend)
+    app.state.meeting_pipeline = MeetingPipeline(clients)
+    app.state.background_tasks = set()
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            preflight = await client.post("/api/analyze/preflight", json={"recording_url": "https://cdn.test/a.wav"})
+            with patch_nodes(STT_CHECK_INTERVAL=0.01):
+                job = await client.post("/api/analyze/jobs", json={"recording_url": "https://cdn.test/a.wav"})
+                for task in list(app.state.background_tasks):
+                    await task
+            app.state.provider_clients = fake_clients(media=_media(b""))
+            rejected = await client.post("/api/analyze/jobs", json={"recording_url": "https://cdn.test/b.wav"})
+    finally:
+        await app.state.cost_ledger.aclose()
+        await backend.aclose()
+        for name in ("provider_clients", "job_store", "meeting_pipeline", "background_tasks", "cost_ledger"):
+            delattr(app.state, name)
+
+    assert preflight.status_code == 200
+    assert preflight.json()["duration_seconds"] == 1800 and preflight.json()["container"] == "wav"
+    assert job.status_code == 202
+    body = job.json()
+    assert body["preflight"]["estimated_completion_seconds"] == 15 + 1800 * 0.25 + 60
+    assert body["estimated_completion_at"] > body["created_at"]
+    assert rejected.status_code == 422 and "empty" in rejected.json()["detail"]
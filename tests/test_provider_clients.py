@@ -0,0 +1,80 @@
+import httpx
+import pytest
+from unittest.mock import patch
+
+import assemblyai as aai
+
+from src.services.meeting_generator.generate_meeting import process_with_assemblyai
+from src.utils.clients import AssemblyAIClient, ConnectionStats, ProviderClients
+
+TRANSCRIPT_ID = "transcript-1"
+
+
+def _make_stt_client(handler) -> AssemblyAIClient:
+    http_client = httpx.AsyncClient(
+        base_url="https://api.assemblyai.test",
+        transport=httpx.MockTransport(handler),
+    )
+    return AssemblyAIClient(http_client, aai.TranscriptionConfig(language_code="ko", speaker_labels=True))
+
+
+def _initial_state():
+    return {"file_url": "https://storage.test/recording.m4a", "errors": [], "performance_metrics": None}
+
+
+def test_connection_stats_snapshot():
+    """요청 수 대비 새 커넥션 수로 재사용 비율을 계산"""
+    stats = ConnectionStats()
+    for _ in range(4):
+        stats.on_request(httpx.Request("GET", "https://example.test"))
+    stats._trace("connection.connect_tcp.complete", {})
+
+    snapshot = stats.snapshot()
+    assert snapshot["requests"] == 4
+    assert snapshot["new_connections"] == 1
+    assert snapshot["reused_connections"] == 3
+    assert snapshot["reuse_ratio"] == 0.75
+
+
+@pytest.mark.asyncio
+async def test_transcribe_polls_shared_client_until_completed():
+    """주입된 STT 클라이언트로 전사를 등록하고 완료될 때까지 폴링"""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        if request.method == "POST":
+            return httpx.Response(200, json={"id": TRANSCRIPT_ID, "status": "queued", "audio_url": "x"})
+        return httpx.Response(200, json={
+            "id": TRANSCRIPT_ID,
+            "status": "completed",
+            "audio_url": "x",
+            "audio_duration": 12,
+            "utterances": [
+                {"speaker": "A", "text": "안녕하세요", "start": 0, "end": 3000, "confidence": 1.0, "words": []},
+                {"speaker": "B", "text": "반갑습니다", "start": 3000, "end": 4000, "confidence": 1.0, "words": []},
+            ],
+        })
+
+    clients = ProviderClients(stt=_make_stt_client(handler), supabase=object(), meeting_llm=object(), title_llm=object())
+
+    with patch("src.services.meeting_generator.generate_meeting.STT_CHECK_INTERVAL", 0):
+        state = await process_with_assemblyai(_initial_state(), clients=clients)
+
+    assert calls == [("POST", "/v2/transcript"), ("GET", f"/v2/transcript/{TRANSCRIPT_ID}")]
+    assert state["transcript"]["total_duration"] == 12
+    assert state["speaker_stats_percent"] == {"A": 75.0, "B": 25.0}
+    assert state["performance_metrics"]["transcribe_status"] == "success"
+
+
+@pytest.mark.asyncio
+async def test_transcribe_marks_failed_on_provider_error():
+    """제공자 오류 응답은 파이프라인 상태를 failed로 기록"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(401, json={"error": "Invalid API key"})
+
+    clients = ProviderClients(stt=_make_stt_client(handler), supabase=object(), meeting_llm=object(), title_llm=object())
+    state = await process_with_assemblyai(_initial_state(), clients=clients)
+
+    assert state["status"] == "failed"
+    assert "Invalid API key" in state["errors"][0]
@@ -0,0 +1,179 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.responses import JSONResponse
+from unittest.mock import patch
+
+from benchmarks.fakes import FakeChatModel, email_responder
+from src.services.template_generator import generate_email
+from src.utils.cost_ledger import CostLedger
+from src.utils.request_dedup import (
+    DEDUP_HEADER,
+    IdempotencyKeyConflict,
+    RequestDeduplicator,
+    request_fingerprint,
+)
+from src.utils.state_backend import create_state_backend
+from src.web.main import app
+
+PAYLOAD = {
+    "user_id": "user_001",
+    "target_info": "(가상)김수연",
+    "purpose": "Growth, Work",
+    "detailed_context": "다음 분기 목표를 논의하고 싶습니다.",
+    "tone_and_manner": "Casual",
+}
+
+
+def _producer(calls, delay=0.05):
+    async def produce():
+        calls.append(len(calls))
+        await asyncio.sleep(delay)
+        return JSONResponse({"run": len(calls)}, headers={"X-Cache": "MISS"})
+
+    return produce
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_run(tmp_path):
+    backend = create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}")
+    dedup = RequestDeduplicator(backend)
+    calls = []
+    fingerprint = request_fingerprint("analyze", PAYLOAD)
+
+    responses = await asyncio.gather(*(dedup.run("analyze", fingerprint, _producer(calls)) for _ in range(3)))
+    # 완료 후 다시 보낸 요청(재생성 등)은 새로 실행
+    again = await dedup.run("analyze", fingerprint, _producer(calls))
+    await backend.aclose()
+
+    assert len(calls) == 2
+    assert [response.headers[DEDUP_HEADER] for response in responses] == ["NEW", "JOINED", "JOINED"]
+    assert {response.body for response in responses} == {b'{"run":1}'}
+    assert responses[1].headers["X-Cache"] == "MISS"
+    assert again.headers[DEDUP_HEADER] == "NEW"
+
+
+@pytest.mark.asyncio
+async def test_request_on_another_worker_waits_for_running_result(tmp_path):
+    state_path = tmp_path / "state.sqlite3"
+    worker_a = RequestDeduplicator(create_state_backend(f"sqlite:///{state_path}"), poll_interval=0.01)
+    worker_b = RequestDeduplicator(create_state_backend(f"sqlite:///{state_path}"), poll_interval=0.01)
+    calls = []
+    fingerprint = request_fingerprint("analyze", PAYLOAD)
+
+    leader = asyncio.create_task(worker_a.run("analyze", fingerprint, _producer(calls, delay=0.2)))
+    await asyncio.sleep(0.05)
+    follower = await worker_b.run("analyze", fingerprint, _producer(calls))
+
+    assert (await leader).headers[DEDUP_HEADER] == "NEW"
+    assert follower.headers[DEDUP_HEADER] == "JOINED"
+    assert follower.body == b'{"run":1}' and len(calls) == 1
+
+    # 실행 워커가 결과 없이 끝나면 기다리던 워커가 이어서 실행
+    async def fail():
+        await asyncio.sleep(0.1)
+        raise RuntimeError("LLM 호출 실패")
+
+    failed = asyncio.create_task(worker_a.run("analyze", fingerprint, fail))
+    await asyncio.sleep(0.05)
+    retried = await worker_b.run("analyze", fingerprint, _producer(calls))
+    with pytest.raises(RuntimeError):
+        await failed
+    assert retried.headers[DEDUP_HEADER] == "NEW" and len(calls) == 2
+    await worker_a.backend.aclose()
+    await worker_b.backend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_run_is_cancelled_only_when_every_waiter_leaves(tmp_path):
+    backend = create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}")
+    dedup = RequestDeduplicator(backend)
+    calls, cancelled = [], []
+
+    async def produce():
+        calls.append(1)
+        try:
+            await asyncio.sleep(0.2)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+        return JSONResponse({"ok": True})
+
+    first = asyncio.create_task(dedup.run("analyze", "a", produce))
+    second = asyncio.create_task(dedup.run("analyze", "a", produce))
+    await asyncio.sleep(0.05)
+    first.cancel()
+    assert (await second).status_code == 200
+    assert cancelled == []
+
+    only = asyncio.create_task(dedup.run("analyze", "b", produce))
+    await asyncio.sleep(0.05)
+    only.cancel()
+    await asyncio.gather(only, return_exceptions=True)
+    await asyncio.sleep(0.01)
+    assert cancelled == [1]
+    # 취소된 실행의 표시는 해제되어 다음 요청이 바로 실행
+    assert await backend.get("dedup:flight:b:lease") is None
+    await backend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_replays_completed_response(tmp_path):
+    backend = create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}")
+    dedup = RequestDeduplicator(backend)
+    calls = []
+    fingerprint = request_fingerprint("analyze", PAYLOAD)
+
+    first = await dedup.run("analyze", fingerprint, _producer(calls), idempotency_key="retry-1", scope="user_001")
+    replayed = await dedup.run("analyze", fingerprint, _producer(calls), idempotency_key="retry-1", scope="user_001")
+    other_user = await dedup.run("analyze", fingerprint, _producer(calls), idempotency_key="retry-1", scope="user_002")
+    with pytest.raises(IdempotencyKeyConflict):
+        await dedup.run(
+            "analyze", request_fingerprint("analyze", {**PAYLOAD, "purpose": "Work"}), _producer(calls),
+            idempotency_key="retry-1", scope="user_001",
+        )
+    await backend.aclose()
+
+    assert first.headers[DEDUP_HEADER] == "NEW"
+    assert replayed.headers[DEDUP_HEADER] == "REPLAYED" and replayed.body == first.body
+    assert other_user.headers[DEDUP_HEADER] == "NEW"
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_template_endpoint_supports_idempotency_key(tmp_path):
+    prompts = []
+
+    def responder(messages):
+        prompts.append(messages[-1].content)
+        return email_responder(messages)
+
+    backend = create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}")
+    app.state.request_deduplicator = RequestDeduplicator(backend)
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    try:
+        with patch.object(generate_email, "llm", FakeChatModel(responder=responder)):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                params = {"generation_type": "email"}
+                headers = {"Idempotency-Key": "email-retry-1"}
+                first = await client.post("/api/template", params=params, json=PAYLOAD, headers=headers)
+                retried = await client.post("/api/template", params=params, json=PAYLOAD, headers=headers)
+                changed = await client.post(
+                    "/api/template", params=params, json={**PAYLOAD, "purpose": "Work"}, headers=headers
+                )
+                too_long = await client.post(
+                    "/api/template", params=params, json=PAYLOAD, headers={"Idempotency-Key": "k" * 256}
+                )
+    finally:
+        await app.state.cost_ledger.aclose()
+        await backend.aclose()
+        del app.state.cost_ledger, app.state.request_deduplicator
+
+    assert first.headers[DEDUP_HEADER] == "NEW"
+    assert retried.headers[DEDUP_HEADER] == "REPLAYED"
+    assert retried.json() == first.json()
+    assert changed.status_code == 422
+    assert too_long.status_code == 400
+    assert len(prompts) == 1
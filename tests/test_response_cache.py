@@ -0,0 +1,124 @@
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.utils.cost_ledger import CostLedger
+from src.utils.response_cache import (
+    CACHE_BYPASS,
+    CACHE_HIT,
+    CACHE_MISS,
+    ResponseCache,
+    cached_call,
+    cached_stream,
+    make_cache_key,
+)
+from src.utils.schemas import EmailGeneratorOutput
+from src.web.main import app
+
+
+class _FakeLLM:
+    model_name = "gemini-2.5-flash"
+    temperature = 0.7
+    max_output_tokens = 10000
+    thinking_budget = 0
+
+
+def test_cache_key_normalizes_inputs_and_tracks_model_and_prompt_version():
+    base = make_cache_key("template", "user_001", {"purpose": "Growth, Work", "language": "Korean"}, _FakeLLM(), "v1")
+    spaced = make_cache_key("template", "user_001", {"language": "Korean", "purpose": "  Growth,   Work "}, _FakeLLM(), "v1")
+    assert base == spaced
+
+    hotter = _FakeLLM()
+    hotter.temperature = 1.0
+    assert base != make_cache_key("template", "user_001", {"purpose": "Growth, Work", "language": "Korean"}, hotter, "v1")
+    assert base != make_cache_key("template", "user_001", {"purpose": "Growth, Work", "language": "Korean"}, _FakeLLM(), "v2")
+    assert base != make_cache_key("email", "user_001", {"purpose": "Growth, Work", "language": "Korean"}, _FakeLLM(), "v1")
+
+
+def test_template_variants_fill_pool_then_rotate():
+    cache = ResponseCache(variants={"template": 2})
+    key = "template:abc"
+    assert cache.get(key) is None
+    cache.put(key, "v1")
+    # 풀이 아직 덜 찼으므로 새로 생성하도록 미스 처리
+    assert cache.get(key) is None
+    cache.put(key, "v2")
+    assert [cache.get(key) for _ in range(4)] == ["v1", "v2", "v1", "v2"]
+
+
+def test_ttl_expiry_and_lru_eviction():
+    cache = ResponseCache(max_entries=2, ttl_seconds=60, variants={})
+    with patch("src.utils.response_cache.time.monotonic", return_value=0):
+        cache.put("email:a", "A")
+        cache.put("email:b", "B")
+        assert cache.get("email:a") == "A"  # a를 최근 사용으로 갱신
+        cache.put("email:c", "C")  # 가장 오래 사용되지 않은 b 제거
+        assert cache.get("email:b") is None
+        assert len(cache) == 2
+    with patch("src.utils.response_cache.time.monotonic", return_value=61):
+        assert cache.get("email:a") is None
+
+
+@pytest.mark.asyncio
+async def test_cached_call_reports_hit_miss_and_bypass():
+    produce = AsyncMock(return_value="result")
+    cache = ResponseCache(variants={})
+
+    assert await cached_call(None, "email:k", produce) == ("result", CACHE_BYPASS)
+    assert await cached_call(cache, "email:k", produce) == ("result", CACHE_MISS)
+    assert await cached_call(cache, "email:k", produce) == ("result", CACHE_HIT)
+    assert produce.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_guide_stream_is_replayed_and_failed_streams_are_not_cached():
+    cache = ResponseCache(variants={})
+
+    async def guide():
+        yield 'data: "## 가이드"\n\n'
+        yield 'data: "본문"\n\n'
+
+    async def failing_guide():
+        yield 'data: "## 가이드"\n\n'
+        yield 'data: {"error": "boom"}\n\n'
+
+    stream, status = cached_stream(cache, "guide:k", guide)
+    first = [event async for event in stream]
+    assert status == CACHE_MISS
+
+    stream, status = cached_stream(cache, "guide:k", guide)
+    assert status == CACHE_HIT
+    assert [event async for event in stream] == first
+
+    is_error = lambda event: event.startswith("data: {")
+    stream, _ = cached_stream(cache, "guide:failed", failing_guide, is_error)
+    [event async for event in stream]
+    assert cached_stream(cache, "guide:failed", failing_guide, is_error)[1] == CACHE_MISS
+
+
+@pytest.mark.asyncio
+async def test_template_endpoint_serves_repeated_email_from_cache(tmp_path):
+    payload = {
+        "user_id": "user_001",
+        "target_info": "(가상)김수연",
+        "purpose": "Growth, Work",
+        "tone_and_manner": "Casual",
+    }
+    generate = AsyncMock(return_value=EmailGeneratorOutput(generated_email="안녕하세요"))
+    app.state.response_cache = ResponseCache(variants={})
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    try:
+        with patch("src.web.main.generate_email", generate):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                first = await client.post("/api/template", params={"generation_type": "email"}, json=payload)
+                second = await client.post("/api/template", params={"generation_type": "email"}, json=payload)
+    finally:
+        await app.state.cost_ledger.aclose()
+        del app.state.cost_ledger
+        del app.state.response_cache
+
+    assert first.headers["x-cache"] == CACHE_MISS
+    assert second.headers["x-cache"] == CACHE_HIT
+    assert second.json() == {"generated_email": "안녕하세요"}
+    assert generate.await_count == 1
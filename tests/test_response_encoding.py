@@ -0,0 +1,120 @@
+import json
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from src.utils.cost_ledger import CostLedger
+from src.utils.metrics import RESPONSE_COMPRESSION_BYTES
+from src.utils.serialization import dumps, exclude_fields, parse_field_list, select_fields
+from src.web.main import app
+from src.web.middleware import CompressionMiddleware, select_encoding
+
+TRANSCRIPT = [{"speaker": "김지현", "text": "지난주 진행 상황을 공유해 주세요"}] * 200
+ANALYSIS_RESULT = {
+    "title": "3분기 목표 점검",
+    "ai_summary": "### 프로젝트 진행\n- 현황: 일정대로 진행 중",
+    "ai_core_summary": {"core_content": "핵심", "decisions_made": ["릴리즈 범위 축소"]},
+    "transcript": TRANSCRIPT,
+}
+
+
+def test_field_selection_and_encoding():
+    assert parse_field_list(" title,ai_core_summary , title,") == ["ai_core_summary", "title"]
+    assert select_fields(ANALYSIS_RESULT, ["title", "ai_core_summary.core_content"]) == {
+        "title": "3분기 목표 점검", "ai_core_summary": {"core_content": "핵심"},
+    }
+
+    excluded = exclude_fields(ANALYSIS_RESULT, ["transcript", "ai_core_summary.decisions_made", "missing.x"])
+    assert excluded == {
+        "title": "3분기 목표 점검", "ai_summary": ANALYSIS_RESULT["ai_summary"], "ai_core_summary": {"core_content": "핵심"},
+    }
+    # 원본은 바뀌지 않음
+    assert ANALYSIS_RESULT["ai_core_summary"]["decisions_made"] == ["릴리즈 범위 축소"]
+    assert select_fields(ANALYSIS_RESULT) is ANALYSIS_RESULT
+
+    # 표준 json의 공백 없는 UTF-8 출력과 같은 바이트열
+    assert dumps(ANALYSIS_RESULT) == json.dumps(ANALYSIS_RESULT, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def test_select_encoding_respects_q_values():
+    assert select_encoding("gzip, deflate") == "gzip"
+    assert select_encoding("gzip;q=0, deflate") is None
+    assert select_encoding("*") in ("br", "gzip")
+    assert select_encoding("identity") is None
+    assert select_encoding("") is None
+
+
+def _compression_app() -> CompressionMiddleware:
+    async def large(request):
+        return JSONResponse(ANALYSIS_RESULT, headers={"ETag": '"abc"'})
+
+    async def small(request):
+        return JSONResponse({"title": "3분기 목표 점검"})
+
+    async def events(request):
+        async def stream():
+            for index in range(50):
+                yield f"data: {json.dumps({'index': index, 'text': '안녕하세요' * 10})}\n\n"
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    async def chunked(request):
+        async def stream():
+            for item in TRANSCRIPT:
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+        return StreamingResponse(stream(), media_type="application/x-ndjson+json")
+
+    routes = [Route(path, endpoint) for path, endpoint in
+              (("/large", large), ("/small", small), ("/events", events), ("/chunked", chunked))]
+    return CompressionMiddleware(Starlette(routes=routes), minimum_size=500)
+
+
+@pytest.mark.asyncio
+async def test_middleware_compresses_json_and_streams_but_not_sse():
+    sent_before = RESPONSE_COMPRESSION_BYTES.labels("gzip", "sent").value
+    transport = httpx.ASGITransport(app=_compression_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        headers = {"accept-encoding": "gzip"}
+        large = await client.get("/large", headers=headers)
+        small = await client.get("/small", headers=headers)
+        events = await client.get("/events", headers=headers)
+        chunked = await client.get("/chunked", headers=headers)
+        identity = await client.get("/large", headers={"accept-encoding": "identity"})
+
+    assert large.headers["content-encoding"] == "gzip" and large.json() == ANALYSIS_RESULT
+    assert int(large.headers["content-length"]) < len(identity.content) / 5
+    assert large.headers["vary"] == "Accept-Encoding" and large.headers["etag"] == 'W/"abc"'
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in events.headers and events.text.count("data: ") == 50
+    assert chunked.headers["content-encoding"] == "gzip" and "content-length" not in chunked.headers
+    assert chunked.text.count("\n") == len(TRANSCRIPT)
+    assert "content-encoding" not in identity.headers and identity.headers["etag"] == '"abc"'
+    assert RESPONSE_COMPRESSION_BYTES.labels("gzip", "sent").value > sent_before
+
+
+@pytest.mark.asyncio
+async def test_analyze_endpoint_returns_only_selected_fields(tmp_path):
+    pipeline = AsyncMock()
+    pipeline.run.return_value = {"status": "completed", "analysis_result": ANALYSIS_RESULT}
+    app.state.meeting_pipeline = pipeline
+    app.state.job_store = None
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            body = {"recording_url": "https://storage.test/a.m4a"}
+            full = await client.post("/api/analyze", json=body, headers={"accept-encoding": "gzip"})
+            selected = await client.post("/api/analyze", json=body, params={"fields": "title,ai_core_summary"})
+            excluded = await client.post("/api/analyze", json=body, params={"exclude": "transcript"})
+    finally:
+        await app.state.cost_ledger.aclose()
+        for name in ("meeting_pipeline", "job_store", "cost_ledger"):
+            delattr(app.state, name)
+
+    assert full.json() == ANALYSIS_RESULT and full.headers["content-encoding"] == "gzip"
+    assert selected.json() == {"title": "3분기 목표 점검", "ai_core_summary": ANALYSIS_RESULT["ai_core_summary"]}
+    assert "content-encoding" not in selected.headers  # 최소 크기보다 작아 압축하지 않음
+    assert "transcript" not in excluded.json() and excluded.json()["title"] == "3분기 목표 점검"
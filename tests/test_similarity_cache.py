@@ -0,0 +1,111 @@
+import httpx
+import pytest
+from unittest.mock import patch
+
+from benchmarks.bench_similarity import run
+from benchmarks.fakes import FakeChatModel, template_responder
+from src.services.template_generator import generate_template
+from src.utils.cost_ledger import CostLedger
+from src.utils.response_cache import CACHE_MISS, CACHE_SIMILAR, ResponseCache, cached_call
+from src.utils.schemas import TemplateGeneratorInput
+from src.utils.similarity_cache import SimilarityCache
+from src.web.main import app
+
+CONTEXT = "김수연님이 최근 디자인 시스템 개편을 맡은 뒤로 야근이 잦아져 번아웃이 걱정됩니다. 필요한 지원 방안을 논의하고 싶습니다."
+REWORDED = "김수연님이 최근 디자인 시스템 개편을 맡은 뒤로 야근이 잦아져 번아웃이 걱정돼요. 필요한 지원 방안을 논의하고 싶습니다"
+
+PAYLOAD = {
+    "user_id": "user_001",
+    "target_info": "(가상)김수연",
+    "purpose": "Growth, Work",
+    "detailed_context": CONTEXT,
+    "tone_and_manner": "Casual",
+}
+
+
+def _lookup(cache, **overrides):
+    return generate_template.get_similar_lookup(cache, TemplateGeneratorInput(**{**PAYLOAD, **overrides}))
+
+
+def test_reworded_context_and_reordered_purpose_share_partition():
+    cache = SimilarityCache()
+    _lookup(cache).put("questions")
+
+    similar = _lookup(cache, detailed_context=REWORDED, purpose="work,  growth")
+    assert similar.get() == "questions"
+    assert cache.threshold <= similar.score < 1.0
+    assert _lookup(cache, tone_and_manner="Formal").get() is None
+    assert _lookup(cache, detailed_context="신규 입사자의 온보딩 진행 상황과 팀 적응을 확인하고 싶습니다.").get() is None
+
+
+def test_eviction_removes_entries_from_lsh_buckets():
+    cache = SimilarityCache(max_entries=2)
+    cache.put("p", CONTEXT, "A")
+    cache.put("p", "신규 입사자의 온보딩 진행 상황과 팀 적응을 확인하고 싶습니다.", "B")
+    cache.put("p", "다음 분기 목표와 커리어 방향에 대해 이야기하고 싶습니다.", "C")  # 가장 오래된 A 제거
+
+    assert len(cache) == 2
+    assert cache.get("p", REWORDED) is None
+    assert sum(len(bucket) for bucket in cache._buckets.values()) == 2 * cache.bands
+    cache.put("p", CONTEXT, "D")  # 비워진 서명 행 재사용
+    assert cache.get("p", REWORDED)[0] == "D"
+
+
+@pytest.mark.asyncio
+async def test_similar_lookup_is_skipped_while_exact_variant_pool_fills():
+    cache = ResponseCache(variants={"template": 2})
+    similarity_cache = SimilarityCache()
+    produced = []
+
+    async def produce():
+        produced.append(len(produced))
+        return produced[-1]
+
+    # 같은 키의 변형은 새로 생성하고, 유사 캐시에는 키의 첫 결과만 등록
+    assert await cached_call(cache, "template:a", produce, similarity_cache.bind("p", CONTEXT)) == (0, CACHE_MISS)
+    assert await cached_call(cache, "template:a", produce, similarity_cache.bind("p", CONTEXT)) == (1, CACHE_MISS)
+    assert len(similarity_cache) == 1
+    assert await cached_call(cache, "template:b", produce, similarity_cache.bind("p", REWORDED)) == (0, CACHE_SIMILAR)
+
+
+@pytest.mark.asyncio
+async def test_template_endpoint_reports_similar_cache_status(tmp_path):
+    prompts = []
+
+    def responder(messages):
+        prompts.append(messages[-1].content)
+        return template_responder(messages)
+
+    llm = FakeChatModel(responder=responder)
+    app.state.response_cache = ResponseCache()
+    app.state.similarity_cache = SimilarityCache()
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    try:
+        with patch.object(generate_template, "llm", llm), patch.object(generate_template, "chain", generate_template.get_chain()):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                first = await client.post("/api/template", json=PAYLOAD)
+                similar = await client.post(
+                    "/api/template", json={**PAYLOAD, "detailed_context": REWORDED, "purpose": "Work, Growth"}
+                )
+                streamed = await client.post(
+                    "/api/template", params={"stream": "true"}, json={**PAYLOAD, "detailed_context": REWORDED + "!"}
+                )
+    finally:
+        await app.state.cost_ledger.aclose()
+        for name in ("response_cache", "similarity_cache", "cost_ledger"):
+            delattr(app.state, name)
+
+    assert first.json()["cache_status"] == CACHE_MISS
+    assert similar.headers["X-Cache"] == CACHE_SIMILAR
+    assert similar.json() == {**first.json(), "cache_status": CACHE_SIMILAR}
+    assert streamed.headers["X-Cache"] == CACHE_SIMILAR
+    assert '"cache_status": "SIMILAR"' in streamed.text
+    assert len(prompts) == 1
+
+
+def test_benchmark_reports_lookup_latency_and_recall():
+    [result] = run([200], queries=20, partitions=4)
+    assert result["entries"] == 200
+    assert result["lookup_hit_p99_us"] > 0
+    assert result["recall"] >= 0.9
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from src.utils.job_store import JobStore
+from src.utils.state_backend import LockError, SQLiteStateBackend, create_state_backend
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return str(tmp_path / "state.sqlite3")
+
+
+@pytest.mark.asyncio
+async def test_set_get_with_nx_and_expiry(state_path):
+    """Redis와 동일한 set(nx, px) / get / ttl 동작"""
+    backend = SQLiteStateBackend(state_path)
+
+    assert await backend.set("key", "value") is True
+    assert await backend.set("key", "other", nx=True) is None
+    assert await backend.get("key") == b"value"
+    assert await backend.ttl("key") == -1
+
+    await backend.set("short", 1, px=50)
+    assert await backend.exists("short") == 1
+    await asyncio.sleep(0.1)
+    assert await backend.get("short") is None
+    assert await backend.ttl("short") == -2
+
+    assert await backend.incrby("counter", 5) == 5
+    assert await backend.incr("counter") == 6
+    assert await backend.delete("key", "missing") == 1
+    await backend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_state_is_shared_between_backend_instances(state_path):
+    """같은 파일을 여는 다른 워커(인스턴스)에서 작업 상태와 락이 보임"""
+    worker_a = create_state_backend(f"sqlite:///{state_path}")
+    worker_b = create_state_backend(f"sqlite:///{state_path}")
+
+    job = await JobStore(worker_a).create("analyze", recording_url="https://storage.test/a.m4a")
+    await JobStore(worker_a).update(job["job_id"], status="completed", result={"title": "회의"})
+
+    shared = await JobStore(worker_b).get(job["job_id"])
+    assert shared["status"] == "completed"
+    assert shared["result"] == {"title": "회의"}
+
+    # 같은 job_id를 두 워커에서 동시에 만들면 하나만 성공하고 기존 작업은 덮어쓰지 않음
+    created = await asyncio.gather(
+        JobStore(worker_a).create("analyze", job_id="job_dup"), JobStore(worker_b).create("analyze", job_id="job_dup")
+    )
+    assert sum(job is not None for job in created) == 1
+    assert await JobStore(worker_a).create("analyze", job_id=job["job_id"]) is None
+    assert (await JobStore(worker_b).get(job["job_id"]))["status"] == "completed"
+
+    async with worker_a.lock("lock:recording", timeout=5):
+        with pytest.raises(LockError):
+            async with worker_b.lock("lock:recording", blocking_timeout=0.2):
+                pass
+    assert await worker_b.lock("lock:recording", blocking_timeout=0.2).acquire()
+
+    await worker_a.aclose()
+    await worker_b.aclose()
+
+
+def test_unknown_backend_url_is_rejected():
+    with pytest.raises(ValueError):
+        create_state_backend("memcached://localhost")
@@ -0,0 +1,103 @@
+import json
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from benchmarks.fakes import FakeChatModel, email_responder, template_responder
+from src.services.template_generator import generate_email, generate_template
+from src.utils.cost_ledger import CostLedger
+from src.utils.response_cache import ResponseCache
+from src.utils.streaming import IncrementalJsonParser, ParagraphBuffer
+from src.web.main import app
+
+PAYLOAD = {
+    "user_id": "user_001",
+    "target_info": "(가상)김수연",
+    "purpose": "Growth, Work",
+    "tone_and_manner": "Casual",
+}
+
+
+def _feed_in_chunks(parser, text, size):
+    events = []
+    for start in range(0, len(text), size):
+        events.extend(parser.feed(text[start:start + size]))
+    return events
+
+
+@pytest.mark.parametrize("size", [1, 3, 17])
+def test_incremental_parser_matches_json_loads_for_any_chunking(size):
+    obj = {"1": '따옴표 "인용" \\ 이모지 😀\t탭', "2": "둘째 줄\n줄바꿈", "count": 3, "meta": {"tags": ["}", "a"]}}
+    text = "```json\n" + json.dumps(obj, ensure_ascii=True, indent=2) + "\n```"
+
+    parser = IncrementalJsonParser()
+    events = _feed_in_chunks(parser, text, size)
+
+    assert parser.done
+    assert parser.result == obj
+    assert [(e.key, e.value) for e in events if e.kind == "value"] == list(obj.items())
+    deltas = "".join(e.value for e in events if e.kind == "delta" and e.key == "1")
+    assert deltas == obj["1"]
+
+
+def test_question_is_emitted_as_soon_as_its_value_closes():
+    parser = IncrementalJsonParser()
+    assert [e for e in parser.feed('{"1": "첫 질문", "2": "둘') if e.kind == "value"] == [("value", "1", "첫 질문")]
+    assert parser.feed('째"}')[-1] == ("value", "2", "둘째")
+
+    with pytest.raises(ValueError):
+        IncrementalJsonParser().feed('{"1" "missing colon"}')
+
+
+def test_paragraph_buffer_splits_on_blank_lines_across_chunks():
+    buffer = ParagraphBuffer()
+    assert buffer.feed("안녕하세요.\n") == []
+    assert buffer.feed("\n본문 첫") == ["안녕하세요."]
+    assert buffer.feed(" 문단\n\n\n") == ["본문 첫 문단"]
+    assert buffer.feed("감사합니다.") == []
+    assert buffer.flush() == ["감사합니다."]
+
+
+def _parse_sse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines.get("event"), json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_template_and_email_stream_typed_events_and_final_output(tmp_path):
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    app.state.response_cache = ResponseCache(variants={})
+    template_llm = FakeChatModel(responder=template_responder, chunk_tokens=3)
+    email_llm = FakeChatModel(responder=email_responder, chunk_tokens=3)
+    try:
+        with patch.object(generate_template, "llm", template_llm), patch.object(generate_email, "llm", email_llm):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                template = await client.post("/api/template", params={"stream": True}, json=PAYLOAD)
+                cached = await client.post("/api/template", params={"stream": True}, json=PAYLOAD)
+                email = await client.post(
+                    "/api/template", params={"generation_type": "email", "stream": True}, json=PAYLOAD
+                )
+    finally:
+        await app.state.cost_ledger.aclose()
+        del app.state.cost_ledger
+        del app.state.response_cache
+
+    assert template.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(template.text)
+    expected = json.loads(template_responder([]))
+    assert [data["question"] for name, data in events if name == "question"] == list(expected.values())
+    assert events[-1] == ("done", {"generated_questions": expected, "cache_status": "MISS"})
+
+    # 캐시 적중 시에도 같은 이벤트 순서로 재생 (done 이벤트의 cache_status만 다름)
+    assert cached.headers["x-cache"] == "HIT"
+    assert _parse_sse(cached.text) == events[:-1] + [("done", {"generated_questions": expected, "cache_status": "HIT"})]
+
+    email_events = _parse_sse(email.text)
+    body = json.loads(email_responder([]))["generated_email"]
+    assert [data["text"] for name, data in email_events if name == "paragraph"] == body.split("\n\n")
+    assert email_events[-1] == ("done", {"generated_email": body})
@@ -0,0 +1,75 @@
+import json
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from benchmarks.fakes import FakeChatModel, LatencyDistribution, email_responder, guide_responder, template_responder
+from src.services.template_generator import generate_email, generate_template, generate_usage_guide
+from src.services.template_generator.generate_bundle import stream_bundle
+from src.utils.cost_ledger import CostLedger
+from src.utils.schemas import TemplateGeneratorInput
+from src.web.main import app
+
+PAYLOAD = {
+    "user_id": "user_001",
+    "target_info": "(가상)김수연",
+    "purpose": "Growth, Work",
+    "tone_and_manner": "Casual",
+}
+
+
+def _fake_llms(latency_ms, template_failure_rate=0.0):
+    latency = LatencyDistribution(mean_ms=latency_ms)
+    return (
+        patch.object(generate_template, "llm", FakeChatModel(
+            responder=template_responder, first_token_latency=latency, failure_rate=template_failure_rate,
+        )),
+        patch.object(generate_email, "llm", FakeChatModel(responder=email_responder, first_token_latency=latency)),
+        patch.object(generate_usage_guide, "llm", FakeChatModel(responder=guide_responder, first_token_latency=latency)),
+    )
+
+
+@pytest.mark.asyncio
+async def test_bundle_runs_email_concurrently_and_guide_after_questions(tmp_path):
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    template_patch, email_patch, guide_patch = _fake_llms(latency_ms=300)
+    try:
+        with template_patch, email_patch, guide_patch:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/api/template/bundle", json=PAYLOAD)
+    finally:
+        await app.state.cost_ledger.aclose()
+        del app.state.cost_ledger
+
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    names = [name for name, _ in events]
+
+    # 이메일은 템플릿과 동시에 끝나고, 가이드는 질문이 완성된 뒤 시작
+    assert names.index("email.done") < names.index("guide.chunk")
+    assert names.index("template.done") < names.index("guide.chunk")
+    assert names[-1] == "done"
+
+    final = events[-1][1]
+    assert final["generated_questions"] == json.loads(template_responder([]))
+    assert final["generated_email"] == json.loads(email_responder([]))["generated_email"]
+    assert final["usage_guide"] == guide_responder([])
+    # 순차 호출(약 900ms)이 아닌 max(이메일, 템플릿 + 가이드) ≈ 600ms
+    assert final["elapsed_ms"] < 850
+
+
+@pytest.mark.asyncio
+async def test_bundle_keeps_email_when_template_fails():
+    template_patch, email_patch, guide_patch = _fake_llms(latency_ms=0, template_failure_rate=1.0)
+    with template_patch, email_patch, guide_patch:
+        events = [event async for event in stream_bundle(TemplateGeneratorInput(**PAYLOAD))]
+
+    names = [name for name, _ in events]
+    assert "template.error" in names
+    assert "email.done" in names
+    assert not any(name.startswith("guide.") for name in names)
+    assert events[-1][1]["generated_questions"] is None
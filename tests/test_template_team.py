@@ -0,0 +1,123 @@
+import asyncio
+import json
+import re
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from benchmarks.fakes import FakeChatModel, template_responder
+from src.services.template_generator import generate_team, generate_template
+from src.services.template_generator.generate_team import plan_packs, stream_team_templates, to_member_input
+from src.utils.cost_ledger import CostLedger
+from src.utils.response_cache import ResponseCache
+from src.utils.schemas import TeamTemplateInput, TemplateGeneratorOutput
+from src.web.main import app
+
+QUESTIONS = json.loads(template_responder([]))
+
+
+def _team(count, packed=False, long_members=0):
+    members = [{"target_info": f"팀원{index}", "detailed_context": f"{index}번 팀원의 온보딩 상황"} for index in range(count)]
+    members += [{"target_info": f"장문{index}", "detailed_context": "프로젝트 회고 " * 200} for index in range(long_members)]
+    return TeamTemplateInput(
+        user_id="user_001", purpose="Growth, Work", tone_and_manner="Casual", packed=packed, members=members
+    )
+
+
+def _inputs(team):
+    return [to_member_input(team, member) for member in team.members]
+
+
+async def _collect(events):
+    return [event async for event in events]
+
+
+@pytest.mark.asyncio
+async def test_members_are_generated_with_bounded_concurrency():
+    running, peak = 0, 0
+
+    async def fake_generate(input_data):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return TemplateGeneratorOutput(generated_questions={"1": input_data.target_info})
+
+    team = _team(6)
+    with patch.object(generate_template, "generate_template", fake_generate):
+        events = await _collect(stream_team_templates(team, _inputs(team), concurrency=2))
+
+    assert peak == 2
+    members = [data for name, data in events if name == "member"]
+    assert sorted(data["index"] for data in members) == list(range(6))
+    assert all(data["generated_questions"] == {"1": data["target_info"]} for data in members)
+    assert events[-1][0] == "done"
+    assert events[-1][1]["completed"] == 6 and events[-1][1]["llm_calls"] == 6
+
+
+def test_plan_packs_groups_only_small_inputs():
+    team = _team(4, packed=True, long_members=1)
+    assert plan_packs(_inputs(team), pack_size=3) == [[0, 1, 2], [3], [4]]
+
+
+@pytest.mark.asyncio
+async def test_packed_mode_generates_several_members_per_call_and_falls_back_for_missing():
+    prompts = []
+
+    def responder(messages):
+        prompt = messages[-1].content
+        prompts.append(prompt)
+        members = [int(index) for index in re.findall(r"### Member (\d+)", prompt)]
+        if not members:
+            return template_responder(messages)
+        # 두 번째 팀원을 빠뜨린 응답 → 해당 팀원만 단독 생성으로 대체
+        return json.dumps({str(index): QUESTIONS for index in members if index != 2}, ensure_ascii=False)
+
+    llm = FakeChatModel(responder=responder)
+    team = _team(3, packed=True, long_members=1)
+    cache = ResponseCache(variants={})
+    with patch.object(generate_template, "llm", llm), \
+            patch.object(generate_template, "chain", generate_template.get_chain()), \
+            patch.object(generate_team, "llm", llm), \
+            patch.object(generate_team, "packed_chain", generate_team.get_packed_chain()):
+        events = await _collect(stream_team_templates(team, _inputs(team), cache))
+        repeated = await _collect(stream_team_templates(team, _inputs(team), cache))
+
+    assert "### Member 3" in prompts[0] and "팀원2" in prompts[0]
+    # packed 프롬프트도 단일 프롬프트와 같은 질문 구성 규칙을 포함
+    assert "generate at least 3 structured questions" in prompts[0]
+    members = {data["index"]: data for name, data in events if name == "member"}
+    assert sorted(members) == [0, 1, 2, 3]
+    assert all(data["generated_questions"] == QUESTIONS for data in members.values())
+    # packed 1회 + 빠진 팀원 1회 + 긴 입력 팀원 1회
+    assert events[-1][1]["llm_calls"] == 3
+    # packed로 생성한 결과도 팀원별 키로 캐시되어 재요청 시 LLM을 호출하지 않음
+    assert repeated[-1][1]["llm_calls"] == 0
+    assert {data["cache_status"] for name, data in repeated if name == "member"} == {"HIT"}
+    # packed 결과는 packed 프롬프트 버전 키에만 저장되어 단일 템플릿 요청에는 재사용되지 않음
+    with patch.object(generate_team, "llm", llm), patch.object(generate_template, "llm", llm):
+        first = _inputs(team)[0]
+        assert cache.get(generate_team.get_packed_cache_key(first)) is not None
+        assert cache.get(generate_template.get_cache_key(first)) is None
+
+
+@pytest.mark.asyncio
+async def test_team_endpoint_streams_member_events(tmp_path):
+    app.state.cost_ledger = CostLedger(str(tmp_path / "ledger.sqlite3"))
+    try:
+        with patch.object(generate_template, "llm", FakeChatModel(responder=template_responder)), \
+                patch.object(generate_template, "chain", generate_template.get_chain()):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/api/template/team", json=_team(3).model_dump())
+                empty = await client.post("/api/template/team", json={**_team(1).model_dump(), "members": []})
+    finally:
+        await app.state.cost_ledger.aclose()
+        del app.state.cost_ledger
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    names = re.findall(r"^event: (.+)$", response.text, flags=re.MULTILINE)
+    assert names == ["member"] * 3 + ["done"]
+    assert empty.status_code == 422
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+from src.utils import tracing
+from src.utils.tracing import JsonlSpanExporter, start_span, start_trace
+from src.web.main import app
+
+
+class _CollectingExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+@pytest.fixture
+def exporter():
+    collecting = _CollectingExporter()
+    previous = tracing.get_exporter()
+    tracing.set_exporter(collecting)
+    yield collecting
+    tracing.set_exporter(previous)
+
+
+@pytest.mark.asyncio
+async def test_span_tree_covers_chain_llm_and_child_tasks(exporter):
+    """체인 구성요소/LLM 호출/하위 태스크 span이 같은 trace에 부모-자식으로 기록"""
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="첫 번째 질문 두 번째 질문")]))
+    chain = ChatPromptTemplate.from_messages([("human", "{topic}")]) | llm | StrOutputParser()
+
+    with start_trace("POST /api/template") as root:
+        with start_span("node.generate"):
+            chunks = [chunk async for chunk in chain.astream({"topic": "1on1"})]
+
+        async def child_task():
+            with start_span("background"):
+                await asyncio.sleep(0)
+
+        await asyncio.create_task(child_task())
+
+    assert "".join(chunks) == "첫 번째 질문 두 번째 질문"
+    by_name = {span.name: span for span in exporter.spans}
+    assert {span.trace_id for span in exporter.spans} == {root.trace_id}
+    assert by_name["node.generate"].parent_id == root.span_id
+    assert by_name["background"].parent_id == root.span_id
+    assert by_name["chain.ChatPromptTemplate"].parent_id == by_name["chain.RunnableSequence"].span_id
+    assert by_name["chain.RunnableSequence"].parent_id == by_name["node.generate"].span_id
+    llm_span = by_name["llm"]
+    assert llm_span.attributes["stream_chunks"] > 1
+    assert llm_span.attributes["time_to_first_token_ms"] <= llm_span.duration_ms
+    assert "node.generate;dur=" in root.trace.server_timing()
+
+
+def test_spans_outside_trace_are_noop(exporter):
+    with start_span("orphan") as span:
+        assert span is None
+    assert exporter.spans == []
+
+
+def test_jsonl_exporter_writes_one_span_per_line(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    jsonl = JsonlSpanExporter(str(path))
+    previous = tracing.get_exporter()
+    tracing.set_exporter(jsonl)
+    try:
+        with start_trace("GET /api/config"):
+            with start_span("work", user_id="user_001"):
+                pass
+    finally:
+        tracing.set_exporter(previous)
+
+    for _ in range(50):
+        if path.exists() and len(path.read_text().splitlines()) == 2:
+            break
+        time.sleep(0.02)
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["name"] for record in records] == ["work", "GET /api/config"]
+    assert records[0]["attributes"] == {"user_id": "user_001"}
+
+
+@pytest.mark.asyncio
+async def test_middleware_adds_trace_headers(exporter):
+    """상위 서비스의 traceparent를 이어받고 Server-Timing 헤더를 반환"""
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(
+            "/api/config", headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"}
+        )
+
+    assert response.headers["x-trace-id"] == trace_id
+    assert "total;dur=" in response.headers["server-timing"]